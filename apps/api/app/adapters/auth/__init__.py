@@ -1,12 +1,21 @@
 """Auth verifier adapters."""
 
-from .base import AuthVerificationError, TokenVerifier
+from .base import AsyncTokenVerifier, AuthVerificationError, TokenVerifier
+from .cache import CachingTokenVerifier
 from .firebase_auth import FirebaseTokenVerifier
+from .jwks_auth import JwksTokenVerifier
 from .mock_auth import MockTokenVerifier
+from .offload import DirectAsyncTokenVerifier, OffloadedTokenVerifier, as_async_verifier
 
 __all__ = [
+    "AsyncTokenVerifier",
     "AuthVerificationError",
     "TokenVerifier",
+    "CachingTokenVerifier",
     "FirebaseTokenVerifier",
+    "JwksTokenVerifier",
     "MockTokenVerifier",
+    "DirectAsyncTokenVerifier",
+    "OffloadedTokenVerifier",
+    "as_async_verifier",
 ]
@@ -12,9 +12,26 @@ class AuthVerificationError(Exception):
 class TokenVerifier(ABC):
     """Provider-neutral token verification interface."""
 
+    # True when verification may block on network I/O and must leave the event loop.
+    blocking: bool = False
+
     @abstractmethod
     def verify_token(self, token: str) -> AuthPrincipal:
         """Verify token and return normalized principal."""
 
+    def warm_up(self) -> None:
+        """Load provider SDKs or keys ahead of the first request; no-op by default."""
+
+    def close(self) -> None:
+        """Release background resources; no-op by default."""
+
+
+class AsyncTokenVerifier(ABC):
+    """Awaitable verification interface used by request dependencies."""
+
+    @abstractmethod
+    async def verify_token(self, token: str) -> AuthPrincipal:
+        """Verify token and return normalized principal."""
+
 
-__all__ = ["AuthVerificationError", "TokenVerifier"]
+__all__ = ["AsyncTokenVerifier", "AuthVerificationError", "TokenVerifier"]
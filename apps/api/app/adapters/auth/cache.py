@@ -0,0 +1,110 @@
+"""Bounded cache of verified principals in front of any token verifier."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+import hashlib
+import threading
+import time
+
+from app.adapters.auth.base import TokenVerifier
+from app.schemas.auth import AuthPrincipal
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    principal: AuthPrincipal
+    expires_at: float
+
+
+class CachingTokenVerifier(TokenVerifier):
+    """LRU cache of successful verifications keyed by the token's SHA-256 digest.
+
+    An entry is served until the earlier of the token's ``exp`` and
+    ``revocation_check_seconds`` after it was verified; after that the wrapped
+    verifier runs again, which re-applies its revocation check. Failures are
+    never cached. Raw tokens are not retained.
+    """
+
+    def __init__(
+        self,
+        inner: TokenVerifier,
+        *,
+        max_entries: int = 10_000,
+        revocation_check_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self._inner = inner
+        self.blocking = inner.blocking
+        self._max_entries = max_entries
+        self._revocation_check_seconds = revocation_check_seconds
+        self._clock = clock
+        self._entries: OrderedDict[bytes, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def inner(self) -> TokenVerifier:
+        return self._inner
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, token: str) -> AuthPrincipal | None:
+        """Return a live cached principal without calling the wrapped verifier."""
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.principal
+
+    def verify_token(self, token: str) -> AuthPrincipal:
+        principal = self.lookup(token)
+        if principal is not None:
+            return principal
+
+        key = hashlib.sha256(token.encode()).digest()
+        now = self._clock()
+        with self._lock:
+            self.misses += 1
+
+        principal = self._inner.verify_token(token)
+
+        expires_at = now + self._revocation_check_seconds
+        if principal.expires_at is not None:
+            expires_at = min(expires_at, principal.expires_at.timestamp())
+        if expires_at <= now:
+            return principal
+
+        with self._lock:
+            self._entries[key] = _CacheEntry(principal=principal, expires_at=expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return principal
+
+    def warm_up(self) -> None:
+        self._inner.warm_up()
+
+    def close(self) -> None:
+        self._inner.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+__all__ = ["CachingTokenVerifier"]
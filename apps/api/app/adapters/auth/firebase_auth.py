@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
+from types import ModuleType
+
 from app.adapters.auth.base import AuthVerificationError, TokenVerifier
 from app.schemas.auth import AuthPrincipal
 
@@ -9,11 +12,16 @@ from app.schemas.auth import AuthPrincipal
 class FirebaseTokenVerifier(TokenVerifier):
     """Verifies Firebase JWTs and normalizes principal data."""
 
-    def __init__(self, project_id: str | None, audience: str | None) -> None:
+    # Revocation checks are a remote lookup.
+    blocking = True
+
+    def __init__(self, project_id: str | None, audience: str | None, eager_init: bool = False) -> None:
         self._project_id = project_id
         self._audience = audience
+        self._eager_init = eager_init
 
-    def verify_token(self, token: str) -> AuthPrincipal:
+    @staticmethod
+    def _firebase_auth() -> ModuleType:
         try:
             import firebase_admin
             from firebase_admin import auth as firebase_auth
@@ -22,6 +30,14 @@ class FirebaseTokenVerifier(TokenVerifier):
 
         if not firebase_admin._apps:
             firebase_admin.initialize_app()
+        return firebase_auth
+
+    def warm_up(self) -> None:
+        if self._eager_init:
+            self._firebase_auth()
+
+    def verify_token(self, token: str) -> AuthPrincipal:
+        firebase_auth = self._firebase_auth()
 
         try:
             decoded = firebase_auth.verify_id_token(token, check_revoked=True)
@@ -42,7 +58,11 @@ class FirebaseTokenVerifier(TokenVerifier):
         if not user_id:
             raise AuthVerificationError("Bearer token missing user identity")
 
-        return AuthPrincipal(user_id=user_id, role=role)
+        expires_at = None
+        if isinstance(decoded.get("exp"), (int, float)):
+            expires_at = datetime.fromtimestamp(decoded["exp"], UTC)
+
+        return AuthPrincipal(user_id=user_id, role=role, expires_at=expires_at)
 
 
 __all__ = ["FirebaseTokenVerifier"]
@@ -0,0 +1,217 @@
+"""Offline JWKS-backed JWT verifier adapter (Firebase or Keycloak issuers)."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import UTC, datetime
+import json
+import threading
+import time
+from typing import Any
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+from app.adapters.auth.base import AuthVerificationError, TokenVerifier
+from app.schemas.auth import AuthPrincipal
+
+FIREBASE_JWKS_URI = "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
+
+
+def _load_jwks_document(jwks_uri: str, timeout_seconds: float) -> dict[str, Any]:
+    parsed = urlparse(jwks_uri)
+    if parsed.scheme in ("http", "https"):
+        with urlopen(jwks_uri, timeout=timeout_seconds) as response:  # noqa: S310 - configured URI
+            return json.loads(response.read())
+
+    path = parsed.path if parsed.scheme == "file" else jwks_uri
+    with open(path, "rb") as handle:
+        return json.loads(handle.read())
+
+
+class JwksTokenVerifier(TokenVerifier):
+    """Verifies RS256 JWTs locally against a cached JSON Web Key Set.
+
+    Keys are fetched once up front, refreshed on a background thread every
+    ``refresh_seconds``, and refreshed on demand when a token names an unknown
+    ``kid`` (at most once per ``min_refresh_seconds``), so steady-state
+    verification needs no network access. ``jwks_uri`` may be an HTTP(S) URL,
+    a ``file://`` URI or a plain filesystem path.
+
+    A refresh on an unknown ``kid`` or on a first request after a failed
+    warm-up fetches over the network and waits on the refresher's lock, so
+    the verifier is ``blocking``; put it behind ``CachingTokenVerifier`` to
+    answer repeat tokens on the event loop.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        *,
+        jwks_uri: str,
+        issuer: str,
+        audience: str | None,
+        refresh_seconds: float = 3600.0,
+        min_refresh_seconds: float = 30.0,
+        leeway_seconds: float = 0.0,
+        fetch_timeout_seconds: float = 5.0,
+        background_refresh: bool = True,
+        loader: Callable[[str, float], dict[str, Any]] = _load_jwks_document,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._jwks_uri = jwks_uri
+        self._issuer = issuer
+        self._audience = audience
+        self._refresh_seconds = refresh_seconds
+        self._min_refresh_seconds = min_refresh_seconds
+        self._leeway_seconds = leeway_seconds
+        self._fetch_timeout_seconds = fetch_timeout_seconds
+        self._background_refresh = background_refresh
+        self._loader = loader
+        self._clock = clock
+
+        self._keys: dict[str, Any] = {}
+        self._last_refresh: float | None = None
+        self._refresh_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.refresh_count = 0
+
+    @classmethod
+    def for_firebase(cls, project_id: str, audience: str | None = None, **kwargs: Any) -> JwksTokenVerifier:
+        """Firebase ID tokens: issuer ``securetoken.google.com/<project>``, audience the project id."""
+        kwargs.setdefault("jwks_uri", FIREBASE_JWKS_URI)
+        return cls(
+            issuer=f"https://securetoken.google.com/{project_id}",
+            audience=audience or project_id,
+            **kwargs,
+        )
+
+    @classmethod
+    def for_keycloak(
+        cls,
+        server_url: str,
+        realm: str,
+        audience: str | None = None,
+        **kwargs: Any,
+    ) -> JwksTokenVerifier:
+        """Keycloak realm tokens: issuer ``<server>/realms/<realm>`` with the realm certs endpoint."""
+        issuer = f"{server_url.rstrip('/')}/realms/{realm}"
+        kwargs.setdefault("jwks_uri", f"{issuer}/protocol/openid-connect/certs")
+        return cls(issuer=issuer, audience=audience, **kwargs)
+
+    @property
+    def key_ids(self) -> frozenset[str]:
+        return frozenset(self._keys)
+
+    def refresh(self) -> None:
+        """Fetch the key set and atomically replace the cached keys."""
+        try:
+            from jwt import PyJWKSet, PyJWTError
+        except ImportError as exc:  # pragma: no cover - depends on optional package
+            raise AuthVerificationError("JWKS auth verifier is unavailable") from exc
+
+        with self._refresh_lock:
+            try:
+                key_set = PyJWKSet.from_dict(self._loader(self._jwks_uri, self._fetch_timeout_seconds))
+            except (OSError, ValueError, PyJWTError) as exc:
+                raise AuthVerificationError("Signing keys are unavailable") from exc
+
+            keys: dict[str, Any] = {}
+            for jwk in key_set.keys:
+                if jwk.key_id and jwk.algorithm_name == "RS256":
+                    keys[jwk.key_id] = jwk.key
+            self._keys = keys
+            self._last_refresh = self._clock()
+            self.refresh_count += 1
+
+    def start(self) -> None:
+        """Load keys if needed and start the periodic background refresher."""
+        with self._start_lock:
+            if self._last_refresh is None:
+                self.refresh()
+            if not self._background_refresh or self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._refresh_loop, name="jwks-refresh", daemon=True)
+            self._thread.start()
+
+    def warm_up(self) -> None:
+        self.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._fetch_timeout_seconds)
+            self._thread = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self._refresh_seconds):
+            try:
+                self.refresh()
+            except AuthVerificationError:  # pragma: no cover - keep serving the last good key set
+                continue
+
+    def _key_for(self, kid: str) -> Any:
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid usually means rotation: refresh once, rate limited so
+        # garbage kids cannot turn every request into a network fetch.
+        last_refresh = self._last_refresh
+        if last_refresh is None or self._clock() - last_refresh >= self._min_refresh_seconds:
+            self.refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise AuthVerificationError("Invalid bearer token signing key")
+        return key
+
+    def verify_token(self, token: str) -> AuthPrincipal:
+        try:
+            import jwt
+        except ImportError as exc:  # pragma: no cover - depends on optional package
+            raise AuthVerificationError("JWKS auth verifier is unavailable") from exc
+
+        if self._last_refresh is None:
+            self.start()
+
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as exc:
+            raise AuthVerificationError("Invalid bearer token") from exc
+
+        if header.get("alg") != "RS256" or not header.get("kid"):
+            raise AuthVerificationError("Invalid bearer token")
+
+        key = self._key_for(str(header["kid"]))
+        try:
+            decoded = jwt.decode(
+                token,
+                key=key,
+                algorithms=["RS256"],
+                issuer=self._issuer,
+                audience=self._audience,
+                leeway=self._leeway_seconds,
+                options={"require": ["exp", "iat", "iss"], "verify_aud": self._audience is not None},
+            )
+        except jwt.InvalidAudienceError as exc:
+            raise AuthVerificationError("Invalid bearer token audience") from exc
+        except jwt.InvalidIssuerError as exc:
+            raise AuthVerificationError("Invalid bearer token issuer") from exc
+        except jwt.PyJWTError as exc:
+            raise AuthVerificationError("Invalid bearer token") from exc
+
+        user_id = str(decoded.get("uid") or decoded.get("sub") or "").strip()
+        role = str(decoded.get("role") or "editor").strip()
+        if not user_id:
+            raise AuthVerificationError("Bearer token missing user identity")
+
+        return AuthPrincipal(
+            user_id=user_id,
+            role=role,
+            expires_at=datetime.fromtimestamp(decoded["exp"], UTC),
+        )
+
+
+__all__ = ["FIREBASE_JWKS_URI", "JwksTokenVerifier"]
@@ -0,0 +1,46 @@
+"""Adapters exposing synchronous token verifiers through ``AsyncTokenVerifier``."""
+
+from __future__ import annotations
+
+from app.adapters.auth.base import AsyncTokenVerifier, TokenVerifier
+from app.adapters.auth.cache import CachingTokenVerifier
+from app.core.executor import BlockingExecutor
+from app.schemas.auth import AuthPrincipal
+
+
+class DirectAsyncTokenVerifier(AsyncTokenVerifier):
+    """Calls a non-blocking verifier inline on the event loop."""
+
+    def __init__(self, verifier: TokenVerifier) -> None:
+        self._verifier = verifier
+
+    async def verify_token(self, token: str) -> AuthPrincipal:
+        return self._verifier.verify_token(token)
+
+
+class OffloadedTokenVerifier(AsyncTokenVerifier):
+    """Runs a blocking verifier on the bounded executor.
+
+    When the verifier is a ``CachingTokenVerifier``, cache hits are answered
+    inline so only misses pay for the thread hop.
+    """
+
+    def __init__(self, verifier: TokenVerifier, executor: BlockingExecutor) -> None:
+        self._verifier = verifier
+        self._executor = executor
+
+    async def verify_token(self, token: str) -> AuthPrincipal:
+        if isinstance(self._verifier, CachingTokenVerifier):
+            principal = self._verifier.lookup(token)
+            if principal is not None:
+                return principal
+        return await self._executor.run(self._verifier.verify_token, token)
+
+
+def as_async_verifier(verifier: TokenVerifier, executor: BlockingExecutor) -> AsyncTokenVerifier:
+    if verifier.blocking:
+        return OffloadedTokenVerifier(verifier, executor)
+    return DirectAsyncTokenVerifier(verifier)
+
+
+__all__ = ["DirectAsyncTokenVerifier", "OffloadedTokenVerifier", "as_async_verifier"]
@@ -0,0 +1,19 @@
+"""LLM provider adapters."""
+
+from .base import DraftRequest, FragmentRequest, LLMClient, LLMError, ProgressCallback
+from .fake import FakeLLMClient
+from .local_llm import LocalLLMClient
+from .openai_llm import OpenAILLMClient
+from .remote import RemoteLLMClient
+
+__all__ = [
+    "DraftRequest",
+    "FakeLLMClient",
+    "FragmentRequest",
+    "LLMClient",
+    "LLMError",
+    "LocalLLMClient",
+    "OpenAILLMClient",
+    "ProgressCallback",
+    "RemoteLLMClient",
+]
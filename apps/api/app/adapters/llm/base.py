@@ -0,0 +1,57 @@
+"""LLM provider interfaces."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.adapters.providers import ProviderError
+
+# Receives provider-side progress as a fraction in [0, 1].
+ProgressCallback = Callable[[float], None]
+
+
+class LLMError(ProviderError):
+    """Raised when a provider call fails; ``retryable`` marks transient failures."""
+
+    def __init__(self, message: str, *, code: str = "LLM_FAILED", retryable: bool = False) -> None:
+        super().__init__(message, code=code, retryable=retryable)
+
+
+@dataclass(frozen=True, slots=True)
+class FragmentRequest:
+    """Rewrite of one selected markdown fragment."""
+
+    fragment: str
+    context: str | None = None
+    model_profile: str | None = None
+    prompt_template_id: str | None = None
+    prompt_params_ref: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class DraftRequest:
+    """Draft markdown for a transcript (or one window of it)."""
+
+    transcript: str
+    context: str | None = None
+    model_profile: str | None = None
+    prompt_template_id: str | None = None
+    prompt_params_ref: str | None = None
+
+
+class LLMClient(ABC):
+    """Provider-neutral text generation used by draft and regenerate workflows."""
+
+    @abstractmethod
+    async def generate(self, request: DraftRequest, progress: ProgressCallback | None = None) -> str:
+        """Return draft markdown for ``request.transcript``."""
+
+    @abstractmethod
+    async def regenerate(self, request: FragmentRequest, progress: ProgressCallback | None = None) -> str:
+        """Return the replacement markdown for ``request.fragment``."""
+
+    async def aclose(self) -> None:
+        """Release pooled connections; the default holds none."""
+
+
+__all__ = ["DraftRequest", "FragmentRequest", "LLMClient", "LLMError", "ProgressCallback"]
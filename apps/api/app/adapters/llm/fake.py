@@ -0,0 +1,56 @@
+"""Local fake LLM for tests and load runs."""
+
+from __future__ import annotations
+
+import asyncio
+
+from .base import DraftRequest, FragmentRequest, LLMClient, LLMError, ProgressCallback
+
+
+class FakeLLMClient(LLMClient):
+    """Deterministic stand-in: waits ``latency_seconds`` in ``steps`` and echoes its input.
+
+    ``fail_with`` makes every call raise. ``calls`` and ``max_in_flight``
+    let load tests check how much provider work the caller really issued.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_seconds: float = 0.0,
+        steps: int = 4,
+        fail_with: LLMError | None = None,
+    ) -> None:
+        if steps < 1:
+            raise ValueError("steps must be positive")
+        self._latency_seconds = latency_seconds
+        self._steps = steps
+        self._fail_with = fail_with
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, request: DraftRequest, progress: ProgressCallback | None = None) -> str:
+        await self._call(progress)
+        return request.transcript.strip()
+
+    async def regenerate(self, request: FragmentRequest, progress: ProgressCallback | None = None) -> str:
+        await self._call(progress)
+        return f"{request.fragment} (regenerated)"
+
+    async def _call(self, progress: ProgressCallback | None) -> None:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            for step in range(1, self._steps + 1):
+                await asyncio.sleep(self._latency_seconds / self._steps)
+                if progress is not None:
+                    progress(step / self._steps)
+            if self._fail_with is not None:
+                raise self._fail_with
+        finally:
+            self.in_flight -= 1
+
+
+__all__ = ["FakeLLMClient"]
@@ -0,0 +1,59 @@
+"""Adapter for a local LLM service exposing the workflow contract."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .base import DraftRequest, FragmentRequest, ProgressCallback
+from .remote import RemoteLLMClient
+
+
+class LocalLLMClient(RemoteLLMClient):
+    """Calls ``POST /llm/generate`` and ``POST /llm/regenerate``; both answer ``{"markdown": ...}``.
+
+    Prompt templates are resolved by the service from ``prompt_template_id``
+    and ``prompt_params_ref``, which are forwarded as-is.
+    """
+
+    async def generate(self, request: DraftRequest, progress: ProgressCallback | None = None) -> str:
+        payload = {
+            "model": self._model,
+            "model_profile": request.model_profile,
+            "prompt_template_id": request.prompt_template_id,
+            "prompt_params_ref": request.prompt_params_ref,
+            "transcript": request.transcript,
+            "context": request.context,
+        }
+        body = await self._post(
+            "/llm/generate",
+            payload,
+            prompt_template_id=request.prompt_template_id or "generate",
+            progress=progress,
+        )
+        return self._markdown(body)
+
+    async def regenerate(self, request: FragmentRequest, progress: ProgressCallback | None = None) -> str:
+        payload = {
+            "model": self._model,
+            "model_profile": request.model_profile,
+            "prompt_template_id": request.prompt_template_id,
+            "prompt_params_ref": request.prompt_params_ref,
+            "fragment": request.fragment,
+            "context": request.context,
+        }
+        body = await self._post(
+            "/llm/regenerate",
+            payload,
+            prompt_template_id=request.prompt_template_id or "regenerate",
+            progress=progress,
+        )
+        return self._markdown(body)
+
+    def _markdown(self, body: Any) -> str:
+        markdown = body.get("markdown") if isinstance(body, dict) else None
+        if not isinstance(markdown, str):
+            raise self._bad_response()
+        return markdown
+
+
+__all__ = ["LocalLLMClient"]
@@ -0,0 +1,83 @@
+"""Adapter for the OpenAI chat completions API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .base import DraftRequest, FragmentRequest, ProgressCallback
+from .remote import RemoteLLMClient
+
+_GENERATE_PROMPT = (
+    "Write step-by-step user instructions in markdown from the screen-recording transcript. "
+    "Return only the markdown."
+)
+_REGENERATE_PROMPT = (
+    "Rewrite the markdown fragment so it reads as clear instructions. Keep its meaning and "
+    "formatting, and return only the replacement markdown."
+)
+
+
+def _user_message(text: str, context: str | None) -> str:
+    return f"Context:\n{context}\n\n---\n\n{text}" if context else text
+
+
+class OpenAILLMClient(RemoteLLMClient):
+    """Calls ``POST /chat/completions`` with the built-in draft and rewrite prompts.
+
+    OpenAI has no notion of our prompt templates, so ``prompt_template_id``
+    and ``prompt_params_ref`` only take part in the coalescing key.
+    Temperature is pinned to 0 so coalesced callers share an answer they
+    could have received on their own.
+    """
+
+    async def generate(self, request: DraftRequest, progress: ProgressCallback | None = None) -> str:
+        return await self._complete(
+            _GENERATE_PROMPT,
+            _user_message(request.transcript, request.context),
+            template=request.prompt_template_id or "generate",
+            params_ref=request.prompt_params_ref,
+            progress=progress,
+        )
+
+    async def regenerate(self, request: FragmentRequest, progress: ProgressCallback | None = None) -> str:
+        return await self._complete(
+            _REGENERATE_PROMPT,
+            _user_message(request.fragment, request.context),
+            template=request.prompt_template_id or "regenerate",
+            params_ref=request.prompt_params_ref,
+            progress=progress,
+        )
+
+    async def _complete(
+        self,
+        system: str,
+        user: str,
+        *,
+        template: str,
+        params_ref: str | None,
+        progress: ProgressCallback | None,
+    ) -> str:
+        payload = {
+            "model": self._model,
+            "temperature": 0,
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": user}],
+        }
+        body = await self._post(
+            "/chat/completions",
+            payload,
+            prompt_template_id=f"{template}:{params_ref or ''}",
+            progress=progress,
+        )
+        return self._content(body)
+
+    def _content(self, body: Any) -> str:
+        try:
+            content = body["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            content = None
+        if not isinstance(content, str):
+            raise self._bad_response()
+        return content
+
+
+__all__ = ["OpenAILLMClient"]
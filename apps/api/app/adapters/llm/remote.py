@@ -0,0 +1,48 @@
+"""Shared plumbing for LLM adapters that call a provider over HTTP."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from app.adapters.providers import ProviderClient, ProviderError, ProviderStats, request_key
+
+from .base import LLMClient, LLMError, ProgressCallback
+
+
+class RemoteLLMClient(LLMClient):
+    """Base for HTTP providers: maps ``ProviderError`` onto ``LLMError`` and coalesces identical prompts.
+
+    The pooled connections belong to the container, so ``aclose`` leaves
+    them open.
+    """
+
+    def __init__(self, provider: ProviderClient, *, model: str) -> None:
+        self._provider = provider
+        self._model = model
+
+    @property
+    def stats(self) -> ProviderStats:
+        return self._provider.stats
+
+    async def _post(
+        self,
+        path: str,
+        payload: Mapping[str, Any],
+        *,
+        prompt_template_id: str,
+        progress: ProgressCallback | None,
+    ) -> Any:
+        try:
+            body = await self._provider.post(path, key=request_key(prompt_template_id, payload), json=payload)
+        except ProviderError as exc:
+            raise LLMError(str(exc), code=exc.code, retryable=exc.retryable) from exc
+        if progress is not None:
+            progress(1.0)
+        return body
+
+    def _bad_response(self) -> LLMError:
+        return LLMError(f"{self._provider.name} returned a malformed body", code="PROVIDER_BAD_RESPONSE")
+
+
+__all__ = ["RemoteLLMClient"]
@@ -0,0 +1,59 @@
+"""Media adapters: ffmpeg frame extraction, ffprobe frame timing, image headers, annotations and derivatives."""
+
+from .annotations import (
+    BASE_DPI,
+    AnnotationError,
+    AnnotationRenderer,
+    RenderStats,
+    canonical_operation,
+    encode_image,
+    ops_hash,
+    output_size,
+    prefix_hashes,
+)
+from .derivatives import DERIVATIVE_FORMATS, DerivativeSpec, write_derivatives
+from .ffmpeg import (
+    NEAREST_KEYFRAME,
+    PRECISE,
+    DecodePass,
+    FfmpegError,
+    FrameResult,
+    FrameSpec,
+    build_pass_command,
+    run_pass,
+)
+from .image_headers import image_dimensions, read_image_dimensions
+from .pool import ExtractionStats, FrameExtractionPool, PassRunner, plan_passes
+from .probe import build_probe_command, parse_packets, probe_frame_times
+
+__all__ = [
+    "BASE_DPI",
+    "DERIVATIVE_FORMATS",
+    "NEAREST_KEYFRAME",
+    "PRECISE",
+    "AnnotationError",
+    "AnnotationRenderer",
+    "DecodePass",
+    "DerivativeSpec",
+    "ExtractionStats",
+    "FfmpegError",
+    "FrameExtractionPool",
+    "FrameResult",
+    "FrameSpec",
+    "PassRunner",
+    "RenderStats",
+    "build_pass_command",
+    "build_probe_command",
+    "canonical_operation",
+    "encode_image",
+    "image_dimensions",
+    "ops_hash",
+    "output_size",
+    "parse_packets",
+    "plan_passes",
+    "prefix_hashes",
+    "probe_frame_times",
+    "read_image_dimensions",
+    "run_pass",
+    "write_derivatives",
+]
@@ -0,0 +1,515 @@
+"""Deterministic flattening of screenshot annotation operation logs onto their base image."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import io
+import json
+import math
+from pathlib import Path
+import re
+import threading
+from typing import Any
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # pragma: no cover - depends on optional packages
+    np = None
+
+from .image_headers import image_dimensions
+
+# Style sizes (thickness, radius, font size) are in pixels of the base image
+# at this density; rendering at another DPI scales them with the image.
+BASE_DPI = 96
+MAX_DPI = 1200
+MAX_PIXELS = 100_000_000
+# Part of every ops hash: bump it when rendering output changes, so renders
+# cached (or stored) by older code are not mistaken for current ones.
+RENDER_VERSION = 1
+
+OP_TYPES = ("blur", "stroke", "arrow", "highlight", "text", "box")
+# The API contract's names for two of the same operations.
+_ALIASES = {"marker": "highlight", "pencil": "stroke"}
+_RECT_OPS = frozenset({"blur", "highlight", "box"})
+_MAX_POINTS = 4096
+_MAX_TEXT = 500
+_COLOR = re.compile(r"#[0-9A-Fa-f]{6}")
+
+# (name, default, upper bound) of each op type's style properties.
+_STYLE: dict[str, tuple[tuple[str, object, float], ...]] = {
+    "blur": (("radius", 8.0, 200.0),),
+    "stroke": (("color", "#E53935", 0), ("thickness", 3.0, 200.0), ("opacity", 1.0, 1.0)),
+    "arrow": (("color", "#E53935", 0), ("thickness", 4.0, 200.0), ("opacity", 1.0, 1.0)),
+    "highlight": (("color", "#FFEB3B", 0), ("opacity", 0.4, 1.0)),
+    "text": (("color", "#E53935", 0), ("font_size", 16.0, 400.0), ("opacity", 1.0, 1.0)),
+    "box": (("color", "#E53935", 0), ("thickness", 3.0, 200.0), ("opacity", 1.0, 1.0)),
+}
+
+
+class AnnotationError(ValueError):
+    """An invalid operation (``INVALID_ANNOTATION``) or an image that cannot be rendered."""
+
+    def __init__(self, message: str, code: str = "INVALID_ANNOTATION") -> None:
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _number(value: object, name: str, low: float, high: float, *, exclusive_low: bool = False) -> float:
+    if isinstance(value, bool) or not isinstance(value, int | float) or not math.isfinite(value):
+        raise AnnotationError(f"{name} must be a number")
+    if value < low or value > high or (exclusive_low and value == low):
+        raise AnnotationError(f"{name} must be between {low:g} and {high:g}")
+    return float(value)
+
+
+def _point(value: object, name: str) -> dict[str, float]:
+    if not isinstance(value, Mapping):
+        raise AnnotationError(f"{name} must be an object with x and y")
+    return {"x": _number(value.get("x"), f"{name}.x", 0, 1), "y": _number(value.get("y"), f"{name}.y", 0, 1)}
+
+
+def _rect(value: object, name: str) -> dict[str, float]:
+    if not isinstance(value, Mapping):
+        raise AnnotationError(f"{name} must be an object with x, y, w and h")
+    rect = _point(value, name)
+    rect["w"] = _number(value.get("w"), f"{name}.w", 0, 1 - rect["x"], exclusive_low=True)
+    rect["h"] = _number(value.get("h"), f"{name}.h", 0, 1 - rect["y"], exclusive_low=True)
+    return rect
+
+
+def _geometry(op_type: str, geometry: Mapping[str, Any]) -> dict[str, Any]:
+    if op_type in _RECT_OPS:
+        return {"rect": _rect(geometry.get("rect"), "geometry.rect")}
+    if op_type == "arrow":
+        return {"from": _point(geometry.get("from"), "geometry.from"), "to": _point(geometry.get("to"), "geometry.to")}
+    if op_type == "text":
+        value = geometry.get("value")
+        if not isinstance(value, str) or not value.strip() or len(value) > _MAX_TEXT:
+            raise AnnotationError(f"geometry.value must be non-empty text of at most {_MAX_TEXT} characters")
+        return {"pos": _point(geometry.get("pos"), "geometry.pos"), "value": value}
+    points = geometry.get("points")
+    if not isinstance(points, Sequence) or isinstance(points, str) or not 1 <= len(points) <= _MAX_POINTS:
+        raise AnnotationError(f"geometry.points must list 1 to {_MAX_POINTS} points")
+    return {"points": [_point(point, f"geometry.points[{n}]") for n, point in enumerate(points)]}
+
+
+def canonical_operation(operation: Mapping[str, Any]) -> dict[str, Any]:
+    """Validated ``{op_type, geometry, style}`` with aliases resolved and style defaults filled in.
+
+    Two operations that render identically have the same canonical form
+    (``marker`` and ``highlight``, ``1`` and ``1.0``); fields other than
+    these three, such as ``op_id`` or ``created_by``, are not part of it.
+    """
+    if not isinstance(operation, Mapping):
+        raise AnnotationError("Each operation must be an object")
+    raw_type = operation.get("op_type")
+    op_type = _ALIASES.get(raw_type, raw_type) if isinstance(raw_type, str) else None
+    if op_type not in _STYLE:
+        raise AnnotationError(f"op_type must be one of: {', '.join(OP_TYPES + tuple(_ALIASES))}")
+    geometry = operation.get("geometry")
+    style = operation.get("style") or {}
+    if not isinstance(geometry, Mapping) or not isinstance(style, Mapping):
+        raise AnnotationError("geometry and style must be objects")
+    canonical_style: dict[str, Any] = {}
+    for name, default, high in _STYLE[op_type]:
+        value = style.get(name, default)
+        if name == "color":
+            if not isinstance(value, str) or not _COLOR.fullmatch(value):
+                raise AnnotationError("style.color must be a #RRGGBB color")
+            canonical_style[name] = value.upper()
+        else:
+            canonical_style[name] = _number(value, f"style.{name}", 0, high, exclusive_low=name != "opacity")
+    return {"op_type": op_type, "geometry": _geometry(op_type, geometry), "style": canonical_style}
+
+
+def _chain(base_checksum: str, operations: Sequence[Mapping[str, Any]]) -> list[str]:
+    digest = hashlib.sha256(f"annotations/{RENDER_VERSION}|{base_checksum}".encode()).hexdigest()
+    hashes = [digest]
+    for operation in operations:
+        encoded = json.dumps(operation, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        digest = hashlib.sha256(f"{digest}|{encoded}".encode()).hexdigest()
+        hashes.append(digest)
+    return hashes
+
+
+def prefix_hashes(base_checksum: str, operations: Sequence[Mapping[str, Any]]) -> list[str]:
+    """Hash of the base image alone, then of each op-log prefix: ``n + 1`` hashes for ``n`` operations.
+
+    Each hash chains the previous one, so logs that share a prefix share
+    its hashes and a render cached for a prefix serves every log extending it.
+    """
+    return _chain(base_checksum, [canonical_operation(operation) for operation in operations])
+
+
+def ops_hash(base_checksum: str, operations: Sequence[Mapping[str, Any]]) -> str:
+    """Deterministic identity of the image rendered from ``operations`` over the base image."""
+    return prefix_hashes(base_checksum, operations)[-1]
+
+
+def output_size(width: int, height: int, dpi: float) -> tuple[int, int]:
+    """Pixel size of a ``width`` x ``height`` base image rendered at ``dpi``."""
+    scale = dpi / BASE_DPI
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+# Rendering. Canvases are uint8 RGB arrays; each operation computes a
+# float32 coverage mask over its own bounding box only, composites it and
+# rounds back to uint8, so a render continued from a cached prefix is
+# bit-identical to one from scratch. Masks use only elementwise arithmetic
+# and sqrt (correctly rounded on every platform) and blur uses sequential
+# float64 prefix sums, so output does not depend on CPU or SIMD width.
+# Text and DPI resampling are Pillow's, so they are pinned by its version.
+
+
+def _rgb(color: str) -> np.ndarray:
+    return np.array([int(color[n : n + 2], 16) for n in (1, 3, 5)], dtype=np.float32)
+
+
+def _box(canvas: np.ndarray, x0: float, y0: float, x1: float, y1: float) -> tuple[int, int, int, int] | None:
+    height, width = canvas.shape[:2]
+    box = (max(math.floor(x0), 0), max(math.floor(y0), 0), min(math.ceil(x1), width), min(math.ceil(y1), height))
+    return box if box[2] > box[0] and box[3] > box[1] else None
+
+
+def _grid(box: tuple[int, int, int, int]) -> tuple[np.ndarray, np.ndarray]:
+    # Pixel centres of ``box`` as a row and a column that broadcast together.
+    xs = np.arange(box[0], box[2], dtype=np.float32) + np.float32(0.5)
+    ys = np.arange(box[1], box[3], dtype=np.float32) + np.float32(0.5)
+    return xs[None, :], ys[:, None]
+
+
+def _composite(canvas: np.ndarray, box: tuple[int, int, int, int], coverage: np.ndarray, color: str, opacity: float) -> None:
+    x0, y0, x1, y1 = box
+    region = canvas[y0:y1, x0:x1].astype(np.float32)
+    alpha = (coverage * np.float32(opacity))[..., None]
+    region += (_rgb(color) - region) * alpha
+    canvas[y0:y1, x0:x1] = np.clip(np.rint(region), 0, 255).astype(np.uint8)
+
+
+def _segment_distance(xs: np.ndarray, ys: np.ndarray, a: tuple[float, float], b: tuple[float, float]) -> np.ndarray:
+    dx, dy = np.float32(b[0] - a[0]), np.float32(b[1] - a[1])
+    length2 = dx * dx + dy * dy
+    px, py = xs - np.float32(a[0]), ys - np.float32(a[1])
+    t = np.clip((px * dx + py * dy) / length2, 0, 1) if length2 > 0 else np.float32(0)
+    px, py = px - t * dx, py - t * dy
+    return np.sqrt(px * px + py * py)
+
+
+def _accumulate(mask: np.ndarray, box: tuple[int, int, int, int], sub: tuple[int, int, int, int], coverage: np.ndarray) -> None:
+    view = mask[sub[1] - box[1] : sub[3] - box[1], sub[0] - box[0] : sub[2] - box[0]]
+    np.maximum(view, coverage, out=view)
+
+
+def _polyline(mask: np.ndarray, box: tuple[int, int, int, int], points: list[tuple[float, float]], half: float) -> None:
+    segments = list(zip(points, points[1:], strict=False)) or [(points[0], points[0])]
+    for a, b in segments:
+        # Each segment is rasterized over its own box, so long strokes cost
+        # their length, not the area of their bounding box.
+        sub = (
+            max(math.floor(min(a[0], b[0]) - half - 1), box[0]),
+            max(math.floor(min(a[1], b[1]) - half - 1), box[1]),
+            min(math.ceil(max(a[0], b[0]) + half + 1), box[2]),
+            min(math.ceil(max(a[1], b[1]) + half + 1), box[3]),
+        )
+        if sub[2] <= sub[0] or sub[3] <= sub[1]:
+            continue
+        xs, ys = _grid(sub)
+        coverage = np.clip(np.float32(half + 0.5) - _segment_distance(xs, ys, a, b), 0, 1)
+        _accumulate(mask, box, sub, coverage)
+
+
+def _triangle(mask: np.ndarray, box: tuple[int, int, int, int], corners: list[tuple[float, float]]) -> None:
+    xs, ys = _grid(box)
+    (ax, ay), (bx, by), (cx, cy) = corners
+    orientation = 1.0 if (bx - ax) * (cy - ay) - (by - ay) * (cx - ax) > 0 else -1.0
+    inside = None
+    for (px, py), (qx, qy) in zip(corners, corners[1:] + corners[:1], strict=True):
+        length = math.hypot(qx - px, qy - py)
+        if length == 0:
+            return
+        # Signed distance to the edge's line, positive on the triangle's side.
+        distance = ((xs - np.float32(px)) * np.float32((qy - py) * -orientation / length)) + (
+            (ys - np.float32(py)) * np.float32((qx - px) * orientation / length)
+        )
+        inside = distance if inside is None else np.minimum(inside, distance)
+    np.maximum(mask, np.clip(inside + np.float32(0.5), 0, 1), out=mask)
+
+
+def _rect_distance(xs: np.ndarray, ys: np.ndarray, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+    # Signed distance to the rectangle's edge: negative inside.
+    qx = np.abs(xs - np.float32((x0 + x1) / 2)) - np.float32((x1 - x0) / 2)
+    qy = np.abs(ys - np.float32((y0 + y1) / 2)) - np.float32((y1 - y0) / 2)
+    ox, oy = np.maximum(qx, 0), np.maximum(qy, 0)
+    return np.sqrt(ox * ox + oy * oy) + np.minimum(np.maximum(qx, qy), 0)
+
+
+def _box_blur(region: np.ndarray, radius: int, axis: int) -> np.ndarray:
+    # Mean over a (2 * radius + 1)-wide window via prefix sums; edges repeat.
+    count = region.shape[axis]
+    padding = [(0, 0)] * region.ndim
+    padding[axis] = (radius + 1, radius)
+    sums = np.cumsum(np.pad(region, padding, mode="edge"), axis=axis, dtype=np.float64)
+    width = 2 * radius + 1
+    upper = np.take(sums, np.arange(width, width + count), axis=axis)
+    lower = np.take(sums, np.arange(count), axis=axis)
+    return (upper - lower) / width
+
+
+@lru_cache(maxsize=32)
+def _font(size: int) -> Any:
+    return ImageFont.load_default(size=size)
+
+
+def _blur(canvas: np.ndarray, geometry: dict[str, Any], style: dict[str, Any], scale: float) -> None:
+    height, width = canvas.shape[:2]
+    rect = geometry["rect"]
+    box = _box(
+        canvas,
+        rect["x"] * width,
+        rect["y"] * height,
+        (rect["x"] + rect["w"]) * width,
+        (rect["y"] + rect["h"]) * height,
+    )
+    if box is None:
+        return
+    x0, y0, x1, y1 = box
+    # Three box passes approximate a Gaussian with sigma ~ radius / 2. Only
+    # pixels inside the rectangle are read, so nothing outside bleeds in.
+    radius = max(1, round(style["radius"] * scale / 2))
+    region = canvas[y0:y1, x0:x1].astype(np.float64)
+    for _ in range(3):
+        region = _box_blur(_box_blur(region, radius, 0), radius, 1)
+    canvas[y0:y1, x0:x1] = np.clip(np.rint(region), 0, 255).astype(np.uint8)
+
+
+def _text(canvas: np.ndarray, geometry: dict[str, Any], style: dict[str, Any], scale: float) -> None:
+    height, width = canvas.shape[:2]
+    font = _font(max(1, round(style["font_size"] * scale)))
+    value = geometry["value"]
+    bounds = ImageDraw.Draw(Image.new("L", (1, 1))).multiline_textbbox((0, 0), value, font=font)
+    glyphs = Image.new("L", (max(math.ceil(bounds[2]), 1), max(math.ceil(bounds[3]), 1)))
+    ImageDraw.Draw(glyphs).multiline_text((0, 0), value, fill=255, font=font)
+    x, y = round(geometry["pos"]["x"] * width), round(geometry["pos"]["y"] * height)
+    box = _box(canvas, x, y, x + glyphs.width, y + glyphs.height)
+    if box is None:
+        return
+    coverage = np.asarray(glyphs, dtype=np.float32)[box[1] - y : box[3] - y, box[0] - x : box[2] - x] / np.float32(255)
+    _composite(canvas, box, coverage, style["color"], style["opacity"])
+
+
+def _apply(canvas: np.ndarray, operation: dict[str, Any], scale: float) -> None:
+    op_type, geometry, style = operation["op_type"], operation["geometry"], operation["style"]
+    if op_type == "blur":
+        _blur(canvas, geometry, style, scale)
+        return
+    if op_type == "text":
+        _text(canvas, geometry, style, scale)
+        return
+    height, width = canvas.shape[:2]
+    if op_type in _RECT_OPS:
+        rect = geometry["rect"]
+        x0, y0 = rect["x"] * width, rect["y"] * height
+        x1, y1 = x0 + rect["w"] * width, y0 + rect["h"] * height
+        half = style["thickness"] * scale / 2 if op_type == "box" else 0.0
+        box = _box(canvas, x0 - half - 1, y0 - half - 1, x1 + half + 1, y1 + half + 1)
+        if box is None:
+            return
+        xs, ys = _grid(box)
+        distance = _rect_distance(xs, ys, x0, y0, x1, y1)
+        edge = np.abs(distance) if op_type == "box" else distance
+        coverage = np.clip(np.float32(half + 0.5) - edge, 0, 1)
+        _composite(canvas, box, coverage, style["color"], style["opacity"])
+        return
+    half = style["thickness"] * scale / 2
+    if op_type == "stroke":
+        points = [(point["x"] * width, point["y"] * height) for point in geometry["points"]]
+        head: list[tuple[float, float]] = []
+    else:
+        start = (geometry["from"]["x"] * width, geometry["from"]["y"] * height)
+        tip = (geometry["to"]["x"] * width, geometry["to"]["y"] * height)
+        length = math.hypot(tip[0] - start[0], tip[1] - start[1])
+        head_length = min(max(6 * half, 8 * scale), length)
+        if head_length == 0:
+            points, head = [start], []
+        else:
+            ux, uy = (tip[0] - start[0]) / length, (tip[1] - start[1]) / length
+            base = (tip[0] - ux * head_length, tip[1] - uy * head_length)
+            spread = head_length / 2
+            points = [start, base]
+            head = [tip, (base[0] - uy * spread, base[1] + ux * spread), (base[0] + uy * spread, base[1] - ux * spread)]
+    outline = points + head
+    box = _box(
+        canvas,
+        min(x for x, _ in outline) - half - 1,
+        min(y for _, y in outline) - half - 1,
+        max(x for x, _ in outline) + half + 1,
+        max(y for _, y in outline) + half + 1,
+    )
+    if box is None:
+        return
+    mask = np.zeros((box[3] - box[1], box[2] - box[0]), dtype=np.float32)
+    _polyline(mask, box, points, half)
+    if head:
+        _triangle(mask, box, head)
+    _composite(canvas, box, mask, style["color"], style["opacity"])
+
+
+def _load_base(path: Path, size: tuple[int, int]) -> np.ndarray:
+    try:
+        with Image.open(path) as image:
+            image = image.convert("RGB")
+            if image.size != size:
+                image = image.resize(size, Image.Resampling.LANCZOS)
+            return np.array(image, dtype=np.uint8)
+    except OSError as exc:
+        raise AnnotationError("Base image is unreadable", "IMAGE_UNREADABLE") from exc
+
+
+def encode_image(image: np.ndarray, format: str) -> bytes:
+    """Encode a rendered image as ``png``, ``jpg`` or ``webp``; the same pixels give the same bytes."""
+    options: dict[str, dict[str, Any]] = {
+        "png": {"format": "PNG", "compress_level": 6},
+        "jpg": {"format": "JPEG", "quality": 92},
+        "webp": {"format": "WEBP", "quality": 90, "method": 4},
+    }
+    if format not in options:
+        raise AnnotationError(f"Unsupported image format {format!r}")
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, **options[format])
+    return buffer.getvalue()
+
+
+@dataclass(frozen=True, slots=True)
+class RenderStats:
+    renders: int
+    ops_applied: int
+    ops_reused: int
+    entries: int
+    bytes: int
+    max_bytes: int
+    evictions: int
+
+
+class AnnotationRenderer:
+    """Flattens op logs onto base images, caching the render of every op-log prefix.
+
+    Renders are keyed by ``prefix_hashes`` and output size, so appending an
+    operation to a log rendered before applies just that operation to the
+    cached prefix, and undo is a cache hit. The cache is an LRU bounded by
+    ``max_bytes`` of pixels. Returned arrays are read-only and shared with
+    the cache. Calls block on decoding and compositing; run them on an
+    executor.
+    """
+
+    def __init__(self, *, max_bytes: int = 256 * 2**20) -> None:
+        if np is None:
+            raise AnnotationError("Annotation rendering needs numpy and Pillow", "RENDERER_UNAVAILABLE")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, int, int], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._renders = 0
+        self._ops_applied = 0
+        self._ops_reused = 0
+        self.evictions = 0
+
+    @property
+    def stats(self) -> RenderStats:
+        with self._lock:
+            return RenderStats(
+                renders=self._renders,
+                ops_applied=self._ops_applied,
+                ops_reused=self._ops_reused,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self._max_bytes,
+                evictions=self.evictions,
+            )
+
+    def _cached(self, hashes: list[str], size: tuple[int, int]) -> tuple[int, np.ndarray | None]:
+        with self._lock:
+            for position in range(len(hashes) - 1, -1, -1):
+                image = self._entries.get((hashes[position], *size))
+                if image is not None:
+                    self._entries.move_to_end((hashes[position], *size))
+                    return position, image
+        return 0, None
+
+    def _put(self, key: tuple[str, int, int], image: np.ndarray) -> None:
+        image.flags.writeable = False
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = image
+            self._bytes += image.nbytes
+            # The newest entry stays even if it alone exceeds the cap.
+            while self._bytes > self._max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def render(
+        self,
+        base_path: str | Path,
+        base_checksum: str,
+        operations: Sequence[Mapping[str, Any]],
+        *,
+        dpi: float = BASE_DPI,
+    ) -> np.ndarray:
+        """RGB ``uint8`` array of ``operations`` applied in order to the base image, scaled to ``dpi``.
+
+        ``base_checksum`` identifies the base image's content (its SHA-256);
+        every operation is validated before any rendering starts.
+        """
+        canonical = [canonical_operation(operation) for operation in operations]
+        dpi = _number(dpi, "dpi", 0, MAX_DPI, exclusive_low=True)
+        dimensions = image_dimensions(base_path)
+        if dimensions is None:
+            raise AnnotationError("Base image is unreadable", "IMAGE_UNREADABLE")
+        size = output_size(*dimensions, dpi)
+        if size[0] * size[1] > MAX_PIXELS:
+            raise AnnotationError(f"Rendering at {dpi:g} DPI exceeds {MAX_PIXELS} pixels", "IMAGE_TOO_LARGE")
+        hashes = _chain(base_checksum, canonical)
+        start, image = self._cached(hashes, size)
+        if image is None:
+            image = _load_base(Path(base_path), size)
+            self._put((hashes[0], *size), image)
+        scale = size[0] / dimensions[0]
+        for position in range(start, len(canonical)):
+            image = image.copy()
+            _apply(image, canonical[position], scale)
+            self._put((hashes[position + 1], *size), image)
+        with self._lock:
+            self._renders += 1
+            self._ops_applied += len(canonical) - start
+            self._ops_reused += start
+        return image
+
+
+__all__ = [
+    "BASE_DPI",
+    "MAX_DPI",
+    "MAX_PIXELS",
+    "OP_TYPES",
+    "RENDER_VERSION",
+    "AnnotationError",
+    "AnnotationRenderer",
+    "RenderStats",
+    "canonical_operation",
+    "encode_image",
+    "ops_hash",
+    "output_size",
+    "prefix_hashes",
+]
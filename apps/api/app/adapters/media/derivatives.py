@@ -0,0 +1,96 @@
+"""Downscaled WebP/JPEG renditions of screenshot images."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+import os
+from pathlib import Path
+from uuid import uuid4
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on optional package
+    Image = None
+
+_SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+DERIVATIVE_FORMATS = tuple(_SAVE_OPTIONS)
+
+
+@dataclass(frozen=True, slots=True)
+class DerivativeSpec:
+    """One rendition: at most ``width`` pixels wide (never upscaled), written to ``output_path``."""
+
+    width: int
+    format: str
+    output_path: str
+
+
+def _scaled(size: tuple[int, int], width: int) -> tuple[int, int]:
+    if size[0] <= width:
+        return size
+    return width, max(1, round(size[1] * width / size[0]))
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    # JPEG has no alpha: composite onto white rather than let transparent
+    # pixels turn black.
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _save(image: Image.Image, spec: DerivativeSpec) -> None:
+    dest = Path(spec.output_path)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    temp = dest.with_name(f".{dest.name}.{uuid4().hex}")
+    try:
+        out = _flatten(image) if spec.format == "jpg" else image
+        out.save(temp, **_SAVE_OPTIONS[spec.format])
+        os.replace(temp, dest)
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(temp)
+
+
+def write_derivatives(source_path: str | Path, specs: Sequence[DerivativeSpec]) -> list[tuple[int, int]]:
+    """Write every rendition of ``source_path`` from one decode; returns each one's ``(width, height)``.
+
+    Renditions are produced widest first, each downscaled from the previous
+    one, so the full-resolution image is resampled once. JPEG sources are
+    decoded straight at the smallest DCT scale that still covers the widest
+    rendition, which skips most of the decode work for thumbnails. Raises
+    ``OSError`` if the source cannot be decoded.
+    """
+    if Image is None:
+        raise OSError("Pillow is required to write image derivatives")
+    for spec in specs:
+        if spec.format not in _SAVE_OPTIONS:
+            raise ValueError(f"Unsupported derivative format {spec.format!r}")
+    order = sorted(range(len(specs)), key=lambda n: -specs[n].width)
+    sizes: list[tuple[int, int]] = [(0, 0)] * len(specs)
+    with Image.open(source_path) as source:
+        widest = _scaled(source.size, specs[order[0]].width) if specs else source.size
+        source.draft("RGB", widest)
+        image = source.convert("RGBA" if source.mode in ("RGBA", "LA", "P") else "RGB")
+    if image.mode == "RGBA" and image.getchannel("A").getextrema() == (255, 255):
+        image = image.convert("RGB")
+    scaled: dict[tuple[int, int], Image.Image] = {}
+    for n in order:
+        size = _scaled(image.size, specs[n].width)
+        if size not in scaled:
+            image = image if size == image.size else image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            scaled[size] = image
+        _save(scaled[size], specs[n])
+        sizes[n] = size
+    return sizes
+
+
+__all__ = ["DERIVATIVE_FORMATS", "DerivativeSpec", "write_derivatives"]
@@ -0,0 +1,151 @@
+"""ffmpeg invocations that extract many frames from one video in a single decode pass."""
+
+from __future__ import annotations
+
+from contextlib import suppress
+from dataclasses import dataclass
+import os
+import subprocess
+
+from .image_headers import image_dimensions
+
+PRECISE = "precise"
+NEAREST_KEYFRAME = "nearest_keyframe"
+
+_CODEC_OPTIONS = {
+    "png": ("-c:v", "png"),
+    "jpg": ("-c:v", "mjpeg", "-q:v", "2"),
+    "webp": ("-c:v", "libwebp", "-quality", "90"),
+}
+
+
+class FfmpegError(Exception):
+    """A failed extraction; ``retryable`` marks timeouts. Messages never include ffmpeg output."""
+
+    # Positional arguments only, so the error pickles back from pool workers.
+    def __init__(self, message: str, code: str = "FFMPEG_FAILED", retryable: bool = False) -> None:
+        super().__init__(message, code, retryable)
+        self.message = message
+        self.code = code
+        self.retryable = retryable
+
+    def __str__(self) -> str:
+        return self.message
+
+
+@dataclass(frozen=True, slots=True)
+class FrameSpec:
+    """One frame to write to ``output_path``; ``timestamp_ms`` is already offset-adjusted.
+
+    ``seek_ms`` is the keyframe at or before a precise frame, when the
+    video's frame index is known; passes seek there instead of to the frame.
+    """
+
+    timestamp_ms: int
+    strategy: str
+    format: str
+    output_path: str
+    seek_ms: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class FrameResult:
+    output_path: str
+    width: int
+    height: int
+
+
+@dataclass(frozen=True, slots=True)
+class DecodePass:
+    """Frames of one video extracted by one ffmpeg process.
+
+    ``seek_ms`` is where the precise frames' input seek lands; it must not
+    be after the earliest precise frame. ``None`` seeks to that frame.
+    """
+
+    video_path: str
+    frames: tuple[FrameSpec, ...]
+    seek_ms: int | None = None
+
+
+def _seconds(ms: int) -> str:
+    return f"{ms / 1000:.3f}"
+
+
+def build_pass_command(ffmpeg_path: str, decode_pass: DecodePass) -> list[str]:
+    """Command line for ``decode_pass``.
+
+    Precise frames share one input: ffmpeg seeks once to ``seek_ms``,
+    decodes forward, and each output picks its frame with an output-side
+    ``-ss`` relative to that point, so the video is opened, sought and
+    decoded once however many frames the pass holds. Nearest-keyframe
+    frames each get an inexact input seek (no decoding past the keyframe)
+    within the same process.
+    """
+    command = [ffmpeg_path, "-hide_banner", "-loglevel", "error", "-nostdin", "-y"]
+    outputs: list[str] = []
+    inputs = 0
+    precise = [frame for frame in decode_pass.frames if frame.strategy == PRECISE]
+    if precise:
+        first = min(frame.timestamp_ms for frame in precise)
+        seek_ms = first if decode_pass.seek_ms is None else min(decode_pass.seek_ms, first)
+        command += ["-ss", _seconds(seek_ms), "-i", decode_pass.video_path]
+        for frame in precise:
+            outputs += ["-map", "0:v:0", "-ss", _seconds(frame.timestamp_ms - seek_ms)]
+            outputs += ["-frames:v", "1", "-update", "1", *_CODEC_OPTIONS[frame.format], frame.output_path]
+        inputs = 1
+    for frame in decode_pass.frames:
+        if frame.strategy == PRECISE:
+            continue
+        command += ["-noaccurate_seek", "-ss", _seconds(frame.timestamp_ms), "-i", decode_pass.video_path]
+        outputs += ["-map", f"{inputs}:v:0", "-frames:v", "1", "-update", "1"]
+        outputs += [*_CODEC_OPTIONS[frame.format], frame.output_path]
+        inputs += 1
+    return command + outputs
+
+
+def run_pass(ffmpeg_path: str, decode_pass: DecodePass, timeout_seconds: float) -> list[FrameResult | None]:
+    """Run one pass (in a pool worker) and read each output's dimensions from its header.
+
+    A frame ffmpeg did not produce, e.g. a timestamp past the end of the
+    video, comes back as ``None`` without failing the rest of the pass.
+    """
+    for frame in decode_pass.frames:
+        os.makedirs(os.path.dirname(frame.output_path) or ".", exist_ok=True)
+        # A stale output from an earlier attempt must not pass for a new frame.
+        with suppress(FileNotFoundError):
+            os.remove(frame.output_path)
+    try:
+        completed = subprocess.run(
+            build_pass_command(ffmpeg_path, decode_pass),
+            capture_output=True,
+            timeout=timeout_seconds,
+            check=False,
+        )
+    except FileNotFoundError:
+        raise FfmpegError("ffmpeg executable not found", "FFMPEG_NOT_FOUND") from None
+    except subprocess.TimeoutExpired:
+        raise FfmpegError("ffmpeg timed out", "FFMPEG_TIMEOUT", True) from None
+    if completed.returncode != 0:
+        raise FfmpegError(f"ffmpeg exited with status {completed.returncode}")
+
+    results: list[FrameResult | None] = []
+    for frame in decode_pass.frames:
+        try:
+            size = image_dimensions(frame.output_path)
+        except OSError:
+            size = None
+        results.append(FrameResult(frame.output_path, *size) if size is not None else None)
+    return results
+
+
+__all__ = [
+    "NEAREST_KEYFRAME",
+    "PRECISE",
+    "DecodePass",
+    "FfmpegError",
+    "FrameResult",
+    "FrameSpec",
+    "build_pass_command",
+    "run_pass",
+]
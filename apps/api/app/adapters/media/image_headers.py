@@ -0,0 +1,83 @@
+"""Image dimensions read from file headers, without decoding pixels."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import struct
+from typing import BinaryIO
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...); not DHT/JPG/DAC.
+_JPEG_SOF = frozenset({0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF})
+
+
+def _png(head: bytes) -> tuple[int, int] | None:
+    if len(head) < 24 or head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+def _webp(head: bytes) -> tuple[int, int] | None:
+    chunk = head[12:16]
+    if chunk == b"VP8 " and len(head) >= 30 and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(head) >= 25 and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(head) >= 30:
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+
+def _jpeg(stream: BinaryIO) -> tuple[int, int] | None:
+    # Walk marker segments (skipping EXIF/ICC payloads by length) up to the frame header.
+    stream.seek(2)
+    while True:
+        byte = stream.read(1)
+        if byte != b"\xff":
+            return None
+        while byte == b"\xff":
+            byte = stream.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker in (0xD9, 0xDA):
+            return None
+        length_bytes = stream.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if marker in _JPEG_SOF:
+            frame = stream.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return width, height
+        stream.seek(length - 2, 1)
+
+
+def read_image_dimensions(stream: BinaryIO) -> tuple[int, int] | None:
+    """``(width, height)`` of a PNG, JPEG or WebP from its header, or ``None`` if unrecognized.
+
+    Reads a few dozen bytes for PNG and WebP; JPEG seeks over metadata
+    segments to the frame header, so large EXIF blocks are never read.
+    """
+    head = stream.read(32)
+    if head.startswith(_PNG_SIGNATURE):
+        return _png(head)
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return _webp(head)
+    if head[:2] == b"\xff\xd8":
+        return _jpeg(stream)
+    return None
+
+
+def image_dimensions(path: str | Path) -> tuple[int, int] | None:
+    with open(path, "rb") as stream:
+        return read_image_dimensions(stream)
+
+
+__all__ = ["image_dimensions", "read_image_dimensions"]
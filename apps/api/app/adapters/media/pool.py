@@ -0,0 +1,220 @@
+"""Process pool of ffmpeg workers with per-video request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+import multiprocessing
+
+from .ffmpeg import PRECISE, DecodePass, FfmpegError, FrameResult, FrameSpec, run_pass
+
+PassRunner = Callable[[str, DecodePass, float], list[FrameResult | None]]
+
+
+def plan_passes(
+    video_path: str,
+    frames: list[FrameSpec],
+    *,
+    max_frames: int,
+    max_span_ms: int,
+) -> list[DecodePass]:
+    """Group ``frames`` into passes of nearby timestamps.
+
+    Frames are taken in timestamp order; a new pass starts once a pass holds
+    ``max_frames``, the next frame is more than ``max_span_ms`` after the
+    pass's first, or a precise frame's ``seek_ms`` hint differs from the
+    pass's previous one. Past a keyframe, seeking to it again is cheaper
+    than decoding forward through the gap. A pass seeks to the earliest
+    ``seek_ms`` hint among its precise frames, if any.
+    """
+    passes: list[DecodePass] = []
+    current: list[FrameSpec] = []
+    keyframe_ms: int | None = None
+    for frame in sorted(frames, key=lambda frame: (frame.timestamp_ms, frame.output_path)):
+        hint = frame.seek_ms if frame.strategy == PRECISE else None
+        if current and (
+            len(current) == max_frames
+            or frame.timestamp_ms - current[0].timestamp_ms > max_span_ms
+            or (hint is not None and keyframe_ms is not None and hint != keyframe_ms)
+        ):
+            passes.append(_decode_pass(video_path, current))
+            current = []
+            keyframe_ms = None
+        current.append(frame)
+        if hint is not None:
+            keyframe_ms = hint
+    if current:
+        passes.append(_decode_pass(video_path, current))
+    return passes
+
+
+def _decode_pass(video_path: str, frames: list[FrameSpec]) -> DecodePass:
+    seeks = [frame.seek_ms for frame in frames if frame.strategy == PRECISE and frame.seek_ms is not None]
+    return DecodePass(video_path, tuple(frames), min(seeks) if seeks else None)
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractionStats:
+    requests: int
+    # Requests that shared an identical frame with another request in the batch.
+    coalesced: int
+    passes: int
+    frames: int
+    failed_passes: int
+    queued: int
+
+
+@dataclass(slots=True)
+class _Waiter:
+    frame: FrameSpec
+    future: asyncio.Future[FrameResult]
+    started: Callable[[], None] | None
+
+
+class FrameExtractionPool:
+    """Extracts frames with ffmpeg on ``workers`` worker processes.
+
+    Requests for the same video arriving within ``batch_window_seconds`` of
+    the first are flushed together (sooner once ``max_pass_frames`` are
+    waiting): identical frames are extracted once, and the rest are grouped
+    by ``plan_passes`` into decode passes that each open and seek the video
+    once. Passes run concurrently across workers. ``started`` callbacks fire
+    when a request's pass is handed to a worker. Must be used from a single
+    event loop.
+    """
+
+    def __init__(
+        self,
+        ffmpeg_path: str = "ffmpeg",
+        *,
+        workers: int = 2,
+        batch_window_seconds: float = 0.05,
+        max_pass_frames: int = 32,
+        max_pass_span_ms: int = 5_000,
+        timeout_seconds: float = 600.0,
+        executor: Executor | None = None,
+        runner: PassRunner = run_pass,
+    ) -> None:
+        if workers < 1 or max_pass_frames < 1:
+            raise ValueError("workers and max_pass_frames must be positive")
+        self._ffmpeg_path = ffmpeg_path
+        self._workers = workers
+        self._window = batch_window_seconds
+        self._max_pass_frames = max_pass_frames
+        self._max_pass_span_ms = max_pass_span_ms
+        self._timeout = timeout_seconds
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._runner = runner
+        self._pending: dict[str, list[_Waiter]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._running: set[asyncio.Task[None]] = set()
+        self._requests = 0
+        self._coalesced = 0
+        self._passes = 0
+        self._frames = 0
+        self._failed_passes = 0
+
+    @property
+    def stats(self) -> ExtractionStats:
+        return ExtractionStats(
+            requests=self._requests,
+            coalesced=self._coalesced,
+            passes=self._passes,
+            frames=self._frames,
+            failed_passes=self._failed_passes,
+            queued=sum(len(waiters) for waiters in self._pending.values()),
+        )
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            # Spawned workers do not inherit the server's threads or event loop.
+            self._executor = ProcessPoolExecutor(self._workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def extract(
+        self,
+        video_path: str,
+        frame: FrameSpec,
+        *,
+        started: Callable[[], None] | None = None,
+    ) -> FrameResult:
+        """Queue ``frame`` for the next pass over ``video_path``; raises ``FfmpegError`` on failure."""
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(frame, loop.create_future(), started)
+        waiters = self._pending.setdefault(video_path, [])
+        waiters.append(waiter)
+        self._requests += 1
+        if len(waiters) >= self._max_pass_frames:
+            self._flush(video_path)
+        elif video_path not in self._timers:
+            self._timers[video_path] = loop.call_later(self._window, self._flush, video_path)
+        return await waiter.future
+
+    def _flush(self, video_path: str) -> None:
+        timer = self._timers.pop(video_path, None)
+        if timer is not None:
+            timer.cancel()
+        by_output: dict[str, list[_Waiter]] = {}
+        for waiter in self._pending.pop(video_path, []):
+            by_output.setdefault(waiter.frame.output_path, []).append(waiter)
+        self._coalesced += sum(len(waiters) - 1 for waiters in by_output.values())
+        frames = [waiters[0].frame for waiters in by_output.values()]
+        for decode_pass in plan_passes(
+            video_path,
+            frames,
+            max_frames=self._max_pass_frames,
+            max_span_ms=self._max_pass_span_ms,
+        ):
+            task = asyncio.get_running_loop().create_task(self._run(decode_pass, by_output))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, decode_pass: DecodePass, by_output: dict[str, list[_Waiter]]) -> None:
+        waiters = [waiter for frame in decode_pass.frames for waiter in by_output[frame.output_path]]
+        for waiter in waiters:
+            if waiter.started is not None and not waiter.future.done():
+                waiter.started()
+        self._passes += 1
+        self._frames += len(decode_pass.frames)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._pool(),
+                self._runner,
+                self._ffmpeg_path,
+                decode_pass,
+                self._timeout,
+            )
+        except Exception as exc:
+            self._failed_passes += 1
+            error = exc if isinstance(exc, FfmpegError) else FfmpegError("Extraction worker failed", "FFMPEG_FAILED", True)
+            for waiter in waiters:
+                if not waiter.future.done():
+                    waiter.future.set_exception(error)
+            return
+        for frame, result in zip(decode_pass.frames, results):
+            for waiter in by_output[frame.output_path]:
+                if waiter.future.done():
+                    continue
+                if result is None:
+                    waiter.future.set_exception(FfmpegError("No frame at the requested timestamp", "FRAME_NOT_FOUND"))
+                else:
+                    waiter.future.set_result(result)
+
+    def shutdown(self) -> None:
+        """Drop queued requests and stop the workers without waiting for running passes."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for waiters in self._pending.values():
+            for waiter in waiters:
+                waiter.future.cancel()
+        self._pending.clear()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+__all__ = ["ExtractionStats", "FrameExtractionPool", "PassRunner", "plan_passes"]
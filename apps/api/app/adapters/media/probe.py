@@ -0,0 +1,95 @@
+"""ffprobe listing of a video's frame and keyframe timestamps."""
+
+from __future__ import annotations
+
+from array import array
+import subprocess
+
+from .ffmpeg import FfmpegError
+
+
+def build_probe_command(ffprobe_path: str, video_path: str) -> list[str]:
+    """Command listing ``pts_time,flags`` for every packet of the first video stream.
+
+    Packets are read from the container without decoding, so probing a
+    multi-GB video costs one sequential read of its packet headers. The
+    container's ``start_time`` follows on a ``format`` line; each line is
+    prefixed with its section name.
+    """
+    return [
+        ffprobe_path,
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,flags:format=start_time",
+        "-of",
+        "csv",
+        video_path,
+    ]
+
+
+def _microseconds(value: bytes) -> int:
+    # pts_time is printed with six decimals; parse it exactly rather than via float.
+    negative = value.startswith(b"-")
+    whole, _, fraction = value.lstrip(b"-").partition(b".")
+    us = int(whole or b"0") * 1_000_000 + int(fraction[:6].ljust(6, b"0") or b"0")
+    return -us if negative else us
+
+
+def parse_packets(output: bytes) -> tuple[array, array]:
+    """Sorted frame and keyframe presentation times in microseconds from probe output.
+
+    Times are relative to the container's ``start_time``, the origin ffmpeg
+    measures ``-ss`` from, so they line up with request timestamps even when
+    the first packet is not at zero (MPEG-TS, edit lists). Packets without
+    a timestamp (``N/A``) are skipped; packets come in decode order, so both
+    arrays are sorted before returning.
+    """
+    frames = array("q")
+    keyframes = array("q")
+    start_us = 0
+    for line in output.splitlines():
+        section, _, fields = line.strip().partition(b",")
+        pts, _, flags = fields.partition(b",")
+        if not pts or pts == b"N/A":
+            continue
+        try:
+            us = _microseconds(pts)
+        except ValueError:
+            continue
+        if section == b"format":
+            start_us = us
+            continue
+        frames.append(us)
+        if flags.startswith(b"K"):
+            keyframes.append(us)
+    return (
+        array("q", sorted(us - start_us for us in frames)),
+        array("q", sorted(us - start_us for us in keyframes)),
+    )
+
+
+def probe_frame_times(ffprobe_path: str, video_path: str, timeout_seconds: float) -> tuple[array, array]:
+    """Frame and keyframe times of ``video_path``; raises ``FfmpegError`` if ffprobe fails."""
+    try:
+        completed = subprocess.run(
+            build_probe_command(ffprobe_path, video_path),
+            capture_output=True,
+            timeout=timeout_seconds,
+            check=False,
+        )
+    except FileNotFoundError:
+        raise FfmpegError("ffprobe executable not found", "FFMPEG_NOT_FOUND") from None
+    except subprocess.TimeoutExpired:
+        raise FfmpegError("ffprobe timed out", "FFMPEG_TIMEOUT", True) from None
+    if completed.returncode != 0:
+        raise FfmpegError(f"ffprobe exited with status {completed.returncode}")
+    frames, keyframes = parse_packets(completed.stdout)
+    if not frames or not keyframes:
+        raise FfmpegError("Video has no decodable frames", "VIDEO_UNREADABLE")
+    return frames, keyframes
+
+
+__all__ = ["build_probe_command", "parse_packets", "probe_frame_times"]
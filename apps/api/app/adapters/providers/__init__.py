@@ -0,0 +1,12 @@
+"""Shared HTTP plumbing for AI provider adapters."""
+
+from .client import ProviderClient, ProviderError, ProviderStats, RetryPolicy, build_http_pool, request_key
+
+__all__ = [
+    "ProviderClient",
+    "ProviderError",
+    "ProviderStats",
+    "RetryPolicy",
+    "build_http_pool",
+    "request_key",
+]
@@ -0,0 +1,245 @@
+"""Pooled HTTP access to AI providers with retry and in-flight coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+import hashlib
+import json
+import random
+from typing import Any
+
+import httpx
+
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class ProviderError(Exception):
+    """A failed provider call, classified RETRYABLE (``retryable``) or NON_RETRYABLE.
+
+    Messages name the provider and HTTP status only; response bodies may
+    echo prompts or transcripts and are never included.
+    """
+
+    def __init__(self, message: str, *, code: str = "PROVIDER_FAILED", retryable: bool = False) -> None:
+        super().__init__(message)
+        self.code = code
+        self.retryable = retryable
+
+
+def _status_error(provider: str, response: httpx.Response) -> ProviderError:
+    status = response.status_code
+    message = f"{provider} returned HTTP {status}"
+    if status == 429:
+        return ProviderError(message, code="PROVIDER_RATE_LIMITED", retryable=True)
+    if status in _RETRYABLE_STATUS:
+        return ProviderError(message, code="PROVIDER_UNAVAILABLE", retryable=True)
+    if status in (401, 403):
+        return ProviderError(message, code="PROVIDER_AUTH_FAILED")
+    return ProviderError(message, code="PROVIDER_REJECTED")
+
+
+def _retry_after(response: httpx.Response | None) -> float | None:
+    if response is None:
+        return None
+    try:
+        return max(float(response.headers.get("retry-after", "")), 0.0)
+    except ValueError:
+        return None
+
+
+def request_key(prompt_template_id: str, params: Mapping[str, Any]) -> str:
+    """Coalescing key: the prompt template plus a hash of the canonical request params."""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return f"{prompt_template_id}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter; ``attempts`` counts the first try."""
+
+    attempts: int = 3
+    base_delay_seconds: float = 0.2
+    max_delay_seconds: float = 5.0
+
+    def delay(self, retry: int, rng: random.Random, retry_after: float | None = None) -> float:
+        backoff = rng.uniform(0.0, min(self.max_delay_seconds, self.base_delay_seconds * 2**retry))
+        if retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_delay_seconds))
+        return backoff
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderStats:
+    calls: int
+    coalesced: int
+    attempts: int
+    retries: int
+    failures: int
+    in_flight: int
+    max_in_flight: int
+
+
+def build_http_pool(
+    *,
+    max_connections: int = 64,
+    max_keepalive_connections: int = 32,
+    keepalive_seconds: float = 30.0,
+    timeout_seconds: float = 60.0,
+) -> httpx.AsyncClient:
+    """One keep-alive connection pool shared by every provider adapter in the process."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_seconds,
+        ),
+        timeout=httpx.Timeout(timeout_seconds, connect=min(timeout_seconds, 10.0)),
+    )
+
+
+class ProviderClient:
+    """Calls one provider through the shared pool.
+
+    At most ``max_concurrency`` requests are on the wire at once; retry
+    backoff happens outside that limit so waiting retries do not hold a
+    slot. RETRYABLE failures (transport errors, timeouts, 408/429/5xx) are
+    retried per ``retry``, honouring ``Retry-After``. Calls passing the same
+    ``key`` while one is in flight share its result instead of issuing a
+    second request; a caller cancelling does not cancel the shared request
+    for the others. Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        pool: httpx.AsyncClient,
+        base_url: str,
+        *,
+        name: str,
+        headers: Mapping[str, str] | None = None,
+        max_concurrency: int = 4,
+        timeout_seconds: float | None = None,
+        retry: RetryPolicy = RetryPolicy(),
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: random.Random | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        if retry.attempts < 1:
+            raise ValueError("retry.attempts must be positive")
+        self.name = name
+        self._pool = pool
+        self._base_url = base_url.rstrip("/")
+        self._headers = dict(headers or {})
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._timeout = timeout_seconds
+        self._retry = retry
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._calls = 0
+        self._coalesced = 0
+        self._attempts = 0
+        self._retries = 0
+        self._failures = 0
+        self._on_wire = 0
+        self._max_on_wire = 0
+
+    @property
+    def stats(self) -> ProviderStats:
+        return ProviderStats(
+            calls=self._calls,
+            coalesced=self._coalesced,
+            attempts=self._attempts,
+            retries=self._retries,
+            failures=self._failures,
+            in_flight=self._on_wire,
+            max_in_flight=self._max_on_wire,
+        )
+
+    async def post(
+        self,
+        path: str,
+        *,
+        key: str | None = None,
+        json: Mapping[str, Any] | None = None,
+        data: Mapping[str, str] | None = None,
+        files: Mapping[str, tuple[str, bytes, str]] | None = None,
+    ) -> Any:
+        """POST and return the decoded JSON body, shared with identical in-flight calls when ``key`` is set."""
+        self._calls += 1
+        if key is None:
+            return await self._send(path, json=json, data=data, files=files)
+        shared = self._inflight.get(key)
+        if shared is None:
+            shared = asyncio.ensure_future(self._send(path, json=json, data=data, files=files))
+            self._inflight[key] = shared
+            shared.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(shared)
+
+    def _forget(self, key: str, done: asyncio.Future[Any]) -> None:
+        if self._inflight.get(key) is done:
+            del self._inflight[key]
+        if not done.cancelled():
+            # Mark the outcome retrieved even if every waiter was cancelled.
+            done.exception()
+
+    async def _send(
+        self,
+        path: str,
+        *,
+        json: Mapping[str, Any] | None,
+        data: Mapping[str, str] | None,
+        files: Mapping[str, tuple[str, bytes, str]] | None,
+    ) -> Any:
+        url = f"{self._base_url}/{path.lstrip('/')}"
+        timeout = self._timeout if self._timeout is not None else httpx.USE_CLIENT_DEFAULT
+        for attempt in range(self._retry.attempts):
+            response: httpx.Response | None = None
+            async with self._slots:
+                self._attempts += 1
+                self._on_wire += 1
+                self._max_on_wire = max(self._max_on_wire, self._on_wire)
+                try:
+                    response = await self._pool.post(
+                        url,
+                        json=json,
+                        data=data,
+                        files=files,
+                        headers=self._headers,
+                        timeout=timeout,
+                    )
+                except httpx.TimeoutException:
+                    error = ProviderError(f"{self.name} timed out", code="PROVIDER_TIMEOUT", retryable=True)
+                except httpx.TransportError:
+                    error = ProviderError(f"{self.name} is unreachable", code="PROVIDER_UNAVAILABLE", retryable=True)
+                else:
+                    error = _status_error(self.name, response) if response.is_error else None
+                finally:
+                    self._on_wire -= 1
+            if error is None:
+                assert response is not None
+                try:
+                    return response.json()
+                except ValueError:
+                    self._failures += 1
+                    raise ProviderError(f"{self.name} returned a malformed body", code="PROVIDER_BAD_RESPONSE") from None
+            if not error.retryable or attempt + 1 == self._retry.attempts:
+                self._failures += 1
+                raise error
+            self._retries += 1
+            await self._sleep(self._retry.delay(attempt, self._rng, _retry_after(response)))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+
+__all__ = [
+    "ProviderClient",
+    "ProviderError",
+    "ProviderStats",
+    "RetryPolicy",
+    "build_http_pool",
+    "request_key",
+]
@@ -0,0 +1,11 @@
+"""Artifact storage adapters."""
+
+from .base import ArtifactNotFoundError, ArtifactStorage, StorageError
+from .local import LocalArtifactStorage
+
+__all__ = [
+    "ArtifactNotFoundError",
+    "ArtifactStorage",
+    "StorageError",
+    "LocalArtifactStorage",
+]
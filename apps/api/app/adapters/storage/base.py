@@ -0,0 +1,31 @@
+"""Artifact storage interfaces."""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO
+
+
+class StorageError(Exception):
+    """Raised when an artifact cannot be read from storage."""
+
+
+class ArtifactNotFoundError(StorageError):
+    """Raised when the URI does not name a stored artifact."""
+
+
+class ArtifactStorage(ABC):
+    """Provider-neutral read access to workflow artifacts addressed by URI."""
+
+    # True when reads block on disk or network I/O and must leave the event loop.
+    blocking: bool = True
+
+    @abstractmethod
+    def open(self, uri: str) -> BinaryIO:
+        """Open the artifact for sequential binary reads; the caller closes it."""
+
+    def local_path(self, uri: str) -> Path | None:
+        """Filesystem path of the artifact for tools that need one (e.g. ffmpeg), or ``None`` if remote."""
+        return None
+
+
+__all__ = ["ArtifactNotFoundError", "ArtifactStorage", "StorageError"]
@@ -0,0 +1,49 @@
+"""Local-filesystem artifact storage for development and tests."""
+
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import unquote, urlsplit
+
+from app.adapters.storage.base import ArtifactNotFoundError, ArtifactStorage, StorageError
+
+
+class LocalArtifactStorage(ArtifactStorage):
+    """Serves artifacts from files under ``root``.
+
+    Accepts ``file://`` URIs and bare keys relative to ``root``; anything that
+    resolves outside ``root`` is rejected, as are other URI schemes.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root).resolve()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _resolve(self, uri: str) -> Path:
+        parts = urlsplit(uri)
+        if parts.scheme == "file":
+            path = Path(unquote(parts.path))
+        elif not parts.scheme:
+            path = self._root / uri
+        else:
+            raise StorageError(f"Unsupported artifact URI scheme: {parts.scheme}")
+
+        resolved = path.resolve()
+        if not resolved.is_relative_to(self._root):
+            raise StorageError("Artifact URI is outside the storage root")
+        return resolved
+
+    def local_path(self, uri: str) -> Path | None:
+        return self._resolve(uri)
+
+    def open(self, uri: str) -> BinaryIO:
+        path = self._resolve(uri)
+        try:
+            return path.open("rb")
+        except (FileNotFoundError, IsADirectoryError) as exc:
+            raise ArtifactNotFoundError("Artifact not found") from exc
+
+
+__all__ = ["LocalArtifactStorage"]
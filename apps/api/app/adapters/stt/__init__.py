@@ -0,0 +1,15 @@
+"""STT provider adapters."""
+
+from .base import STTClient, STTError, TranscriptionRequest
+from .local_stt import LocalSTTClient
+from .openai_stt import OpenAISTTClient
+from .remote import RemoteSTTClient
+
+__all__ = [
+    "LocalSTTClient",
+    "OpenAISTTClient",
+    "RemoteSTTClient",
+    "STTClient",
+    "STTError",
+    "TranscriptionRequest",
+]
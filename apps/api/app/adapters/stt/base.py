@@ -0,0 +1,44 @@
+"""STT provider interfaces."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from app.adapters.providers import ProviderError
+from app.schemas.transcript import TranscriptSegment
+
+
+class STTError(ProviderError):
+    """Raised when transcription fails; ``retryable`` marks transient failures."""
+
+    def __init__(self, message: str, *, code: str = "STT_FAILED", retryable: bool = False) -> None:
+        super().__init__(message, code=code, retryable=retryable)
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptionRequest:
+    """Audio to transcribe, uploaded to the provider as a file.
+
+    ``audio_sha256`` is the audio artifact's known checksum, if any; it
+    saves adapters from hashing the payload again.
+    """
+
+    audio: bytes
+    filename: str = "audio.wav"
+    content_type: str = "audio/wav"
+    language: str | None = None
+    model_profile: str | None = None
+    audio_sha256: str | None = None
+
+
+class STTClient(ABC):
+    """Provider-neutral speech-to-text returning structured transcript segments."""
+
+    @abstractmethod
+    async def transcribe(self, request: TranscriptionRequest) -> list[TranscriptSegment]:
+        """Return the segments of ``request.audio`` in time order."""
+
+    async def aclose(self) -> None:
+        """Release pooled connections; the default holds none."""
+
+
+__all__ = ["STTClient", "STTError", "TranscriptionRequest"]
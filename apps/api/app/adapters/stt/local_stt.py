@@ -0,0 +1,28 @@
+"""Adapter for a local STT service exposing the workflow contract."""
+
+from __future__ import annotations
+
+from pydantic import ValidationError
+
+from app.schemas.transcript import TranscriptSegment
+
+from .base import TranscriptionRequest
+from .remote import RemoteSTTClient
+
+
+class LocalSTTClient(RemoteSTTClient):
+    """Calls ``POST /stt/transcribe``, which answers ``{"segments": [{start_ms, end_ms, text}]}``."""
+
+    async def transcribe(self, request: TranscriptionRequest) -> list[TranscriptSegment]:
+        body = await self._upload(
+            "/stt/transcribe",
+            request,
+            {"model": self._model, "language": request.language, "model_profile": request.model_profile},
+        )
+        try:
+            return [TranscriptSegment.model_validate(item) for item in body["segments"]]
+        except (KeyError, TypeError, ValidationError):
+            raise self._bad_response() from None
+
+
+__all__ = ["LocalSTTClient"]
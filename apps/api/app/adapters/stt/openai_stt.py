@@ -0,0 +1,35 @@
+"""Adapter for the OpenAI audio transcription API."""
+
+from __future__ import annotations
+
+from pydantic import ValidationError
+
+from app.schemas.transcript import TranscriptSegment
+
+from .base import TranscriptionRequest
+from .remote import RemoteSTTClient
+
+
+class OpenAISTTClient(RemoteSTTClient):
+    """Calls ``POST /audio/transcriptions`` with ``verbose_json`` and converts second offsets to milliseconds."""
+
+    async def transcribe(self, request: TranscriptionRequest) -> list[TranscriptSegment]:
+        body = await self._upload(
+            "/audio/transcriptions",
+            request,
+            {"model": self._model, "language": request.language, "response_format": "verbose_json"},
+        )
+        try:
+            return [
+                TranscriptSegment(
+                    start_ms=round(float(item["start"]) * 1000),
+                    end_ms=round(float(item["end"]) * 1000),
+                    text=str(item["text"]).strip(),
+                )
+                for item in body["segments"]
+            ]
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise self._bad_response() from None
+
+
+__all__ = ["OpenAISTTClient"]
@@ -0,0 +1,61 @@
+"""Shared plumbing for STT adapters that call a provider over HTTP."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from app.adapters.providers import ProviderClient, ProviderError, ProviderStats, request_key
+from app.core.executor import BlockingExecutor
+
+from .base import STTClient, STTError, TranscriptionRequest
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class RemoteSTTClient(STTClient):
+    """Base for HTTP providers: uploads the audio as multipart form data.
+
+    Identical uploads in flight (same audio digest, language, model and
+    profile) share one provider call. The digest is the request's
+    ``audio_sha256`` when given, else the audio is hashed on ``executor``.
+    The pooled connections belong to the container, so ``aclose`` leaves
+    them open.
+    """
+
+    def __init__(self, provider: ProviderClient, *, model: str, executor: BlockingExecutor | None = None) -> None:
+        self._provider = provider
+        self._model = model
+        self._executor = executor
+
+    @property
+    def stats(self) -> ProviderStats:
+        return self._provider.stats
+
+    async def _audio_digest(self, request: TranscriptionRequest) -> str:
+        if request.audio_sha256 is not None:
+            return request.audio_sha256
+        if self._executor is None:
+            return _sha256(request.audio)
+        return await self._executor.run(_sha256, request.audio)
+
+    async def _upload(self, path: str, request: TranscriptionRequest, fields: dict[str, str | None]) -> Any:
+        data = {name: value for name, value in fields.items() if value is not None}
+        params = {**data, "audio_sha256": await self._audio_digest(request)}
+        try:
+            return await self._provider.post(
+                path,
+                key=request_key("transcribe", params),
+                data=data,
+                files={"file": (request.filename, request.audio, request.content_type)},
+            )
+        except ProviderError as exc:
+            raise STTError(str(exc), code=exc.code, retryable=exc.retryable) from exc
+
+    def _bad_response(self) -> STTError:
+        return STTError(f"{self._provider.name} returned a malformed body", code="PROVIDER_BAD_RESPONSE")
+
+
+__all__ = ["RemoteSTTClient"]
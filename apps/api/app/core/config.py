@@ -9,12 +9,80 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     """Runtime configuration loaded from environment variables."""
 
-    auth_provider: Literal["mock", "firebase"] = "firebase"
+    auth_provider: Literal["mock", "firebase", "jwks"] = "firebase"
     firebase_project_id: str | None = None
     firebase_audience: str | None = None
+    firebase_eager_init: bool = False
+    jwks_issuer_profile: Literal["firebase", "keycloak"] = "firebase"
+    jwks_uri: str | None = None
+    jwks_refresh_seconds: float = 3600.0
+    keycloak_server_url: str | None = None
+    keycloak_realm: str | None = None
+    keycloak_audience: str | None = None
+    auth_cache_enabled: bool = True
+    auth_cache_max_entries: int = 10_000
+    auth_cache_revocation_check_seconds: float = 300.0
     callback_secret: str
+    storage_backend: Literal["memory", "sqlite"] = "memory"
+    sqlite_path: str = "howera.db"
+    sqlite_pool_size: int = 4
+    blocking_pool_size: int = 8
+    callback_dedupe_events_per_job: int = 64
+    callback_dedupe_max_jobs: int = 10_000
+    job_events_history_size: int = 256
+    job_events_subscriber_buffer: int = 64
+    job_events_heartbeat_seconds: float = 15.0
+    artifact_storage_root: str = "artifacts"
+    transcript_ingest_batch_size: int = 1024
+    transcript_index_max_bytes: int = 256 * 2**20
+    instruction_snapshot_interval: int = 32
+    instruction_block_index_cache_entries: int = 1024
+    instruction_validation_cache_entries: int = 1024
+    llm_provider: Literal["fake", "openai", "local"] = "fake"
+    llm_model: str | None = None
+    llm_max_concurrency: int = 4
+    fake_llm_latency_seconds: float = 0.0
+    openai_api_key: str | None = None
+    openai_base_url: str = "https://api.openai.com/v1"
+    local_llm_base_url: str | None = None
+    local_llm_model: str | None = None
+    stt_provider: Literal["openai", "local"] | None = None
+    openai_stt_model: str = "whisper-1"
+    local_stt_base_url: str | None = None
+    local_stt_model: str | None = None
+    stt_max_concurrency: int = 2
+    provider_timeout_seconds: float = 120.0
+    provider_max_connections: int = 64
+    provider_max_keepalive_connections: int = 32
+    provider_keepalive_seconds: float = 30.0
+    provider_retry_attempts: int = 3
+    provider_retry_base_delay_seconds: float = 0.5
+    regenerate_max_finished_tasks: int = 10_000
+    draft_window_tokens: int = 3000
+    draft_window_overlap_tokens: int = 200
+    draft_max_concurrency: int = 4
+    draft_fragment_cache_entries: int = 4096
+    ffmpeg_path: str = "ffmpeg"
+    screenshot_workers: int = 2
+    screenshot_batch_window_seconds: float = 0.05
+    screenshot_max_pass_frames: int = 32
+    screenshot_max_pass_span_ms: int = 5_000
+    screenshot_timeout_seconds: float = 600.0
+    screenshot_output_root: str = "artifacts/screenshots"
+    screenshot_cache_root: str = "artifacts/frame-cache"
+    screenshot_cache_max_bytes: int = 2**30
+    screenshot_max_finished_tasks: int = 10_000
+    ffprobe_path: str = "ffprobe"
+    video_index_timeout_seconds: float = 600.0
+    video_index_cache_max_bytes: int = 64 * 2**20
+    derivative_root: str = "artifacts/derivatives"
+    derivative_thumbnail_width: int = 320
+    derivative_preview_width: int = 1280
+    # Falls back to callback_secret; set explicitly to rotate one without the other.
+    url_signing_secret: str | None = None
+    signed_url_ttl_seconds: int = 900
 
-    model_config = SettingsConfigDict(env_prefix="HOWERA_", extra="ignore")
+    model_config = SettingsConfigDict(env_prefix="HOWERA_", extra="ignore", frozen=True)
 
 
 @lru_cache(maxsize=1)
@@ -0,0 +1,410 @@
+"""Application-scoped dependency container."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from fastapi import FastAPI
+import httpx
+
+from app.adapters.auth import (
+    AsyncTokenVerifier,
+    CachingTokenVerifier,
+    FirebaseTokenVerifier,
+    JwksTokenVerifier,
+    MockTokenVerifier,
+    TokenVerifier,
+    as_async_verifier,
+)
+from app.adapters.llm import FakeLLMClient, LLMClient, LocalLLMClient, OpenAILLMClient
+from app.adapters.media import FrameExtractionPool
+from app.adapters.providers import ProviderClient, RetryPolicy, build_http_pool
+from app.adapters.storage import ArtifactStorage, LocalArtifactStorage
+from app.adapters.stt import LocalSTTClient, OpenAISTTClient, STTClient
+from app.core.config import Settings, get_settings
+from app.core.events import JobEventBroker
+from app.core.executor import BlockingExecutor
+from app.core.signing import UrlSigner
+from app.repositories.async_adapters import as_async_repository
+from app.repositories.base import AsyncRepository, Repository
+from app.repositories.block_index import BlockIndexCache
+from app.repositories.derivatives import DerivativeStore
+from app.repositories.draft_fragments import DraftFragmentCache
+from app.repositories.frame_cache import FrameCache
+from app.repositories.frame_index import VideoFrameIndexCache
+from app.repositories.instructions import InstructionStore
+from app.repositories.memory import InMemoryStore
+from app.repositories.screenshots import ScreenshotAssetStore
+from app.repositories.sql import SqlRepository
+from app.repositories.transcript_index import TranscriptIndexCache
+from app.repositories.transcripts import TranscriptStore
+from app.services.callbacks import StatusCallbackEngine, StatusCallbackService
+from app.services.derivatives import DerivativeService
+from app.services.drafts import DraftService
+from app.services.instruction_validation import InstructionValidator
+from app.services.instructions import InstructionService
+from app.services.jobs import JobService
+from app.services.projects import ProjectService
+from app.services.regenerate import RegenerateService
+from app.services.screenshots import ScreenshotService
+from app.services.transcript_ingest import TranscriptIngestor
+from app.services.transcripts import TranscriptService
+from app.services.video_index import VideoIndexService
+
+
+def _build_jwks_verifier(settings: Settings) -> JwksTokenVerifier:
+    options: dict[str, object] = {"refresh_seconds": settings.jwks_refresh_seconds}
+    if settings.jwks_uri:
+        options["jwks_uri"] = settings.jwks_uri
+
+    if settings.jwks_issuer_profile == "keycloak":
+        if not settings.keycloak_server_url or not settings.keycloak_realm:
+            raise ValueError("Keycloak JWKS verification requires server URL and realm")
+        return JwksTokenVerifier.for_keycloak(
+            settings.keycloak_server_url,
+            settings.keycloak_realm,
+            audience=settings.keycloak_audience,
+            **options,
+        )
+
+    if not settings.firebase_project_id:
+        raise ValueError("Firebase JWKS verification requires a project id")
+    return JwksTokenVerifier.for_firebase(
+        settings.firebase_project_id,
+        audience=settings.firebase_audience,
+        **options,
+    )
+
+
+def build_token_verifier(settings: Settings) -> TokenVerifier:
+    """Resolve the configured provider adapter, wrapped in the verified-token cache when enabled."""
+    verifier: TokenVerifier
+    if settings.auth_provider == "firebase":
+        verifier = FirebaseTokenVerifier(
+            project_id=settings.firebase_project_id,
+            audience=settings.firebase_audience,
+            eager_init=settings.firebase_eager_init,
+        )
+    elif settings.auth_provider == "jwks":
+        verifier = _build_jwks_verifier(settings)
+    else:
+        verifier = MockTokenVerifier()
+
+    if not settings.auth_cache_enabled:
+        return verifier
+    return CachingTokenVerifier(
+        verifier,
+        max_entries=settings.auth_cache_max_entries,
+        revocation_check_seconds=settings.auth_cache_revocation_check_seconds,
+    )
+
+
+def build_http_client(settings: Settings) -> httpx.AsyncClient | None:
+    """The keep-alive pool shared by every remote provider, or ``None`` when none is configured."""
+    if settings.llm_provider == "fake" and settings.stt_provider is None:
+        return None
+    return build_http_pool(
+        max_connections=settings.provider_max_connections,
+        max_keepalive_connections=settings.provider_max_keepalive_connections,
+        keepalive_seconds=settings.provider_keepalive_seconds,
+        timeout_seconds=settings.provider_timeout_seconds,
+    )
+
+
+def _provider(
+    settings: Settings,
+    http: httpx.AsyncClient | None,
+    *,
+    name: str,
+    base_url: str,
+    max_concurrency: int,
+    api_key: str | None = None,
+) -> ProviderClient:
+    if http is None:
+        raise ValueError(f"{name} requires the shared provider HTTP client")
+    return ProviderClient(
+        http,
+        base_url,
+        name=name,
+        headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
+        max_concurrency=max_concurrency,
+        retry=RetryPolicy(
+            attempts=settings.provider_retry_attempts,
+            base_delay_seconds=settings.provider_retry_base_delay_seconds,
+        ),
+    )
+
+
+def build_llm_client(settings: Settings, http: httpx.AsyncClient | None = None) -> LLMClient:
+    if settings.llm_provider == "openai":
+        if not settings.openai_api_key or not settings.llm_model:
+            raise ValueError("OpenAI LLM provider requires an API key and model")
+        provider = _provider(
+            settings,
+            http,
+            name="openai-llm",
+            base_url=settings.openai_base_url,
+            max_concurrency=settings.llm_max_concurrency,
+            api_key=settings.openai_api_key,
+        )
+        return OpenAILLMClient(provider, model=settings.llm_model)
+    if settings.llm_provider == "local":
+        if not settings.local_llm_base_url or not settings.local_llm_model:
+            raise ValueError("Local LLM provider requires a base URL and model")
+        provider = _provider(
+            settings,
+            http,
+            name="local-llm",
+            base_url=settings.local_llm_base_url,
+            max_concurrency=settings.llm_max_concurrency,
+        )
+        return LocalLLMClient(provider, model=settings.local_llm_model)
+    return FakeLLMClient(latency_seconds=settings.fake_llm_latency_seconds)
+
+
+def build_stt_client(
+    settings: Settings,
+    http: httpx.AsyncClient | None = None,
+    executor: BlockingExecutor | None = None,
+) -> STTClient | None:
+    if settings.stt_provider == "openai":
+        if not settings.openai_api_key:
+            raise ValueError("OpenAI STT provider requires an API key")
+        provider = _provider(
+            settings,
+            http,
+            name="openai-stt",
+            base_url=settings.openai_base_url,
+            max_concurrency=settings.stt_max_concurrency,
+            api_key=settings.openai_api_key,
+        )
+        return OpenAISTTClient(provider, model=settings.openai_stt_model, executor=executor)
+    if settings.stt_provider == "local":
+        if not settings.local_stt_base_url or not settings.local_stt_model:
+            raise ValueError("Local STT provider requires a base URL and model")
+        provider = _provider(
+            settings,
+            http,
+            name="local-stt",
+            base_url=settings.local_stt_base_url,
+            max_concurrency=settings.stt_max_concurrency,
+        )
+        return LocalSTTClient(provider, model=settings.local_stt_model, executor=executor)
+    return None
+
+
+def build_repository(settings: Settings) -> Repository:
+    if settings.storage_backend == "sqlite":
+        return SqlRepository.from_path(settings.sqlite_path, pool_size=settings.sqlite_pool_size)
+    return InMemoryStore()
+
+
+@dataclass(slots=True)
+class AppContainer:
+    """Long-lived collaborators built once per application and shared by every request.
+
+    ``store`` and ``token_verifier`` are the synchronous backends; requests use
+    their async views, which offload blocking backends to ``executor``.
+    """
+
+    settings: Settings
+    executor: BlockingExecutor
+    events: JobEventBroker
+    store: Repository
+    repository: AsyncRepository
+    token_verifier: TokenVerifier
+    async_token_verifier: AsyncTokenVerifier
+    project_service: ProjectService
+    job_service: JobService
+    callback_service: StatusCallbackService
+    storage: ArtifactStorage
+    transcripts: TranscriptStore
+    transcript_indexes: TranscriptIndexCache
+    transcript_service: TranscriptService
+    instructions: InstructionStore
+    instruction_service: InstructionService
+    http: httpx.AsyncClient | None
+    llm: LLMClient
+    stt: STTClient | None
+    regenerate_service: RegenerateService
+    draft_service: DraftService
+    screenshot_assets: ScreenshotAssetStore
+    screenshot_service: ScreenshotService
+    video_index_service: VideoIndexService
+    derivative_service: DerivativeService
+
+    def warm_up(self) -> None:
+        """Pay provider import/initialization cost at startup instead of on the first request."""
+        self.token_verifier.warm_up()
+
+    def close(self) -> None:
+        # Stop queued/running regenerate and screenshot tasks (and the ffmpeg
+        # workers), then end open event streams so the server can drain connections.
+        self.regenerate_service.close()
+        self.screenshot_service.close()
+        self.video_index_service.close()
+        self.derivative_service.close()
+        self.events.close()
+        self.token_verifier.close()
+        # Let in-flight offloaded calls finish before their backend goes away.
+        self.executor.shutdown(wait=True)
+        self.store.close()
+
+    async def aclose(self) -> None:
+        """Close pooled provider connections on the loop that opened them; runs after ``close``."""
+        await self.llm.aclose()
+        if self.stt is not None:
+            await self.stt.aclose()
+        if self.http is not None:
+            await self.http.aclose()
+
+
+def build_container(
+    settings: Settings,
+    *,
+    store: Repository | None = None,
+    token_verifier: TokenVerifier | None = None,
+    storage: ArtifactStorage | None = None,
+    llm: LLMClient | None = None,
+) -> AppContainer:
+    """Wire collaborators from ``settings``; keyword arguments override the configured backends."""
+    executor = BlockingExecutor(settings.blocking_pool_size)
+    events = JobEventBroker(
+        history_size=settings.job_events_history_size,
+        subscriber_buffer=settings.job_events_subscriber_buffer,
+    )
+    store = store if store is not None else build_repository(settings)
+    token_verifier = token_verifier if token_verifier is not None else build_token_verifier(settings)
+    repository = as_async_repository(store, executor)
+    storage = storage if storage is not None else LocalArtifactStorage(settings.artifact_storage_root)
+    transcripts = TranscriptStore()
+    transcript_indexes = TranscriptIndexCache(max_bytes=settings.transcript_index_max_bytes)
+    instructions = InstructionStore(snapshot_interval=settings.instruction_snapshot_interval)
+    instruction_service = InstructionService(
+        repository,
+        instructions,
+        executor,
+        block_indexes=BlockIndexCache(max_entries=settings.instruction_block_index_cache_entries),
+        validator=InstructionValidator(max_documents=settings.instruction_validation_cache_entries),
+    )
+    transcript_service = TranscriptService(repository, transcripts, transcript_indexes, executor)
+    http = build_http_client(settings)
+    llm = llm if llm is not None else build_llm_client(settings, http)
+    screenshot_assets = ScreenshotAssetStore()
+    video_index_service = VideoIndexService(
+        repository,
+        storage,
+        ffprobe_path=settings.ffprobe_path,
+        timeout_seconds=settings.video_index_timeout_seconds,
+        cache=VideoFrameIndexCache(max_bytes=settings.video_index_cache_max_bytes),
+        executor=executor,
+    )
+    derivative_service = DerivativeService(
+        DerivativeStore(settings.derivative_root),
+        UrlSigner(
+            settings.url_signing_secret or settings.callback_secret,
+            ttl_seconds=settings.signed_url_ttl_seconds,
+        ),
+        variants={"thumbnail": settings.derivative_thumbnail_width, "preview": settings.derivative_preview_width},
+        executor=executor,
+    )
+    return AppContainer(
+        settings=settings,
+        executor=executor,
+        events=events,
+        store=store,
+        repository=repository,
+        token_verifier=token_verifier,
+        async_token_verifier=as_async_verifier(token_verifier, executor),
+        project_service=ProjectService(repository),
+        job_service=JobService(repository),
+        callback_service=StatusCallbackService(
+            StatusCallbackEngine(
+                store,
+                max_events_per_job=settings.callback_dedupe_events_per_job,
+                max_jobs=settings.callback_dedupe_max_jobs,
+                events=events,
+            ),
+            executor if store.blocking else None,
+            transcripts=TranscriptIngestor(
+                storage,
+                transcripts,
+                indexes=transcript_indexes,
+                batch_size=settings.transcript_ingest_batch_size,
+            ),
+            ingest_executor=executor if storage.blocking else None,
+            videos=video_index_service,
+        ),
+        storage=storage,
+        transcripts=transcripts,
+        transcript_indexes=transcript_indexes,
+        transcript_service=transcript_service,
+        instructions=instructions,
+        instruction_service=instruction_service,
+        http=http,
+        llm=llm,
+        stt=build_stt_client(settings, http, executor),
+        regenerate_service=RegenerateService(
+            instruction_service,
+            llm,
+            max_concurrency=settings.llm_max_concurrency,
+            events=events,
+            max_finished_tasks=settings.regenerate_max_finished_tasks,
+        ),
+        draft_service=DraftService(
+            transcript_service,
+            instruction_service,
+            llm,
+            cache=DraftFragmentCache(max_entries=settings.draft_fragment_cache_entries),
+            max_concurrency=settings.draft_max_concurrency,
+            max_window_tokens=settings.draft_window_tokens,
+            overlap_tokens=settings.draft_window_overlap_tokens,
+            executor=executor,
+        ),
+        screenshot_assets=screenshot_assets,
+        screenshot_service=ScreenshotService(
+            repository,
+            instruction_service,
+            storage,
+            FrameExtractionPool(
+                settings.ffmpeg_path,
+                workers=settings.screenshot_workers,
+                batch_window_seconds=settings.screenshot_batch_window_seconds,
+                max_pass_frames=settings.screenshot_max_pass_frames,
+                max_pass_span_ms=settings.screenshot_max_pass_span_ms,
+                timeout_seconds=settings.screenshot_timeout_seconds,
+            ),
+            FrameCache(settings.screenshot_cache_root, max_bytes=settings.screenshot_cache_max_bytes),
+            output_root=settings.screenshot_output_root,
+            assets=screenshot_assets,
+            indexes=video_index_service,
+            derivatives=derivative_service,
+            events=events,
+            executor=executor,
+            max_finished_tasks=settings.screenshot_max_finished_tasks,
+        ),
+        video_index_service=video_index_service,
+        derivative_service=derivative_service,
+    )
+
+
+def ensure_container(app: FastAPI) -> AppContainer:
+    """Return the app's container, building it from current settings on first use."""
+    container: AppContainer | None = app.state.container
+    if container is None:
+        container = build_container(get_settings())
+        app.state.container = container
+        app.state.store = container.store
+    return container
+
+
+__all__ = [
+    "AppContainer",
+    "build_container",
+    "build_http_client",
+    "build_llm_client",
+    "build_repository",
+    "build_stt_client",
+    "build_token_verifier",
+    "ensure_container",
+]
@@ -0,0 +1,276 @@
+"""In-process pub/sub of per-job status events for server-sent event streams."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+import json
+import threading
+from typing import Any
+
+JOB_STATUS_EVENT = "job.status"
+REGENERATE_STATUS_EVENT = "regenerate.status"
+EXPORT_STATUS_EVENT = "export.status"
+SCREENSHOT_STATUS_EVENT = "screenshot.status"
+
+HEARTBEAT_FRAME = b": keep-alive\n\n"
+
+_HEARTBEAT = object()
+
+
+def _expire(waiter: asyncio.Future[object]) -> None:
+    if not waiter.done():
+        waiter.set_result(_HEARTBEAT)
+
+
+def encode_sse(event_type: str, data: dict[str, Any], event_id: int | None = None) -> bytes:
+    """Encode one ``text/event-stream`` frame; ``data`` is compact single-line JSON."""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+@dataclass(frozen=True, slots=True)
+class JobEvent:
+    id: int
+    job_id: str
+    type: str
+    data: dict[str, Any]
+    # Encoded once at publish time and shared by every subscriber.
+    frame: bytes
+
+
+@dataclass(slots=True)
+class _JobChannel:
+    history: deque[JobEvent]
+    subscribers: set[JobEventSubscription] = field(default_factory=set)
+
+
+class JobEventSubscription:
+    """One subscriber's bounded buffer of events for a job.
+
+    Events are pushed on the subscriber's event loop. When the buffer is full
+    the subscription closes instead of growing; the client reconnects with
+    ``Last-Event-ID`` and the broker replays what it missed from history.
+    """
+
+    __slots__ = ("job_id", "closed", "overflowed", "_broker", "_loop", "_buffer", "_max_buffer", "_waiter")
+
+    def __init__(
+        self,
+        broker: JobEventBroker,
+        job_id: str,
+        loop: asyncio.AbstractEventLoop,
+        backlog: Iterable[JobEvent],
+        max_buffer: int,
+    ) -> None:
+        self.job_id = job_id
+        self.closed = False
+        self.overflowed = False
+        self._broker = broker
+        self._loop = loop
+        self._buffer: deque[JobEvent] = deque(backlog)
+        self._max_buffer = max_buffer
+        self._waiter: asyncio.Future[object] | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def _push(self, event: JobEvent) -> None:
+        if self.closed:
+            return
+        if len(self._buffer) >= self._max_buffer:
+            self.overflowed = True
+            self._finish()
+            return
+        self._buffer.append(event)
+        self._wake()
+
+    def _finish(self) -> None:
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def frames(self, heartbeat_seconds: float) -> AsyncIterator[bytes]:
+        """Yield encoded events, or a heartbeat comment after ``heartbeat_seconds`` of silence.
+
+        Ends once the subscription is closed and its buffer is drained.
+        """
+        while True:
+            if self._buffer:
+                yield self._buffer.popleft().frame
+                continue
+            if self.closed:
+                return
+            # A bare future plus a timer handle is much cheaper per idle
+            # subscriber than ``asyncio.wait_for``.
+            waiter = self._waiter = self._loop.create_future()
+            timer = self._loop.call_later(heartbeat_seconds, _expire, waiter)
+            try:
+                await waiter
+            finally:
+                timer.cancel()
+                self._waiter = None
+            if waiter.result() is _HEARTBEAT:
+                yield HEARTBEAT_FRAME
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self)
+        self._finish()
+
+
+def _push_all(subscribers: Iterable[JobEventSubscription], event: JobEvent) -> None:
+    for subscriber in subscribers:
+        subscriber._push(event)
+
+
+def _finish_all(subscribers: Iterable[JobEventSubscription]) -> None:
+    for subscriber in subscribers:
+        subscriber._finish()
+
+
+class JobEventBroker:
+    """Fans job events out to subscribers and keeps a short per-job history for resume.
+
+    Event ids come from one process-wide counter, so they never repeat even
+    after a job's channel is evicted and recreated. ``publish`` may be called
+    from any thread; delivery is scheduled onto each subscriber's loop.
+    Channels of jobs nobody is watching are evicted least-recently-used once
+    more than ``max_tracked_jobs`` are held.
+    """
+
+    def __init__(
+        self,
+        *,
+        history_size: int = 256,
+        subscriber_buffer: int = 64,
+        max_tracked_jobs: int = 10_000,
+    ) -> None:
+        if history_size < 1 or subscriber_buffer < 1 or max_tracked_jobs < 1:
+            raise ValueError("history_size, subscriber_buffer and max_tracked_jobs must be positive")
+        self._history_size = history_size
+        self._subscriber_buffer = subscriber_buffer
+        self._max_tracked_jobs = max_tracked_jobs
+        self._lock = threading.Lock()
+        self._channels: OrderedDict[str, _JobChannel] = OrderedDict()
+        self._sequence = 0
+        self._closed = False
+        self.published = 0
+        self.overflow_disconnects = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(channel.subscribers) for channel in self._channels.values())
+
+    def _channel(self, job_id: str) -> _JobChannel:
+        channel = self._channels.get(job_id)
+        if channel is None:
+            channel = _JobChannel(history=deque(maxlen=self._history_size))
+            self._channels[job_id] = channel
+            self._evict_idle()
+        else:
+            self._channels.move_to_end(job_id)
+        return channel
+
+    def _evict_idle(self) -> None:
+        if len(self._channels) <= self._max_tracked_jobs:
+            return
+        for job_id in list(self._channels):
+            if len(self._channels) <= self._max_tracked_jobs:
+                return
+            if not self._channels[job_id].subscribers:
+                del self._channels[job_id]
+
+    def publish(self, job_id: str, event_type: str, data: dict[str, Any]) -> JobEvent:
+        with self._lock:
+            self._sequence += 1
+            event = JobEvent(
+                id=self._sequence,
+                job_id=job_id,
+                type=event_type,
+                data=data,
+                frame=encode_sse(event_type, data, self._sequence),
+            )
+            channel = self._channel(job_id)
+            channel.history.append(event)
+            subscribers = tuple(channel.subscribers)
+            self.published += 1
+        if subscribers:
+            self._deliver(subscribers, event)
+        return event
+
+    def _deliver(self, subscribers: tuple[JobEventSubscription, ...], event: JobEvent) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        by_loop: dict[asyncio.AbstractEventLoop, list[JobEventSubscription]] = {}
+        for subscriber in subscribers:
+            by_loop.setdefault(subscriber.loop, []).append(subscriber)
+        for loop, group in by_loop.items():
+            if loop is running:
+                _push_all(group, event)
+            else:
+                try:
+                    loop.call_soon_threadsafe(_push_all, group, event)
+                except RuntimeError:  # pragma: no cover - subscriber loop already closed
+                    continue
+
+    def subscribe(self, job_id: str, *, last_event_id: int | None = None) -> JobEventSubscription:
+        """Register a subscriber on the running loop, replaying history newer than ``last_event_id``."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            channel = self._channel(job_id)
+            backlog = [] if last_event_id is None else [e for e in channel.history if e.id > last_event_id]
+            subscription = JobEventSubscription(self, job_id, loop, backlog, self._subscriber_buffer)
+            if self._closed:
+                subscription.closed = True
+            else:
+                channel.subscribers.add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: JobEventSubscription) -> None:
+        with self._lock:
+            channel = self._channels.get(subscription.job_id)
+            if channel is not None:
+                channel.subscribers.discard(subscription)
+            if subscription.overflowed:
+                self.overflow_disconnects += 1
+
+    def close(self) -> None:
+        """End every open stream, e.g. on shutdown; clients reconnect and resume elsewhere."""
+        with self._lock:
+            self._closed = True
+            subscribers = [sub for channel in self._channels.values() for sub in channel.subscribers]
+            for channel in self._channels.values():
+                channel.subscribers.clear()
+
+        by_loop: dict[asyncio.AbstractEventLoop, list[JobEventSubscription]] = {}
+        for subscriber in subscribers:
+            by_loop.setdefault(subscriber.loop, []).append(subscriber)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_finish_all, group)
+            except RuntimeError:  # pragma: no cover - subscriber loop already closed
+                _finish_all(group)
+
+
+__all__ = [
+    "EXPORT_STATUS_EVENT",
+    "HEARTBEAT_FRAME",
+    "JOB_STATUS_EVENT",
+    "REGENERATE_STATUS_EVENT",
+    "SCREENSHOT_STATUS_EVENT",
+    "JobEvent",
+    "JobEventBroker",
+    "JobEventSubscription",
+    "encode_sse",
+]
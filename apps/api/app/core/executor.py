@@ -0,0 +1,89 @@
+"""Bounded thread pool for offloading blocking calls from the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import functools
+import threading
+import time
+from typing import ParamSpec, TypeVar
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutorStats:
+    submitted: int
+    completed: int
+    queued: int
+    running: int
+    total_queue_wait_seconds: float
+    max_queue_wait_seconds: float
+
+    @property
+    def mean_queue_wait_seconds(self) -> float:
+        started = self.submitted - self.queued
+        return self.total_queue_wait_seconds / started if started else 0.0
+
+
+class BlockingExecutor:
+    """Fixed-size worker pool that records how long calls wait for a free worker."""
+
+    def __init__(self, max_workers: int, *, thread_name_prefix: str = "howera-blocking") -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._running = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                submitted=self._submitted,
+                completed=self._completed,
+                queued=self._submitted - self._completed - self._running,
+                running=self._running,
+                total_queue_wait_seconds=self._total_wait,
+                max_queue_wait_seconds=self._max_wait,
+            )
+
+    def _instrumented(self, fn: Callable[_P, _T], enqueued_at: float) -> Callable[_P, _T]:
+        @functools.wraps(fn)
+        def call(*args: _P.args, **kwargs: _P.kwargs) -> _T:
+            waited = time.perf_counter() - enqueued_at
+            with self._lock:
+                self._running += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        return call
+
+    async def run(self, fn: Callable[_P, _T], /, *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        """Run ``fn`` on a worker thread and await its result."""
+        with self._lock:
+            self._submitted += 1
+        call = self._instrumented(fn, time.perf_counter())
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(call, *args, **kwargs))
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+__all__ = ["BlockingExecutor", "ExecutorStats"]
@@ -0,0 +1,119 @@
+"""Fair, bounded admission of asyncio work across tenants."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import time
+
+
+@dataclass(frozen=True, slots=True)
+class LimiterStats:
+    admitted: int
+    running: int
+    queued: int
+    max_queued: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.admitted if self.admitted else 0.0
+
+
+class FairLimiter:
+    """At most ``limit`` holders at once; waiters are admitted round-robin by key.
+
+    Each key (e.g. an owner) has its own FIFO queue, and a freed slot goes to
+    the next key in rotation, so one tenant submitting a burst cannot starve
+    the others. Must be used from a single event loop.
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self._running = 0
+        # Keys with waiters, in rotation order.
+        self._queues: OrderedDict[str, deque[asyncio.Future[None]]] = OrderedDict()
+        self._queued = 0
+        self._admitted = 0
+        self._max_queued = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def stats(self) -> LimiterStats:
+        return LimiterStats(
+            admitted=self._admitted,
+            running=self._running,
+            queued=self._queued,
+            max_queued=self._max_queued,
+            total_wait_seconds=self._total_wait,
+            max_wait_seconds=self._max_wait,
+        )
+
+    def queued_for(self, key: str) -> int:
+        queue = self._queues.get(key)
+        return len(queue) if queue is not None else 0
+
+    @asynccontextmanager
+    async def slot(self, key: str) -> AsyncIterator[None]:
+        await self._acquire(key)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, key: str) -> None:
+        enqueued_at = time.perf_counter()
+        if self._running < self.limit and not self._queued:
+            self._running += 1
+        else:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._queues.setdefault(key, deque()).append(waiter)
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Admitted just as we were cancelled: pass the slot on.
+                    self._release()
+                else:
+                    self._discard(key, waiter)
+                raise
+        waited = time.perf_counter() - enqueued_at
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _discard(self, key: str, waiter: asyncio.Future[None]) -> None:
+        queue = self._queues.get(key)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            del self._queues[key]
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next key in rotation, if any.
+        while self._queues:
+            key, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._running -= 1
+
+
+__all__ = ["FairLimiter", "LimiterStats"]
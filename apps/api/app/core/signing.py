@@ -0,0 +1,58 @@
+"""Expiring HMAC-signed URLs for artifacts served without a bearer token."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import UTC, datetime
+import hashlib
+import hmac
+import time
+from urllib.parse import urlencode
+
+
+class UrlSigner:
+    """Signs a URL path with an expiry; anyone holding the URL may fetch it until then.
+
+    The key is derived from ``secret`` for this purpose only, so sharing a
+    configured secret (e.g. the callback secret) does not let a signature
+    stand in for it. Expiries are rounded up to ``granularity_seconds`` so
+    repeated signing of the same path within that window yields the same
+    URL, which browsers and CDNs can cache.
+    """
+
+    def __init__(
+        self,
+        secret: str | bytes,
+        *,
+        ttl_seconds: int = 900,
+        granularity_seconds: int = 60,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not secret:
+            raise ValueError("a signing secret is required")
+        if ttl_seconds < 1 or granularity_seconds < 1:
+            raise ValueError("ttl_seconds and granularity_seconds must be positive")
+        raw = secret.encode() if isinstance(secret, str) else secret
+        self._key = hmac.new(raw, b"howera-signed-url/1", hashlib.sha256).digest()
+        self._ttl = ttl_seconds
+        self._granularity = granularity_seconds
+        self._clock = clock
+
+    def _signature(self, path: str, expires: int) -> str:
+        return hmac.new(self._key, f"{path}\n{expires}".encode(), hashlib.sha256).hexdigest()
+
+    def sign(self, path: str) -> tuple[str, datetime]:
+        """``path`` with ``expires`` and ``signature`` query parameters, and when it expires."""
+        deadline = int(self._clock()) + self._ttl
+        expires = -(-deadline // self._granularity) * self._granularity
+        query = urlencode({"expires": expires, "signature": self._signature(path, expires)})
+        return f"{path}?{query}", datetime.fromtimestamp(expires, UTC)
+
+    def verify(self, path: str, expires: int, signature: str) -> bool:
+        """Whether ``signature`` was issued for ``path`` and ``expires`` has not passed."""
+        if expires < self._clock():
+            return False
+        return hmac.compare_digest(self._signature(path, expires), signature)
+
+
+__all__ = ["UrlSigner"]
@@ -0,0 +1,69 @@
+"""Job lifecycle transition table from ``spec/domain/job_fsm.md``."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from app.schemas.job import JobStatus
+
+TERMINAL_STATUSES: frozenset[JobStatus] = frozenset({JobStatus.DONE, JobStatus.FAILED, JobStatus.CANCELLED})
+
+# Processing states that may be re-entered to retry the same step (spec 4.2, ↩).
+RETRYABLE_STATUSES: frozenset[JobStatus] = frozenset(
+    {JobStatus.AUDIO_EXTRACTING, JobStatus.TRANSCRIBING, JobStatus.GENERATING}
+)
+
+# Explicit rows of spec tables 4.1-4.3; the global rules of 4.4 are added below.
+_EXPLICIT_TRANSITIONS: dict[JobStatus, tuple[JobStatus, ...]] = {
+    JobStatus.CREATED: (JobStatus.UPLOADING, JobStatus.UPLOADED),
+    JobStatus.UPLOADING: (JobStatus.UPLOADED,),
+    JobStatus.UPLOADED: (JobStatus.AUDIO_EXTRACTING,),
+    JobStatus.AUDIO_EXTRACTING: (JobStatus.AUDIO_READY, JobStatus.AUDIO_EXTRACTING),
+    JobStatus.AUDIO_READY: (JobStatus.TRANSCRIBING,),
+    JobStatus.TRANSCRIBING: (JobStatus.TRANSCRIPT_READY, JobStatus.TRANSCRIBING),
+    JobStatus.TRANSCRIPT_READY: (JobStatus.GENERATING,),
+    JobStatus.GENERATING: (JobStatus.DRAFT_READY, JobStatus.GENERATING),
+    JobStatus.DRAFT_READY: (JobStatus.EDITING,),
+    JobStatus.EDITING: (JobStatus.REGENERATING, JobStatus.EXPORTING),
+    JobStatus.REGENERATING: (JobStatus.EDITING,),
+    JobStatus.EXPORTING: (JobStatus.DONE, JobStatus.EDITING),
+}
+
+
+def _build_transitions() -> Mapping[JobStatus, frozenset[JobStatus]]:
+    table: dict[JobStatus, frozenset[JobStatus]] = {}
+    for status in JobStatus:
+        if status in TERMINAL_STATUSES:
+            table[status] = frozenset()
+            continue
+        table[status] = frozenset(_EXPLICIT_TRANSITIONS.get(status, ())) | {JobStatus.CANCELLED, JobStatus.FAILED}
+    return MappingProxyType(table)
+
+
+# Precomputed once so a legality check is a dict lookup plus a set membership test.
+TRANSITIONS: Mapping[JobStatus, frozenset[JobStatus]] = _build_transitions()
+
+
+def is_terminal(status: JobStatus) -> bool:
+    return status in TERMINAL_STATUSES
+
+
+def can_transition(current: JobStatus, target: JobStatus) -> bool:
+    return target in TRANSITIONS[current]
+
+
+def allowed_next_statuses(current: JobStatus) -> list[JobStatus]:
+    """Allowed targets in declaration order, for error details."""
+    allowed = TRANSITIONS[current]
+    return [status for status in JobStatus if status in allowed]
+
+
+__all__ = [
+    "RETRYABLE_STATUSES",
+    "TERMINAL_STATUSES",
+    "TRANSITIONS",
+    "allowed_next_statuses",
+    "can_transition",
+    "is_terminal",
+]
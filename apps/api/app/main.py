@@ -2,29 +2,55 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
+from app.core.container import AppContainer, ensure_container
 from app.errors import ApiError
-from app.repositories.memory import InMemoryStore
-from app.routes import internal_router, jobs_router, projects_router
+from app.routes import (
+    derivatives_router,
+    instructions_router,
+    internal_router,
+    job_events_router,
+    jobs_router,
+    projects_router,
+    screenshot_tasks_router,
+    screenshots_router,
+    tasks_router,
+    transcripts_router,
+)
 from app.schemas.error import ErrorResponse
 
 
 _OPENAPI_RESPONSE_CODES: dict[str, dict[str, set[str]]] = {
-    "/api/v1/projects": {"post": {"201", "401"}, "get": {"200"}},
+    "/api/v1/projects": {"post": {"201", "401"}, "get": {"200", "400", "401"}},
     "/api/v1/projects/{projectId}": {"get": {"200", "404"}},
-    "/api/v1/projects/{projectId}/jobs": {"post": {"201", "401", "404"}},
-    "/api/v1/internal/jobs/{jobId}/status": {"post": {"200", "204", "401", "404", "409"}},
+    "/api/v1/projects/{projectId}/jobs": {"post": {"201", "401", "404"}, "get": {"200", "400", "401", "404"}},
+    "/api/v1/internal/jobs/{jobId}/status": {"post": {"200", "204", "401", "404", "409", "422"}},
+    "/api/v1/internal/jobs/status-batch": {"post": {"200", "401"}},
+    "/api/v1/jobs/{jobId}/events": {"get": {"200", "401", "404"}},
+    "/api/v1/jobs/{jobId}/transcript": {"get": {"200", "401", "404", "409"}},
+    "/api/v1/jobs/{jobId}/transcript/search": {"get": {"200", "401", "404", "409"}},
+    "/api/v1/instructions/{instructionId}": {"get": {"200", "401", "404"}, "put": {"200", "401", "404", "409"}},
+    "/api/v1/instructions/{instructionId}/regenerate": {"post": {"200", "202", "400", "401", "404", "409"}},
+    "/api/v1/tasks/{taskId}": {"get": {"200", "401", "404"}},
+    "/api/v1/jobs/{jobId}/screenshots/extract": {"post": {"200", "202", "400", "401", "404"}},
+    "/api/v1/screenshot-tasks/{taskId}": {"get": {"200", "401", "404"}},
+    "/api/v1/derivatives/{checksum}/{name}": {"get": {"200", "404"}},
 }
 
 _AUTH_VALIDATION_PATHS: set[tuple[str, str]] = {
     ("POST", "/api/v1/projects"),
     ("POST", "/api/v1/projects/{projectId}/jobs"),
     ("POST", "/api/v1/internal/jobs/{jobId}/status"),
+    ("POST", "/api/v1/internal/jobs/status-batch"),
 }
 
 
@@ -49,9 +75,24 @@ def _apply_contract_response_codes(schema: dict) -> None:
                 responses.setdefault(status_code, {"description": "See API contract"})
 
 
-def create_app() -> FastAPI:
-    app = FastAPI(title="Howera API", version="1.1.0")
-    app.state.store = InMemoryStore()
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    container = ensure_container(app)
+    # Warm-up may import SDKs or fetch signing keys; keep it off the event loop.
+    await run_in_threadpool(container.warm_up)
+    try:
+        yield
+    finally:
+        container.close()
+        await container.aclose()
+
+
+def create_app(container: AppContainer | None = None) -> FastAPI:
+    """Build the API app; pass ``container`` to substitute collaborators in tests."""
+    app = FastAPI(title="Howera API", version="1.1.0", lifespan=_lifespan)
+    # Both are populated from settings at startup (or on first request) unless injected here.
+    app.state.container = container
+    app.state.store = container.store if container is not None else None
 
     @app.exception_handler(ApiError)
     async def handle_api_error(_, exc: ApiError) -> JSONResponse:
@@ -75,6 +116,13 @@ def create_app() -> FastAPI:
     api_prefix = "/api/v1"
     app.include_router(projects_router, prefix=api_prefix)
     app.include_router(jobs_router, prefix=api_prefix)
+    app.include_router(job_events_router, prefix=api_prefix)
+    app.include_router(transcripts_router, prefix=api_prefix)
+    app.include_router(instructions_router, prefix=api_prefix)
+    app.include_router(tasks_router, prefix=api_prefix)
+    app.include_router(screenshots_router, prefix=api_prefix)
+    app.include_router(screenshot_tasks_router, prefix=api_prefix)
+    app.include_router(derivatives_router, prefix=api_prefix)
     app.include_router(internal_router, prefix=api_prefix)
 
     def custom_openapi() -> dict:
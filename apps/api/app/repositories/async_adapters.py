@@ -0,0 +1,99 @@
+"""Adapters exposing synchronous repositories through ``AsyncRepository``."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from app.core.executor import BlockingExecutor
+from app.repositories.base import AsyncRepository, JobRecord, ProjectRecord, Repository
+
+
+class DirectAsyncRepository(AsyncRepository):
+    """Calls a non-blocking repository inline; no thread hop or copying."""
+
+    def __init__(self, repository: Repository) -> None:
+        self._repository = repository
+
+    async def create_project(self, owner_id: str, name: str) -> ProjectRecord:
+        return self._repository.create_project(owner_id, name)
+
+    async def get_project(self, project_id: str) -> ProjectRecord | None:
+        return self._repository.get_project(project_id)
+
+    async def list_projects_for_owner(
+        self,
+        owner_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[ProjectRecord]:
+        return self._repository.list_projects_for_owner(owner_id, after=after, limit=limit)
+
+    async def get_project_for_owner(self, owner_id: str, project_id: str) -> ProjectRecord | None:
+        return self._repository.get_project_for_owner(owner_id, project_id)
+
+    async def create_job(self, owner_id: str, project_id: str) -> JobRecord:
+        return self._repository.create_job(owner_id, project_id)
+
+    async def get_job(self, job_id: str) -> JobRecord | None:
+        return self._repository.get_job(job_id)
+
+    async def list_jobs_for_project(
+        self,
+        project_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[JobRecord]:
+        return self._repository.list_jobs_for_project(project_id, after=after, limit=limit)
+
+
+class OffloadedAsyncRepository(AsyncRepository):
+    """Runs each call of a blocking repository on the bounded executor."""
+
+    def __init__(self, repository: Repository, executor: BlockingExecutor) -> None:
+        self._repository = repository
+        self._executor = executor
+
+    async def create_project(self, owner_id: str, name: str) -> ProjectRecord:
+        return await self._executor.run(self._repository.create_project, owner_id, name)
+
+    async def get_project(self, project_id: str) -> ProjectRecord | None:
+        return await self._executor.run(self._repository.get_project, project_id)
+
+    async def list_projects_for_owner(
+        self,
+        owner_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[ProjectRecord]:
+        return await self._executor.run(self._repository.list_projects_for_owner, owner_id, after=after, limit=limit)
+
+    async def get_project_for_owner(self, owner_id: str, project_id: str) -> ProjectRecord | None:
+        return await self._executor.run(self._repository.get_project_for_owner, owner_id, project_id)
+
+    async def create_job(self, owner_id: str, project_id: str) -> JobRecord:
+        return await self._executor.run(self._repository.create_job, owner_id, project_id)
+
+    async def get_job(self, job_id: str) -> JobRecord | None:
+        return await self._executor.run(self._repository.get_job, job_id)
+
+    async def list_jobs_for_project(
+        self,
+        project_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[JobRecord]:
+        return await self._executor.run(self._repository.list_jobs_for_project, project_id, after=after, limit=limit)
+
+
+def as_async_repository(repository: Repository, executor: BlockingExecutor) -> AsyncRepository:
+    """Offload blocking backends; call non-blocking ones (the in-memory store) inline."""
+    if repository.blocking:
+        return OffloadedAsyncRepository(repository, executor)
+    return DirectAsyncRepository(repository)
+
+
+__all__ = ["DirectAsyncRepository", "OffloadedAsyncRepository", "as_async_repository"]
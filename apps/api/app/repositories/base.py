@@ -0,0 +1,160 @@
+"""Persistence interfaces shared by repository backends."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, ClassVar
+
+from app.schemas.job import JobStatus
+
+
+@dataclass(slots=True)
+class ProjectRecord:
+    id: str
+    name: str
+    owner_id: str
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class JobRecord:
+    id: str
+    project_id: str
+    owner_id: str
+    status: JobStatus
+    created_at: datetime
+    updated_at: datetime | None = None
+    manifest: dict[str, Any] = field(default_factory=dict)
+    failure_code: str | None = None
+    failure_message: str | None = None
+    failed_stage: str | None = None
+    # Last accepted status callback; ``occurred_at`` ordering is checked against it.
+    last_event_id: str | None = None
+    last_event_digest: str | None = None
+    last_event_at: datetime | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class JobTransition:
+    """Everything one accepted status callback writes, applied atomically."""
+
+    job_id: str
+    status: JobStatus
+    manifest: dict[str, Any]
+    failure_code: str | None
+    failure_message: str | None
+    failed_stage: str | None
+    event_id: str
+    event_digest: str
+    occurred_at: datetime
+    recorded_at: datetime
+
+
+class Repository(ABC):
+    """Project/job persistence surface consumed by services.
+
+    Listings are ordered by ``(created_at, id)``; ``after`` is an exclusive
+    keyset position and ``limit`` caps the number of returned records.
+    """
+
+    # True when calls may block on I/O and must be kept off the event loop.
+    blocking: ClassVar[bool] = False
+
+    project_write_count: int
+    job_write_count: int
+
+    @abstractmethod
+    def create_project(self, owner_id: str, name: str) -> ProjectRecord:
+        """Persist and return a new project."""
+
+    @abstractmethod
+    def get_project(self, project_id: str) -> ProjectRecord | None:
+        """Return a project by id regardless of owner."""
+
+    @abstractmethod
+    def list_projects_for_owner(
+        self,
+        owner_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[ProjectRecord]:
+        """Return owner projects in created order."""
+
+    @abstractmethod
+    def get_project_for_owner(self, owner_id: str, project_id: str) -> ProjectRecord | None:
+        """Return a project only when it belongs to ``owner_id``."""
+
+    @abstractmethod
+    def create_job(self, owner_id: str, project_id: str) -> JobRecord:
+        """Persist and return a new job in ``CREATED`` status."""
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> JobRecord | None:
+        """Return a job by id regardless of owner."""
+
+    @abstractmethod
+    def list_jobs_for_project(
+        self,
+        project_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[JobRecord]:
+        """Return project jobs in created order."""
+
+    @abstractmethod
+    def apply_job_transition(self, transition: JobTransition) -> JobRecord | None:
+        """Write status, manifest, failure metadata and last event together; ``None`` if the job is gone."""
+
+    def close(self) -> None:
+        """Release connections or other backend resources; no-op by default."""
+
+
+class AsyncRepository(ABC):
+    """Awaitable form of ``Repository`` used by services on the event loop."""
+
+    @abstractmethod
+    async def create_project(self, owner_id: str, name: str) -> ProjectRecord:
+        """Persist and return a new project."""
+
+    @abstractmethod
+    async def get_project(self, project_id: str) -> ProjectRecord | None:
+        """Return a project by id regardless of owner."""
+
+    @abstractmethod
+    async def list_projects_for_owner(
+        self,
+        owner_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[ProjectRecord]:
+        """Return owner projects in created order."""
+
+    @abstractmethod
+    async def get_project_for_owner(self, owner_id: str, project_id: str) -> ProjectRecord | None:
+        """Return a project only when it belongs to ``owner_id``."""
+
+    @abstractmethod
+    async def create_job(self, owner_id: str, project_id: str) -> JobRecord:
+        """Persist and return a new job in ``CREATED`` status."""
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> JobRecord | None:
+        """Return a job by id regardless of owner."""
+
+    @abstractmethod
+    async def list_jobs_for_project(
+        self,
+        project_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[JobRecord]:
+        """Return project jobs in created order."""
+
+
+__all__ = ["AsyncRepository", "JobRecord", "JobTransition", "ProjectRecord", "Repository"]
@@ -0,0 +1,249 @@
+"""Per-version index of instruction markdown blocks."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+import hashlib
+import re
+import threading
+
+from app.repositories.instructions import Delta
+
+# ADR-001 block marker: ``<!-- block:<uuid> -->``. A block runs from its
+# marker to the next marker (or the end of the document).
+BLOCK_MARKER = re.compile(r"<!--\s*block:([^\s>]*)\s*-->")
+_HEADING = re.compile(r"^(#{1,6})[ \t]+(.*?)[ \t#]*$", re.MULTILINE)
+
+# Open ATX headings as ``(level, title)``, outermost first.
+_Headings = tuple[tuple[int, str], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class BlockSpan:
+    block_id: str
+    # ``start`` is the marker's offset; ``content_start`` is just past it.
+    start: int
+    content_start: int
+    end: int
+    heading_path: tuple[str, ...]
+    # sha256 of the block content without its marker, whitespace-trimmed.
+    content_hash: str
+
+
+def _advance(headings: _Headings, markdown: str, start: int, end: int) -> tuple[_Headings, _Headings | None]:
+    """Headings open after ``markdown[start:end]``, and those open at its first heading."""
+    first: _Headings | None = None
+    for match in _HEADING.finditer(markdown, start, end):
+        level = len(match.group(1))
+        headings = tuple(heading for heading in headings if heading[0] < level) + ((level, match.group(2)),)
+        if first is None:
+            first = headings
+    return headings, first
+
+
+class _Parsed:
+    __slots__ = ("ids", "starts", "content_starts", "paths", "hashes", "entries")
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.starts = array("q")
+        self.content_starts = array("q")
+        self.paths: list[tuple[str, ...]] = []
+        self.hashes: list[str] = []
+        self.entries: list[_Headings] = []
+
+    def add(self, markdown: str, marker: re.Match[str], end: int, entry: _Headings) -> _Headings:
+        exit_headings, first = _advance(entry, markdown, marker.end(), end)
+        content = markdown[marker.end() : end].strip()
+        self.ids.append(marker.group(1))
+        self.starts.append(marker.start())
+        self.content_starts.append(marker.end())
+        self.paths.append(tuple(title for _, title in (first if first is not None else entry)))
+        self.hashes.append(hashlib.sha256(content.encode("utf-8")).hexdigest())
+        self.entries.append(entry)
+        return exit_headings
+
+
+def _scan(
+    markdown: str,
+    start: int,
+    headings: _Headings,
+    resync: Callable[[int, _Headings], bool] | None = None,
+) -> tuple[_Parsed, int | None]:
+    """Parse blocks from ``start`` (0 or a marker offset) with ``headings`` open there.
+
+    Stops before the first marker ``resync`` accepts and returns its offset,
+    so the caller can reuse everything from there on.
+    """
+    parsed = _Parsed()
+    pending: tuple[re.Match[str], _Headings] | None = None
+    for marker in BLOCK_MARKER.finditer(markdown, start):
+        if pending is None:
+            headings, _ = _advance(headings, markdown, start, marker.start())
+        else:
+            headings = parsed.add(markdown, pending[0], marker.start(), pending[1])
+            if resync is not None and resync(marker.start(), headings):
+                return parsed, marker.start()
+        pending = (marker, headings)
+    if pending is not None:
+        parsed.add(markdown, pending[0], len(markdown), pending[1])
+    return parsed, None
+
+
+class BlockIndex:
+    """Block markers of one markdown version: id, char span, heading path and content hash.
+
+    Immutable. ``apply`` derives the next version's index by reparsing only
+    the blocks an edit touched (and any later blocks whose heading path it
+    changed); ``parsed_chars`` records how much text that took.
+    """
+
+    __slots__ = ("_ids", "_starts", "_content_starts", "_paths", "_hashes", "_entries", "_length", "_positions", "parsed_chars")
+
+    def __init__(self, parsed: _Parsed, length: int, parsed_chars: int) -> None:
+        self._ids = parsed.ids
+        self._starts = parsed.starts
+        self._content_starts = parsed.content_starts
+        self._paths = parsed.paths
+        self._hashes = parsed.hashes
+        self._entries = parsed.entries
+        self._length = length
+        self._positions: dict[str, int] | None = None
+        self.parsed_chars = parsed_chars
+
+    @classmethod
+    def build(cls, markdown: str) -> BlockIndex:
+        parsed, _ = _scan(markdown, 0, ())
+        return cls(parsed, len(markdown), len(markdown))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[BlockSpan]:
+        for position in range(len(self._ids)):
+            yield self.block(position)
+
+    @property
+    def length(self) -> int:
+        """Length of the markdown this index describes."""
+        return self._length
+
+    def block(self, position: int) -> BlockSpan:
+        end = self._starts[position + 1] if position + 1 < len(self._starts) else self._length
+        return BlockSpan(
+            block_id=self._ids[position],
+            start=self._starts[position],
+            content_start=self._content_starts[position],
+            end=end,
+            heading_path=self._paths[position],
+            content_hash=self._hashes[position],
+        )
+
+    def position(self, block_id: str) -> int | None:
+        """Position of the first block carrying ``block_id``."""
+        if self._positions is None:
+            positions: dict[str, int] = {}
+            for position, existing in enumerate(self._ids):
+                positions.setdefault(existing, position)
+            self._positions = positions
+        return self._positions.get(block_id)
+
+    def find(self, block_id: str) -> BlockSpan | None:
+        """First block carrying ``block_id``."""
+        position = self.position(block_id)
+        return None if position is None else self.block(position)
+
+    def positions_overlapping(self, start: int, end: int) -> range:
+        """Positions of the blocks intersecting ``[start, end)``; text before the first marker belongs to none."""
+        first = bisect_right(self._starts, start) - 1
+        last = bisect_left(self._starts, end)
+        if first < 0:
+            first = 0
+        elif first < len(self._starts) and self.block(first).end <= start:
+            first += 1
+        return range(first, max(last, first))
+
+    def overlapping(self, start: int, end: int) -> list[BlockSpan]:
+        return [self.block(position) for position in self.positions_overlapping(start, end)]
+
+    def apply(self, markdown: str, delta: Delta) -> BlockIndex:
+        """Index of ``markdown``, produced from this index's document by ``delta``."""
+        if not delta:
+            return self
+        edit_start, edit_end = delta[0][0], delta[-1][1]
+        shift = len(markdown) - self._length
+        new_edit_end = edit_end + shift
+
+        # Markers ending at or before the edit are unchanged, so the last of
+        # them is a safe place to resume parsing with its recorded headings.
+        resume = bisect_right(self._content_starts, edit_start) - 1
+        if resume >= 0:
+            start, headings = self._starts[resume], self._entries[resume]
+        else:
+            resume, start, headings = 0, 0, ()
+        reuse = len(self._ids)
+
+        def resync(offset: int, open_headings: _Headings) -> bool:
+            # A marker past the edit whose block starts with the same open
+            # headings as before parses exactly as it did; so does the rest.
+            nonlocal reuse
+            if offset < new_edit_end:
+                return False
+            position = bisect_left(self._starts, offset - shift)
+            if position == len(self._starts) or self._starts[position] != offset - shift:
+                return False
+            if self._entries[position] != open_headings:
+                return False
+            reuse = position
+            return True
+
+        parsed, stop = _scan(markdown, start, headings, resync)
+        merged = _Parsed()
+        merged.ids = self._ids[:resume] + parsed.ids + self._ids[reuse:]
+        merged.starts = self._starts[:resume] + parsed.starts + array("q", (s + shift for s in self._starts[reuse:]))
+        merged.content_starts = (
+            self._content_starts[:resume]
+            + parsed.content_starts
+            + array("q", (s + shift for s in self._content_starts[reuse:]))
+        )
+        merged.paths = self._paths[:resume] + parsed.paths + self._paths[reuse:]
+        merged.hashes = self._hashes[:resume] + parsed.hashes + self._hashes[reuse:]
+        merged.entries = self._entries[:resume] + parsed.entries + self._entries[reuse:]
+        return BlockIndex(merged, len(markdown), (len(markdown) if stop is None else stop) - start)
+
+
+class BlockIndexCache:
+    """Block indexes per ``(instruction_id, version)``, evicted least-recently-used past ``max_entries``."""
+
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int], BlockIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, instruction_id: str, version: int) -> BlockIndex | None:
+        with self._lock:
+            index = self._entries.get((instruction_id, version))
+            if index is not None:
+                self._entries.move_to_end((instruction_id, version))
+            return index
+
+    def put(self, instruction_id: str, version: int, index: BlockIndex) -> None:
+        with self._lock:
+            self._entries[(instruction_id, version)] = index
+            self._entries.move_to_end((instruction_id, version))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+__all__ = ["BLOCK_MARKER", "BlockIndex", "BlockIndexCache", "BlockSpan"]
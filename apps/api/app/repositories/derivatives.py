@@ -0,0 +1,94 @@
+"""Content-keyed on-disk store of downscaled image renditions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import re
+import shutil
+import threading
+
+from app.adapters.media import image_dimensions
+
+_CHECKSUM = re.compile(r"[0-9a-f]{64}")
+_STAGING = ".staging"
+
+
+def is_checksum(value: str) -> bool:
+    """Whether ``value`` is a lowercase hex SHA-256, i.e. safe to use as a path component."""
+    return _CHECKSUM.fullmatch(value) is not None
+
+
+@dataclass(frozen=True, slots=True)
+class Derivative:
+    path: Path
+    width: int
+    height: int
+    size_bytes: int
+
+
+class DerivativeStore:
+    """Renditions under ``root``, one directory per source image checksum.
+
+    A rendition is named by its width bound and format
+    (``<root>/ab/<checksum>/320.webp``), so identical images uploaded or
+    extracted many times share one set of files, and changing the
+    configured widths never serves a stale size. Files enter by an atomic
+    rename from ``staging_path``. Known renditions are remembered in memory;
+    others are found on disk and their dimensions read from image headers.
+    Calls block on disk I/O.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root).resolve()
+        self._known: dict[tuple[str, int, str], Derivative] = {}
+        self._lock = threading.Lock()
+        shutil.rmtree(self._root / _STAGING, ignore_errors=True)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _path(self, checksum: str, width: int, format: str) -> Path:
+        if not is_checksum(checksum):
+            raise ValueError("checksum must be a lowercase hex SHA-256")
+        return self._root / checksum[:2] / checksum / f"{width}.{format}"
+
+    def staging_path(self, checksum: str, width: int, format: str) -> Path:
+        """Where to write a rendition before ``put``."""
+        self._path(checksum, width, format)
+        return self._root / _STAGING / f"{checksum}-{width}.{format}"
+
+    def get(self, checksum: str, width: int, format: str) -> Derivative | None:
+        key = (checksum, width, format)
+        with self._lock:
+            derivative = self._known.get(key)
+        if derivative is not None:
+            return derivative
+        path = self._path(checksum, width, format)
+        try:
+            size_bytes = path.stat().st_size
+            dimensions = image_dimensions(path)
+        except OSError:
+            return None
+        if dimensions is None:
+            return None
+        derivative = Derivative(path, dimensions[0], dimensions[1], size_bytes)
+        with self._lock:
+            self._known[key] = derivative
+        return derivative
+
+    def put(self, checksum: str, width: int, format: str, staged: str | Path, size: tuple[int, int]) -> Derivative:
+        """Move the rendition at ``staged`` into the store."""
+        path = self._path(checksum, width, format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size_bytes = Path(staged).stat().st_size
+        os.replace(staged, path)
+        derivative = Derivative(path, size[0], size[1], size_bytes)
+        with self._lock:
+            self._known[(checksum, width, format)] = derivative
+        return derivative
+
+
+__all__ = ["Derivative", "DerivativeStore", "is_checksum"]
@@ -0,0 +1,44 @@
+"""Cache of generated draft fragments per transcript window."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+
+
+class DraftFragmentCache:
+    """Fragment markdown per window key, evicted least-recently-used past ``max_entries``.
+
+    Keys are content hashes of a window's transcript text and prompt
+    settings, so the same window generated again (a retry, or an
+    unchanged stretch of a re-transcribed job) skips the provider.
+    """
+
+    def __init__(self, *, max_entries: int = 4096) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+            return fragment
+
+    def put(self, key: str, fragment: str) -> None:
+        with self._lock:
+            self._entries[key] = fragment
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+__all__ = ["DraftFragmentCache"]
@@ -0,0 +1,224 @@
+"""Content-keyed on-disk cache of extracted video frames."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import threading
+from uuid import uuid4
+
+from app.adapters.media import image_dimensions
+
+_STAGING = ".staging"
+
+
+def frame_key(video_sha256: str, timestamp_ms: int, strategy: str, format: str) -> str:
+    """Cache key of one frame: the video's content hash, effective timestamp, strategy and format."""
+    return hashlib.sha256(f"{video_sha256}|{timestamp_ms}|{strategy}|{format}".encode()).hexdigest()
+
+
+def file_sha256(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        while chunk := stream.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _replace_from(source: Path, dest: Path) -> None:
+    # Hard-link when source and dest share a filesystem, else copy; either
+    # way ``dest`` appears complete or not at all.
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    temp = dest.with_name(f".{dest.name}.{uuid4().hex}")
+    try:
+        try:
+            os.link(source, temp)
+        except OSError:
+            shutil.copyfile(source, temp)
+        os.replace(temp, dest)
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(temp)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedFrame:
+    path: Path
+    width: int
+    height: int
+    checksum_sha256: str
+    size_bytes: int
+
+
+@dataclass(frozen=True, slots=True)
+class FrameCacheStats:
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+    max_bytes: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    path: Path
+    size_bytes: int
+    # Unknown for files found on disk at startup until their first hit.
+    width: int | None = None
+    height: int | None = None
+    checksum_sha256: str | None = None
+
+
+class FrameCache:
+    """Extracted frames under ``root``, evicted least-recently-used past ``max_bytes``.
+
+    Files are named by ``frame_key`` and enter the cache by an atomic rename
+    from ``staging_path``, so a reader never sees a partial frame. Frames
+    are handed out with ``checkout``, which links (or copies) the cached file
+    to a caller-owned path; eviction only unlinks the cache's own name.
+    Files left by an earlier process are adopted at startup in modification
+    order, and hits refresh the modification time, so recency survives
+    restarts. Calls block on disk I/O.
+    """
+
+    def __init__(self, root: str | Path, *, max_bytes: int = 2**30) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self._root = Path(root).resolve()
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self.evictions = 0
+        self._load()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def stats(self) -> FrameCacheStats:
+        with self._lock:
+            return FrameCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self._max_bytes,
+                evictions=self.evictions,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        shutil.rmtree(self._root / _STAGING, ignore_errors=True)
+        found: list[tuple[int, str, Path, int]] = []
+        for shard in self._root.glob("[0-9a-f][0-9a-f]"):
+            for path in shard.iterdir():
+                if path.name.startswith("."):
+                    continue
+                with suppress(OSError):
+                    stat = path.stat()
+                    found.append((stat.st_mtime_ns, path.stem, path, stat.st_size))
+        for _, key, path, size in sorted(found):
+            self._entries[key] = _Entry(path, size)
+            self._bytes += size
+        self._evict()
+
+    def _path(self, key: str, format: str) -> Path:
+        return self._root / key[:2] / f"{key}.{format}"
+
+    def staging_path(self, key: str, format: str) -> Path:
+        """Where to write a frame before ``put``; unique per key, so one writer per key at a time."""
+        return self._root / _STAGING / f"{key}.{format}"
+
+    def checkout(self, key: str, dest: str | Path, *, record: bool = True) -> CachedFrame | None:
+        """Link the cached frame for ``key`` to ``dest``; ``None`` (a miss) if it is not cached.
+
+        ``record=False`` leaves hit/miss counts alone, for the lookup that
+        follows filling a miss.
+        """
+        dest = Path(dest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if record:
+                    self._misses += 1
+                return None
+            path, width, height, checksum = entry.path, entry.width, entry.height, entry.checksum_sha256
+        # Disk work runs unlocked so other lookups are not serialized behind
+        # it; a concurrent eviction surfaces here as an OSError.
+        try:
+            if checksum is None:
+                size = image_dimensions(path)
+                if size is None:
+                    raise OSError("unreadable cached frame")
+                width, height = size
+                checksum = file_sha256(path)
+            _replace_from(path, dest)
+            os.utime(path)
+        except OSError:
+            failed = True
+        else:
+            failed = False
+        with self._lock:
+            current = self._entries.get(key)
+            if failed:
+                # Deleted or corrupted behind our back: forget it and re-extract.
+                if current is entry:
+                    self._drop(key)
+                if record:
+                    self._misses += 1
+                return None
+            if current is entry:
+                entry.width, entry.height, entry.checksum_sha256 = width, height, checksum
+                self._entries.move_to_end(key)
+            if record:
+                self._hits += 1
+        assert width is not None and height is not None
+        return CachedFrame(dest, width, height, checksum, entry.size_bytes)
+
+    def put(self, key: str, format: str, staged: str | Path, width: int, height: int) -> CachedFrame:
+        """Move the frame at ``staged`` into the cache under ``key``."""
+        staged = Path(staged)
+        checksum = file_sha256(staged)
+        size = staged.stat().st_size
+        path = self._path(key, format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged, path)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key).size_bytes
+            self._entries[key] = _Entry(path, size, width, height, checksum)
+            self._bytes += size
+            self._evict()
+        return CachedFrame(path, width, height, checksum, size)
+
+    def _evict(self) -> None:
+        # The newest entry stays even if it alone exceeds the cap.
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size_bytes
+        with suppress(FileNotFoundError):
+            os.remove(entry.path)
+
+
+__all__ = ["CachedFrame", "FrameCache", "FrameCacheStats", "file_sha256", "frame_key"]
@@ -0,0 +1,174 @@
+"""Per-video frame and keyframe timing indexes, persisted next to the video."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from contextlib import suppress
+import os
+from pathlib import Path
+import struct
+import sys
+import threading
+from uuid import uuid4
+
+from app.adapters.media import PRECISE
+
+# Version 3 stores times relative to the container start time.
+_MAGIC = b"HWFIDX3\n"
+# Magic, video size, video mtime (ns), frame count, keyframe count, video SHA-256 (zeros if unknown).
+_HEADER = struct.Struct("<8sqqII32s")
+_NO_CHECKSUM = bytes(32)
+
+
+def index_path(video: Path) -> Path:
+    """Where the index of ``video`` is persisted: beside it, as ``<name>.frames``."""
+    return video.with_name(f"{video.name}.frames")
+
+
+def _ceil_ms(us: int) -> int:
+    # Packets before the container start (negative times) are clamped to it.
+    return max(-(-us // 1000), 0)
+
+
+class VideoFrameIndex:
+    """Sorted presentation times (microseconds) of a video's frames and keyframes.
+
+    Lookups are bisections over two ``array('q')`` columns, so snapping and
+    frame stepping do no media I/O. Millisecond results are rounded the way
+    ffmpeg seeks need them: a frame time is floored, so an output-side
+    ``-ss`` at it keeps that frame; a keyframe time is rounded up, so an
+    input-side seek to it lands on that keyframe rather than the one before.
+    ``checksum`` is the video's SHA-256, kept here so the frame cache can be
+    keyed by content without reading the video again.
+    """
+
+    __slots__ = ("checksum", "frames", "keyframes")
+
+    def __init__(self, frames: array, keyframes: array, checksum: str | None = None) -> None:
+        if not frames or not keyframes:
+            raise ValueError("an index needs at least one frame and one keyframe")
+        self.frames = frames
+        self.keyframes = keyframes
+        self.checksum = checksum
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.frames) + len(self.keyframes)) * 8
+
+    def _frame_position(self, timestamp_ms: int) -> int:
+        # The first frame at or after ``timestamp_ms`` is the one a precise seek yields.
+        return bisect_left(self.frames, timestamp_ms * 1000)
+
+    def _keyframe_us(self, timestamp_ms: int) -> int:
+        position = bisect_right(self.keyframes, timestamp_ms * 1000) - 1
+        return self.keyframes[max(position, 0)]
+
+    def snap_ms(self, timestamp_ms: int, strategy: str) -> int | None:
+        """Timestamp of the frame ``strategy`` extracts at ``timestamp_ms``; ``None`` past the last frame."""
+        if strategy == PRECISE:
+            position = self._frame_position(timestamp_ms)
+            return self.frames[position] // 1000 if position < len(self.frames) else None
+        if timestamp_ms * 1000 > self.frames[-1]:
+            return None
+        return _ceil_ms(self._keyframe_us(timestamp_ms))
+
+    def step_ms(self, timestamp_ms: int, frames: int) -> int:
+        """Timestamp of the frame ``frames`` away (negative steps back) from the one at ``timestamp_ms``, clamped."""
+        position = min(self._frame_position(timestamp_ms), len(self.frames) - 1) + frames
+        return max(self.frames[min(max(position, 0), len(self.frames) - 1)] // 1000, 0)
+
+    def preseek_ms(self, timestamp_ms: int) -> int:
+        """Input seek point for a precise extraction at ``timestamp_ms``: the keyframe at or before it."""
+        return _ceil_ms(self._keyframe_us(timestamp_ms))
+
+    def save(self, path: Path, *, video_size: int, video_mtime_ns: int) -> None:
+        """Write the index atomically, stamped with the video's size and mtime."""
+        frames, keyframes = array("q", self.frames), array("q", self.keyframes)
+        if sys.byteorder == "big":
+            frames.byteswap()
+            keyframes.byteswap()
+        temp = path.with_name(f".{path.name}.{uuid4().hex}")
+        try:
+            with open(temp, "wb") as stream:
+                digest = bytes.fromhex(self.checksum) if self.checksum is not None else _NO_CHECKSUM
+                stream.write(_HEADER.pack(_MAGIC, video_size, video_mtime_ns, len(frames), len(keyframes), digest))
+                frames.tofile(stream)
+                keyframes.tofile(stream)
+            os.replace(temp, path)
+        finally:
+            with suppress(FileNotFoundError):
+                os.remove(temp)
+
+    @classmethod
+    def load(cls, path: Path, *, video_size: int, video_mtime_ns: int) -> VideoFrameIndex | None:
+        """The index stored at ``path``, or ``None`` if missing, corrupt or stamped for another version of the video."""
+        try:
+            with open(path, "rb") as stream:
+                header = stream.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return None
+                magic, size, mtime_ns, frame_count, keyframe_count, digest = _HEADER.unpack(header)
+                if magic != _MAGIC or (size, mtime_ns) != (video_size, video_mtime_ns):
+                    return None
+                frames, keyframes = array("q"), array("q")
+                frames.fromfile(stream, frame_count)
+                keyframes.fromfile(stream, keyframe_count)
+        except (OSError, EOFError):
+            return None
+        if sys.byteorder == "big":
+            frames.byteswap()
+            keyframes.byteswap()
+        if not frames or not keyframes:
+            return None
+        return cls(frames, keyframes, digest.hex() if digest != _NO_CHECKSUM else None)
+
+
+class VideoFrameIndexCache:
+    """Loaded indexes by ``(path, size, mtime_ns)``, evicted least-recently-used past ``max_bytes``.
+
+    Keying on the file's size and mtime means a replaced video never gets
+    its predecessor's index.
+    """
+
+    def __init__(self, *, max_bytes: int = 64 * 2**20) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, int, int], VideoFrameIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def get(self, key: tuple[str, int, int]) -> VideoFrameIndex | None:
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+            return index
+
+    def put(self, key: tuple[str, int, int], index: VideoFrameIndex) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            self._entries[key] = index
+            self._nbytes += index.nbytes
+            while self._nbytes > self._max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+                self.evictions += 1
+
+
+__all__ = ["VideoFrameIndex", "VideoFrameIndexCache", "index_path"]
@@ -0,0 +1,281 @@
+"""Instruction storage with snapshot + delta version history."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from difflib import SequenceMatcher
+import threading
+from typing import Any
+from uuid import uuid4
+
+# A delta is a sorted tuple of non-overlapping ``(start, end, replacement)``
+# edits against the previous version's text.
+Delta = tuple[tuple[int, int, str], ...]
+
+_SCAN_BLOCK = 4096
+# Edited regions smaller than this are stored as one replacement; larger ones
+# are line-diffed so scattered edits do not store everything in between.
+_LINE_DIFF_THRESHOLD = 4096
+
+
+def _common_prefix(a: str, b: str, limit: int) -> int:
+    # Compare whole blocks with C-level slice equality, then bisect the first
+    # mismatching block.
+    start = 0
+    while start < limit:
+        stop = min(start + _SCAN_BLOCK, limit)
+        if a[start:stop] != b[start:stop]:
+            lo, hi = start, stop - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if a[start:mid] == b[start:mid]:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            return lo
+        start = stop
+    return limit
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    matched = 0
+    while matched < limit:
+        step = min(_SCAN_BLOCK, limit - matched)
+        a_end, b_end = len(a) - matched, len(b) - matched
+        if a[a_end - step : a_end] != b[b_end - step : b_end]:
+            lo, hi = 0, step - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if a[a_end - mid : a_end] == b[b_end - mid : b_end]:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            return matched + lo
+        matched += step
+    return limit
+
+
+def compute_delta(old: str, new: str) -> Delta:
+    """Edits that turn ``old`` into ``new``; ``apply_delta(old, delta) == new``."""
+    prefix = _common_prefix(old, new, min(len(old), len(new)))
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    old_mid = old[prefix : len(old) - suffix]
+    new_mid = new[prefix : len(new) - suffix]
+    if not old_mid and not new_mid:
+        return ()
+    if len(old_mid) + len(new_mid) <= _LINE_DIFF_THRESHOLD:
+        return ((prefix, prefix + len(old_mid), new_mid),)
+
+    old_lines = old_mid.splitlines(keepends=True)
+    new_lines = new_mid.splitlines(keepends=True)
+    offsets = [prefix]
+    for line in old_lines:
+        offsets.append(offsets[-1] + len(line))
+    edits: list[tuple[int, int, str]] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_lines, new_lines).get_opcodes():
+        if tag != "equal":
+            edits.append((offsets[i1], offsets[i2], "".join(new_lines[j1:j2])))
+    return tuple(edits)
+
+
+def apply_delta(text: str, delta: Delta) -> str:
+    pieces: list[str] = []
+    cursor = 0
+    for start, end, replacement in delta:
+        pieces.append(text[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(text[cursor:])
+    return "".join(pieces)
+
+
+def delta_size(delta: Delta) -> int:
+    """Characters of replacement text a delta carries."""
+    return sum(len(replacement) for _, _, replacement in delta)
+
+
+@dataclass(frozen=True, slots=True)
+class InstructionVersionRecord:
+    instruction_id: str
+    job_id: str
+    owner_id: str
+    version: int
+    markdown: str
+    updated_at: datetime
+    # Version metadata such as validation results; stored as given.
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+class InstructionVersionConflict(Exception):
+    """Raised when an update's ``base_version`` is not the current version."""
+
+    def __init__(self, base_version: int, current_version: int) -> None:
+        super().__init__(f"base version {base_version} is not current version {current_version}")
+        self.base_version = base_version
+        self.current_version = current_version
+
+
+@dataclass(slots=True)
+class _Version:
+    # Exactly one of ``snapshot``/``delta`` is set.
+    snapshot: str | None
+    delta: Delta | None
+    # Index of the snapshot this version is reconstructed from.
+    base: int
+    updated_at: datetime
+    metadata: dict[str, Any]
+
+
+@dataclass(slots=True)
+class _History:
+    instruction_id: str
+    job_id: str
+    owner_id: str
+    versions: list[_Version]
+    # Hot copy of the latest markdown; never reconstructed.
+    latest: str
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class InstructionStore:
+    """Process-local instruction versions kept as snapshot + delta chains.
+
+    Every ``snapshot_interval``-th version is stored whole and the rest as a
+    delta against their predecessor, so reading any version applies at most
+    ``snapshot_interval - 1`` deltas to a snapshot. A version whose delta
+    would carry more than ``max_delta_ratio`` of the document (a rewrite) is
+    stored as a snapshot instead. The latest version is held whole and read
+    without reconstruction.
+    """
+
+    def __init__(
+        self,
+        *,
+        snapshot_interval: int = 32,
+        max_delta_ratio: float = 0.5,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be positive")
+        self._snapshot_interval = snapshot_interval
+        self._max_delta_ratio = max_delta_ratio
+        self._clock = clock
+        self._histories: dict[str, _History] = {}
+        self._lock = threading.Lock()
+        self.reconstructed_deltas = 0
+
+    def _record(self, history: _History, number: int, markdown: str) -> InstructionVersionRecord:
+        version = history.versions[number - 1]
+        return InstructionVersionRecord(
+            instruction_id=history.instruction_id,
+            job_id=history.job_id,
+            owner_id=history.owner_id,
+            version=number,
+            markdown=markdown,
+            updated_at=version.updated_at,
+            metadata=version.metadata,
+        )
+
+    def create(
+        self,
+        *,
+        job_id: str,
+        owner_id: str,
+        markdown: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> InstructionVersionRecord:
+        history = _History(
+            instruction_id=str(uuid4()),
+            job_id=job_id,
+            owner_id=owner_id,
+            versions=[_Version(markdown, None, 0, self._clock(), dict(metadata or {}))],
+            latest=markdown,
+        )
+        with self._lock:
+            self._histories[history.instruction_id] = history
+        return self._record(history, 1, markdown)
+
+    def get(self, instruction_id: str, version: int | None = None) -> InstructionVersionRecord | None:
+        """Latest version, or the exact ``version``; ``None`` when either is unknown."""
+        history = self._histories.get(instruction_id)
+        if history is None:
+            return None
+        with history.lock:
+            latest = len(history.versions)
+            if version is None or version == latest:
+                return self._record(history, latest, history.latest)
+            if not 1 <= version < latest:
+                return None
+            return self._record(history, version, self._reconstruct(history, version - 1))
+
+    def update(
+        self,
+        instruction_id: str,
+        *,
+        base_version: int,
+        markdown: str,
+        metadata: dict[str, Any] | None = None,
+        delta: Delta | None = None,
+    ) -> InstructionVersionRecord | None:
+        """Append a version on top of ``base_version``; raises ``InstructionVersionConflict`` if stale.
+
+        ``delta`` may carry ``compute_delta(base markdown, markdown)`` when the
+        caller already has it.
+        """
+        history = self._histories.get(instruction_id)
+        if history is None:
+            return None
+        with history.lock:
+            current = len(history.versions)
+            if base_version != current:
+                raise InstructionVersionConflict(base_version, current)
+
+            index = current
+            base = history.versions[-1].base
+            if delta is None:
+                delta = compute_delta(history.latest, markdown)
+            rewrite = delta_size(delta) > self._max_delta_ratio * max(len(markdown), 1)
+            if rewrite or index - base >= self._snapshot_interval:
+                entry = _Version(markdown, None, index, self._clock(), dict(metadata or {}))
+            else:
+                entry = _Version(None, delta, base, self._clock(), dict(metadata or {}))
+            history.versions.append(entry)
+            history.latest = markdown
+            return self._record(history, index + 1, markdown)
+
+    def _reconstruct(self, history: _History, index: int) -> str:
+        target = history.versions[index]
+        text = history.versions[target.base].snapshot
+        assert text is not None
+        for step in range(target.base + 1, index + 1):
+            delta = history.versions[step].delta
+            assert delta is not None
+            text = apply_delta(text, delta)
+        self.reconstructed_deltas += index - target.base
+        return text
+
+    def stored_chars(self, instruction_id: str) -> int:
+        """Characters held for ``instruction_id``'s history, including the hot latest copy."""
+        history = self._histories.get(instruction_id)
+        if history is None:
+            return 0
+        with history.lock:
+            total = 0
+            for version in history.versions:
+                total += len(version.snapshot) if version.snapshot is not None else delta_size(version.delta or ())
+            if history.versions[-1].snapshot is not history.latest:
+                total += len(history.latest)
+            return total
+
+
+__all__ = [
+    "Delta",
+    "InstructionStore",
+    "InstructionVersionConflict",
+    "InstructionVersionRecord",
+    "apply_delta",
+    "compute_delta",
+    "delta_size",
+]
@@ -2,39 +2,62 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right, insort
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from typing import TypeVar
 from uuid import uuid4
 
+from app.repositories.base import JobRecord, JobTransition, ProjectRecord, Repository
 from app.schemas.job import JobStatus
 
 
-@dataclass(slots=True)
-class ProjectRecord:
-    id: str
-    name: str
-    owner_id: str
-    created_at: datetime
+_RecordT = TypeVar("_RecordT", ProjectRecord, JobRecord)
 
 
-@dataclass(slots=True)
-class JobRecord:
-    id: str
-    project_id: str
-    owner_id: str
-    status: JobStatus
-    created_at: datetime
-    updated_at: datetime | None = None
+def _created_order(record: ProjectRecord | JobRecord) -> tuple[datetime, str]:
+    return (record.created_at, record.id)
+
+
+def _page(
+    records: list[_RecordT],
+    after: tuple[datetime, str] | None,
+    limit: int | None,
+) -> list[_RecordT]:
+    start = 0 if after is None else bisect_right(records, after, key=_created_order)
+    stop = None if limit is None else start + limit
+    return records[start:stop]
 
 
 @dataclass(slots=True)
-class InMemoryStore:
-    """Simple, deterministic persistence layer for scaffolding and tests."""
+class InMemoryStore(Repository):
+    """Simple, deterministic persistence layer for scaffolding and tests.
+
+    Secondary indexes keep per-owner projects and per-project jobs sorted by
+    ``(created_at, id)`` so listings cost O(k) for k results instead of a scan
+    over every record. Writes go through the ``create_*`` methods, which keep
+    the indexes in step with the primary dictionaries.
+    """
 
     projects: dict[str, ProjectRecord] = field(default_factory=dict)
     jobs: dict[str, JobRecord] = field(default_factory=dict)
     project_write_count: int = 0
     job_write_count: int = 0
+    _projects_by_owner: dict[str, list[ProjectRecord]] = field(default_factory=dict, init=False, repr=False)
+    _jobs_by_project: dict[str, list[JobRecord]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for project in self.projects.values():
+            self._index_project(project)
+        for job in self.jobs.values():
+            self._index_job(job)
+
+    def _index_project(self, project: ProjectRecord) -> None:
+        # Records are created in clock order, so insort almost always appends.
+        insort(self._projects_by_owner.setdefault(project.owner_id, []), project, key=_created_order)
+
+    def _index_job(self, job: JobRecord) -> None:
+        insort(self._jobs_by_project.setdefault(job.project_id, []), job, key=_created_order)
 
     def create_project(self, owner_id: str, name: str) -> ProjectRecord:
         now = datetime.now(UTC)
@@ -45,16 +68,22 @@ class InMemoryStore:
             created_at=now,
         )
         self.projects[project.id] = project
+        self._index_project(project)
         self.project_write_count += 1
         return project
 
     def get_project(self, project_id: str) -> ProjectRecord | None:
         return self.projects.get(project_id)
 
-    def list_projects_for_owner(self, owner_id: str) -> list[ProjectRecord]:
-        projects = [record for record in self.projects.values() if record.owner_id == owner_id]
-        projects.sort(key=lambda record: record.created_at)
-        return projects
+    def list_projects_for_owner(
+        self,
+        owner_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[ProjectRecord]:
+        """Return owner projects ordered by ``(created_at, id)``, strictly after ``after``."""
+        return _page(self._projects_by_owner.get(owner_id, []), after, limit)
 
     def get_project_for_owner(self, owner_id: str, project_id: str) -> ProjectRecord | None:
         project = self.projects.get(project_id)
@@ -73,5 +102,36 @@ class InMemoryStore:
             updated_at=now,
         )
         self.jobs[job.id] = job
+        self._index_job(job)
+        self.job_write_count += 1
+        return job
+
+    def get_job(self, job_id: str) -> JobRecord | None:
+        return self.jobs.get(job_id)
+
+    def list_jobs_for_project(
+        self,
+        project_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[JobRecord]:
+        """Return project jobs ordered by ``(created_at, id)``, strictly after ``after``."""
+        return _page(self._jobs_by_project.get(project_id, []), after, limit)
+
+    def apply_job_transition(self, transition: JobTransition) -> JobRecord | None:
+        job = self.jobs.get(transition.job_id)
+        if job is None:
+            return None
+        # Updated in place: the listing indexes hold the same record objects.
+        job.status = transition.status
+        job.updated_at = transition.recorded_at
+        job.manifest = transition.manifest
+        job.failure_code = transition.failure_code
+        job.failure_message = transition.failure_message
+        job.failed_stage = transition.failed_stage
+        job.last_event_id = transition.event_id
+        job.last_event_digest = transition.event_digest
+        job.last_event_at = transition.occurred_at
         self.job_write_count += 1
         return job
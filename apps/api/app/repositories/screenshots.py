@@ -0,0 +1,98 @@
+"""Process-local screenshot asset versions per anchor."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import threading
+from uuid import uuid4
+
+from app.schemas.screenshot import ScreenshotAssetKind
+
+
+@dataclass(frozen=True, slots=True)
+class ScreenshotAssetRecord:
+    id: str
+    job_id: str
+    owner_id: str
+    anchor_id: str
+    version: int
+    kind: ScreenshotAssetKind
+    previous_asset_id: str | None
+    image_uri: str
+    mime_type: str
+    width: int
+    height: int
+    created_at: datetime
+    extraction_key: str | None = None
+    checksum_sha256: str | None = None
+    upload_id: str | None = None
+    ops_hash: str | None = None
+    rendered_from_asset_id: str | None = None
+    is_deleted: bool = False
+
+
+class ScreenshotAssetStore:
+    """Immutable asset versions; each new asset for an anchor supersedes the previous one."""
+
+    def __init__(self, *, clock: Callable[[], datetime] = lambda: datetime.now(UTC)) -> None:
+        self._clock = clock
+        self._assets: dict[str, ScreenshotAssetRecord] = {}
+        self._latest: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def create(
+        self,
+        *,
+        job_id: str,
+        owner_id: str,
+        anchor_id: str,
+        kind: ScreenshotAssetKind,
+        image_uri: str,
+        mime_type: str,
+        width: int,
+        height: int,
+        extraction_key: str | None = None,
+        checksum_sha256: str | None = None,
+        upload_id: str | None = None,
+        ops_hash: str | None = None,
+        rendered_from_asset_id: str | None = None,
+    ) -> ScreenshotAssetRecord:
+        with self._lock:
+            previous = self._assets.get(self._latest.get(anchor_id, ""))
+            record = ScreenshotAssetRecord(
+                id=str(uuid4()),
+                job_id=job_id,
+                owner_id=owner_id,
+                anchor_id=anchor_id,
+                version=previous.version + 1 if previous is not None else 1,
+                kind=kind,
+                previous_asset_id=previous.id if previous is not None else None,
+                image_uri=image_uri,
+                mime_type=mime_type,
+                width=width,
+                height=height,
+                created_at=self._clock(),
+                extraction_key=extraction_key,
+                checksum_sha256=checksum_sha256,
+                upload_id=upload_id,
+                ops_hash=ops_hash,
+                rendered_from_asset_id=rendered_from_asset_id,
+            )
+            self._assets[record.id] = record
+            self._latest[anchor_id] = record.id
+        return record
+
+    def get(self, asset_id: str) -> ScreenshotAssetRecord | None:
+        return self._assets.get(asset_id)
+
+    def latest(self, anchor_id: str) -> ScreenshotAssetRecord | None:
+        asset_id = self._latest.get(anchor_id)
+        return self._assets.get(asset_id) if asset_id is not None else None
+
+
+__all__ = ["ScreenshotAssetRecord", "ScreenshotAssetStore"]
@@ -0,0 +1,319 @@
+"""Relational repository backend (SQLite locally, portable SQL for PostgreSQL)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+import json
+import queue
+import sqlite3
+import threading
+from uuid import uuid4
+
+from app.repositories.base import JobRecord, JobTransition, ProjectRecord, Repository
+from app.schemas.job import JobStatus
+
+# Statements are module constants so each pooled connection's statement cache
+# reuses the prepared form. Only the ``?`` placeholder style is SQLite-specific.
+SCHEMA_STATEMENTS: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS projects (
+        id VARCHAR(36) PRIMARY KEY,
+        owner_id VARCHAR(255) NOT NULL,
+        name TEXT NOT NULL,
+        created_at VARCHAR(32) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id VARCHAR(36) PRIMARY KEY,
+        project_id VARCHAR(36) NOT NULL REFERENCES projects (id),
+        owner_id VARCHAR(255) NOT NULL,
+        status VARCHAR(32) NOT NULL,
+        created_at VARCHAR(32) NOT NULL,
+        updated_at VARCHAR(32),
+        manifest TEXT NOT NULL DEFAULT '{}',
+        failure_code VARCHAR(255),
+        failure_message TEXT,
+        failed_stage VARCHAR(64),
+        last_event_id VARCHAR(255),
+        last_event_digest VARCHAR(64),
+        last_event_at VARCHAR(32)
+    )
+    """,
+    # SAS 8.3: jobs(project_id, created_at); id breaks created_at ties for keyset paging.
+    "CREATE INDEX IF NOT EXISTS jobs_project_created_idx ON jobs (project_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS projects_owner_created_idx ON projects (owner_id, created_at, id)",
+)
+
+# Stored in ``PRAGMA user_version``. Databases created before versioning read
+# as 0 and carry the original ``jobs`` columns only.
+SCHEMA_VERSION = 2
+# Columns added to ``jobs`` at version 2; ``CREATE TABLE IF NOT EXISTS`` does
+# not add them to an existing table, so they are altered in.
+_JOB_COLUMNS_V2: tuple[tuple[str, str], ...] = (
+    ("manifest", "TEXT NOT NULL DEFAULT '{}'"),
+    ("failure_code", "VARCHAR(255)"),
+    ("failure_message", "TEXT"),
+    ("failed_stage", "VARCHAR(64)"),
+    ("last_event_id", "VARCHAR(255)"),
+    ("last_event_digest", "VARCHAR(64)"),
+    ("last_event_at", "VARCHAR(32)"),
+)
+
+_INSERT_PROJECT = "INSERT INTO projects (id, owner_id, name, created_at) VALUES (?, ?, ?, ?)"
+_SELECT_PROJECT = "SELECT id, name, owner_id, created_at FROM projects WHERE id = ?"
+_SELECT_OWNER_PROJECT = "SELECT id, name, owner_id, created_at FROM projects WHERE id = ? AND owner_id = ?"
+# Each listing has an unbounded form and a ``LIMIT ?`` form.
+_LIST_ALL_OWNER_PROJECTS = (
+    "SELECT id, name, owner_id, created_at FROM projects "
+    "WHERE owner_id = ? AND (created_at, id) > (?, ?) "
+    "ORDER BY created_at, id"
+)
+_LIST_OWNER_PROJECTS = f"{_LIST_ALL_OWNER_PROJECTS} LIMIT ?"
+_INSERT_JOB = (
+    "INSERT INTO jobs (id, project_id, owner_id, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_JOB_COLUMNS = (
+    "id, project_id, owner_id, status, created_at, updated_at, manifest, "
+    "failure_code, failure_message, failed_stage, last_event_id, last_event_digest, last_event_at"
+)
+_SELECT_JOB = f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?"
+_LIST_ALL_PROJECT_JOBS = (
+    f"SELECT {_JOB_COLUMNS} FROM jobs "
+    "WHERE project_id = ? AND (created_at, id) > (?, ?) "
+    "ORDER BY created_at, id"
+)
+_LIST_PROJECT_JOBS = f"{_LIST_ALL_PROJECT_JOBS} LIMIT ?"
+_UPDATE_JOB_TRANSITION = (
+    "UPDATE jobs SET status = ?, updated_at = ?, manifest = ?, failure_code = ?, failure_message = ?, "
+    "failed_stage = ?, last_event_id = ?, last_event_digest = ?, last_event_at = ? WHERE id = ?"
+)
+
+# Sorts before every stored timestamp/id, so "after nothing" shares the keyset statement.
+_KEYSET_START = ("", "")
+
+
+def format_timestamp(value: datetime) -> str:
+    """Fixed-width UTC ISO-8601 text so lexical order matches time order."""
+    return value.astimezone(UTC).isoformat(timespec="microseconds")
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _project_from_row(row: tuple) -> ProjectRecord:
+    return ProjectRecord(id=row[0], name=row[1], owner_id=row[2], created_at=datetime.fromisoformat(row[3]))
+
+
+def _job_from_row(row: tuple) -> JobRecord:
+    return JobRecord(
+        id=row[0],
+        project_id=row[1],
+        owner_id=row[2],
+        status=JobStatus(row[3]),
+        created_at=datetime.fromisoformat(row[4]),
+        updated_at=_parse_timestamp(row[5]),
+        manifest=json.loads(row[6]),
+        failure_code=row[7],
+        failure_message=row[8],
+        failed_stage=row[9],
+        last_event_id=row[10],
+        last_event_digest=row[11],
+        last_event_at=_parse_timestamp(row[12]),
+    )
+
+
+def _migrate(connection: sqlite3.Connection) -> None:
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version < 2:
+        existing = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+        for name, declaration in _JOB_COLUMNS_V2:
+            if name not in existing:
+                connection.execute(f"ALTER TABLE jobs ADD COLUMN {name} {declaration}")
+    if version < SCHEMA_VERSION:
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _keyset(after: tuple[datetime, str] | None, limit: int | None) -> tuple[str | int, ...]:
+    position = _KEYSET_START if after is None else (format_timestamp(after[0]), after[1])
+    return position if limit is None else (*position, limit)
+
+
+class SqliteConnectionPool:
+    """Fixed-size pool of WAL-mode SQLite connections shareable across threads."""
+
+    def __init__(self, path: str, *, size: int = 4, busy_timeout_ms: int = 5_000) -> None:
+        if size < 1:
+            raise ValueError("size must be positive")
+        self._connections: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=size)
+        self._all: list[sqlite3.Connection] = []
+        for _ in range(size):
+            connection = sqlite3.connect(
+                path,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=256,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+            self._all.append(connection)
+            self._connections.put(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self) -> None:
+        for connection in self._all:
+            connection.close()
+        self._all.clear()
+
+
+class SqlRepository(Repository):
+    """Durable project/job repository with the same surface as ``InMemoryStore``.
+
+    Write counters are process-local and mirror the in-memory store so tests
+    can assert on side effects regardless of backend.
+    """
+
+    blocking = True
+
+    def __init__(self, pool: SqliteConnectionPool) -> None:
+        self._pool = pool
+        self._counter_lock = threading.Lock()
+        self.project_write_count = 0
+        self.job_write_count = 0
+        with pool.transaction() as connection:
+            for statement in SCHEMA_STATEMENTS:
+                connection.execute(statement)
+            _migrate(connection)
+
+    @classmethod
+    def from_path(cls, path: str, *, pool_size: int = 4) -> SqlRepository:
+        return cls(SqliteConnectionPool(path, size=pool_size))
+
+    def create_project(self, owner_id: str, name: str) -> ProjectRecord:
+        project = ProjectRecord(id=str(uuid4()), name=name, owner_id=owner_id, created_at=datetime.now(UTC))
+        with self._pool.transaction() as connection:
+            connection.execute(
+                _INSERT_PROJECT,
+                (project.id, project.owner_id, project.name, format_timestamp(project.created_at)),
+            )
+        with self._counter_lock:
+            self.project_write_count += 1
+        return project
+
+    def get_project(self, project_id: str) -> ProjectRecord | None:
+        with self._pool.connection() as connection:
+            row = connection.execute(_SELECT_PROJECT, (project_id,)).fetchone()
+        return _project_from_row(row) if row is not None else None
+
+    def list_projects_for_owner(
+        self,
+        owner_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[ProjectRecord]:
+        with self._pool.connection() as connection:
+            statement = _LIST_ALL_OWNER_PROJECTS if limit is None else _LIST_OWNER_PROJECTS
+            rows = connection.execute(statement, (owner_id, *_keyset(after, limit))).fetchall()
+        return [_project_from_row(row) for row in rows]
+
+    def get_project_for_owner(self, owner_id: str, project_id: str) -> ProjectRecord | None:
+        with self._pool.connection() as connection:
+            row = connection.execute(_SELECT_OWNER_PROJECT, (project_id, owner_id)).fetchone()
+        return _project_from_row(row) if row is not None else None
+
+    def create_job(self, owner_id: str, project_id: str) -> JobRecord:
+        now = datetime.now(UTC)
+        job = JobRecord(
+            id=str(uuid4()),
+            project_id=project_id,
+            owner_id=owner_id,
+            status=JobStatus.CREATED,
+            created_at=now,
+            updated_at=now,
+        )
+        with self._pool.transaction() as connection:
+            connection.execute(
+                _INSERT_JOB,
+                (
+                    job.id,
+                    job.project_id,
+                    job.owner_id,
+                    job.status.value,
+                    format_timestamp(job.created_at),
+                    format_timestamp(now),
+                ),
+            )
+        with self._counter_lock:
+            self.job_write_count += 1
+        return job
+
+    def get_job(self, job_id: str) -> JobRecord | None:
+        with self._pool.connection() as connection:
+            row = connection.execute(_SELECT_JOB, (job_id,)).fetchone()
+        return _job_from_row(row) if row is not None else None
+
+    def list_jobs_for_project(
+        self,
+        project_id: str,
+        *,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[JobRecord]:
+        with self._pool.connection() as connection:
+            statement = _LIST_ALL_PROJECT_JOBS if limit is None else _LIST_PROJECT_JOBS
+            rows = connection.execute(statement, (project_id, *_keyset(after, limit))).fetchall()
+        return [_job_from_row(row) for row in rows]
+
+    def apply_job_transition(self, transition: JobTransition) -> JobRecord | None:
+        with self._pool.transaction() as connection:
+            cursor = connection.execute(
+                _UPDATE_JOB_TRANSITION,
+                (
+                    transition.status.value,
+                    format_timestamp(transition.recorded_at),
+                    json.dumps(transition.manifest, separators=(",", ":")),
+                    transition.failure_code,
+                    transition.failure_message,
+                    transition.failed_stage,
+                    transition.event_id,
+                    transition.event_digest,
+                    format_timestamp(transition.occurred_at),
+                    transition.job_id,
+                ),
+            )
+            if cursor.rowcount == 0:
+                return None
+            row = connection.execute(_SELECT_JOB, (transition.job_id,)).fetchone()
+        with self._counter_lock:
+            self.job_write_count += 1
+        return _job_from_row(row)
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+__all__ = ["SCHEMA_STATEMENTS", "SCHEMA_VERSION", "SqlRepository", "SqliteConnectionPool", "format_timestamp"]
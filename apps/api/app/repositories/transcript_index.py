@@ -0,0 +1,218 @@
+"""Per-job inverted indexes over transcript segment text."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+import heapq
+import math
+import re
+import threading
+
+from app.repositories.transcripts import CompactTranscript
+
+_TOKEN = re.compile(r"\w+")
+_PHRASE = re.compile(r'"([^"]*)"')
+
+# A posting is ``segment << _POSITION_BITS | position``, so one sorted array
+# per token holds segment ids and token positions for phrase matching.
+_POSITION_BITS = 16
+_MAX_POSITION = (1 << _POSITION_BITS) - 1
+
+# Rough per-token cost of the dict slots, key string and array headers.
+_TOKEN_OVERHEAD_BYTES = 160
+
+# BM25 parameters.
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Case-folded word tokens; the same rules apply to segments and queries."""
+    return _TOKEN.findall(text.casefold())
+
+
+def parse_query(query: str) -> tuple[list[str], list[list[str]]]:
+    """Split ``query`` into bare terms and ``"quoted phrases"`` (each a token list)."""
+    phrases: list[list[str]] = []
+    terms: list[str] = []
+    for tokens in (tokenize(match) for match in _PHRASE.findall(query)):
+        if len(tokens) > 1:
+            phrases.append(tokens)
+        else:
+            terms.extend(tokens)
+    terms.extend(tokenize(_PHRASE.sub(" ", query)))
+    return terms, phrases
+
+
+class TranscriptIndex:
+    """Positional inverted index of one transcript, built segment by segment.
+
+    Segment ids are the transcript's segment indexes, so segments must be
+    added in transcript order. Queries match segments containing every term
+    and phrase, ranked by BM25 over the query terms.
+    """
+
+    __slots__ = ("_postings", "_df", "_lengths", "_total_tokens", "_nbytes")
+
+    def __init__(self) -> None:
+        self._postings: dict[str, array] = {}
+        self._df: dict[str, int] = {}
+        self._lengths = array("I")
+        self._total_tokens = 0
+        self._nbytes = 0
+
+    @classmethod
+    def build(cls, transcript: CompactTranscript) -> TranscriptIndex:
+        index = cls()
+        for segment in transcript:
+            index.add(segment.text)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index."""
+        return self._nbytes
+
+    def add(self, text: str) -> int:
+        """Index the next segment's text and return its segment id."""
+        segment = len(self._lengths)
+        tokens = tokenize(text)
+        base = segment << _POSITION_BITS
+        for position, token in enumerate(tokens[: _MAX_POSITION + 1]):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = array("Q")
+                self._df[token] = 0
+                self._nbytes += _TOKEN_OVERHEAD_BYTES + len(token)
+            if not postings or postings[-1] >> _POSITION_BITS != segment:
+                self._df[token] += 1
+            postings.append(base | position)
+        self._nbytes += 8 * min(len(tokens), _MAX_POSITION + 1) + 4
+        self._lengths.append(len(tokens))
+        self._total_tokens += len(tokens)
+        return segment
+
+    def _contains(self, postings: array, segment: int, position: int) -> bool:
+        key = segment << _POSITION_BITS | position
+        at = bisect_left(postings, key)
+        return at < len(postings) and postings[at] == key
+
+    def _has_phrase(self, tokens: list[str], segment: int) -> bool:
+        first = self._postings[tokens[0]]
+        base = segment << _POSITION_BITS
+        for at in range(bisect_left(first, base), bisect_left(first, base + _MAX_POSITION + 1)):
+            position = first[at] & _MAX_POSITION
+            if all(
+                self._contains(self._postings[token], segment, position + offset)
+                for offset, token in enumerate(tokens[1:], 1)
+            ):
+                return True
+        return False
+
+    def _matches(self, tokens: list[str]) -> list[tuple[int, list[int]]]:
+        """Segments containing every token, with per-token frequencies in ``tokens`` order.
+
+        Walks the first (rarest) token's postings and probes the others by
+        bisect; segment ids only grow, so each probe starts where the last
+        one stopped.
+        """
+        first, *others = (self._postings[token] for token in tokens)
+        lows = [0] * len(others)
+        matches: list[tuple[int, list[int]]] = []
+        at = 0
+        while at < len(first):
+            segment = first[at] >> _POSITION_BITS
+            base, ceiling = segment << _POSITION_BITS, (segment + 1) << _POSITION_BITS
+            stop = bisect_left(first, ceiling, at)
+            frequencies = [stop - at]
+            for slot, postings in enumerate(others):
+                start = bisect_left(postings, base, lows[slot])
+                end = bisect_left(postings, ceiling, start)
+                lows[slot] = end
+                if start == end:
+                    break
+                frequencies.append(end - start)
+            else:
+                matches.append((segment, frequencies))
+            at = stop
+        return matches
+
+    def search(self, query: str, limit: int) -> list[tuple[int, float]]:
+        """Top ``limit`` ``(segment_id, score)`` pairs, best first; ties keep transcript order."""
+        terms, phrases = parse_query(query)
+        required = set(terms).union(*phrases)
+        if not required or limit < 1 or any(token not in self._postings for token in required):
+            return []
+
+        tokens = sorted(required, key=self._df.__getitem__)
+        matches = self._matches(tokens)
+        if phrases:
+            matches = [m for m in matches if all(self._has_phrase(phrase, m[0]) for phrase in phrases)]
+
+        count = len(self._lengths)
+        average_length = self._total_tokens / count
+        weights = [math.log(1 + (count - self._df[token] + 0.5) / (self._df[token] + 0.5)) for token in tokens]
+        scored: list[tuple[float, int]] = []
+        for segment, frequencies in matches:
+            norm = _K1 * (1 - _B + _B * self._lengths[segment] / average_length)
+            score = sum(w * f * (_K1 + 1) / (f + norm) for w, f in zip(weights, frequencies))
+            scored.append((score, -segment))
+        return [(-negated, round(score, 6)) for score, negated in heapq.nlargest(limit, scored)]
+
+
+class TranscriptIndexCache:
+    """Per-job indexes, evicted least-recently-used past ``max_bytes``.
+
+    An entry is tied to the transcript object it was built from, so a job
+    whose transcript is replaced gets a fresh index rather than a stale one.
+    The most recently stored index is kept even if it alone exceeds the cap.
+    """
+
+    def __init__(self, *, max_bytes: int = 256 * 2**20) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[CompactTranscript, TranscriptIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def get(self, job_id: str, transcript: CompactTranscript) -> TranscriptIndex | None:
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None:
+                return None
+            if entry[0] is not transcript:
+                self._drop(job_id)
+                return None
+            self._entries.move_to_end(job_id)
+            return entry[1]
+
+    def put(self, job_id: str, transcript: CompactTranscript, index: TranscriptIndex) -> None:
+        with self._lock:
+            if job_id in self._entries:
+                self._drop(job_id)
+            self._entries[job_id] = (transcript, index)
+            self._nbytes += index.nbytes
+            while self._nbytes > self._max_bytes and len(self._entries) > 1:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, job_id: str) -> None:
+        _, index = self._entries.pop(job_id)
+        self._nbytes -= index.nbytes
+
+
+__all__ = ["TranscriptIndex", "TranscriptIndexCache", "parse_query", "tokenize"]
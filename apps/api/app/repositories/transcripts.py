@@ -0,0 +1,179 @@
+"""Compact per-job transcript segment storage."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+import threading
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentRecord:
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+class CompactTranscript:
+    """Immutable transcript held as parallel typed arrays plus one UTF-8 buffer.
+
+    ``starts``/``ends`` are 32-bit millisecond arrays sorted by start time and
+    segment ``i``'s text is ``text[offsets[i]:offsets[i + 1]]``, so a 10k
+    segment transcript is a handful of flat buffers instead of 10k objects.
+    Segments are materialized only for the slice being read.
+    """
+
+    __slots__ = ("_starts", "_ends", "_offsets", "_text")
+
+    def __init__(self, starts: array, ends: array, offsets: array, text: bytes | bytearray) -> None:
+        if not (len(starts) == len(ends) == len(offsets) - 1):
+            raise ValueError("starts, ends and offsets must describe the same segments")
+        self._starts = starts
+        self._ends = ends
+        self._offsets = offsets
+        self._text = text
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[tuple[int, int, str]]) -> CompactTranscript:
+        builder = TranscriptBuilder()
+        for start_ms, end_ms, text in segments:
+            builder.append(start_ms, end_ms, text)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the segment buffers (excluding fixed object overhead)."""
+        return (
+            self._starts.buffer_info()[1] * self._starts.itemsize
+            + self._ends.buffer_info()[1] * self._ends.itemsize
+            + self._offsets.buffer_info()[1] * self._offsets.itemsize
+            + len(self._text)
+        )
+
+    def start_ms(self, index: int) -> int:
+        return self._starts[index]
+
+    def segment(self, index: int) -> SegmentRecord:
+        start, stop = self._offsets[index], self._offsets[index + 1]
+        return SegmentRecord(
+            start_ms=self._starts[index],
+            end_ms=self._ends[index],
+            text=self._text[start:stop].decode(),
+        )
+
+    def segments(self, start: int = 0, stop: int | None = None) -> list[SegmentRecord]:
+        stop = len(self) if stop is None else min(stop, len(self))
+        return [self.segment(index) for index in range(max(start, 0), stop)]
+
+    def __iter__(self) -> Iterator[SegmentRecord]:
+        for index in range(len(self)):
+            yield self.segment(index)
+
+    def index_at(self, timestamp_ms: int) -> int | None:
+        """Index of the segment covering ``timestamp_ms`` (``start <= t < end``), if any."""
+        index = bisect_right(self._starts, timestamp_ms) - 1
+        if index < 0 or timestamp_ms >= self._ends[index]:
+            return None
+        return index
+
+    def segment_at(self, timestamp_ms: int) -> SegmentRecord | None:
+        index = self.index_at(timestamp_ms)
+        return self.segment(index) if index is not None else None
+
+    def first_index_from(self, timestamp_ms: int) -> int:
+        """Index of the first segment starting at or after ``timestamp_ms``."""
+        return bisect_left(self._starts, timestamp_ms)
+
+    def resume_index(self, start_ms: int, index: int) -> int:
+        """Index following the cursor position ``(start_ms, index)``.
+
+        The index is trusted when it still points at a segment with that start
+        time; otherwise (e.g. the transcript was replaced) paging resumes after
+        every segment starting at or before ``start_ms``.
+        """
+        if 0 <= index < len(self) and self._starts[index] == start_ms:
+            return index + 1
+        return bisect_right(self._starts, start_ms)
+
+
+class TranscriptBuilder:
+    """Accumulates segments into the flat buffers of a ``CompactTranscript``.
+
+    Segments may arrive in any order; they are sorted by start time (stably)
+    when the transcript is built. ``build`` hands the buffers over without
+    copying and leaves the builder empty.
+    """
+
+    __slots__ = ("_starts", "_ends", "_offsets", "_text", "_sorted")
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._starts = array("i")
+        self._ends = array("i")
+        self._offsets = array("I", [0])
+        self._text = bytearray()
+        self._sorted = True
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def append(self, start_ms: int, end_ms: int, text: str) -> None:
+        if start_ms < 0 or end_ms < start_ms:
+            raise ValueError("segment must satisfy 0 <= start_ms <= end_ms")
+        if self._starts and start_ms < self._starts[-1]:
+            self._sorted = False
+        self._starts.append(start_ms)
+        self._ends.append(end_ms)
+        self._text += text.encode()
+        self._offsets.append(len(self._text))
+
+    def extend(self, segments: Iterable[tuple[int, int, str]]) -> None:
+        for start_ms, end_ms, text in segments:
+            self.append(start_ms, end_ms, text)
+
+    def build(self) -> CompactTranscript:
+        starts, ends, offsets, text = self._starts, self._ends, self._offsets, self._text
+        in_order = self._sorted
+        self._reset()
+        if in_order:
+            return CompactTranscript(starts, ends, offsets, text)
+
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        builder = TranscriptBuilder()
+        for index in order:
+            builder.append(starts[index], ends[index], text[offsets[index] : offsets[index + 1]].decode())
+        return builder.build()
+
+
+class TranscriptStore:
+    """Process-local map of job id to its current transcript and the artifact it came from."""
+
+    def __init__(self) -> None:
+        self._transcripts: dict[str, tuple[CompactTranscript, str | None]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, job_id: str, transcript: CompactTranscript, *, source_uri: str | None = None) -> None:
+        with self._lock:
+            self._transcripts[job_id] = (transcript, source_uri)
+
+    def get(self, job_id: str) -> CompactTranscript | None:
+        entry = self._transcripts.get(job_id)
+        return entry[0] if entry is not None else None
+
+    def source_uri(self, job_id: str) -> str | None:
+        entry = self._transcripts.get(job_id)
+        return entry[1] if entry is not None else None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._transcripts.pop(job_id, None)
+
+
+__all__ = ["CompactTranscript", "SegmentRecord", "TranscriptBuilder", "TranscriptStore"]
@@ -1,7 +1,25 @@
 """Route modules."""
 
+from .derivatives import router as derivatives_router
+from .instructions import router as instructions_router
 from .internal import router as internal_router
+from .job_events import router as job_events_router
 from .jobs import router as jobs_router
 from .projects import router as projects_router
+from .screenshot_tasks import router as screenshot_tasks_router
+from .screenshots import router as screenshots_router
+from .tasks import router as tasks_router
+from .transcripts import router as transcripts_router
 
-__all__ = ["internal_router", "jobs_router", "projects_router"]
+__all__ = [
+    "derivatives_router",
+    "instructions_router",
+    "internal_router",
+    "job_events_router",
+    "jobs_router",
+    "projects_router",
+    "screenshot_tasks_router",
+    "screenshots_router",
+    "tasks_router",
+    "transcripts_router",
+]
@@ -7,18 +7,21 @@ from typing import Annotated
 from fastapi import Depends, Request, Security
 from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 
-from app.adapters.auth import (
-    AuthVerificationError,
-    FirebaseTokenVerifier,
-    MockTokenVerifier,
-    TokenVerifier,
-)
+from app.adapters.auth import AsyncTokenVerifier, AuthVerificationError
 from app.core.config import Settings, get_settings
+from app.core.container import AppContainer, ensure_container
+from app.core.events import JobEventBroker
 from app.errors import ApiError
-from app.repositories.memory import InMemoryStore
+from app.repositories.base import Repository
 from app.schemas.auth import AuthPrincipal
+from app.services.callbacks import StatusCallbackService
+from app.services.derivatives import DerivativeService
+from app.services.instructions import InstructionService
 from app.services.jobs import JobService
 from app.services.projects import ProjectService
+from app.services.regenerate import RegenerateService
+from app.services.screenshots import ScreenshotService
+from app.services.transcripts import TranscriptService
 
 bearer_scheme = HTTPBearer(auto_error=False, scheme_name="bearerAuth")
 callback_secret_scheme = APIKeyHeader(
@@ -32,27 +35,31 @@ def _auth_error(message: str) -> ApiError:
     return ApiError(status_code=401, code="UNAUTHORIZED", message=message)
 
 
-def get_token_verifier(settings: Annotated[Settings, Depends(get_settings)]) -> TokenVerifier:
+async def get_container(request: Request) -> AppContainer:
+    """Return the app-scoped container, building it on first use if startup did not run.
+
+    Resolvers that only read the container are ``async`` so FastAPI runs them
+    inline instead of dispatching each one to the threadpool.
+    """
+    return ensure_container(request.app)
+
+
+async def get_token_verifier(container: Annotated[AppContainer, Depends(get_container)]) -> AsyncTokenVerifier:
     """Resolve provider adapter from configuration."""
-    if settings.auth_provider == "firebase":
-        return FirebaseTokenVerifier(
-            project_id=settings.firebase_project_id,
-            audience=settings.firebase_audience,
-        )
-    return MockTokenVerifier()
+    return container.async_token_verifier
 
 
 async def get_authenticated_principal(
     request: Request,
     credentials: Annotated[HTTPAuthorizationCredentials | None, Security(bearer_scheme)],
-    verifier: Annotated[TokenVerifier, Depends(get_token_verifier)],
+    verifier: Annotated[AsyncTokenVerifier, Depends(get_token_verifier)],
 ) -> AuthPrincipal:
     """Validate bearer token and attach normalized principal to request context."""
     if credentials is None or credentials.scheme.lower() != "bearer" or not credentials.credentials:
         raise _auth_error("Invalid or missing bearer token")
 
     try:
-        principal = verifier.verify_token(credentials.credentials)
+        principal = await verifier.verify_token(credentials.credentials)
     except AuthVerificationError as exc:
         raise _auth_error(str(exc) or "Invalid bearer token") from exc
 
@@ -69,13 +76,41 @@ async def require_callback_secret(
         raise _auth_error("Invalid callback authentication")
 
 
-def get_store(request: Request) -> InMemoryStore:
-    return request.app.state.store
+async def get_store(container: Annotated[AppContainer, Depends(get_container)]) -> Repository:
+    return container.store
+
+
+async def get_project_service(container: Annotated[AppContainer, Depends(get_container)]) -> ProjectService:
+    return container.project_service
+
+
+async def get_job_service(container: Annotated[AppContainer, Depends(get_container)]) -> JobService:
+    return container.job_service
+
+
+async def get_callback_service(container: Annotated[AppContainer, Depends(get_container)]) -> StatusCallbackService:
+    return container.callback_service
+
+
+async def get_job_events(container: Annotated[AppContainer, Depends(get_container)]) -> JobEventBroker:
+    return container.events
+
+
+async def get_transcript_service(container: Annotated[AppContainer, Depends(get_container)]) -> TranscriptService:
+    return container.transcript_service
+
+
+async def get_instruction_service(container: Annotated[AppContainer, Depends(get_container)]) -> InstructionService:
+    return container.instruction_service
+
+
+async def get_regenerate_service(container: Annotated[AppContainer, Depends(get_container)]) -> RegenerateService:
+    return container.regenerate_service
 
 
-def get_project_service(store: Annotated[InMemoryStore, Depends(get_store)]) -> ProjectService:
-    return ProjectService(store)
+async def get_screenshot_service(container: Annotated[AppContainer, Depends(get_container)]) -> ScreenshotService:
+    return container.screenshot_service
 
 
-def get_job_service(store: Annotated[InMemoryStore, Depends(get_store)]) -> JobService:
-    return JobService(store)
+async def get_derivative_service(container: Annotated[AppContainer, Depends(get_container)]) -> DerivativeService:
+    return container.derivative_service
@@ -0,0 +1,32 @@
+"""Signed screenshot derivative downloads."""
+
+import time
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import FileResponse
+
+from app.routes.dependencies import get_derivative_service
+from app.schemas.error import NoLeakNotFoundError
+from app.services.derivatives import DerivativeService
+
+router = APIRouter(prefix="/derivatives", tags=["Screenshots"])
+
+
+@router.get(
+    "/{checksum}/{name}",
+    response_class=FileResponse,
+    responses={200: {"content": {"image/webp": {}, "image/jpeg": {}}}, 404: {"model": NoLeakNotFoundError}},
+)
+async def get_derivative(
+    checksum: Annotated[str, Path()],
+    name: Annotated[str, Path()],
+    expires: Annotated[int, Query()],
+    signature: Annotated[str, Query()],
+    service: Annotated[DerivativeService, Depends(get_derivative_service)],
+) -> FileResponse:
+    """Serve a rendition named by a signed URL from ``ScreenshotAsset.derivatives``; no bearer token needed."""
+    path, media_type = await service.open(checksum=checksum, name=name, expires=expires, signature=signature)
+    # Content never changes for a given checksum; cache only as long as the signature is valid.
+    max_age = max(0, expires - int(time.time()))
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": f"private, max-age={max_age}, immutable"})
@@ -0,0 +1,79 @@
+"""Instruction routes."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path, Query, status
+from fastapi.responses import JSONResponse
+
+from app.routes.dependencies import get_authenticated_principal, get_instruction_service, get_regenerate_service
+from app.schemas.auth import AuthPrincipal
+from app.schemas.error import ActiveTaskConflictError, ErrorResponse, NoLeakNotFoundError, VersionConflictError
+from app.schemas.instruction import Instruction, RegenerateRequest, RegenerateTask, UpdateInstructionRequest
+from app.services.instructions import InstructionService
+from app.services.regenerate import RegenerateService
+
+router = APIRouter(prefix="/instructions", tags=["Instructions"])
+
+
+@router.get(
+    "/{instructionId}",
+    response_model=Instruction,
+    responses={401: {"model": ErrorResponse}, 404: {"model": NoLeakNotFoundError}},
+)
+async def get_instruction(
+    instruction_id: Annotated[str, Path(alias="instructionId")],
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[InstructionService, Depends(get_instruction_service)],
+    version: Annotated[int | None, Query(ge=1)] = None,
+) -> Instruction:
+    """Latest version when ``version`` is omitted, otherwise that exact version."""
+    return await service.get_instruction(owner_id=principal.user_id, instruction_id=instruction_id, version=version)
+
+
+@router.put(
+    "/{instructionId}",
+    response_model=Instruction,
+    responses={
+        401: {"model": ErrorResponse},
+        404: {"model": NoLeakNotFoundError},
+        409: {"model": VersionConflictError},
+    },
+)
+async def update_instruction(
+    instruction_id: Annotated[str, Path(alias="instructionId")],
+    request: UpdateInstructionRequest,
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[InstructionService, Depends(get_instruction_service)],
+) -> Instruction:
+    """Create the next version; a stale ``base_version`` is a VERSION_CONFLICT with no mutation."""
+    return await service.update_instruction(
+        owner_id=principal.user_id,
+        instruction_id=instruction_id,
+        base_version=request.base_version,
+        markdown=request.markdown,
+    )
+
+
+@router.post(
+    "/{instructionId}/regenerate",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=RegenerateTask,
+    responses={
+        200: {"model": RegenerateTask},
+        400: {"model": ErrorResponse},
+        401: {"model": ErrorResponse},
+        404: {"model": NoLeakNotFoundError},
+        409: {"model": VersionConflictError | ActiveTaskConflictError},
+    },
+)
+async def regenerate_instruction(
+    instruction_id: Annotated[str, Path(alias="instructionId")],
+    request: RegenerateRequest,
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[RegenerateService, Depends(get_regenerate_service)],
+) -> RegenerateTask | JSONResponse:
+    """Queue regeneration of the selection; a repeated ``client_request_id`` returns the existing task (200)."""
+    task, replayed = await service.submit(owner_id=principal.user_id, instruction_id=instruction_id, request=request)
+    if replayed:
+        return JSONResponse(status_code=status.HTTP_200_OK, content=task.model_dump(mode="json", exclude_none=True))
+    return task
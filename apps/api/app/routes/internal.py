@@ -2,29 +2,56 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Path, Response, status
+from fastapi.responses import JSONResponse
 
-from app.routes.dependencies import require_callback_secret
-from app.schemas.error import ErrorResponse
-from app.schemas.internal import StatusCallbackRequest, StatusCallbackReplayResponse
+from app.routes.dependencies import get_callback_service, require_callback_secret
+from app.schemas.error import ErrorResponse, NoLeakNotFoundError
+from app.schemas.internal import (
+    StatusCallbackBatchRequest,
+    StatusCallbackBatchResponse,
+    StatusCallbackReplayResponse,
+    StatusCallbackRequest,
+)
+from app.services.callbacks import StatusCallbackService
 
 router = APIRouter(prefix="/internal", tags=["Internal"])
 
 
+@router.post(
+    "/jobs/status-batch",
+    response_model=StatusCallbackBatchResponse,
+    responses={401: {"model": ErrorResponse}},
+)
+async def post_job_status_callback_batch(
+    batch: StatusCallbackBatchRequest,
+    _: Annotated[None, Depends(require_callback_secret)],
+    service: Annotated[StatusCallbackService, Depends(get_callback_service)],
+) -> StatusCallbackBatchResponse:
+    """Apply many callbacks under one authentication; per-event outcomes mirror the single endpoint."""
+    return StatusCallbackBatchResponse(results=await service.ingest_batch(batch.events))
+
+
 @router.post(
     "/jobs/{jobId}/status",
     status_code=status.HTTP_204_NO_CONTENT,
     responses={
         200: {"model": StatusCallbackReplayResponse},
         401: {"model": ErrorResponse},
-        404: {"model": ErrorResponse},
+        404: {"model": NoLeakNotFoundError},
         409: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
         204: {"description": "Status updated"},
     },
 )
 async def post_job_status_callback(
-    _: StatusCallbackRequest,
-    __: Annotated[None, Depends(require_callback_secret)],
+    job_id: Annotated[str, Path(alias="jobId")],
+    callback: StatusCallbackRequest,
+    _: Annotated[None, Depends(require_callback_secret)],
+    service: Annotated[StatusCallbackService, Depends(get_callback_service)],
 ) -> Response:
     # Story 1.1 keeps this path on callback-secret auth, not bearer auth.
+    replay = await service.ingest(job_id, callback)
+    if replay is not None:
+        return JSONResponse(status_code=status.HTTP_200_OK, content=replay.model_dump(mode="json", exclude_none=True))
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,80 @@
+"""Job event stream routes."""
+
+from collections.abc import AsyncIterator
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Path
+from fastapi.responses import StreamingResponse
+
+from app.core.config import Settings, get_settings
+from app.core.events import JOB_STATUS_EVENT, JobEventBroker, JobEventSubscription, encode_sse
+from app.routes.dependencies import get_authenticated_principal, get_job_events, get_job_service
+from app.schemas.auth import AuthPrincipal
+from app.schemas.error import ErrorResponse, NoLeakNotFoundError
+from app.schemas.job import Job
+from app.services.jobs import JobService
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+# Client reconnect delay advertised to EventSource, in milliseconds.
+_RETRY_MS = 3000
+
+
+def _parse_last_event_id(value: str | None) -> int | None:
+    if value is None or not value.strip().isdigit():
+        return None
+    return int(value)
+
+
+def _snapshot_frame(job: Job) -> bytes:
+    # No ``id`` field: the snapshot must not move the client's Last-Event-ID.
+    data = {
+        "job_id": job.id,
+        "status": job.status.value,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        "snapshot": True,
+    }
+    return encode_sse(JOB_STATUS_EVENT, data)
+
+
+async def _stream(subscription: JobEventSubscription, snapshot: bytes, heartbeat_seconds: float) -> AsyncIterator[bytes]:
+    try:
+        yield f"retry: {_RETRY_MS}\n\n".encode()
+        yield snapshot
+        async for frame in subscription.frames(heartbeat_seconds):
+            yield frame
+    finally:
+        subscription.close()
+
+
+@router.get(
+    "/{jobId}/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Server-sent event stream", "content": {"text/event-stream": {}}},
+        401: {"model": ErrorResponse},
+        404: {"model": NoLeakNotFoundError},
+    },
+)
+async def stream_job_events(
+    job_id: Annotated[str, Path(alias="jobId")],
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[JobService, Depends(get_job_service)],
+    events: Annotated[JobEventBroker, Depends(get_job_events)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    last_event_id: Annotated[str | None, Header(alias="Last-Event-ID")] = None,
+) -> StreamingResponse:
+    """Stream status changes for an owned job; ``Last-Event-ID`` replays what a reconnecting client missed."""
+    # Subscribe before reading the snapshot so no transition falls between the two.
+    subscription = events.subscribe(job_id, last_event_id=_parse_last_event_id(last_event_id))
+    try:
+        job = await service.get_job(owner_id=principal.user_id, job_id=job_id)
+    except BaseException:
+        subscription.close()
+        raise
+
+    return StreamingResponse(
+        _stream(subscription, _snapshot_frame(job), settings.job_events_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
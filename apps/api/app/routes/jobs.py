@@ -2,13 +2,14 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Depends, Path, Query, status
 
 from app.routes.dependencies import get_authenticated_principal, get_job_service
 from app.schemas.auth import AuthPrincipal
-from app.schemas.error import ErrorResponse
-from app.schemas.job import Job
+from app.schemas.error import ErrorResponse, NoLeakNotFoundError
+from app.schemas.job import Job, JobPage
 from app.services.jobs import JobService
+from app.services.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 
 router = APIRouter(prefix="/projects", tags=["Jobs"])
 
@@ -24,4 +25,19 @@ async def create_job(
     principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
     service: Annotated[JobService, Depends(get_job_service)],
 ) -> Job:
-    return service.create_job(owner_id=principal.user_id, project_id=project_id)
+    return await service.create_job(owner_id=principal.user_id, project_id=project_id)
+
+
+@router.get(
+    "/{projectId}/jobs",
+    response_model=JobPage,
+    responses={401: {"model": ErrorResponse}, 404: {"model": NoLeakNotFoundError}},
+)
+async def list_jobs(
+    project_id: Annotated[str, Path(alias="projectId")],
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[JobService, Depends(get_job_service)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    cursor: Annotated[str | None, Query()] = None,
+) -> JobPage:
+    return await service.list_jobs(owner_id=principal.user_id, project_id=project_id, limit=limit, cursor=cursor)
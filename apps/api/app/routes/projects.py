@@ -2,12 +2,13 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Depends, Path, Query, status
 
 from app.routes.dependencies import get_authenticated_principal, get_project_service
 from app.schemas.auth import AuthPrincipal
 from app.schemas.error import ErrorResponse, NoLeakNotFoundError
-from app.schemas.project import CreateProjectRequest, Project
+from app.schemas.project import CreateProjectRequest, Project, ProjectPage
+from app.services.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 from app.services.projects import ProjectService
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
@@ -24,19 +25,21 @@ async def create_project(
     principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
     service: Annotated[ProjectService, Depends(get_project_service)],
 ) -> Project:
-    return service.create_project(owner_id=principal.user_id, name=payload.name)
+    return await service.create_project(owner_id=principal.user_id, name=payload.name)
 
 
 @router.get(
     "",
-    response_model=list[Project],
+    response_model=ProjectPage,
     responses={401: {"model": ErrorResponse}},
 )
 async def list_projects(
     principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
     service: Annotated[ProjectService, Depends(get_project_service)],
-) -> list[Project]:
-    return service.list_projects(owner_id=principal.user_id)
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    cursor: Annotated[str | None, Query()] = None,
+) -> ProjectPage:
+    return await service.list_projects(owner_id=principal.user_id, limit=limit, cursor=cursor)
 
 
 @router.get(
@@ -49,4 +52,4 @@ async def get_project(
     principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
     service: Annotated[ProjectService, Depends(get_project_service)],
 ) -> Project:
-    return service.get_project(owner_id=principal.user_id, project_id=project_id)
+    return await service.get_project(owner_id=principal.user_id, project_id=project_id)
@@ -0,0 +1,27 @@
+"""Screenshot task routes."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path
+
+from app.routes.dependencies import get_authenticated_principal, get_screenshot_service
+from app.schemas.auth import AuthPrincipal
+from app.schemas.error import ErrorResponse, NoLeakNotFoundError
+from app.schemas.screenshot import ScreenshotTask
+from app.services.screenshots import ScreenshotService
+
+router = APIRouter(prefix="/screenshot-tasks", tags=["Screenshots"])
+
+
+@router.get(
+    "/{taskId}",
+    response_model=ScreenshotTask,
+    responses={401: {"model": ErrorResponse}, 404: {"model": NoLeakNotFoundError}},
+)
+async def get_screenshot_task(
+    task_id: Annotated[str, Path(alias="taskId")],
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[ScreenshotService, Depends(get_screenshot_service)],
+) -> ScreenshotTask:
+    """Poll an extraction task; SUCCEEDED carries the new ``asset_id``."""
+    return await service.get_task(owner_id=principal.user_id, task_id=task_id)
@@ -0,0 +1,38 @@
+"""Screenshot extraction routes."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path, status
+from fastapi.responses import JSONResponse
+
+from app.routes.dependencies import get_authenticated_principal, get_screenshot_service
+from app.schemas.auth import AuthPrincipal
+from app.schemas.error import ErrorResponse, NoLeakNotFoundError
+from app.schemas.screenshot import ScreenshotExtractionRequest, ScreenshotTask
+from app.services.screenshots import ScreenshotService
+
+router = APIRouter(prefix="/jobs", tags=["Screenshots"])
+
+
+@router.post(
+    "/{jobId}/screenshots/extract",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ScreenshotTask,
+    responses={
+        200: {"model": ScreenshotTask},
+        400: {"model": ErrorResponse},
+        401: {"model": ErrorResponse},
+        404: {"model": NoLeakNotFoundError},
+    },
+)
+async def extract_screenshot(
+    job_id: Annotated[str, Path(alias="jobId")],
+    request: ScreenshotExtractionRequest,
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[ScreenshotService, Depends(get_screenshot_service)],
+) -> ScreenshotTask | JSONResponse:
+    """Queue extraction of one frame; a repeated idempotency or extraction key returns the existing task (200)."""
+    task, replayed = await service.extract(owner_id=principal.user_id, job_id=job_id, request=request)
+    if replayed:
+        return JSONResponse(status_code=status.HTTP_200_OK, content=task.model_dump(mode="json", exclude_none=True))
+    return task
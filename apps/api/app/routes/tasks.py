@@ -0,0 +1,27 @@
+"""Regenerate task routes."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path
+
+from app.routes.dependencies import get_authenticated_principal, get_regenerate_service
+from app.schemas.auth import AuthPrincipal
+from app.schemas.error import ErrorResponse, NoLeakNotFoundError
+from app.schemas.instruction import RegenerateTask
+from app.services.regenerate import RegenerateService
+
+router = APIRouter(prefix="/tasks", tags=["Instructions"])
+
+
+@router.get(
+    "/{taskId}",
+    response_model=RegenerateTask,
+    responses={401: {"model": ErrorResponse}, 404: {"model": NoLeakNotFoundError}},
+)
+async def get_task(
+    task_id: Annotated[str, Path(alias="taskId")],
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[RegenerateService, Depends(get_regenerate_service)],
+) -> RegenerateTask:
+    """Poll a regenerate task; SUCCEEDED carries the new ``instruction_version``."""
+    return await service.get_task(owner_id=principal.user_id, task_id=task_id)
@@ -0,0 +1,51 @@
+"""Transcript routes."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path, Query
+
+from app.routes.dependencies import get_authenticated_principal, get_transcript_service
+from app.schemas.auth import AuthPrincipal
+from app.schemas.error import ErrorResponse, NoLeakNotFoundError
+from app.schemas.transcript import TranscriptPage, TranscriptSearchResponse
+from app.services.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.services.transcripts import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    MAX_SEARCH_QUERY_LENGTH,
+    TranscriptService,
+)
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get(
+    "/{jobId}/transcript",
+    response_model=TranscriptPage,
+    responses={401: {"model": ErrorResponse}, 404: {"model": NoLeakNotFoundError}, 409: {"model": ErrorResponse}},
+)
+async def get_transcript(
+    job_id: Annotated[str, Path(alias="jobId")],
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[TranscriptService, Depends(get_transcript_service)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    cursor: Annotated[str | None, Query()] = None,
+) -> TranscriptPage:
+    """Page through an owned job's transcript segments in ``start_ms`` order."""
+    return await service.get_transcript(owner_id=principal.user_id, job_id=job_id, limit=limit, cursor=cursor)
+
+
+@router.get(
+    "/{jobId}/transcript/search",
+    response_model=TranscriptSearchResponse,
+    responses={401: {"model": ErrorResponse}, 404: {"model": NoLeakNotFoundError}, 409: {"model": ErrorResponse}},
+)
+async def search_transcript(
+    job_id: Annotated[str, Path(alias="jobId")],
+    principal: Annotated[AuthPrincipal, Depends(get_authenticated_principal)],
+    service: Annotated[TranscriptService, Depends(get_transcript_service)],
+    q: Annotated[str, Query(min_length=1, max_length=MAX_SEARCH_QUERY_LENGTH)],
+    limit: Annotated[int, Query(ge=1, le=MAX_SEARCH_LIMIT)] = DEFAULT_SEARCH_LIMIT,
+) -> TranscriptSearchResponse:
+    """Rank segments containing every term and ``"quoted phrase"`` of ``q``; hits carry ``start_ms``."""
+    return await service.search_transcript(owner_id=principal.user_id, job_id=job_id, query=q, limit=limit)
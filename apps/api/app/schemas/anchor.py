@@ -0,0 +1,36 @@
+"""Screenshot anchor API schemas."""
+
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class CharRange(BaseModel):
+    start_offset: int = Field(ge=0)
+    end_offset: int = Field(ge=0)
+
+
+class AddressType(str, Enum):
+    BLOCK_ID = "block_id"
+    CHAR_RANGE = "char_range"
+
+
+class AnchorAddress(BaseModel):
+    address_type: AddressType
+    block_id: str | None = None
+    char_range: CharRange | None = None
+    strategy: str | None = None
+
+
+class ResolutionState(str, Enum):
+    RETAIN = "retain"
+    REMAP = "remap"
+    UNRESOLVED = "unresolved"
+
+
+class AnchorResolution(BaseModel):
+    source_instruction_version_id: str
+    target_instruction_version_id: str
+    resolution_state: ResolutionState
+    trace: dict[str, Any] | None = None
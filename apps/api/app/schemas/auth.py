@@ -1,5 +1,7 @@
 """Authentication schemas."""
 
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -8,3 +10,4 @@ class AuthPrincipal(BaseModel):
 
     user_id: str = Field(min_length=1)
     role: str = Field(default="editor", min_length=1)
+    expires_at: datetime | None = None
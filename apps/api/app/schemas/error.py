@@ -15,3 +15,24 @@ class ErrorResponse(BaseModel):
 class NoLeakNotFoundError(BaseModel):
     code: Literal["RESOURCE_NOT_FOUND"]
     message: str
+
+
+class VersionConflictDetails(BaseModel):
+    base_version: int
+    current_version: int
+
+
+class VersionConflictError(BaseModel):
+    code: Literal["VERSION_CONFLICT"]
+    message: str
+    details: VersionConflictDetails
+
+
+class ActiveTaskConflictDetails(BaseModel):
+    active_task_id: str
+
+
+class ActiveTaskConflictError(BaseModel):
+    code: Literal["REGENERATE_IN_PROGRESS"]
+    message: str
+    details: ActiveTaskConflictDetails
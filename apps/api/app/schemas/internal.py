@@ -1,16 +1,25 @@
 """Internal callback schemas."""
 
 from datetime import datetime
+from typing import Any, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from app.schemas.error import ErrorResponse
 from app.schemas.job import JobStatus
 
+MAX_CALLBACK_BATCH_EVENTS = 500
+
 
 class StatusCallbackRequest(BaseModel):
     event_id: str
     status: JobStatus
     occurred_at: datetime
+    actor_type: Literal["orchestrator", "system"] | None = None
+    artifact_updates: dict[str, Any] | None = None
+    failure_code: str | None = None
+    failure_message: str | None = None
+    failed_stage: str | None = None
     correlation_id: str
 
 
@@ -20,3 +29,26 @@ class StatusCallbackReplayResponse(BaseModel):
     replayed: bool
     current_status: JobStatus | None = None
     latest_applied_occurred_at: datetime | None = None
+
+
+class StatusCallbackBatchEvent(StatusCallbackRequest):
+    job_id: str
+
+
+class StatusCallbackBatchRequest(BaseModel):
+    events: list[StatusCallbackBatchEvent] = Field(min_length=1, max_length=MAX_CALLBACK_BATCH_EVENTS)
+
+
+class StatusCallbackBatchResult(BaseModel):
+    job_id: str
+    event_id: str
+    outcome: Literal["applied", "replayed", "rejected"]
+    # Status the single-event endpoint returns for the same callback.
+    status_code: int
+    current_status: JobStatus | None = None
+    latest_applied_occurred_at: datetime | None = None
+    error: ErrorResponse | None = None
+
+
+class StatusCallbackBatchResponse(BaseModel):
+    results: list[StatusCallbackBatchResult]
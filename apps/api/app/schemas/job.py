@@ -39,3 +39,9 @@ class Job(BaseModel):
     manifest: ArtifactManifest | None = None
     created_at: datetime
     updated_at: datetime | None = None
+
+
+class JobPage(BaseModel):
+    items: list[Job]
+    limit: int
+    next_cursor: str | None = None
@@ -13,3 +13,9 @@ class Project(BaseModel):
     id: str
     name: str
     created_at: datetime
+
+
+class ProjectPage(BaseModel):
+    items: list[Project]
+    limit: int
+    next_cursor: str | None = None
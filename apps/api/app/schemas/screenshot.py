@@ -0,0 +1,95 @@
+"""Screenshot extraction API schemas."""
+
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from app.schemas.anchor import CharRange
+
+
+class ScreenshotStrategy(str, Enum):
+    NEAREST_KEYFRAME = "nearest_keyframe"
+    PRECISE = "precise"
+
+
+class ScreenshotFormat(str, Enum):
+    PNG = "png"
+    JPG = "jpg"
+    WEBP = "webp"
+
+
+class ScreenshotExtractionRequest(BaseModel):
+    instruction_id: str = Field(min_length=1)
+    instruction_version_id: str = Field(min_length=1)
+    anchor_id: str | None = None
+    block_id: str | None = None
+    char_range: CharRange | None = None
+    timestamp_ms: int = Field(ge=0)
+    offset_ms: int = 0
+    strategy: ScreenshotStrategy = ScreenshotStrategy.PRECISE
+    format: ScreenshotFormat = ScreenshotFormat.PNG
+    idempotency_key: str | None = Field(default=None, min_length=1)
+
+
+class ScreenshotTaskOperation(str, Enum):
+    EXTRACT = "extract"
+    REPLACE = "replace"
+
+
+class ScreenshotTaskStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class ScreenshotTask(BaseModel):
+    task_id: str
+    operation: ScreenshotTaskOperation
+    status: ScreenshotTaskStatus
+    progress_pct: int | None = Field(default=None, ge=0, le=100)
+    anchor_id: str | None = None
+    asset_id: str | None = None
+    # Offset-adjusted timestamp the frame was taken at.
+    extracted_at_ms: int | None = None
+    failure_code: str | None = None
+    failure_message: str | None = None
+    replayed: bool = False
+
+
+class ScreenshotAssetKind(str, Enum):
+    EXTRACTED = "EXTRACTED"
+    UPLOADED = "UPLOADED"
+    ANNOTATED = "ANNOTATED"
+
+
+class ScreenshotDerivative(BaseModel):
+    variant: str
+    format: ScreenshotFormat
+    mime_type: str
+    width: int
+    height: int
+    url: str
+    expires_at: datetime
+
+
+class ScreenshotAsset(BaseModel):
+    id: str
+    anchor_id: str
+    version: int = Field(ge=1)
+    kind: ScreenshotAssetKind
+    previous_asset_id: str | None = None
+    image_uri: str
+    mime_type: str
+    width: int
+    height: int
+    extraction_key: str | None = None
+    checksum_sha256: str | None = None
+    upload_id: str | None = None
+    ops_hash: str | None = None
+    rendered_from_asset_id: str | None = None
+    is_deleted: bool = False
+    created_at: datetime
+    # Renditions generated so far; empty until background generation finishes.
+    derivatives: list[ScreenshotDerivative] = Field(default_factory=list)
@@ -0,0 +1,27 @@
+"""Transcript API schemas."""
+
+from pydantic import BaseModel
+
+
+class TranscriptSegment(BaseModel):
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+class TranscriptPage(BaseModel):
+    items: list[TranscriptSegment]
+    limit: int
+    next_cursor: str | None = None
+
+
+class TranscriptSearchHit(BaseModel):
+    start_ms: int
+    end_ms: int
+    text: str
+    score: float
+
+
+class TranscriptSearchResponse(BaseModel):
+    items: list[TranscriptSearchHit]
+    limit: int
@@ -0,0 +1,144 @@
+"""Anchor resolution across instruction versions."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from app.repositories.block_index import BlockIndex, BlockSpan
+from app.schemas.anchor import AddressType, AnchorAddress, AnchorResolution, ResolutionState
+
+_UNMAPPED = -1
+
+
+class AnchorResolver:
+    """Classify anchors of one instruction from a source version onto a target version.
+
+    The two versions' block indexes are diffed once on construction: each
+    source block is matched to the target block with the same ``block_id``,
+    or failing that to the only unclaimed target block with the same content
+    hash (a block whose marker was regenerated). Each anchor is then
+    resolved against that mapping without touching the markdown.
+
+    ``block_id`` anchors are retained while their block exists and remapped
+    to the hash-matched block otherwise. ``char_range`` anchors follow their
+    blocks when every block they cover is unchanged and still adjacent, and
+    are retained only if the range did not move.
+    """
+
+    def __init__(
+        self,
+        source: BlockIndex,
+        target: BlockIndex,
+        *,
+        source_version_id: str,
+        target_version_id: str,
+    ) -> None:
+        self._source = source
+        self._target = target
+        self._source_version_id = source_version_id
+        self._target_version_id = target_version_id
+        self._source_blocks = list(source)
+        self._target_blocks = list(target)
+        self._mapping, self._methods = self._diff()
+
+    def _diff(self) -> tuple[list[int], list[str | None]]:
+        mapping = [_UNMAPPED] * len(self._source_blocks)
+        methods: list[str | None] = [None] * len(self._source_blocks)
+        claimed: set[int] = set()
+        for position, block in enumerate(self._source_blocks):
+            target = self._target.position(block.block_id)
+            if target is not None:
+                mapping[position], methods[position] = target, "block_id"
+                claimed.add(target)
+
+        by_hash: dict[str, list[int]] = {}
+        for position, block in enumerate(self._target_blocks):
+            if position not in claimed:
+                by_hash.setdefault(block.content_hash, []).append(position)
+        for position, block in enumerate(self._source_blocks):
+            if mapping[position] != _UNMAPPED:
+                continue
+            candidates = by_hash.get(block.content_hash, ())
+            if len(candidates) == 1:
+                mapping[position], methods[position] = candidates[0], "content_hash"
+        return mapping, methods
+
+    def _result(self, state: ResolutionState, trace: dict[str, Any]) -> AnchorResolution:
+        return AnchorResolution(
+            source_instruction_version_id=self._source_version_id,
+            target_instruction_version_id=self._target_version_id,
+            resolution_state=state,
+            trace=trace,
+        )
+
+    def _resolve_block(self, block_id: str) -> AnchorResolution:
+        trace: dict[str, Any] = {"address_type": AddressType.BLOCK_ID.value, "source_block_id": block_id}
+        target_position = self._target.position(block_id)
+        source_position = self._source.position(block_id)
+        if target_position is not None:
+            target_block = self._target_blocks[target_position]
+            trace.update(method="block_id", target_block_id=block_id)
+            if source_position is not None:
+                trace["content_changed"] = self._source_blocks[source_position].content_hash != target_block.content_hash
+            return self._result(ResolutionState.RETAIN, trace)
+        if source_position is not None and self._mapping[source_position] != _UNMAPPED:
+            target_block = self._target_blocks[self._mapping[source_position]]
+            trace.update(method="content_hash", target_block_id=target_block.block_id)
+            return self._result(ResolutionState.REMAP, trace)
+        trace["reason"] = "block_removed" if source_position is not None else "block_not_in_source"
+        return self._result(ResolutionState.UNRESOLVED, trace)
+
+    def _resolve_range(self, start: int, end: int) -> AnchorResolution:
+        trace: dict[str, Any] = {
+            "address_type": AddressType.CHAR_RANGE.value,
+            "source_char_range": {"start_offset": start, "end_offset": end},
+        }
+        if not 0 <= start < end <= self._source.length:
+            trace["reason"] = "range_out_of_bounds"
+            return self._result(ResolutionState.UNRESOLVED, trace)
+        positions = self._source.positions_overlapping(start, end)
+        if not positions or start < self._source_blocks[positions[0]].start:
+            # Text outside every block (the preamble) has no stable identity.
+            trace["reason"] = "outside_blocks"
+            return self._result(ResolutionState.UNRESOLVED, trace)
+
+        covered: list[tuple[BlockSpan, BlockSpan]] = []
+        first_target = self._mapping[positions[0]]
+        for step, position in enumerate(positions):
+            target_position = self._mapping[position]
+            source_block = self._source_blocks[position]
+            if target_position == _UNMAPPED or target_position != first_target + step:
+                trace.update(reason="block_moved_or_removed", source_block_id=source_block.block_id)
+                return self._result(ResolutionState.UNRESOLVED, trace)
+            target_block = self._target_blocks[target_position]
+            if (
+                target_block.content_hash != source_block.content_hash
+                or target_block.end - target_block.start != source_block.end - source_block.start
+            ):
+                trace.update(reason="content_changed", source_block_id=source_block.block_id)
+                return self._result(ResolutionState.UNRESOLVED, trace)
+            covered.append((source_block, target_block))
+
+        shift = covered[0][1].start - covered[0][0].start
+        trace.update(
+            method="content_hash",
+            source_block_ids=[source_block.block_id for source_block, _ in covered],
+            target_block_ids=[target_block.block_id for _, target_block in covered],
+            offset_shift=shift,
+            target_char_range={"start_offset": start + shift, "end_offset": end + shift},
+        )
+        return self._result(ResolutionState.RETAIN if shift == 0 else ResolutionState.REMAP, trace)
+
+    def resolve(self, address: AnchorAddress) -> AnchorResolution:
+        if address.address_type is AddressType.BLOCK_ID and address.block_id is not None:
+            return self._resolve_block(address.block_id)
+        if address.address_type is AddressType.CHAR_RANGE and address.char_range is not None:
+            return self._resolve_range(address.char_range.start_offset, address.char_range.end_offset)
+        return self._result(
+            ResolutionState.UNRESOLVED,
+            {"address_type": address.address_type.value, "reason": "address_incomplete"},
+        )
+
+    def resolve_all(self, addresses: Iterable[AnchorAddress]) -> list[AnchorResolution]:
+        return [self.resolve(address) for address in addresses]
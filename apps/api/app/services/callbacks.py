@@ -0,0 +1,391 @@
+"""Workflow status callback ingestion."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+import hashlib
+import json
+import threading
+from typing import Any
+
+from app.core.events import JOB_STATUS_EVENT, JobEventBroker
+from app.core.executor import BlockingExecutor
+from app.domain.job_fsm import allowed_next_statuses, can_transition, is_terminal
+from app.errors import ApiError
+from app.repositories.base import JobRecord, JobTransition, Repository
+from app.schemas.internal import (
+    StatusCallbackBatchEvent,
+    StatusCallbackBatchResult,
+    StatusCallbackReplayResponse,
+    StatusCallbackRequest,
+)
+from app.schemas.job import JobStatus
+from app.services.transcript_ingest import TranscriptIngestor
+from app.services.video_index import VideoIndexService
+
+# Per-job critical sections are serialized through a fixed set of locks so
+# memory does not grow with the number of jobs.
+_LOCK_STRIPES = 64
+
+# Only contract payload fields are digested, so a batch event (which also
+# carries ``job_id``) digests exactly like the same single-event callback.
+_DIGEST_FIELDS = frozenset(StatusCallbackRequest.model_fields)
+
+# Raw upload artifacts are immutable once recorded (openapi: merge-safe manifest updates).
+_IMMUTABLE_MANIFEST_KEYS = frozenset({"video_uri"})
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def payload_digest(callback: StatusCallbackRequest) -> str:
+    """Compact digest of the callback payload; replays are compared by digest only."""
+    payload = callback.model_dump(mode="json", include=_DIGEST_FIELDS)
+    payload["occurred_at"] = _as_utc(callback.occurred_at).isoformat()
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def merge_manifest(current: dict[str, Any], updates: dict[str, Any] | None) -> dict[str, Any]:
+    """Keyed merge of ``artifact_updates``; never drops keys or rewrites immutable ones."""
+    if not updates:
+        return current
+
+    merged = dict(current)
+    for key, value in updates.items():
+        if value is None or (key in _IMMUTABLE_MANIFEST_KEYS and key in merged):
+            continue
+        if key == "export_uri":
+            exports = list(merged.get("exports") or ())
+            if value not in exports:
+                exports.append(value)
+            merged["exports"] = exports
+            continue
+        merged[key] = value
+    return merged
+
+
+def _not_found() -> ApiError:
+    return ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
+
+
+def _payload_mismatch(event_id: str) -> ApiError:
+    return ApiError(
+        status_code=409,
+        code="EVENT_ID_PAYLOAD_MISMATCH",
+        message="event_id replay payload differs from first accepted payload.",
+        details={"event_id": event_id},
+    )
+
+
+def _transition_error(code: str, message: str, current: JobStatus, attempted: JobStatus) -> ApiError:
+    return ApiError(
+        status_code=409,
+        code=code,
+        message=message,
+        details={
+            "current_status": current.value,
+            "attempted_status": attempted.value,
+            "allowed_next_statuses": [status.value for status in allowed_next_statuses(current)],
+        },
+    )
+
+
+def _out_of_order(latest_applied: datetime, current: JobStatus, attempted: JobStatus) -> ApiError:
+    return ApiError(
+        status_code=409,
+        code="CALLBACK_OUT_OF_ORDER",
+        message="Callback occurred_at is earlier than the latest applied callback.",
+        details={
+            "latest_applied_occurred_at": latest_applied.isoformat(),
+            "current_status": current.value,
+            "attempted_status": attempted.value,
+        },
+    )
+
+
+class StatusCallbackEngine:
+    """Applies workflow callbacks to jobs with FSM, idempotency and ordering checks.
+
+    Each job keeps an insertion-ordered ``event_id -> payload digest`` ledger so
+    replay-vs-mismatch is a dict lookup. Ledgers hold at most
+    ``max_events_per_job`` entries and shrink to ``terminal_retained_events``
+    once a job is terminal; at most ``max_jobs`` ledgers are kept, least
+    recently used first out. A job without a ledger (first seen, evicted or
+    after a restart) is seeded with its persisted last event, which covers
+    the usual retry of the most recent callback; older ids fall through to
+    the ordering check. Applied transitions are published to ``events`` while the
+    job's lock is held, so subscribers see them in apply order.
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        *,
+        max_events_per_job: int = 64,
+        terminal_retained_events: int = 8,
+        max_jobs: int = 10_000,
+        events: JobEventBroker | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        if max_events_per_job < 1 or terminal_retained_events < 1 or max_jobs < 1:
+            raise ValueError("ledger sizes must be positive")
+        self._repository = repository
+        self._max_events = max_events_per_job
+        self._terminal_events = min(terminal_retained_events, max_events_per_job)
+        self._events = events
+        self._clock = clock
+        self._max_jobs = max_jobs
+        # Guards the LRU order of ``_ledgers``; each ledger is only touched under its job's stripe lock.
+        self._ledgers: OrderedDict[str, OrderedDict[str, str]] = OrderedDict()
+        self._ledgers_lock = threading.Lock()
+        self._locks = tuple(threading.Lock() for _ in range(_LOCK_STRIPES))
+        self._counter_lock = threading.Lock()
+        self.applied = 0
+        self.replayed = 0
+        self.rejected = 0
+
+    def ledger_size(self, job_id: str) -> int:
+        return len(self._ledgers.get(job_id, ()))
+
+    def _ledger_for(self, job: JobRecord) -> OrderedDict[str, str]:
+        with self._ledgers_lock:
+            ledger = self._ledgers.get(job.id)
+            if ledger is not None:
+                self._ledgers.move_to_end(job.id)
+                return ledger
+            ledger = OrderedDict()
+            if job.last_event_id is not None and job.last_event_digest is not None:
+                ledger[job.last_event_id] = job.last_event_digest
+            self._ledgers[job.id] = ledger
+            while len(self._ledgers) > self._max_jobs:
+                self._ledgers.popitem(last=False)
+        return ledger
+
+    def _remember(self, ledger: OrderedDict[str, str], event_id: str, digest: str, *, terminal: bool) -> None:
+        ledger[event_id] = digest
+        keep = self._terminal_events if terminal else self._max_events
+        while len(ledger) > keep:
+            ledger.popitem(last=False)
+
+    def ingest(self, job_id: str, callback: StatusCallbackRequest) -> StatusCallbackReplayResponse | None:
+        """Apply ``callback``; returns replay metadata for an identical replay, ``None`` when applied."""
+        digest = payload_digest(callback)
+        with self._locks[hash(job_id) % _LOCK_STRIPES]:
+            try:
+                replay = self._ingest_locked(job_id, callback, digest)
+            except ApiError:
+                with self._counter_lock:
+                    self.rejected += 1
+                raise
+
+        with self._counter_lock:
+            if replay is None:
+                self.applied += 1
+            else:
+                self.replayed += 1
+        return replay
+
+    def ingest_batch(self, events: Sequence[StatusCallbackBatchEvent]) -> list[StatusCallbackBatchResult]:
+        """Apply events with single-event semantics, one result per event in request order.
+
+        Events are grouped by job and each group runs in order under a single
+        acquisition of that job's lock, so no other callback interleaves with
+        it. A rejected event does not undo or block the job's other events.
+        """
+        by_job: dict[str, list[int]] = {}
+        for index, event in enumerate(events):
+            by_job.setdefault(event.job_id, []).append(index)
+
+        results: list[StatusCallbackBatchResult | None] = [None] * len(events)
+        applied = replayed = rejected = 0
+        for job_id, indexes in by_job.items():
+            with self._locks[hash(job_id) % _LOCK_STRIPES]:
+                for index in indexes:
+                    event = events[index]
+                    try:
+                        replay = self._ingest_locked(job_id, event, payload_digest(event))
+                    except ApiError as exc:
+                        rejected += 1
+                        results[index] = StatusCallbackBatchResult(
+                            job_id=job_id,
+                            event_id=event.event_id,
+                            outcome="rejected",
+                            status_code=exc.status_code,
+                            error=exc.payload,
+                        )
+                        continue
+                    if replay is None:
+                        applied += 1
+                        results[index] = StatusCallbackBatchResult(
+                            job_id=job_id, event_id=event.event_id, outcome="applied", status_code=204
+                        )
+                    else:
+                        replayed += 1
+                        results[index] = StatusCallbackBatchResult(
+                            job_id=job_id,
+                            event_id=event.event_id,
+                            outcome="replayed",
+                            status_code=200,
+                            current_status=replay.current_status,
+                            latest_applied_occurred_at=replay.latest_applied_occurred_at,
+                        )
+
+        with self._counter_lock:
+            self.applied += applied
+            self.replayed += replayed
+            self.rejected += rejected
+        return [result for result in results if result is not None]
+
+    def _ingest_locked(
+        self,
+        job_id: str,
+        callback: StatusCallbackRequest,
+        digest: str,
+    ) -> StatusCallbackReplayResponse | None:
+        job = self._repository.get_job(job_id)
+        if job is None:
+            raise _not_found()
+
+        ledger = self._ledger_for(job)
+        seen_digest = ledger.get(callback.event_id)
+        if seen_digest is not None:
+            if seen_digest != digest:
+                raise _payload_mismatch(callback.event_id)
+            return StatusCallbackReplayResponse(
+                job_id=job.id,
+                event_id=callback.event_id,
+                replayed=True,
+                current_status=job.status,
+                latest_applied_occurred_at=job.last_event_at,
+            )
+
+        target = callback.status
+        if is_terminal(job.status):
+            raise _transition_error("FSM_TERMINAL_IMMUTABLE", "Job is in a terminal state", job.status, target)
+
+        occurred_at = _as_utc(callback.occurred_at)
+        if job.last_event_at is not None and occurred_at < job.last_event_at:
+            raise _out_of_order(job.last_event_at, job.status, target)
+
+        if not can_transition(job.status, target):
+            raise _transition_error("FSM_TRANSITION_INVALID", "Job status transition is not allowed", job.status, target)
+
+        previous = job.status
+        failed = target is JobStatus.FAILED
+        transition = JobTransition(
+            job_id=job.id,
+            status=target,
+            manifest=merge_manifest(job.manifest, callback.artifact_updates),
+            failure_code=callback.failure_code if failed else job.failure_code,
+            failure_message=callback.failure_message if failed else job.failure_message,
+            failed_stage=callback.failed_stage if failed else job.failed_stage,
+            event_id=callback.event_id,
+            event_digest=digest,
+            occurred_at=occurred_at,
+            recorded_at=self._clock(),
+        )
+        if self._repository.apply_job_transition(transition) is None:
+            raise _not_found()
+
+        self._remember(ledger, callback.event_id, digest, terminal=is_terminal(target))
+        if self._events is not None:
+            self._events.publish(
+                job.id,
+                JOB_STATUS_EVENT,
+                {
+                    "job_id": job.id,
+                    "status": target.value,
+                    "previous_status": previous.value,
+                    "occurred_at": occurred_at.isoformat(),
+                },
+            )
+        return None
+
+
+def _transcript_uri(callback: StatusCallbackRequest) -> str | None:
+    uri = (callback.artifact_updates or {}).get("transcript_uri")
+    return uri if isinstance(uri, str) and uri else None
+
+
+def _uploaded_video_uri(callback: StatusCallbackRequest) -> str | None:
+    if callback.status != JobStatus.UPLOADED:
+        return None
+    uri = (callback.artifact_updates or {}).get("video_uri")
+    return uri if isinstance(uri, str) and uri else None
+
+
+class StatusCallbackService:
+    """Async entry point; runs the engine on ``executor`` when storage blocks.
+
+    Callbacks that carry ``artifact_updates.transcript_uri`` also stream that
+    transcript into the job's segment store before the response is sent. The
+    transition stays applied if ingestion fails; the caller sees a 422 and its
+    retry (a replay) ingests again, since only a successful ingestion of the
+    same URI is skipped. An UPLOADED callback carrying
+    ``artifact_updates.video_uri`` starts a background build of the video's
+    frame index, which never affects the response.
+    """
+
+    def __init__(
+        self,
+        engine: StatusCallbackEngine,
+        executor: BlockingExecutor | None = None,
+        *,
+        transcripts: TranscriptIngestor | None = None,
+        ingest_executor: BlockingExecutor | None = None,
+        videos: VideoIndexService | None = None,
+    ) -> None:
+        self.engine = engine
+        self._executor = executor
+        self._transcripts = transcripts
+        self._ingest_executor = ingest_executor
+        self._videos = videos
+
+    async def ingest(self, job_id: str, callback: StatusCallbackRequest) -> StatusCallbackReplayResponse | None:
+        if self._executor is None:
+            replay = self.engine.ingest(job_id, callback)
+        else:
+            replay = await self._executor.run(self.engine.ingest, job_id, callback)
+        self._index_video(callback)
+        await self._ingest_transcript(job_id, callback)
+        return replay
+
+    async def ingest_batch(self, events: Sequence[StatusCallbackBatchEvent]) -> list[StatusCallbackBatchResult]:
+        if self._executor is None:
+            results = self.engine.ingest_batch(events)
+        else:
+            results = await self._executor.run(self.engine.ingest_batch, events)
+
+        for index, event in enumerate(events):
+            if results[index].outcome == "rejected":
+                continue
+            self._index_video(event)
+            try:
+                await self._ingest_transcript(event.job_id, event)
+            except ApiError as exc:
+                results[index] = StatusCallbackBatchResult(
+                    job_id=event.job_id,
+                    event_id=event.event_id,
+                    outcome="rejected",
+                    status_code=exc.status_code,
+                    error=exc.payload,
+                )
+        return results
+
+    def _index_video(self, callback: StatusCallbackRequest) -> None:
+        uri = _uploaded_video_uri(callback)
+        if uri is not None and self._videos is not None:
+            self._videos.schedule(uri)
+
+    async def _ingest_transcript(self, job_id: str, callback: StatusCallbackRequest) -> None:
+        uri = _transcript_uri(callback)
+        if uri is None or self._transcripts is None:
+            return
+        if self._ingest_executor is None:
+            self._transcripts.ingest(job_id, uri)
+        else:
+            await self._ingest_executor.run(self._transcripts.ingest, job_id, uri)
@@ -0,0 +1,177 @@
+"""Thumbnail and preview renditions of screenshot assets."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import ParamSpec, TypeVar
+from urllib.parse import unquote, urlsplit
+
+from app.adapters.media import DERIVATIVE_FORMATS, DerivativeSpec, write_derivatives
+from app.core.executor import BlockingExecutor
+from app.core.signing import UrlSigner
+from app.errors import ApiError
+from app.repositories.derivatives import Derivative, DerivativeStore, is_checksum
+from app.repositories.screenshots import ScreenshotAssetRecord
+from app.schemas.screenshot import ScreenshotDerivative, ScreenshotFormat
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+DEFAULT_VARIANTS: Mapping[str, int] = {"thumbnail": 320, "preview": 1280}
+MIME_TYPES = {"jpg": "image/jpeg", "webp": "image/webp"}
+
+Writer = Callable[[Path, Sequence[DerivativeSpec]], list[tuple[int, int]]]
+
+
+def _not_found() -> ApiError:
+    return ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
+
+
+def _local_image(uri: str) -> Path | None:
+    # Assets written by this process carry file:// URIs; remote images are
+    # left to the storage backend's own derivative support.
+    parts = urlsplit(uri)
+    return Path(unquote(parts.path)) if parts.scheme == "file" else None
+
+
+class DerivativeService:
+    """Generates each image's renditions once, in the background, and signs URLs to them.
+
+    ``schedule`` is called whenever an asset is created, whatever its kind.
+    Renditions are keyed by the image checksum, so re-extracting a cached
+    frame or re-uploading the same file costs nothing, and concurrent
+    schedules for one checksum share a single decode. An asset lists only
+    the renditions that exist so far; a failed generation is retried the
+    next time an asset with that checksum is created.
+    """
+
+    def __init__(
+        self,
+        store: DerivativeStore,
+        signer: UrlSigner,
+        *,
+        variants: Mapping[str, int] = DEFAULT_VARIANTS,
+        formats: Sequence[str] = DERIVATIVE_FORMATS,
+        url_prefix: str = "/api/v1/derivatives",
+        executor: BlockingExecutor | None = None,
+        writer: Writer = write_derivatives,
+    ) -> None:
+        if not variants or any(width < 1 for width in variants.values()):
+            raise ValueError("variants need positive widths")
+        unsupported = set(formats) - set(MIME_TYPES)
+        if not formats or unsupported:
+            raise ValueError(f"unsupported derivative formats: {sorted(unsupported)}")
+        self._store = store
+        self._signer = signer
+        self._variants = dict(variants)
+        self._formats = tuple(formats)
+        self._url_prefix = url_prefix.rstrip("/")
+        self._executor = executor
+        self._writer = writer
+        self._building: dict[str, asyncio.Task[None]] = {}
+        self.generated = 0
+        self.reused = 0
+        self.failures = 0
+
+    async def _blocking(self, fn: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        if self._executor is None:
+            return fn(*args, **kwargs)
+        return await self._executor.run(fn, *args, **kwargs)
+
+    def _renditions(self) -> list[tuple[int, str]]:
+        return sorted({(width, format) for width in self._variants.values() for format in self._formats})
+
+    def schedule(self, record: ScreenshotAssetRecord) -> None:
+        """Generate ``record``'s missing renditions in the background; never raises."""
+        checksum = record.checksum_sha256
+        source = _local_image(record.image_uri)
+        if checksum is None or not is_checksum(checksum) or source is None or checksum in self._building:
+            return
+        task = asyncio.get_running_loop().create_task(self._generate(checksum, source))
+        self._building[checksum] = task
+        task.add_done_callback(lambda done: self._building.pop(checksum, None))
+
+    def _missing(self, checksum: str) -> list[tuple[int, str]]:
+        return [(width, format) for width, format in self._renditions() if self._store.get(checksum, width, format) is None]
+
+    def _write(self, checksum: str, source: Path, missing: list[tuple[int, str]]) -> None:
+        specs = [
+            DerivativeSpec(width, format, str(self._store.staging_path(checksum, width, format)))
+            for width, format in missing
+        ]
+        sizes = self._writer(source, specs)
+        for spec, size in zip(specs, sizes, strict=True):
+            self._store.put(checksum, spec.width, spec.format, spec.output_path, size)
+
+    async def _generate(self, checksum: str, source: Path) -> None:
+        try:
+            missing = await self._blocking(self._missing, checksum)
+            if not missing:
+                self.reused += 1
+                return
+            await self._blocking(self._write, checksum, source, missing)
+        except Exception:
+            # Decoders raise more than OSError (e.g. DecompressionBombError);
+            # a background task has no caller to hand them to.
+            self.failures += 1
+        else:
+            self.generated += 1
+
+    def _path(self, checksum: str, width: int, format: str) -> str:
+        return f"{self._url_prefix}/{checksum}/{width}.{format}"
+
+    def _existing(self, checksum: str) -> dict[tuple[int, str], Derivative]:
+        found = {}
+        for width, format in self._renditions():
+            derivative = self._store.get(checksum, width, format)
+            if derivative is not None:
+                found[(width, format)] = derivative
+        return found
+
+    async def for_asset(self, record: ScreenshotAssetRecord) -> list[ScreenshotDerivative]:
+        """Signed URLs of the renditions of ``record``'s image generated so far."""
+        checksum = record.checksum_sha256
+        if checksum is None or not is_checksum(checksum):
+            return []
+        existing = await self._blocking(self._existing, checksum)
+        views = []
+        for variant, width in self._variants.items():
+            for format in self._formats:
+                derivative = existing.get((width, format))
+                if derivative is None:
+                    continue
+                url, expires_at = self._signer.sign(self._path(checksum, width, format))
+                views.append(
+                    ScreenshotDerivative(
+                        variant=variant,
+                        format=ScreenshotFormat(format),
+                        mime_type=MIME_TYPES[format],
+                        width=derivative.width,
+                        height=derivative.height,
+                        url=url,
+                        expires_at=expires_at,
+                    )
+                )
+        return views
+
+    async def open(self, *, checksum: str, name: str, expires: int, signature: str) -> tuple[Path, str]:
+        """File and MIME type behind a signed derivative URL; 404 if unsigned, expired or missing."""
+        width, _, format = name.partition(".")
+        if not is_checksum(checksum) or not width.isdigit() or width != str(int(width)) or format not in MIME_TYPES:
+            raise _not_found()
+        if not self._signer.verify(self._path(checksum, int(width), format), expires, signature):
+            raise _not_found()
+        derivative = await self._blocking(self._store.get, checksum, int(width), format)
+        if derivative is None:
+            raise _not_found()
+        return derivative.path, MIME_TYPES[format]
+
+    def close(self) -> None:
+        """Cancel background generation, e.g. on shutdown."""
+        for task in list(self._building.values()):
+            try:
+                task.cancel()
+            except RuntimeError:  # pragma: no cover - the task's loop is already closed
+                continue
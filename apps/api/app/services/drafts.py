@@ -0,0 +1,267 @@
+"""Draft generation from long transcripts by windowed map-reduce."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import hashlib
+import json
+import re
+from uuid import UUID, uuid5
+
+from app.adapters.llm import DraftRequest, LLMClient
+from app.core.executor import BlockingExecutor
+from app.core.scheduling import FairLimiter
+from app.repositories.block_index import BLOCK_MARKER
+from app.repositories.draft_fragments import DraftFragmentCache
+from app.repositories.transcripts import CompactTranscript
+from app.schemas.instruction import Instruction
+from app.services.instructions import InstructionService
+from app.services.transcripts import TranscriptService
+
+# Bump when window text, prompting or merging changes so cached fragments are not reused.
+DRAFT_GENERATOR_VERSION = "2"
+
+# Namespace for the deterministic block ids of generated drafts.
+_BLOCK_NAMESPACE = UUID("5b0c1f0e-8f0e-4a53-9d0c-6f1f4b7f2d3a")
+_HEADING = re.compile(r"^ {0,3}(#{1,6})[ \t]")
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_SPACE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for budgeting windows."""
+    return len(text) // 4 + 1
+
+
+def _timestamp(ms: int) -> str:
+    seconds = ms // 1000
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptWindow:
+    """Segments ``[start, stop)`` rendered as timestamped lines.
+
+    ``context`` holds segments ``[context_start, start)``, the tail of the
+    previous window, for the model to read but not write steps for.
+    """
+
+    context_start: int
+    start: int
+    stop: int
+    start_ms: int
+    end_ms: int
+    context: str
+    text: str
+
+
+def plan_windows(transcript: CompactTranscript, *, max_tokens: int, overlap_tokens: int) -> list[TranscriptWindow]:
+    """Split ``transcript`` into consecutive windows of at most ``max_tokens``, without overlap.
+
+    Each window after the first also carries the trailing segments of the
+    previous one, up to ``overlap_tokens``, as read-only context, so a step
+    spanning a boundary is understood without being generated twice. A
+    single segment over budget gets a window of its own. Windows depend only
+    on the segments, so the same transcript always yields the same windows.
+    """
+    if max_tokens < 1 or overlap_tokens < 0:
+        raise ValueError("max_tokens must be positive and overlap_tokens non-negative")
+    segments = transcript.segments()
+    lines = [f"[{_timestamp(segment.start_ms)}] {segment.text.strip()}" for segment in segments]
+    tokens = [estimate_tokens(line) for line in lines]
+
+    windows: list[TranscriptWindow] = []
+    start = 0
+    while start < len(lines):
+        stop, used = start, 0
+        while stop < len(lines) and (stop == start or used + tokens[stop] <= max_tokens):
+            used += tokens[stop]
+            stop += 1
+        context_start, overlap = start, 0
+        while context_start > 0 and overlap + tokens[context_start - 1] <= overlap_tokens:
+            context_start -= 1
+            overlap += tokens[context_start]
+        windows.append(
+            TranscriptWindow(
+                context_start=context_start,
+                start=start,
+                stop=stop,
+                start_ms=segments[start].start_ms,
+                end_ms=segments[stop - 1].end_ms,
+                context="\n".join(lines[context_start:start]),
+                text="\n".join(lines[start:stop]),
+            )
+        )
+        start = stop
+    return windows
+
+
+def _split_blocks(fragment: str) -> list[str]:
+    """Split a fragment at headings outside code fences; model-emitted markers and titles are dropped."""
+    blocks: list[list[str]] = [[]]
+    fence: str | None = None
+    for line in BLOCK_MARKER.sub("", fragment).splitlines():
+        fence_match = _FENCE.match(line)
+        if fence_match is not None:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+        elif fence is None:
+            heading = _HEADING.match(line)
+            if heading is not None:
+                if len(heading.group(1)) == 1:
+                    continue
+                blocks.append([])
+        blocks[-1].append(line)
+    return [text for text in ("\n".join(block).strip() for block in blocks) if text]
+
+
+def _normalized(block: str) -> str:
+    return _SPACE.sub(" ", block).strip().lower()
+
+
+def merge_fragments(job_id: str, fragments: list[str], *, title: str = "Instructions") -> str:
+    """Join window fragments into one block-marked document.
+
+    A block repeating one from the previous window's fragment (a step the
+    model wrote again from its context) is dropped. Block ids are derived
+    from the job, the block's position and its content, so identical
+    fragments always merge to identical markdown.
+    """
+    parts = [f"# {title}\n"]
+    previous: set[str] = set()
+    ordinal = 0
+    for fragment in fragments:
+        current: set[str] = set()
+        for block in _split_blocks(fragment):
+            key = _normalized(block)
+            current.add(key)
+            if key in previous:
+                continue
+            digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+            block_id = uuid5(_BLOCK_NAMESPACE, f"{job_id}:{ordinal}:{digest}")
+            parts.append(f"<!-- block:{block_id} -->\n{block}\n")
+            ordinal += 1
+        previous = current
+    return "\n".join(parts)
+
+
+def _window_context(window: TranscriptWindow) -> str:
+    context = f"Transcript excerpt {_timestamp(window.start_ms)}-{_timestamp(window.end_ms)}."
+    if not window.context:
+        return context
+    return f"{context}\nPreceding transcript, already covered; do not write steps for it:\n{window.context}"
+
+
+class DraftService:
+    """Generates a job's first instruction version from its transcript.
+
+    The transcript is planned into token-budgeted windows, each with the
+    previous window's tail as context (``plan_windows``); window fragments
+    are generated concurrently, at most ``max_concurrency`` at a time
+    across all jobs and handed out round-robin per job, then merged
+    deterministically (``merge_fragments``). Every fragment is cached by its window's content
+    hash as soon as it arrives, so when a window fails the others still
+    finish, and generating again after ``FAILED`` only calls the provider
+    for the windows that are missing.
+
+    No route calls this yet: the worker driving a job's GENERATING step is
+    meant to call ``generate_draft`` and then report ``DRAFT_READY`` (or
+    ``FAILED``, after which calling it again resumes) through the status
+    callback.
+    """
+
+    def __init__(
+        self,
+        transcripts: TranscriptService,
+        instructions: InstructionService,
+        llm: LLMClient,
+        *,
+        cache: DraftFragmentCache | None = None,
+        max_concurrency: int = 4,
+        max_window_tokens: int = 3000,
+        overlap_tokens: int = 200,
+        executor: BlockingExecutor | None = None,
+    ) -> None:
+        self._transcripts = transcripts
+        self._instructions = instructions
+        self._llm = llm
+        self._cache = cache if cache is not None else DraftFragmentCache()
+        self._limiter = FairLimiter(max_concurrency)
+        self._max_window_tokens = max_window_tokens
+        self._overlap_tokens = overlap_tokens
+        self._executor = executor
+        self.windows_generated = 0
+        self.windows_reused = 0
+
+    async def generate_draft(
+        self,
+        *,
+        owner_id: str,
+        job_id: str,
+        model_profile: str | None = None,
+        prompt_template_id: str | None = None,
+        prompt_params_ref: str | None = None,
+    ) -> Instruction:
+        """Generate and store the draft; ``LLMError`` is raised once every window has settled."""
+        transcript = await self._transcripts.readable_transcript(owner_id, job_id)
+        if self._executor is None:
+            windows = self._plan(transcript)
+        else:
+            windows = await self._executor.run(self._plan, transcript)
+
+        settings = {
+            "version": DRAFT_GENERATOR_VERSION,
+            "model_profile": model_profile,
+            "prompt_template_id": prompt_template_id,
+            "prompt_params_ref": prompt_params_ref,
+        }
+        results = await asyncio.gather(
+            *(self._fragment(job_id, window, settings) for window in windows),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        fragments = [result for result in results if isinstance(result, str)]
+        if self._executor is None:
+            markdown = merge_fragments(job_id, fragments)
+        else:
+            markdown = await self._executor.run(merge_fragments, job_id, fragments)
+        return await self._instructions.create_instruction(
+            job_id=job_id,
+            markdown=markdown,
+            model_profile_id=model_profile,
+            prompt_template_id=prompt_template_id,
+            prompt_params_ref=prompt_params_ref,
+        )
+
+    def _plan(self, transcript: CompactTranscript) -> list[TranscriptWindow]:
+        return plan_windows(transcript, max_tokens=self._max_window_tokens, overlap_tokens=self._overlap_tokens)
+
+    async def _fragment(self, job_id: str, window: TranscriptWindow, settings: dict[str, str | None]) -> str:
+        canonical = json.dumps(
+            {**settings, "context": window.context, "text": window.text}, sort_keys=True, ensure_ascii=False
+        )
+        key = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.windows_reused += 1
+            return cached
+        async with self._limiter.slot(job_id):
+            fragment = await self._llm.generate(
+                DraftRequest(
+                    transcript=window.text,
+                    context=_window_context(window),
+                    model_profile=settings["model_profile"],
+                    prompt_template_id=settings["prompt_template_id"],
+                    prompt_params_ref=settings["prompt_params_ref"],
+                )
+            )
+        self._cache.put(key, fragment)
+        self.windows_generated += 1
+        return fragment
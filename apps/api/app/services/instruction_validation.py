@@ -0,0 +1,146 @@
+"""Structural validation of instruction markdown."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import re
+import threading
+from uuid import UUID
+
+from app.repositories.block_index import BlockIndex, BlockSpan
+from app.schemas.instruction import ValidationIssue
+
+# Bump whenever a rule changes so memoized results are not reused.
+VALIDATOR_VERSION = "2"
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})", re.MULTILINE)
+
+# A block-content finding before it is placed at a ``blocks[i]`` path.
+_Finding = tuple[str, str]
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _check_block_content(content: str) -> tuple[_Finding, ...]:
+    """Rules that depend only on a block's content, so results are shareable by content hash."""
+    fences = _FENCE.findall(content)
+    open_fence: str | None = None
+    for fence in fences:
+        if open_fence is None:
+            open_fence = fence
+        elif fence[0] == open_fence[0] and len(fence) >= len(open_fence):
+            open_fence = None
+    if open_fence is not None:
+        return (("UNCLOSED_CODE_FENCE", "Code fence is not closed within its block."),)
+    return ()
+
+
+def _merge(
+    index: BlockIndex,
+    block_findings: list[tuple[_Finding, ...]],
+) -> list[ValidationIssue]:
+    issues: list[ValidationIssue] = []
+    seen: set[str] = set()
+    for position, block in enumerate(index):
+        path = f"blocks[{position}]"
+        if not _is_uuid(block.block_id):
+            issues.append(ValidationIssue(code="BLOCK_ID_INVALID", message="Block marker id is not a UUID.", path=path))
+        elif block.block_id.lower() in seen:
+            issues.append(ValidationIssue(code="BLOCK_ID_DUPLICATE", message="Block marker id is repeated.", path=path))
+        else:
+            seen.add(block.block_id.lower())
+        for code, message in block_findings[position]:
+            issues.append(ValidationIssue(code=code, message=message, path=path))
+    return issues
+
+
+def validate_markdown(markdown: str, index: BlockIndex | None = None) -> list[ValidationIssue]:
+    """Structural diagnostics only; messages never quote document content."""
+    if not markdown.strip():
+        return [ValidationIssue(code="EMPTY_DOCUMENT", message="Instruction markdown is empty.")]
+    index = index if index is not None else BlockIndex.build(markdown)
+    return _merge(index, [_check_block_content(markdown[b.content_start : b.end].strip()) for b in index])
+
+
+class _Lru:
+    __slots__ = ("_entries", "_max_entries")
+
+    def __init__(self, max_entries: int) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self._entries: OrderedDict[tuple[str, str], tuple] = OrderedDict()
+        self._max_entries = max_entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[str, str]) -> tuple | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple[str, str], value: tuple) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class InstructionValidator:
+    """``validate_markdown`` memoized by content hash and validator version.
+
+    Whole-document results are cached by ``(sha256(markdown),
+    VALIDATOR_VERSION)``, so saving unchanged or reverted content skips
+    validation entirely. Otherwise content rules run per block, cached by
+    the block's content hash from the block index, so an edit or a
+    regenerate rechecks only the blocks it changed; document-wide rules
+    (marker ids, duplicates) are re-merged from the cached findings.
+    """
+
+    def __init__(self, *, max_documents: int = 1024, max_blocks: int = 65536) -> None:
+        self._documents = _Lru(max_documents)
+        self._blocks = _Lru(max_blocks)
+        self._lock = threading.Lock()
+        self.documents_validated = 0
+        self.documents_skipped = 0
+        self.blocks_validated = 0
+        self.blocks_skipped = 0
+
+    def validate(self, markdown: str, index: BlockIndex | None = None) -> tuple[ValidationIssue, ...]:
+        key = (hashlib.sha256(markdown.encode("utf-8")).hexdigest(), VALIDATOR_VERSION)
+        with self._lock:
+            cached = self._documents.get(key)
+            if cached is not None:
+                self.documents_skipped += 1
+                return cached
+        if not markdown.strip():
+            issues: tuple[ValidationIssue, ...] = tuple(validate_markdown(markdown))
+        else:
+            index = index if index is not None else BlockIndex.build(markdown)
+            issues = tuple(_merge(index, [self._block_findings(markdown, block) for block in index]))
+        with self._lock:
+            self._documents.put(key, issues)
+            self.documents_validated += 1
+        return issues
+
+    def _block_findings(self, markdown: str, block: BlockSpan) -> tuple[_Finding, ...]:
+        key = (block.content_hash, VALIDATOR_VERSION)
+        with self._lock:
+            cached = self._blocks.get(key)
+            if cached is not None:
+                self.blocks_skipped += 1
+                return cached
+        # Content hashes cover the trimmed content, which is what the rules see.
+        findings = _check_block_content(markdown[block.content_start : block.end].strip())
+        with self._lock:
+            self._blocks.put(key, findings)
+            self.blocks_validated += 1
+        return findings
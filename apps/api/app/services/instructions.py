@@ -0,0 +1,274 @@
+"""Instruction service layer."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from app.core.executor import BlockingExecutor
+from app.errors import ApiError
+from app.repositories.base import AsyncRepository
+from app.repositories.block_index import BlockIndex, BlockIndexCache, BlockSpan
+from app.repositories.instructions import (
+    InstructionStore,
+    InstructionVersionConflict,
+    InstructionVersionRecord,
+    compute_delta,
+)
+from app.schemas.anchor import AnchorAddress, AnchorResolution
+from app.schemas.instruction import Instruction, ValidationStatus
+from app.services.anchor_resolution import AnchorResolver
+from app.services.instruction_validation import VALIDATOR_VERSION, InstructionValidator
+
+
+def _not_found() -> ApiError:
+    return ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
+
+
+def _version_conflict(exc: InstructionVersionConflict) -> ApiError:
+    return ApiError(
+        status_code=409,
+        code="VERSION_CONFLICT",
+        message="Base version is stale; no mutation persisted.",
+        details={"base_version": exc.base_version, "current_version": exc.current_version},
+    )
+
+
+def _invalid_selection(message: str) -> ApiError:
+    return ApiError(status_code=400, code="VALIDATION_ERROR", message=message)
+
+
+def select_blocks(
+    index: BlockIndex,
+    *,
+    block_id: str | None = None,
+    char_range: tuple[int, int] | None = None,
+) -> list[BlockSpan]:
+    """Blocks a ``block_id`` (preferred) or ``char_range`` selection addresses in ``index``'s version."""
+    if block_id is not None:
+        block = index.find(block_id)
+        if block is None:
+            raise _invalid_selection("Selection block_id does not exist in this version.")
+        return [block]
+    if char_range is None:
+        raise _invalid_selection("Selection must include block_id or char_range.")
+    start, end = char_range
+    if not 0 <= start < end <= index.length:
+        raise _invalid_selection("Selection char_range is outside the document.")
+    return index.overlapping(start, end)
+
+
+def instruction_version_id(instruction_id: str, version: int) -> str:
+    return f"{instruction_id}:{version}"
+
+
+def _to_instruction(record: InstructionVersionRecord) -> Instruction:
+    metadata = record.metadata
+    return Instruction.model_construct(
+        instruction_id=record.instruction_id,
+        id=record.instruction_id,
+        job_id=record.job_id,
+        version=record.version,
+        markdown=record.markdown,
+        updated_at=record.updated_at,
+        validation_status=metadata["validation_status"],
+        validation_errors=list(metadata["validation_errors"]),
+        validated_at=metadata["validated_at"],
+        validator_version=metadata["validator_version"],
+        model_profile_id=metadata.get("model_profile_id"),
+        prompt_template_id=metadata.get("prompt_template_id"),
+        prompt_params_ref=metadata.get("prompt_params_ref"),
+    )
+
+
+class InstructionService:
+    """Owner-scoped instruction reads and optimistic-concurrency updates.
+
+    Diffing a large document against its predecessor is CPU-bound, so writes
+    run on ``executor`` when one is given. Each write also derives the new
+    version's block index from its predecessor's, reparsing only the edited
+    region; anchor, regenerate and export paths read blocks through
+    ``get_block_index`` instead of reparsing the markdown. Validation goes
+    through ``validator``, which reuses results for unchanged documents and
+    blocks.
+    """
+
+    def __init__(
+        self,
+        store: AsyncRepository,
+        instructions: InstructionStore,
+        executor: BlockingExecutor | None = None,
+        *,
+        block_indexes: BlockIndexCache | None = None,
+        validator: InstructionValidator | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self._store = store
+        self._instructions = instructions
+        self._executor = executor
+        self._block_indexes = block_indexes if block_indexes is not None else BlockIndexCache()
+        self._validator = validator if validator is not None else InstructionValidator()
+        self._clock = clock
+
+    def _validation(self, markdown: str, index: BlockIndex) -> dict[str, Any]:
+        issues = self._validator.validate(markdown, index)
+        return {
+            "validation_status": ValidationStatus.FAIL if issues else ValidationStatus.PASS,
+            "validation_errors": tuple(issues),
+            "validated_at": self._clock(),
+            "validator_version": VALIDATOR_VERSION,
+        }
+
+    def _create(self, job_id: str, owner_id: str, markdown: str, provenance: dict[str, str]) -> InstructionVersionRecord:
+        index = BlockIndex.build(markdown)
+        metadata = {**self._validation(markdown, index), **provenance}
+        record = self._instructions.create(job_id=job_id, owner_id=owner_id, markdown=markdown, metadata=metadata)
+        self._block_indexes.put(record.instruction_id, record.version, index)
+        return record
+
+    def _update(self, instruction_id: str, base_version: int, markdown: str) -> InstructionVersionRecord | None:
+        current = self._instructions.get(instruction_id)
+        if current is None:
+            return None
+        if current.version != base_version:
+            raise InstructionVersionConflict(base_version, current.version)
+
+        # One diff serves the block index, validation and version storage.
+        delta = compute_delta(current.markdown, markdown)
+        previous = self._block_indexes.get(instruction_id, current.version)
+        index = previous.apply(markdown, delta) if previous is not None else BlockIndex.build(markdown)
+        provenance = {key: value for key, value in current.metadata.items() if key.startswith(("model_", "prompt_"))}
+        metadata = {**self._validation(markdown, index), **provenance}
+        record = self._instructions.update(
+            instruction_id,
+            base_version=base_version,
+            markdown=markdown,
+            metadata=metadata,
+            delta=delta,
+        )
+        if record is not None:
+            self._block_indexes.put(instruction_id, record.version, index)
+        return record
+
+    def _block_index(self, instruction_id: str, version: int | None) -> BlockIndex | None:
+        record = self._instructions.get(instruction_id, version)
+        if record is None:
+            return None
+        index = self._block_indexes.get(instruction_id, record.version)
+        if index is None:
+            index = BlockIndex.build(record.markdown)
+            self._block_indexes.put(instruction_id, record.version, index)
+        return index
+
+    async def create_instruction(
+        self,
+        *,
+        job_id: str,
+        markdown: str,
+        model_profile_id: str | None = None,
+        prompt_template_id: str | None = None,
+        prompt_params_ref: str | None = None,
+    ) -> Instruction:
+        """Store the first version of a job's instruction (e.g. a generated draft)."""
+        job = await self._store.get_job(job_id)
+        if job is None:
+            raise _not_found()
+        provenance = {
+            key: value
+            for key, value in (
+                ("model_profile_id", model_profile_id),
+                ("prompt_template_id", prompt_template_id),
+                ("prompt_params_ref", prompt_params_ref),
+            )
+            if value is not None
+        }
+        if self._executor is None:
+            record = self._create(job.id, job.owner_id, markdown, provenance)
+        else:
+            record = await self._executor.run(self._create, job.id, job.owner_id, markdown, provenance)
+        return _to_instruction(record)
+
+    async def get_instruction(self, *, owner_id: str, instruction_id: str, version: int | None = None) -> Instruction:
+        latest = self._instructions.get(instruction_id)
+        if latest is None or latest.owner_id != owner_id:
+            raise _not_found()
+        if version is None or version == latest.version:
+            return _to_instruction(latest)
+
+        # Older versions replay a bounded delta chain.
+        if self._executor is None:
+            record = self._instructions.get(instruction_id, version)
+        else:
+            record = await self._executor.run(self._instructions.get, instruction_id, version)
+        if record is None:
+            raise _not_found()
+        return _to_instruction(record)
+
+    async def get_block_index(self, *, owner_id: str, instruction_id: str, version: int | None = None) -> BlockIndex:
+        """Block index of an owned instruction version (latest by default)."""
+        latest = self._instructions.get(instruction_id)
+        if latest is None or latest.owner_id != owner_id:
+            raise _not_found()
+        index = self._block_indexes.get(instruction_id, version or latest.version)
+        if index is None:
+            # Evicted or never built: rebuild off the event loop.
+            if self._executor is None:
+                index = self._block_index(instruction_id, version)
+            else:
+                index = await self._executor.run(self._block_index, instruction_id, version)
+        if index is None:
+            raise _not_found()
+        return index
+
+    async def resolve_anchors(
+        self,
+        *,
+        owner_id: str,
+        instruction_id: str,
+        source_version: int,
+        anchors: Sequence[AnchorAddress],
+        target_version: int | None = None,
+    ) -> list[AnchorResolution]:
+        """Resolve every anchor bound to ``source_version`` onto ``target_version`` (latest by default) in one pass."""
+        latest = self._instructions.get(instruction_id)
+        if latest is None or latest.owner_id != owner_id:
+            raise _not_found()
+        target_version = target_version or latest.version
+        source = await self.get_block_index(owner_id=owner_id, instruction_id=instruction_id, version=source_version)
+        target = await self.get_block_index(owner_id=owner_id, instruction_id=instruction_id, version=target_version)
+
+        def resolve() -> list[AnchorResolution]:
+            resolver = AnchorResolver(
+                source,
+                target,
+                source_version_id=instruction_version_id(instruction_id, source_version),
+                target_version_id=instruction_version_id(instruction_id, target_version),
+            )
+            return resolver.resolve_all(anchors)
+
+        if self._executor is None:
+            return resolve()
+        return await self._executor.run(resolve)
+
+    async def update_instruction(
+        self,
+        *,
+        owner_id: str,
+        instruction_id: str,
+        base_version: int,
+        markdown: str,
+    ) -> Instruction:
+        current = self._instructions.get(instruction_id)
+        if current is None or current.owner_id != owner_id:
+            raise _not_found()
+        try:
+            if self._executor is None:
+                record = self._update(instruction_id, base_version, markdown)
+            else:
+                record = await self._executor.run(self._update, instruction_id, base_version, markdown)
+        except InstructionVersionConflict as exc:
+            raise _version_conflict(exc) from exc
+        if record is None:
+            raise _not_found()
+        return _to_instruction(record)
@@ -1,24 +1,69 @@
 """Job service layer."""
 
 from app.errors import ApiError
-from app.repositories.memory import InMemoryStore
-from app.schemas.job import Job
+from app.repositories.base import AsyncRepository, JobRecord
+from app.schemas.job import ArtifactManifest, Job, JobPage
+from app.services.pagination import DEFAULT_PAGE_LIMIT, decode_cursor, encode_cursor
+
+
+def _not_found() -> ApiError:
+    return ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
+
+
+def _to_manifest(manifest: dict) -> ArtifactManifest | None:
+    if not manifest:
+        return None
+    # Callbacks may record extra keys (e.g. metrics); only contract fields are exposed.
+    return ArtifactManifest.model_construct(**{name: manifest.get(name) for name in ArtifactManifest.model_fields})
+
+
+def _to_job(record: JobRecord) -> Job:
+    return Job.model_construct(
+        id=record.id,
+        project_id=record.project_id,
+        status=record.status,
+        manifest=_to_manifest(record.manifest),
+        created_at=record.created_at,
+        updated_at=record.updated_at,
+    )
 
 
 class JobService:
-    def __init__(self, store: InMemoryStore) -> None:
+    def __init__(self, store: AsyncRepository) -> None:
         self._store = store
 
-    def create_job(self, *, owner_id: str, project_id: str) -> Job:
-        project = self._store.get_project(project_id)
+    async def create_job(self, *, owner_id: str, project_id: str) -> Job:
+        project = await self._store.get_project(project_id)
         if project is None or project.owner_id != owner_id:
-            raise ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
-
-        record = self._store.create_job(owner_id=owner_id, project_id=project_id)
-        return Job(
-            id=record.id,
-            project_id=record.project_id,
-            status=record.status,
-            created_at=record.created_at,
-            updated_at=record.updated_at,
-        )
+            raise _not_found()
+
+        record = await self._store.create_job(owner_id=owner_id, project_id=project_id)
+        return _to_job(record)
+
+    async def get_job(self, *, owner_id: str, job_id: str) -> Job:
+        record = await self._store.get_job(job_id)
+        if record is None or record.owner_id != owner_id:
+            raise _not_found()
+        return _to_job(record)
+
+    async def list_jobs(
+        self,
+        *,
+        owner_id: str,
+        project_id: str,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        cursor: str | None = None,
+    ) -> JobPage:
+        project = await self._store.get_project_for_owner(owner_id=owner_id, project_id=project_id)
+        if project is None:
+            raise _not_found()
+
+        after = decode_cursor(cursor) if cursor else None
+        # Fetch one extra record to learn whether another page exists.
+        records = await self._store.list_jobs_for_project(project_id, after=after, limit=limit + 1)
+        page = records[:limit]
+        next_cursor = None
+        if len(records) > limit:
+            next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+        return JobPage(items=[_to_job(record) for record in page], limit=limit, next_cursor=next_cursor)
@@ -0,0 +1,35 @@
+"""Opaque keyset cursor helpers shared by paginated listings."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+
+from app.errors import ApiError
+
+DEFAULT_PAGE_LIMIT = 200
+MAX_PAGE_LIMIT = 500
+
+
+def encode_cursor(created_at: datetime, record_id: str) -> str:
+    """Encode a ``(created_at, id)`` position as an opaque URL-safe token."""
+    raw = f"{created_at.isoformat()}|{record_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a token produced by ``encode_cursor``; malformed input is a validation error."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_text, record_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        created_at = datetime.fromisoformat(created_at_text)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ApiError(status_code=400, code="VALIDATION_ERROR", message="Invalid pagination cursor") from exc
+
+    if created_at.tzinfo is None or not record_id:
+        raise ApiError(status_code=400, code="VALIDATION_ERROR", message="Invalid pagination cursor")
+    return created_at, record_id
+
+
+__all__ = ["DEFAULT_PAGE_LIMIT", "MAX_PAGE_LIMIT", "decode_cursor", "encode_cursor"]
@@ -1,26 +1,43 @@
 """Project service layer."""
 
 from app.errors import ApiError
-from app.repositories.memory import InMemoryStore
-from app.schemas.project import Project
+from app.repositories.base import AsyncRepository
+from app.schemas.project import Project, ProjectPage
+from app.services.pagination import DEFAULT_PAGE_LIMIT, decode_cursor, encode_cursor
 
 
 class ProjectService:
-    def __init__(self, store: InMemoryStore) -> None:
+    def __init__(self, store: AsyncRepository) -> None:
         self._store = store
 
-    def create_project(self, *, owner_id: str, name: str) -> Project:
-        record = self._store.create_project(owner_id=owner_id, name=name)
+    async def create_project(self, *, owner_id: str, name: str) -> Project:
+        record = await self._store.create_project(owner_id=owner_id, name=name)
         return Project(id=record.id, name=record.name, created_at=record.created_at)
 
-    def list_projects(self, *, owner_id: str) -> list[Project]:
-        return [
-            Project(id=record.id, name=record.name, created_at=record.created_at)
-            for record in self._store.list_projects_for_owner(owner_id)
+    async def list_projects(
+        self,
+        *,
+        owner_id: str,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        cursor: str | None = None,
+    ) -> ProjectPage:
+        after = decode_cursor(cursor) if cursor else None
+        # Fetch one extra record to learn whether another page exists.
+        records = await self._store.list_projects_for_owner(owner_id, after=after, limit=limit + 1)
+        page = records[:limit]
+        next_cursor = None
+        if len(records) > limit:
+            next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+        # Records come from the store already validated, so skip per-item validation.
+        items = [
+            Project.model_construct(id=record.id, name=record.name, created_at=record.created_at)
+            for record in page
         ]
+        return ProjectPage(items=items, limit=limit, next_cursor=next_cursor)
 
-    def get_project(self, *, owner_id: str, project_id: str) -> Project:
-        record = self._store.get_project_for_owner(owner_id=owner_id, project_id=project_id)
+    async def get_project(self, *, owner_id: str, project_id: str) -> Project:
+        record = await self._store.get_project_for_owner(owner_id=owner_id, project_id=project_id)
         if record is None:
             raise ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
 
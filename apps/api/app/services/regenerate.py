@@ -0,0 +1,310 @@
+"""Regenerate task scheduling."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from app.adapters.llm import FragmentRequest, LLMClient, LLMError
+from app.core.events import REGENERATE_STATUS_EVENT, JobEventBroker
+from app.core.scheduling import FairLimiter, LimiterStats
+from app.errors import ApiError
+from app.schemas.instruction import (
+    RegenerateProvenance,
+    RegenerateRequest,
+    RegenerateTask,
+    RegenerateTaskStatus,
+)
+from app.services.instructions import InstructionService, select_blocks
+
+# Progress reported before and after the provider call; the call itself
+# maps onto the range in between.
+_PROGRESS_STARTED = 5
+_PROGRESS_GENERATED = 90
+
+
+def _not_found() -> ApiError:
+    return ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
+
+
+@dataclass(frozen=True, slots=True)
+class RegenerateStats:
+    submitted: int
+    replayed: int
+    rejected_active: int
+    succeeded: int
+    failed: int
+    llm_calls: int
+    # Admission to the provider: queue depth and time spent waiting for a slot.
+    queue: LimiterStats
+
+
+@dataclass(slots=True)
+class _Task:
+    id: str
+    owner_id: str
+    job_id: str
+    instruction_id: str
+    client_request_id: str
+    provenance: RegenerateProvenance
+    requested_at: datetime
+    status: RegenerateTaskStatus = RegenerateTaskStatus.PENDING
+    progress_pct: int = 0
+    instruction_version: int | None = None
+    failure_code: str | None = None
+    failure_message: str | None = None
+    failed_stage: str | None = None
+    updated_at: datetime | None = None
+    runner: asyncio.Task[None] | None = field(default=None, repr=False)
+
+    def view(self, *, replayed: bool = False) -> RegenerateTask:
+        return RegenerateTask(
+            id=self.id,
+            status=self.status,
+            progress_pct=self.progress_pct,
+            instruction_id=self.instruction_id,
+            instruction_version=self.instruction_version,
+            failure_code=self.failure_code,
+            failure_message=self.failure_message,
+            failed_stage=self.failed_stage,
+            provenance=self.provenance,
+            replayed=replayed,
+            requested_at=self.requested_at,
+            updated_at=self.updated_at,
+        )
+
+
+def _splice(markdown: str, start: int, end: int, replacement: str) -> str:
+    # Keep the selection's surrounding whitespace so block layout is stable.
+    selected = markdown[start:end]
+    lead = len(selected) - len(selected.lstrip())
+    trail = len(selected) - len(selected.rstrip())
+    core_end = max(end - trail, start + lead)
+    return markdown[: start + lead] + replacement.strip() + markdown[core_end:]
+
+
+class RegenerateService:
+    """Runs regenerate tasks on the event loop under a global LLM concurrency cap.
+
+    Only one task may be active (PENDING or RUNNING) per instruction; a
+    second request gets a 409 naming it. Provider slots are handed out
+    round-robin across owners by ``FairLimiter``, so a burst from one owner
+    queues behind nobody else's work. A repeated ``client_request_id``
+    returns the existing task without new provider work. Finished tasks are
+    kept for polling, least-recently-finished evicted past
+    ``max_finished_tasks``.
+    """
+
+    def __init__(
+        self,
+        instructions: InstructionService,
+        llm: LLMClient,
+        *,
+        max_concurrency: int = 4,
+        events: JobEventBroker | None = None,
+        max_finished_tasks: int = 10_000,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self._instructions = instructions
+        self._llm = llm
+        self._limiter = FairLimiter(max_concurrency)
+        self._events = events
+        self._max_finished_tasks = max_finished_tasks
+        self._clock = clock
+        self._tasks: dict[str, _Task] = {}
+        self._by_request: dict[tuple[str, str, str], _Task] = {}
+        self._active: dict[str, _Task] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._submitted = 0
+        self._replayed = 0
+        self._rejected_active = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._llm_calls = 0
+
+    @property
+    def stats(self) -> RegenerateStats:
+        return RegenerateStats(
+            submitted=self._submitted,
+            replayed=self._replayed,
+            rejected_active=self._rejected_active,
+            succeeded=self._succeeded,
+            failed=self._failed,
+            llm_calls=self._llm_calls,
+            queue=self._limiter.stats,
+        )
+
+    def _replay(self, key: tuple[str, str, str]) -> RegenerateTask | None:
+        existing = self._by_request.get(key)
+        if existing is None:
+            return None
+        self._replayed += 1
+        return existing.view(replayed=True)
+
+    async def submit(self, *, owner_id: str, instruction_id: str, request: RegenerateRequest) -> tuple[RegenerateTask, bool]:
+        """Start a task, or return the one already created for ``client_request_id`` (second item ``True``)."""
+        key = (owner_id, instruction_id, request.client_request_id)
+        replay = self._replay(key)
+        if replay is not None:
+            return replay, True
+
+        instruction = await self._instructions.get_instruction(owner_id=owner_id, instruction_id=instruction_id)
+        index = await self._instructions.get_block_index(
+            owner_id=owner_id,
+            instruction_id=instruction_id,
+            version=instruction.version,
+        )
+
+        # Everything below is synchronous, so no other submit interleaves
+        # between these checks and registering the task.
+        replay = self._replay(key)
+        if replay is not None:
+            return replay, True
+        active = self._active.get(instruction_id)
+        if active is not None:
+            self._rejected_active += 1
+            raise ApiError(
+                status_code=409,
+                code="REGENERATE_IN_PROGRESS",
+                message="A regenerate task is already active for this instruction.",
+                details={"active_task_id": active.id},
+            )
+        if request.base_version != instruction.version:
+            raise ApiError(
+                status_code=409,
+                code="VERSION_CONFLICT",
+                message="Base version is stale; no mutation persisted.",
+                details={"base_version": request.base_version, "current_version": instruction.version},
+            )
+        selection = request.selection
+        char_range = (
+            (selection.char_range.start_offset, selection.char_range.end_offset) if selection.char_range else None
+        )
+        blocks = select_blocks(index, block_id=selection.block_id, char_range=char_range)
+        span = (blocks[0].content_start, blocks[0].end) if selection.block_id is not None else char_range
+        assert span is not None
+
+        now = self._clock()
+        task = _Task(
+            id=str(uuid4()),
+            owner_id=owner_id,
+            job_id=instruction.job_id,
+            instruction_id=instruction_id,
+            client_request_id=request.client_request_id,
+            provenance=RegenerateProvenance(
+                instruction_id=instruction_id,
+                base_version=request.base_version,
+                selection=selection,
+                requested_by=owner_id,
+                requested_at=now,
+                model_profile=request.model_profile,
+                prompt_template_id=request.prompt_template_id,
+                prompt_params_ref=request.prompt_params_ref,
+            ),
+            requested_at=now,
+            updated_at=now,
+        )
+        self._tasks[task.id] = task
+        self._by_request[key] = task
+        self._active[instruction_id] = task
+        self._submitted += 1
+        self._publish(task)
+        task.runner = asyncio.create_task(self._run(task, instruction.markdown, span, request))
+        return task.view(), False
+
+    async def get_task(self, *, owner_id: str, task_id: str) -> RegenerateTask:
+        task = self._tasks.get(task_id)
+        if task is None or task.owner_id != owner_id:
+            raise _not_found()
+        return task.view()
+
+    def _publish(self, task: _Task) -> None:
+        if self._events is None:
+            return
+        data: dict[str, object] = {
+            "task_id": task.id,
+            "instruction_id": task.instruction_id,
+            "status": task.status.value,
+            "progress_pct": task.progress_pct,
+        }
+        if task.instruction_version is not None:
+            data["instruction_version"] = task.instruction_version
+        self._events.publish(task.job_id, REGENERATE_STATUS_EVENT, data)
+
+    def _progress(self, task: _Task, pct: int) -> None:
+        if pct <= task.progress_pct:
+            return
+        task.progress_pct = pct
+        task.updated_at = self._clock()
+        self._publish(task)
+
+    def _fail(self, task: _Task, code: str, message: str, stage: str) -> None:
+        task.status = RegenerateTaskStatus.FAILED
+        task.failure_code, task.failure_message, task.failed_stage = code, message, stage
+        task.updated_at = self._clock()
+        self._failed += 1
+
+    async def _run(self, task: _Task, markdown: str, span: tuple[int, int], request: RegenerateRequest) -> None:
+        start, end = span
+        try:
+            async with self._limiter.slot(task.owner_id):
+                task.status = RegenerateTaskStatus.RUNNING
+                self._progress(task, _PROGRESS_STARTED)
+                self._llm_calls += 1
+                scale = _PROGRESS_GENERATED - _PROGRESS_STARTED
+                fragment = await self._llm.regenerate(
+                    FragmentRequest(
+                        fragment=markdown[start:end].strip(),
+                        context=request.context,
+                        model_profile=request.model_profile,
+                        prompt_template_id=request.prompt_template_id,
+                        prompt_params_ref=request.prompt_params_ref,
+                    ),
+                    lambda done: self._progress(task, _PROGRESS_STARTED + int(scale * min(max(done, 0.0), 1.0))),
+                )
+            updated = await self._instructions.update_instruction(
+                owner_id=task.owner_id,
+                instruction_id=task.instruction_id,
+                base_version=task.provenance.base_version,
+                markdown=_splice(markdown, start, end, fragment),
+            )
+        except LLMError as exc:
+            self._fail(task, exc.code, "The model provider could not regenerate the selection.", "llm")
+        except ApiError as exc:
+            self._fail(task, exc.payload.code, exc.payload.message, "apply")
+        except asyncio.CancelledError:
+            self._fail(task, "CANCELLED", "Regeneration was cancelled.", "llm")
+            raise
+        except Exception:
+            self._fail(task, "REGENERATE_FAILED", "Regeneration failed.", "apply")
+        else:
+            task.status = RegenerateTaskStatus.SUCCEEDED
+            task.instruction_version = updated.version
+            task.progress_pct = 100
+            task.updated_at = self._clock()
+            self._succeeded += 1
+        finally:
+            if self._active.get(task.instruction_id) is task:
+                del self._active[task.instruction_id]
+            task.runner = None
+            self._publish(task)
+            self._retire(task)
+
+    def _retire(self, task: _Task) -> None:
+        self._finished[task.id] = None
+        while len(self._finished) > self._max_finished_tasks:
+            evicted = self._tasks.pop(self._finished.popitem(last=False)[0])
+            self._by_request.pop((evicted.owner_id, evicted.instruction_id, evicted.client_request_id), None)
+
+    def close(self) -> None:
+        """Cancel tasks still queued or running, e.g. on shutdown."""
+        for task in list(self._active.values()):
+            if task.runner is not None and not task.runner.done():
+                try:
+                    task.runner.cancel()
+                except RuntimeError:  # pragma: no cover - the task's loop is already closed
+                    continue
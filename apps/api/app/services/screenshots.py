@@ -0,0 +1,473 @@
+"""Screenshot extraction tasks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+from typing import ParamSpec, TypeVar
+from uuid import uuid4
+
+from app.adapters.media import PRECISE, ExtractionStats, FfmpegError, FrameExtractionPool, FrameSpec
+from app.adapters.storage import ArtifactStorage, StorageError
+from app.core.events import SCREENSHOT_STATUS_EVENT, JobEventBroker
+from app.core.executor import BlockingExecutor
+from app.errors import ApiError
+from app.repositories.base import AsyncRepository
+from app.repositories.frame_cache import CachedFrame, FrameCache, FrameCacheStats, file_sha256, frame_key
+from app.repositories.screenshots import ScreenshotAssetRecord, ScreenshotAssetStore
+from app.schemas.screenshot import (
+    ScreenshotAsset,
+    ScreenshotAssetKind,
+    ScreenshotDerivative,
+    ScreenshotExtractionRequest,
+    ScreenshotTask,
+    ScreenshotTaskOperation,
+    ScreenshotTaskStatus,
+)
+from app.services.derivatives import DerivativeService
+from app.services.instructions import InstructionService, select_blocks
+from app.services.video_index import VideoIndexService
+
+# A task is PENDING while its request waits for the batch window and a
+# worker; it jumps to this once its decode pass starts.
+_PROGRESS_DECODING = 10
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+MIME_TYPES = {"png": "image/png", "jpg": "image/jpeg", "webp": "image/webp"}
+
+
+def _not_found() -> ApiError:
+    return ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
+
+
+def _invalid(message: str) -> ApiError:
+    return ApiError(status_code=400, code="VALIDATION_ERROR", message=message)
+
+
+def extraction_key(job_id: str, request: ScreenshotExtractionRequest) -> str:
+    """Canonical replay key of an extraction request (ADR-001)."""
+    return "|".join(
+        (
+            job_id,
+            request.instruction_version_id,
+            str(request.timestamp_ms),
+            str(request.offset_ms),
+            request.strategy.value,
+            request.format.value,
+        )
+    )
+
+
+def to_asset(record: ScreenshotAssetRecord, derivatives: list[ScreenshotDerivative] | None = None) -> ScreenshotAsset:
+    return ScreenshotAsset(
+        id=record.id,
+        anchor_id=record.anchor_id,
+        version=record.version,
+        kind=record.kind,
+        previous_asset_id=record.previous_asset_id,
+        image_uri=record.image_uri,
+        mime_type=record.mime_type,
+        width=record.width,
+        height=record.height,
+        extraction_key=record.extraction_key,
+        checksum_sha256=record.checksum_sha256,
+        upload_id=record.upload_id,
+        ops_hash=record.ops_hash,
+        rendered_from_asset_id=record.rendered_from_asset_id,
+        is_deleted=record.is_deleted,
+        created_at=record.created_at,
+        derivatives=derivatives or [],
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ScreenshotStats:
+    submitted: int
+    replayed: int
+    succeeded: int
+    failed: int
+    extraction: ExtractionStats
+    cache: FrameCacheStats
+
+
+@dataclass(slots=True)
+class _Task:
+    id: str
+    owner_id: str
+    job_id: str
+    anchor_id: str
+    extraction_key: str
+    idempotency_key: str | None
+    extracted_at_ms: int
+    status: ScreenshotTaskStatus = ScreenshotTaskStatus.PENDING
+    progress_pct: int = 0
+    asset_id: str | None = None
+    failure_code: str | None = None
+    failure_message: str | None = None
+    runner: asyncio.Task[None] | None = field(default=None, repr=False)
+
+    def view(self, *, replayed: bool = False) -> ScreenshotTask:
+        return ScreenshotTask(
+            task_id=self.id,
+            operation=ScreenshotTaskOperation.EXTRACT,
+            status=self.status,
+            progress_pct=self.progress_pct,
+            anchor_id=self.anchor_id,
+            asset_id=self.asset_id,
+            extracted_at_ms=self.extracted_at_ms,
+            failure_code=self.failure_code,
+            failure_message=self.failure_message,
+            replayed=replayed,
+        )
+
+
+class ScreenshotService:
+    """Runs extraction tasks against the shared ``FrameExtractionPool``.
+
+    Requests are validated up front; the frame itself is extracted in the
+    background, where the pool batches it with other requests for the same
+    video. Frames are cached by video content, effective timestamp,
+    strategy and format in ``cache``, so re-extracting a frame already seen
+    (an editor nudging the offset back and forth) links the cached file
+    without touching the video; concurrent misses for one frame share a
+    single extraction. With ``indexes``, the requested time is first snapped
+    to the frame (or keyframe) that will actually be extracted, so nearby
+    requests share a cache entry and ``extracted_at_ms`` is exact, and
+    precise passes seek to the keyframe before their first frame. With
+    ``derivatives``, every new asset gets thumbnail and preview renditions
+    generated in the background, listed on the asset once they exist.
+
+    A repeated ``idempotency_key``, or a repeat of the canonical extraction
+    key, returns the existing task. A failed task no longer answers for its
+    canonical key, so an identical request retries it. Finished tasks are
+    kept for polling, least-recently-finished evicted past
+    ``max_finished_tasks``.
+    """
+
+    def __init__(
+        self,
+        store: AsyncRepository,
+        instructions: InstructionService,
+        storage: ArtifactStorage,
+        pool: FrameExtractionPool,
+        cache: FrameCache,
+        *,
+        output_root: str | Path,
+        assets: ScreenshotAssetStore | None = None,
+        indexes: VideoIndexService | None = None,
+        derivatives: DerivativeService | None = None,
+        events: JobEventBroker | None = None,
+        executor: BlockingExecutor | None = None,
+        max_finished_tasks: int = 10_000,
+    ) -> None:
+        self._store = store
+        self._instructions = instructions
+        self._storage = storage
+        self._pool = pool
+        self._cache = cache
+        self._output_root = Path(output_root).resolve()
+        self._assets = assets if assets is not None else ScreenshotAssetStore()
+        self._indexes = indexes
+        self._derivatives = derivatives
+        self._events = events
+        self._executor = executor
+        self._max_finished_tasks = max_finished_tasks
+        self._tasks: dict[str, _Task] = {}
+        self._by_idempotency_key: dict[tuple[str, str], _Task] = {}
+        self._by_extraction_key: dict[tuple[str, str], _Task] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        # Content hashes by (path, size, mtime) of videos without an index,
+        # which otherwise carries the hash computed at upload.
+        self._video_checksums: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[object]] = {}
+        # Tasks waiting on each frame extraction, and the extractions whose pass has started.
+        self._waiting: dict[str, list[_Task]] = {}
+        self._decoding: set[str] = set()
+        self._submitted = 0
+        self._replayed = 0
+        self._succeeded = 0
+        self._failed = 0
+
+    @property
+    def stats(self) -> ScreenshotStats:
+        return ScreenshotStats(
+            submitted=self._submitted,
+            replayed=self._replayed,
+            succeeded=self._succeeded,
+            failed=self._failed,
+            extraction=self._pool.stats,
+            cache=self._cache.stats,
+        )
+
+    def _replay(self, owner_id: str, key: str, idempotency_key: str | None) -> ScreenshotTask | None:
+        existing = None
+        if idempotency_key is not None:
+            existing = self._by_idempotency_key.get((owner_id, idempotency_key))
+        if existing is None:
+            existing = self._by_extraction_key.get((owner_id, key))
+        if existing is None:
+            return None
+        self._replayed += 1
+        return existing.view(replayed=True)
+
+    async def extract(
+        self,
+        *,
+        owner_id: str,
+        job_id: str,
+        request: ScreenshotExtractionRequest,
+    ) -> tuple[ScreenshotTask, bool]:
+        """Start an extraction task, or return the matching existing one (second item ``True``)."""
+        key = extraction_key(job_id, request)
+        replay = self._replay(owner_id, key, request.idempotency_key)
+        if replay is not None:
+            return replay, True
+
+        job = await self._store.get_job(job_id)
+        if job is None or job.owner_id != owner_id:
+            raise _not_found()
+        prefix, _, number = request.instruction_version_id.rpartition(":")
+        if prefix != request.instruction_id or not number.isdigit():
+            raise _invalid("instruction_version_id does not name a version of instruction_id.")
+        instruction = await self._instructions.get_instruction(
+            owner_id=owner_id,
+            instruction_id=request.instruction_id,
+            version=int(number),
+        )
+        if instruction.job_id != job_id:
+            raise _not_found()
+        if request.block_id is not None or request.char_range is not None:
+            index = await self._instructions.get_block_index(
+                owner_id=owner_id,
+                instruction_id=request.instruction_id,
+                version=instruction.version,
+            )
+            char_range = (request.char_range.start_offset, request.char_range.end_offset) if request.char_range else None
+            select_blocks(index, block_id=request.block_id, char_range=char_range)
+        effective_ms = request.timestamp_ms + request.offset_ms
+        if effective_ms < 0:
+            raise _invalid("timestamp_ms + offset_ms must not be negative.")
+
+        # No awaits from here on, so no other request interleaves between
+        # the replay check and registering the task.
+        replay = self._replay(owner_id, key, request.idempotency_key)
+        if replay is not None:
+            return replay, True
+        task = _Task(
+            id=str(uuid4()),
+            owner_id=owner_id,
+            job_id=job_id,
+            anchor_id=request.anchor_id or str(uuid4()),
+            extraction_key=key,
+            idempotency_key=request.idempotency_key,
+            extracted_at_ms=effective_ms,
+        )
+        self._tasks[task.id] = task
+        self._by_extraction_key[(owner_id, key)] = task
+        if request.idempotency_key is not None:
+            self._by_idempotency_key[(owner_id, request.idempotency_key)] = task
+        self._submitted += 1
+        self._publish(task)
+        task.runner = asyncio.create_task(
+            self._run(task, job.manifest.get("video_uri"), request.strategy.value, request.format.value)
+        )
+        return task.view(), False
+
+    async def get_task(self, *, owner_id: str, task_id: str) -> ScreenshotTask:
+        task = self._tasks.get(task_id)
+        if task is None or task.owner_id != owner_id:
+            raise _not_found()
+        return task.view()
+
+    async def get_asset(self, *, owner_id: str, asset_id: str) -> ScreenshotAsset:
+        record = self._assets.get(asset_id)
+        if record is None or record.owner_id != owner_id:
+            raise _not_found()
+        if self._derivatives is None:
+            return to_asset(record)
+        return to_asset(record, await self._derivatives.for_asset(record))
+
+    def _publish(self, task: _Task) -> None:
+        if self._events is None:
+            return
+        data: dict[str, object] = {
+            "task_id": task.id,
+            "anchor_id": task.anchor_id,
+            "status": task.status.value,
+            "progress_pct": task.progress_pct,
+        }
+        if task.asset_id is not None:
+            data["asset_id"] = task.asset_id
+        self._events.publish(task.job_id, SCREENSHOT_STATUS_EVENT, data)
+
+    def _started(self, task: _Task) -> None:
+        task.status = ScreenshotTaskStatus.RUNNING
+        task.progress_pct = _PROGRESS_DECODING
+        self._publish(task)
+
+    def _pass_started(self, key: str) -> None:
+        self._decoding.add(key)
+        for task in self._waiting.get(key, ()):
+            self._started(task)
+
+    def _fail(self, task: _Task, code: str, message: str) -> None:
+        task.status = ScreenshotTaskStatus.FAILED
+        task.failure_code, task.failure_message = code, message
+        self._failed += 1
+
+    def _video_path(self, uri: str | None) -> Path | None:
+        if not uri:
+            return None
+        try:
+            return self._storage.local_path(uri)
+        except StorageError:
+            return None
+
+    async def _blocking(self, fn: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        if self._executor is None:
+            return fn(*args, **kwargs)
+        return await self._executor.run(fn, *args, **kwargs)
+
+    async def _single_flight(self, key: str, start: Callable[[], Awaitable[_T]]) -> _T:
+        # Callers share one run; cancelling a caller does not cancel it.
+        shared = self._inflight.get(key)
+        if shared is None:
+            shared = asyncio.ensure_future(start())
+            self._inflight[key] = shared
+            shared.add_done_callback(lambda done: self._settled(key, done))
+        return await asyncio.shield(shared)  # type: ignore[return-value]
+
+    def _settled(self, key: str, done: asyncio.Task[object]) -> None:
+        if self._inflight.get(key) is done:
+            del self._inflight[key]
+        if not done.cancelled():
+            done.exception()  # Retrieved here in case every caller was cancelled.
+
+    async def _video_checksum(self, video: Path) -> str:
+        stat = await self._blocking(os.stat, video)
+        key = (str(video), stat.st_size, stat.st_mtime_ns)
+        checksum = self._video_checksums.get(key)
+        if checksum is None:
+            checksum = await self._single_flight(f"video:{key}", lambda: self._blocking(file_sha256, video))
+            self._video_checksums[key] = checksum
+            while len(self._video_checksums) > 1024:
+                self._video_checksums.popitem(last=False)
+        return checksum
+
+    async def _extract_into_cache(self, video: Path, key: str, frame: FrameSpec) -> None:
+        try:
+            result = await self._pool.extract(str(video), frame, started=lambda: self._pass_started(key))
+            await self._blocking(self._cache.put, key, frame.format, result.output_path, result.width, result.height)
+        finally:
+            self._decoding.discard(key)
+
+    async def _frame(
+        self,
+        task: _Task,
+        video: Path,
+        strategy: str,
+        format: str,
+        seek_ms: int | None,
+        video_checksum: str | None,
+    ) -> CachedFrame | None:
+        if video_checksum is None:
+            video_checksum = await self._video_checksum(video)
+        key = frame_key(video_checksum, task.extracted_at_ms, strategy, format)
+        # Assets get their own link to the cached file, so eviction never removes an asset's image.
+        dest = self._output_root / task.job_id / f"{key}.{format}"
+        cached = await self._blocking(self._cache.checkout, key, dest)
+        if cached is not None:
+            return cached
+        frame = FrameSpec(task.extracted_at_ms, strategy, format, str(self._cache.staging_path(key, format)), seek_ms)
+        # Every task sharing the extraction reports RUNNING when its pass starts.
+        waiting = self._waiting.setdefault(key, [])
+        waiting.append(task)
+        if key in self._decoding:
+            self._started(task)
+        try:
+            await self._single_flight(key, lambda: self._extract_into_cache(video, key, frame))
+        finally:
+            waiting.remove(task)
+            if not waiting:
+                del self._waiting[key]
+        return await self._blocking(self._cache.checkout, key, dest, record=False)
+
+    async def _run(self, task: _Task, video_uri: str | None, strategy: str, format: str) -> None:
+        try:
+            video = self._video_path(video_uri)
+            if video is None or not await self._blocking(video.is_file):
+                self._fail(task, "VIDEO_NOT_READY", "The job's video is not available for extraction.")
+                return
+            seek_ms = None
+            index = await self._indexes.index(video) if self._indexes is not None else None
+            if index is not None:
+                snapped = index.snap_ms(task.extracted_at_ms, strategy)
+                if snapped is None:
+                    self._fail(task, "FRAME_NOT_FOUND", "No frame at the requested timestamp.")
+                    return
+                task.extracted_at_ms = snapped
+                if strategy == PRECISE:
+                    seek_ms = index.preseek_ms(snapped)
+            checksum = index.checksum if index is not None else None
+            cached = await self._frame(task, video, strategy, format, seek_ms, checksum)
+            if cached is None:
+                self._fail(task, "SCREENSHOT_FAILED", "Screenshot extraction failed.")
+                return
+            asset = self._assets.create(
+                job_id=task.job_id,
+                owner_id=task.owner_id,
+                anchor_id=task.anchor_id,
+                kind=ScreenshotAssetKind.EXTRACTED,
+                image_uri=cached.path.as_uri(),
+                mime_type=MIME_TYPES[format],
+                width=cached.width,
+                height=cached.height,
+                extraction_key=task.extraction_key,
+                checksum_sha256=cached.checksum_sha256,
+            )
+        except FfmpegError as exc:
+            self._fail(task, exc.code, f"{exc}.")
+        except asyncio.CancelledError:
+            self._fail(task, "CANCELLED", "Extraction was cancelled.")
+            raise
+        except Exception:
+            self._fail(task, "SCREENSHOT_FAILED", "Screenshot extraction failed.")
+        else:
+            task.status = ScreenshotTaskStatus.SUCCEEDED
+            task.asset_id = asset.id
+            task.progress_pct = 100
+            self._succeeded += 1
+            if self._derivatives is not None:
+                self._derivatives.schedule(asset)
+        finally:
+            task.runner = None
+            self._publish(task)
+            self._retire(task)
+
+    def _retire(self, task: _Task) -> None:
+        key = (task.owner_id, task.extraction_key)
+        if task.status is ScreenshotTaskStatus.FAILED and self._by_extraction_key.get(key) is task:
+            del self._by_extraction_key[key]
+        self._finished[task.id] = None
+        while len(self._finished) > self._max_finished_tasks:
+            evicted = self._tasks.pop(self._finished.popitem(last=False)[0])
+            if self._by_extraction_key.get((evicted.owner_id, evicted.extraction_key)) is evicted:
+                del self._by_extraction_key[(evicted.owner_id, evicted.extraction_key)]
+            if evicted.idempotency_key is not None:
+                self._by_idempotency_key.pop((evicted.owner_id, evicted.idempotency_key), None)
+
+    def close(self) -> None:
+        """Cancel running tasks and stop the extraction workers, e.g. on shutdown."""
+        for task in self._tasks.values():
+            if task.runner is not None and not task.runner.done():
+                try:
+                    task.runner.cancel()
+                except RuntimeError:  # pragma: no cover - the task's loop is already closed
+                    continue
+        self._pool.shutdown()
@@ -0,0 +1,260 @@
+"""Streaming transcript ingestion from workflow artifacts."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import io
+import json
+import threading
+from typing import Any, TextIO
+
+from app.adapters.storage import ArtifactNotFoundError, ArtifactStorage, StorageError
+from app.errors import ApiError
+from app.repositories.transcript_index import TranscriptIndex, TranscriptIndexCache
+from app.repositories.transcripts import TranscriptBuilder, TranscriptStore
+
+# Segment times are held in signed 32-bit arrays (~596 hours).
+MAX_SEGMENT_MS = 2**31 - 1
+
+_WHITESPACE = " \t\r\n"
+_DECODER = json.JSONDecoder()
+
+
+class TranscriptFormatError(ValueError):
+    """Raised when a segment file is malformed; ``segment_index`` is the offending segment."""
+
+    def __init__(self, message: str, segment_index: int) -> None:
+        super().__init__(message)
+        self.segment_index = segment_index
+
+
+class _TextBuffer:
+    """Sliding window over a text stream holding at most one segment plus one chunk."""
+
+    __slots__ = ("_stream", "_chunk_chars", "_max_segment_chars", "_buf", "_pos")
+
+    def __init__(self, stream: TextIO, chunk_chars: int, max_segment_chars: int) -> None:
+        self._stream = stream
+        self._chunk_chars = chunk_chars
+        self._max_segment_chars = max_segment_chars
+        self._buf = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        chunk = self._stream.read(self._chunk_chars)
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _check_pending(self, index: int) -> None:
+        if len(self._buf) - self._pos > self._max_segment_chars:
+            raise TranscriptFormatError("segment exceeds the maximum encoded size", index)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or ``""`` at end of stream."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def skip(self) -> None:
+        self._pos += 1
+
+    def line(self, index: int) -> str | None:
+        while True:
+            end = self._buf.find("\n", self._pos)
+            if end >= 0:
+                line, self._pos = self._buf[self._pos : end], end + 1
+                return line
+            self._check_pending(index)
+            if not self._fill():
+                if self._pos >= len(self._buf):
+                    return None
+                line, self._pos = self._buf[self._pos :], len(self._buf)
+                return line
+
+    def value(self, index: int) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, self._pos = _DECODER.raw_decode(self._buf, self._pos)
+                return value
+            except json.JSONDecodeError:
+                # Usually a value cut at the chunk boundary: read more and retry.
+                self._check_pending(index)
+                if not self._fill():
+                    raise TranscriptFormatError("segment is not valid JSON", index) from None
+
+
+def _segment(value: Any, index: int, previous_start: int) -> tuple[int, int, str]:
+    if not isinstance(value, dict):
+        raise TranscriptFormatError("segment must be a JSON object", index)
+    start_ms, end_ms, text = value.get("start_ms"), value.get("end_ms"), value.get("text")
+    if type(start_ms) is not int or type(end_ms) is not int or not isinstance(text, str):
+        raise TranscriptFormatError("segment requires integer start_ms/end_ms and string text", index)
+    if not 0 <= start_ms <= end_ms <= MAX_SEGMENT_MS:
+        raise TranscriptFormatError("segment must satisfy 0 <= start_ms <= end_ms", index)
+    if start_ms < previous_start:
+        raise TranscriptFormatError("segments must be ordered by start_ms", index)
+    return start_ms, end_ms, text
+
+
+def iter_transcript_segments(
+    stream: TextIO,
+    *,
+    chunk_chars: int = 64 * 1024,
+    max_segment_chars: int = 64 * 1024,
+) -> Iterator[tuple[int, int, str]]:
+    """Yield validated ``(start_ms, end_ms, text)`` from an NDJSON or JSON-array segment file.
+
+    The format is detected from the first non-whitespace character. The file
+    is read ``chunk_chars`` at a time and never held whole, so the working
+    set is bounded by ``chunk_chars + max_segment_chars`` whatever its length.
+    """
+    buffer = _TextBuffer(stream, chunk_chars, max_segment_chars)
+    previous_start = 0
+    index = 0
+
+    if buffer.peek() != "[":
+        while (line := buffer.line(index)) is not None:
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError:
+                raise TranscriptFormatError("segment is not valid JSON", index) from None
+            segment = _segment(value, index, previous_start)
+            previous_start = segment[0]
+            index += 1
+            yield segment
+        return
+
+    buffer.skip()
+    if buffer.peek() == "]":
+        buffer.skip()
+    else:
+        while True:
+            segment = _segment(buffer.value(index), index, previous_start)
+            previous_start = segment[0]
+            index += 1
+            yield segment
+            separator = buffer.peek()
+            buffer.skip()
+            if separator == "]":
+                break
+            if separator != ",":
+                raise TranscriptFormatError("expected ',' or ']' after segment", index)
+    if buffer.peek():
+        raise TranscriptFormatError("unexpected data after the segment array", index)
+
+
+def _ingest_failed(reason: str, segment_index: int | None = None) -> ApiError:
+    details: dict[str, Any] = {"reason": reason}
+    if segment_index is not None:
+        details["segment_index"] = segment_index
+    return ApiError(
+        status_code=422,
+        code="TRANSCRIPT_INGEST_FAILED",
+        message="Transcript artifact could not be ingested.",
+        details=details,
+    )
+
+
+def _append(builder: TranscriptBuilder, index: TranscriptIndex | None, batch: list[tuple[int, int, str]]) -> None:
+    builder.extend(batch)
+    if index is not None:
+        for _, _, text in batch:
+            index.add(text)
+
+
+class TranscriptIngestor:
+    """Streams a job's segment file from storage into its ``TranscriptStore`` entry.
+
+    Segments are validated as they are parsed and appended to a builder in
+    batches of ``batch_size``; the finished transcript replaces the job's
+    entry only once the whole file has been read, so readers never see a
+    partial transcript. Re-ingesting the URI a job's transcript already came
+    from is a no-op, which makes callback replays cheap. With ``indexes``
+    the job's search index is built batch by batch alongside the transcript
+    and cached with it.
+    """
+
+    def __init__(
+        self,
+        storage: ArtifactStorage,
+        transcripts: TranscriptStore,
+        *,
+        indexes: TranscriptIndexCache | None = None,
+        batch_size: int = 1024,
+        chunk_chars: int = 64 * 1024,
+        max_segment_chars: int = 64 * 1024,
+    ) -> None:
+        if batch_size < 1 or chunk_chars < 1 or max_segment_chars < 1:
+            raise ValueError("batch_size, chunk_chars and max_segment_chars must be positive")
+        self._storage = storage
+        self._transcripts = transcripts
+        self._indexes = indexes
+        self._batch_size = batch_size
+        self._chunk_chars = chunk_chars
+        self._max_segment_chars = max_segment_chars
+        self._counter_lock = threading.Lock()
+        self.ingested = 0
+        self.failed = 0
+
+    @property
+    def blocking(self) -> bool:
+        return self._storage.blocking
+
+    def ingest(self, job_id: str, uri: str) -> bool:
+        """Load ``uri`` as ``job_id``'s transcript; returns ``False`` when it is already current."""
+        if self._transcripts.get(job_id) is not None and self._transcripts.source_uri(job_id) == uri:
+            return False
+
+        index = TranscriptIndex() if self._indexes is not None else None
+        try:
+            builder = self._read(uri, index)
+        except ApiError:
+            with self._counter_lock:
+                self.failed += 1
+            raise
+
+        transcript = builder.build()
+        self._transcripts.put(job_id, transcript, source_uri=uri)
+        if self._indexes is not None and index is not None:
+            self._indexes.put(job_id, transcript, index)
+        with self._counter_lock:
+            self.ingested += 1
+        return True
+
+    def _read(self, uri: str, index: TranscriptIndex | None) -> TranscriptBuilder:
+        builder = TranscriptBuilder()
+        batch: list[tuple[int, int, str]] = []
+        try:
+            with self._storage.open(uri) as raw, io.TextIOWrapper(raw, encoding="utf-8") as text:
+                segments = iter_transcript_segments(
+                    text,
+                    chunk_chars=self._chunk_chars,
+                    max_segment_chars=self._max_segment_chars,
+                )
+                for segment in segments:
+                    batch.append(segment)
+                    if len(batch) >= self._batch_size:
+                        _append(builder, index, batch)
+                        batch.clear()
+        except TranscriptFormatError as exc:
+            raise _ingest_failed(str(exc), exc.segment_index) from exc
+        except UnicodeDecodeError as exc:
+            raise _ingest_failed("transcript artifact is not valid UTF-8") from exc
+        except ArtifactNotFoundError as exc:
+            raise _ingest_failed("transcript artifact not found") from exc
+        except StorageError as exc:
+            raise _ingest_failed(str(exc)) from exc
+        except OSError as exc:
+            raise _ingest_failed("transcript artifact could not be read") from exc
+        _append(builder, index, batch)
+        return builder
@@ -0,0 +1,152 @@
+"""Transcript service layer."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+
+from app.core.executor import BlockingExecutor
+from app.errors import ApiError
+from app.repositories.base import AsyncRepository
+from app.repositories.transcript_index import TranscriptIndex, TranscriptIndexCache
+from app.repositories.transcripts import CompactTranscript, TranscriptStore
+from app.schemas.job import JobStatus
+from app.schemas.transcript import TranscriptPage, TranscriptSearchHit, TranscriptSearchResponse, TranscriptSegment
+from app.services.pagination import DEFAULT_PAGE_LIMIT
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+MAX_SEARCH_QUERY_LENGTH = 256
+
+TRANSCRIPT_READABLE_STATUSES = frozenset(
+    {
+        JobStatus.TRANSCRIPT_READY,
+        JobStatus.GENERATING,
+        JobStatus.DRAFT_READY,
+        JobStatus.EDITING,
+        JobStatus.EXPORTING,
+        JobStatus.DONE,
+        JobStatus.FAILED,
+    }
+)
+
+
+def _not_found() -> ApiError:
+    return ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
+
+
+def _not_ready(status: JobStatus) -> ApiError:
+    return ApiError(
+        status_code=409,
+        code="TRANSCRIPT_NOT_READY",
+        message="Transcript is not available for this job state.",
+        details={"current_status": status.value},
+    )
+
+
+def _invalid_cursor() -> ApiError:
+    return ApiError(status_code=400, code="VALIDATION_ERROR", message="Invalid pagination cursor")
+
+
+def encode_segment_cursor(start_ms: int, index: int) -> str:
+    """Encode the position of the last segment on a page as an opaque URL-safe token."""
+    return base64.urlsafe_b64encode(f"{start_ms}|{index}".encode()).decode().rstrip("=")
+
+
+def decode_segment_cursor(cursor: str) -> tuple[int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_text, index_text = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        start_ms, index = int(start_text), int(index_text)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise _invalid_cursor() from exc
+
+    if start_ms < 0 or index < 0:
+        raise _invalid_cursor()
+    return start_ms, index
+
+
+def transcript_page(transcript: CompactTranscript, *, limit: int, cursor: str | None) -> TranscriptPage:
+    """Slice one page out of ``transcript``; only the returned segments are materialized."""
+    start = transcript.resume_index(*decode_segment_cursor(cursor)) if cursor else 0
+    stop = min(start + limit, len(transcript))
+    items = [
+        TranscriptSegment.model_construct(start_ms=segment.start_ms, end_ms=segment.end_ms, text=segment.text)
+        for segment in transcript.segments(start, stop)
+    ]
+    next_cursor = None
+    if stop < len(transcript):
+        next_cursor = encode_segment_cursor(transcript.start_ms(stop - 1), stop - 1)
+    return TranscriptPage(items=items, limit=limit, next_cursor=next_cursor)
+
+
+class TranscriptService:
+    """Reads owned jobs' transcripts; search indexes evicted from ``indexes`` are rebuilt on demand."""
+
+    def __init__(
+        self,
+        store: AsyncRepository,
+        transcripts: TranscriptStore,
+        indexes: TranscriptIndexCache | None = None,
+        executor: BlockingExecutor | None = None,
+    ) -> None:
+        self._store = store
+        self._transcripts = transcripts
+        self._indexes = indexes if indexes is not None else TranscriptIndexCache()
+        self._executor = executor
+
+    async def readable_transcript(self, owner_id: str, job_id: str) -> CompactTranscript:
+        """The owned job's transcript; 404 for unknown or foreign jobs, 409 before it is ready."""
+        record = await self._store.get_job(job_id)
+        if record is None or record.owner_id != owner_id:
+            raise _not_found()
+        if record.status not in TRANSCRIPT_READABLE_STATUSES:
+            raise _not_ready(record.status)
+
+        transcript = self._transcripts.get(job_id)
+        if transcript is None:
+            # The state machine says the transcript exists but it was never stored here.
+            raise _not_ready(record.status)
+        return transcript
+
+    async def get_transcript(
+        self,
+        *,
+        owner_id: str,
+        job_id: str,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        cursor: str | None = None,
+    ) -> TranscriptPage:
+        transcript = await self.readable_transcript(owner_id, job_id)
+        return transcript_page(transcript, limit=limit, cursor=cursor)
+
+    async def search_transcript(
+        self,
+        *,
+        owner_id: str,
+        job_id: str,
+        query: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> TranscriptSearchResponse:
+        transcript = await self.readable_transcript(owner_id, job_id)
+        index = self._indexes.get(job_id, transcript)
+        if index is None:
+            # Rebuilding a long transcript's index is CPU-bound; keep it off the event loop.
+            if self._executor is None:
+                index = TranscriptIndex.build(transcript)
+            else:
+                index = await self._executor.run(TranscriptIndex.build, transcript)
+            self._indexes.put(job_id, transcript, index)
+
+        items = []
+        for segment_id, score in index.search(query, limit):
+            segment = transcript.segment(segment_id)
+            items.append(
+                TranscriptSearchHit.model_construct(
+                    start_ms=segment.start_ms,
+                    end_ms=segment.end_ms,
+                    text=segment.text,
+                    score=score,
+                )
+            )
+        return TranscriptSearchResponse(items=items, limit=limit)
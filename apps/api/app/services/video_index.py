@@ -0,0 +1,151 @@
+"""Per-video frame timing indexes: built on upload, read by screenshot extraction."""
+
+from __future__ import annotations
+
+from array import array
+import asyncio
+from collections.abc import Callable
+import os
+from pathlib import Path
+
+from app.adapters.media import FfmpegError, probe_frame_times
+from app.adapters.storage import ArtifactStorage, StorageError
+from app.core.executor import BlockingExecutor
+from app.errors import ApiError
+from app.repositories.base import AsyncRepository
+from app.repositories.frame_cache import file_sha256
+from app.repositories.frame_index import VideoFrameIndex, VideoFrameIndexCache, index_path
+
+Prober = Callable[[str, str, float], tuple[array, array]]
+
+
+def _not_found() -> ApiError:
+    return ApiError(status_code=404, code="RESOURCE_NOT_FOUND", message="Resource not found")
+
+
+def _video_not_ready() -> ApiError:
+    return ApiError(status_code=409, code="VIDEO_NOT_READY", message="The job's video has not been indexed.")
+
+
+class VideoIndexService:
+    """Builds each video's ``VideoFrameIndex`` once and serves it from memory or disk.
+
+    ``schedule`` starts a background build when a job reaches UPLOADED; the
+    build also hashes the video once, and the index is written beside it
+    (``<name>.frames``) with that checksum, stamped with the video's size
+    and mtime, so it survives restarts and is rebuilt if the video
+    changes. ``index`` returns the cached, persisted or in-flight index,
+    building on demand for videos uploaded before indexing existed. A
+    failed probe is not retried for the same file until restart; callers
+    fall back to unindexed extraction.
+    """
+
+    def __init__(
+        self,
+        store: AsyncRepository,
+        storage: ArtifactStorage,
+        *,
+        ffprobe_path: str = "ffprobe",
+        timeout_seconds: float = 600.0,
+        cache: VideoFrameIndexCache | None = None,
+        executor: BlockingExecutor | None = None,
+        prober: Prober = probe_frame_times,
+    ) -> None:
+        self._store = store
+        self._storage = storage
+        self._ffprobe_path = ffprobe_path
+        self._timeout = timeout_seconds
+        self._cache = cache if cache is not None else VideoFrameIndexCache()
+        self._executor = executor
+        self._prober = prober
+        self._building: dict[tuple[str, int, int], asyncio.Task[VideoFrameIndex | None]] = {}
+        self._failed: set[tuple[str, int, int]] = set()
+        self.built = 0
+        self.loaded = 0
+        self.failures = 0
+
+    def _local_video(self, uri: str | None) -> Path | None:
+        if not uri:
+            return None
+        try:
+            return self._storage.local_path(uri)
+        except StorageError:
+            return None
+
+    def schedule(self, video_uri: str) -> None:
+        """Index ``video_uri`` in the background; remote or missing videos are skipped."""
+        video = self._local_video(video_uri)
+        if video is not None:
+            task = asyncio.get_running_loop().create_task(self.index(video))
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    def _load_or_build(self, video: Path, size: int, mtime_ns: int) -> tuple[VideoFrameIndex, bool]:
+        path = index_path(video)
+        index = VideoFrameIndex.load(path, video_size=size, video_mtime_ns=mtime_ns)
+        if index is not None:
+            return index, False
+        frames, keyframes = self._prober(self._ffprobe_path, str(video), self._timeout)
+        index = VideoFrameIndex(frames, keyframes, file_sha256(video))
+        index.save(path, video_size=size, video_mtime_ns=mtime_ns)
+        return index, True
+
+    async def _build(self, key: tuple[str, int, int], video: Path) -> VideoFrameIndex | None:
+        try:
+            if self._executor is None:
+                index, built = self._load_or_build(video, key[1], key[2])
+            else:
+                index, built = await self._executor.run(self._load_or_build, video, key[1], key[2])
+        except (FfmpegError, OSError, ValueError):
+            self._failed.add(key)
+            self.failures += 1
+            return None
+        finally:
+            self._building.pop(key, None)
+        if built:
+            self.built += 1
+        else:
+            self.loaded += 1
+        self._cache.put(key, index)
+        return index
+
+    async def index(self, video: Path) -> VideoFrameIndex | None:
+        """The index of the local file ``video``, or ``None`` if it cannot be probed."""
+        try:
+            stat = os.stat(video) if self._executor is None else await self._executor.run(os.stat, video)
+        except OSError:
+            return None
+        key = (str(video), stat.st_size, stat.st_mtime_ns)
+        index = self._cache.get(key)
+        if index is not None or key in self._failed:
+            return index
+        task = self._building.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._build(key, video))
+            self._building[key] = task
+        return await asyncio.shield(task)
+
+    async def _job_index(self, owner_id: str, job_id: str) -> VideoFrameIndex:
+        job = await self._store.get_job(job_id)
+        if job is None or job.owner_id != owner_id:
+            raise _not_found()
+        video = self._local_video(job.manifest.get("video_uri"))
+        index = await self.index(video) if video is not None else None
+        if index is None:
+            raise _video_not_ready()
+        return index
+
+    async def snap(self, *, owner_id: str, job_id: str, timestamp_ms: int, strategy: str) -> int | None:
+        """Timestamp of the frame ``strategy`` would extract at ``timestamp_ms``; ``None`` past the end."""
+        return (await self._job_index(owner_id, job_id)).snap_ms(timestamp_ms, strategy)
+
+    async def step(self, *, owner_id: str, job_id: str, timestamp_ms: int, frames: int) -> int:
+        """Timestamp of the frame ``frames`` away from the one at ``timestamp_ms`` (next: 1, previous: -1)."""
+        return (await self._job_index(owner_id, job_id)).step_ms(timestamp_ms, frames)
+
+    def close(self) -> None:
+        """Cancel background builds, e.g. on shutdown."""
+        for task in list(self._building.values()):
+            try:
+                task.cancel()
+            except RuntimeError:  # pragma: no cover - the task's loop is already closed
+                continue
@@ -0,0 +1,4 @@
+"""Standalone benchmark scripts.
+
+Run from ``apps/api`` with ``python3 -m benchmarks.<module>``.
+"""
@@ -0,0 +1,102 @@
+"""Batch anchor resolution versus resolving each anchor against fresh markdown.
+
+Usage: ``python3 -m benchmarks.bench_anchor_resolution [anchors] [blocks]``
+(defaults to 500 anchors on a 2000-block document).
+
+The target version edits 5% of the blocks, drops 2%, re-issues the markers
+of another 2% and inserts new blocks at the top so every offset moves. 60%
+of the anchors address a ``block_id`` and the rest a ``char_range`` inside
+one block. The per-anchor baseline parses both versions for every anchor;
+the batch run diffs the cached block indexes once and classifies every
+anchor against that diff (reported with and without building the indexes).
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+import random
+import sys
+import time
+
+from app.repositories.block_index import BlockIndex
+from app.schemas.anchor import AnchorAddress, AnchorResolution, CharRange
+from app.services.anchor_resolution import AnchorResolver
+
+_BASELINE_SAMPLE = 25
+
+
+def _id(n: int) -> str:
+    return f"00000000-0000-4000-8000-{n:012d}"
+
+
+def _render(blocks: list[tuple[int, str]]) -> str:
+    return "# Guide\n\n" + "".join(f"<!-- block:{_id(n)} -->\n{text}\n\n" for n, text in blocks)
+
+
+def _versions(blocks: int, rng: random.Random) -> tuple[str, str]:
+    source = [(n, f"## Step {n}\n\nOpen the panel, select item {n} and confirm the export settings.") for n in range(blocks)]
+    target: list[tuple[int, str]] = [(blocks + 10_000 + n, f"Intro paragraph {n}.") for n in range(3)]
+    for n, text in source:
+        roll = rng.random()
+        if roll < 0.02:
+            continue
+        if roll < 0.04:
+            target.append((blocks + n, text))
+        elif roll < 0.09:
+            target.append((n, text + " (revised)"))
+        else:
+            target.append((n, text))
+    return _render(source), _render(target)
+
+
+def _anchors(markdown: str, count: int, rng: random.Random) -> list[AnchorAddress]:
+    index = BlockIndex.build(markdown)
+    anchors = []
+    for _ in range(count):
+        block = index.block(rng.randrange(len(index)))
+        if rng.random() < 0.6:
+            anchors.append(AnchorAddress(address_type="block_id", block_id=block.block_id))
+        else:
+            start = rng.randrange(block.content_start, block.end - 10)
+            char_range = CharRange(start_offset=start, end_offset=start + 10)
+            anchors.append(AnchorAddress(address_type="char_range", char_range=char_range))
+    return anchors
+
+
+def _resolver(source: BlockIndex, target: BlockIndex) -> AnchorResolver:
+    return AnchorResolver(source, target, source_version_id="i:1", target_version_id="i:2")
+
+
+def _timed(fn: Callable[[], list[AnchorResolution]]) -> tuple[list[AnchorResolution], float]:
+    started = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - started
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 500
+    blocks = int(argv[1]) if len(argv) > 1 else 2_000
+    rng = random.Random(5)
+    source_md, target_md = _versions(blocks, rng)
+    anchors = _anchors(source_md, count, rng)
+    source, target = BlockIndex.build(source_md), BlockIndex.build(target_md)
+
+    sample = anchors[:_BASELINE_SAMPLE]
+    _, baseline = _timed(
+        lambda: [_resolver(BlockIndex.build(source_md), BlockIndex.build(target_md)).resolve(a) for a in sample]
+    )
+    per_anchor = baseline / len(sample)
+    batch, cached = _timed(lambda: _resolver(source, target).resolve_all(anchors))
+    _, cold = _timed(lambda: _resolver(BlockIndex.build(source_md), BlockIndex.build(target_md)).resolve_all(anchors))
+
+    states = Counter(result.resolution_state.value for result in batch)
+    print(f"{len(source_md) / 1024:.0f} KiB, {blocks} blocks, {count} anchors: {dict(sorted(states.items()))}")
+    print(f"{'mode':<28} {'total ms':>10} {'per anchor us':>14}")
+    print(f"{'per-anchor (extrapolated)':<28} {per_anchor * count * 1e3:>10.1f} {per_anchor * 1e6:>14.0f}")
+    print(f"{'batch, indexes built':<28} {cold * 1e3:>10.1f} {cold / count * 1e6:>14.0f}")
+    print(f"{'batch, cached indexes':<28} {cached * 1e3:>10.1f} {cached / count * 1e6:>14.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
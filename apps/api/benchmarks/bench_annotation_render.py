@@ -0,0 +1,94 @@
+"""Annotation render time: from scratch, appending one operation, and at export DPI.
+
+Usage: ``python3 -m benchmarks.bench_annotation_render [ops] [repeats]``
+(defaults to a 12-operation log, best of 5 repeats).
+
+Base images are random-noise PNGs (the worst case for blur and for PNG
+decoding) at 1080p and 4K. "cold" renders the whole log with an empty
+cache, including decoding the base image; "append" renders the log after
+its prefix without the last operation was rendered, i.e. one edit in the
+editor; "undo" renders a prefix already in the cache; "export 300 dpi"
+renders the whole log cold at 300 DPI. The benchmark exits if numpy or
+Pillow is not installed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+from app.adapters.media import AnnotationRenderer
+
+
+def _operations(count: int) -> list[dict[str, object]]:
+    kinds = [
+        {"op_type": "blur", "geometry": {"rect": {"x": 0.1, "y": 0.1, "w": 0.25, "h": 0.2}}, "style": {"radius": 12}},
+        {"op_type": "arrow", "geometry": {"from": {"x": 0.2, "y": 0.8}, "to": {"x": 0.45, "y": 0.55}}},
+        {"op_type": "stroke", "geometry": {"points": [{"x": 0.5 + n / 400, "y": 0.5 + (n % 7) / 200} for n in range(60)]}},
+        {"op_type": "highlight", "geometry": {"rect": {"x": 0.6, "y": 0.1, "w": 0.3, "h": 0.08}}},
+        {"op_type": "text", "geometry": {"pos": {"x": 0.6, "y": 0.25}, "value": "Click Export"}, "style": {"font_size": 20}},
+        {"op_type": "box", "geometry": {"rect": {"x": 0.55, "y": 0.05, "w": 0.4, "h": 0.3}}},
+    ]
+    return [kinds[n % len(kinds)] for n in range(count)]
+
+
+def _renderer() -> AnnotationRenderer:
+    return AnnotationRenderer(max_bytes=2**31)
+
+
+def _best_ms(repeats: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _append_ms(repeats: int, path: str, checksum: str, operations: list[dict[str, object]]) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        renderer = _renderer()
+        renderer.render(path, checksum, operations[:-1])
+        started = time.perf_counter()
+        renderer.render(path, checksum, operations)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 12
+    repeats = int(argv[1]) if len(argv) > 1 else 5
+    try:
+        import numpy as np
+        from PIL import Image
+    except ImportError:
+        sys.exit("numpy and Pillow are required; install them to run this benchmark")
+    operations = _operations(count)
+    print(f"{count} operations, best of {repeats}")
+    print(f"{'image':<10} {'mode':<16} {'ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, (width, height) in (("1080p", (1920, 1080)), ("4k", (3840, 2160))):
+            path = os.path.join(tmp, f"{label}.png")
+            pixels = np.random.default_rng(7).integers(0, 256, (height, width, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(path)
+            with open(path, "rb") as stream:
+                checksum = hashlib.sha256(stream.read()).hexdigest()
+            warm = _renderer()
+            warm.render(path, checksum, operations)
+            rows = [
+                ("cold", _best_ms(repeats, lambda: _renderer().render(path, checksum, operations))),
+                ("append", _append_ms(repeats, path, checksum, operations)),
+                ("undo", _best_ms(repeats, lambda: warm.render(path, checksum, operations[:-1]))),
+                ("export 300 dpi", _best_ms(repeats, lambda: _renderer().render(path, checksum, operations, dpi=300))),
+            ]
+            for mode, ms in rows:
+                print(f"{label:<10} {mode:<16} {ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
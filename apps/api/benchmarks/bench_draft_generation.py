@@ -0,0 +1,111 @@
+"""Windowed draft generation versus one whole-transcript prompt, against a fake LLM.
+
+Usage: ``python3 -m benchmarks.bench_draft_generation [minutes] [base_ms] [ms_per_1k_tokens]``
+(defaults to a 60-minute transcript, 50 ms per call plus 250 ms per 1000 tokens).
+
+The fake LLM's latency grows with the prompt, as a real model's does with
+the text it reads and writes; scale ``base_ms``/``ms_per_1k_tokens`` up to
+model a real provider. Rows report wall time and provider calls for one
+prompt over the whole transcript, 3000-token windows at increasing
+concurrency, and a retry after one window failed, which is served from the
+per-window cache except for that window.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from app.adapters.llm import DraftRequest, FakeLLMClient, LLMError, ProgressCallback
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.instructions import InstructionStore
+from app.repositories.memory import InMemoryStore
+from app.repositories.transcripts import CompactTranscript, TranscriptStore
+from app.schemas.job import JobStatus
+from app.services.drafts import DraftService, estimate_tokens
+from app.services.instructions import InstructionService
+from app.services.transcripts import TranscriptService
+
+_SEGMENT_MS = 4_000
+_WINDOW_TOKENS = 3_000
+
+
+class _SizedLLM(FakeLLMClient):
+    """Latency of ``base + per_token * tokens``; optionally fails the first call containing ``poison``."""
+
+    def __init__(self, base: float, per_token: float, poison: str | None = None) -> None:
+        super().__init__()
+        self._base = base
+        self._per_token = per_token
+        self._poison = poison
+
+    async def generate(self, request: DraftRequest, progress: ProgressCallback | None = None) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._base + self._per_token * estimate_tokens(request.transcript))
+        finally:
+            self.in_flight -= 1
+        if self._poison is not None and self._poison in request.transcript:
+            self._poison = None
+            raise LLMError("provider timed out", code="PROVIDER_TIMEOUT", retryable=True)
+        return "\n\n".join(f"## {line[11:40]}\n{line}" for line in request.transcript.splitlines())
+
+
+async def _run(label: str, minutes: int, llm: _SizedLLM, *, window_tokens: int, concurrency: int, retry: bool) -> None:
+    store = InMemoryStore()
+    project = store.create_project(owner_id="owner", name="P")
+    job = store.create_job(owner_id="owner", project_id=project.id)
+    job.status = JobStatus.TRANSCRIPT_READY
+    transcripts = TranscriptStore()
+    count = minutes * 60_000 // _SEGMENT_MS
+    transcripts.put(
+        job.id,
+        CompactTranscript.from_segments(
+            (n * _SEGMENT_MS, n * _SEGMENT_MS + 3_500, f"Now click item {n} in the list, then confirm the dialog.")
+            for n in range(count)
+        ),
+    )
+    repository = DirectAsyncRepository(store)
+    service = DraftService(
+        TranscriptService(repository, transcripts),
+        InstructionService(repository, InstructionStore()),
+        llm,
+        max_concurrency=concurrency,
+        max_window_tokens=window_tokens,
+    )
+
+    if retry:
+        try:
+            await service.generate_draft(owner_id="owner", job_id=job.id)
+        except LLMError:
+            pass
+        llm.calls = 0
+    started = time.perf_counter()
+    draft = await service.generate_draft(owner_id="owner", job_id=job.id)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<26} {elapsed:>8.2f} {llm.calls:>6} {service.windows_reused:>7} {len(draft.markdown) // 1024:>9}")
+
+
+def main(argv: list[str]) -> None:
+    minutes = int(argv[0]) if argv else 60
+    base = (float(argv[1]) if len(argv) > 1 else 50.0) / 1e3
+    per_token = (float(argv[2]) if len(argv) > 2 else 250.0) / 1e6
+    print(f"{minutes}-minute transcript, one segment per {_SEGMENT_MS // 1000} s")
+    print(f"{'mode':<26} {'wall s':>8} {'calls':>6} {'reused':>7} {'draft KiB':>9}")
+    runs = (
+        ("single prompt", 10**9, 1, False),
+        ("windows, concurrency 1", _WINDOW_TOKENS, 1, False),
+        ("windows, concurrency 4", _WINDOW_TOKENS, 4, False),
+        ("windows, concurrency 8", _WINDOW_TOKENS, 8, False),
+        ("retry after 1 failed", _WINDOW_TOKENS, 4, True),
+    )
+    for label, window_tokens, concurrency, retry in runs:
+        llm = _SizedLLM(base, per_token, poison="item 450 " if retry else None)
+        asyncio.run(_run(label, minutes, llm, window_tokens=window_tokens, concurrency=concurrency, retry=retry))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
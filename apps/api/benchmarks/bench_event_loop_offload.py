@@ -0,0 +1,78 @@
+"""Event-loop responsiveness with a blocking token verifier, inline vs offloaded.
+
+Usage: ``python3 -m benchmarks.bench_event_loop_offload [concurrency ...]``
+(defaults to 1, 8 and 32).
+
+Each run fires ``concurrency`` verifications of a verifier that sleeps 20 ms
+(standing in for a Firebase SDK round trip) while a probe task measures how
+late its 1 ms sleeps wake up. Inline calls block the loop for the whole batch;
+offloaded calls only wait for a pool worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from app.adapters.auth import DirectAsyncTokenVerifier, MockTokenVerifier, OffloadedTokenVerifier, TokenVerifier
+from app.adapters.auth.base import AsyncTokenVerifier
+from app.core.executor import BlockingExecutor
+from app.schemas.auth import AuthPrincipal
+
+_DELAY_SECONDS = 0.02
+_POOL_SIZE = 8
+
+
+class _SleepyVerifier(TokenVerifier):
+    blocking = True
+
+    def __init__(self) -> None:
+        self._inner = MockTokenVerifier()
+
+    def verify_token(self, token: str) -> AuthPrincipal:
+        time.sleep(_DELAY_SECONDS)
+        return self._inner.verify_token(token)
+
+
+async def _run(verifier: AsyncTokenVerifier, concurrency: int) -> tuple[float, float]:
+    worst_lag = 0.0
+    stop = asyncio.Event()
+
+    async def probe() -> None:
+        nonlocal worst_lag
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst_lag = max(worst_lag, time.perf_counter() - started - 0.001)
+
+    probing = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(verifier.verify_token(f"test:user-{i}") for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probing
+    return elapsed * 1e3, worst_lag * 1e3
+
+
+async def _main(sizes: list[int]) -> None:
+    print(f"{'mode':>10} {'calls':>6} {'wall ms':>9} {'max loop lag ms':>16}")
+    for concurrency in sizes:
+        inline = DirectAsyncTokenVerifier(_SleepyVerifier())
+        wall, lag = await _run(inline, concurrency)
+        print(f"{'inline':>10} {concurrency:>6} {wall:>9.1f} {lag:>16.1f}")
+
+        executor = BlockingExecutor(_POOL_SIZE)
+        wall, lag = await _run(OffloadedTokenVerifier(_SleepyVerifier(), executor), concurrency)
+        wait_ms = executor.stats.max_queue_wait_seconds * 1e3
+        print(f"{'offloaded':>10} {concurrency:>6} {wall:>9.1f} {lag:>16.1f}  (max queue wait {wait_ms:.1f} ms)")
+        executor.shutdown()
+
+
+def main(argv: list[str]) -> None:
+    asyncio.run(_main([int(arg) for arg in argv] or [1, 8, 32]))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,97 @@
+"""Memory and read latency of snapshot + delta instruction history versus full copies.
+
+Usage: ``python3 -m benchmarks.bench_instruction_versions [edits] [snapshot_interval ...]``
+(defaults to 1000 edits and intervals 8, 32 and 128).
+
+A ~200 KB markdown instruction receives ``edits`` small edits (one line
+rewritten per version, at random positions). The run reports traced memory
+of keeping every version as a full copy and of each ``InstructionStore``
+configuration, then the read latency of the latest (hot) version and of
+random old versions, which replay at most ``snapshot_interval - 1`` deltas.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import random
+import sys
+import time
+import tracemalloc
+
+from app.repositories.instructions import InstructionStore
+
+_TARGET_CHARS = 200 * 1024
+_READS = 200
+
+
+def _document() -> list[str]:
+    lines: list[str] = []
+    size = 0
+    step = 0
+    while size < _TARGET_CHARS:
+        line = f"{step}. Open the export dialog, pick a format and confirm the destination folder.\n"
+        lines.append(line)
+        size += len(line)
+        step += 1
+    return lines
+
+
+def _versions(edits: int) -> Iterator[str]:
+    rng = random.Random(7)
+    lines = _document()
+    yield "".join(lines)
+    for edit in range(edits):
+        position = rng.randrange(len(lines))
+        lines[position] = f"{position}. Revised in edit {edit}: choose PDF and confirm.\n"
+        yield "".join(lines)
+
+
+def _traced(build: Callable[[], object]) -> tuple[object, int]:
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    value = build()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return value, used
+
+
+def _fill(edits: int, interval: int) -> tuple[InstructionStore, str]:
+    # Versions are generated on the fly so only what the store retains is traced.
+    versions = _versions(edits)
+    store = InstructionStore(snapshot_interval=interval)
+    instruction_id = store.create(job_id="job", owner_id="owner", markdown=next(versions)).instruction_id
+    for number, markdown in enumerate(versions, start=1):
+        store.update(instruction_id, base_version=number, markdown=markdown)
+    return store, instruction_id
+
+
+def _per_call_us(fn: Callable[[int | None], object], args: list[int | None]) -> float:
+    started = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - started) / len(args) * 1e6
+
+
+def main(argv: list[str]) -> None:
+    edits = int(argv[0]) if argv else 1_000
+    intervals = [int(arg) for arg in argv[1:]] or [8, 32, 128]
+    rng = random.Random(11)
+    old = [rng.randrange(1, edits + 1) for _ in range(_READS)]
+
+    full, full_bytes = _traced(lambda: list(_versions(edits)))
+    print(f"{len(full[0]) / 1024:.0f} KiB document, {edits} edits; full copies: {full_bytes / 2**20:.1f} MiB")
+    del full
+    print(f"{'interval':>9} {'store MiB':>10} {'ratio':>7} {'latest us':>10} {'old us':>9}")
+    for interval in intervals:
+        filled, store_bytes = _traced(lambda: _fill(edits, interval))
+        store, instruction_id = filled  # type: ignore[misc]
+        latest_us = _per_call_us(lambda _: store.get(instruction_id), [None] * _READS)
+        old_us = _per_call_us(lambda version: store.get(instruction_id, version), old)
+        print(
+            f"{interval:>9} {store_bytes / 2**20:>10.2f} {full_bytes / store_bytes:>6.1f}x"
+            f" {latest_us:>10.2f} {old_us:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,71 @@
+"""Idle SSE subscriber cost and fan-out latency for the job event broker.
+
+Usage: ``python3 -m benchmarks.bench_job_event_subscribers [subscribers ...]``
+(defaults to 1000, 10000 and 50000).
+
+Each subscriber is a task draining ``JobEventSubscription.frames`` exactly as
+the SSE route does, one job per subscriber. The run reports traced memory per
+idle subscriber, the time to deliver one event to one job's subscriber while
+all others stay idle, and the time for one event on a shared job to reach
+every subscriber.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from app.core.events import JOB_STATUS_EVENT, JobEventBroker, JobEventSubscription
+
+_HEARTBEAT_SECONDS = 3600.0
+
+
+async def _drain(subscription: JobEventSubscription, received: asyncio.Queue[float]) -> None:
+    async for _ in subscription.frames(_HEARTBEAT_SECONDS):
+        received.put_nowait(time.perf_counter())
+
+
+async def _run(subscribers: int) -> None:
+    broker = JobEventBroker(max_tracked_jobs=subscribers * 2)
+    received: asyncio.Queue[float] = asyncio.Queue()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_drain(broker.subscribe(f"job-{index}"), received)) for index in range(subscribers)
+    ]
+    await asyncio.sleep(0)
+    subscribe_us = (time.perf_counter() - started) / subscribers * 1e6
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - baseline) / subscribers
+    tracemalloc.stop()
+
+    published_at = time.perf_counter()
+    broker.publish(f"job-{subscribers // 2}", JOB_STATUS_EVENT, {"status": "AUDIO_READY"})
+    single_ms = (await received.get() - published_at) * 1e3
+
+    shared = [asyncio.create_task(_drain(broker.subscribe("shared"), received)) for _ in range(subscribers)]
+    await asyncio.sleep(0)
+    published_at = time.perf_counter()
+    broker.publish("shared", JOB_STATUS_EVENT, {"status": "DONE"})
+    last = 0.0
+    for _ in range(subscribers):
+        last = await received.get()
+    fanout_ms = (last - published_at) * 1e3
+
+    broker.close()
+    await asyncio.gather(*tasks, *shared)
+    print(f"{subscribers:>8} {per_subscriber:>12.0f} {subscribe_us:>13.1f} {single_ms:>10.3f} {fanout_ms:>11.1f}")
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(arg) for arg in argv] or [1_000, 10_000, 50_000]
+    print(f"{'subs':>8} {'bytes/sub':>12} {'subscribe us':>13} {'one-job ms':>10} {'fan-out ms':>11}")
+    for subscribers in sizes:
+        asyncio.run(_run(subscribers))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,121 @@
+"""Provider adapter throughput and tail latency against the local stub server.
+
+Usage: ``python3 -m benchmarks.bench_provider_clients [requests] [latency_ms] [concurrency]``
+(defaults to 2000 regenerate calls, 20 ms per request, 16 provider slots).
+
+Runs ``LocalLLMClient.regenerate`` from 64 concurrent callers against
+``benchmarks.provider_stub`` (1% of requests wait an extra 200 ms). The
+baseline opens a new HTTP client, and so a new connection, per call; the
+other rows share one keep-alive pool, then add a workload where half the
+prompts repeat one in flight (coalesced), and one where 5% of requests
+fail with 503 and are retried. Latency is per call as seen by the caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import random
+import statistics
+import sys
+import time
+
+import httpx
+
+from app.adapters.llm import FragmentRequest, LocalLLMClient
+from app.adapters.providers import ProviderClient, RetryPolicy, build_http_pool
+from benchmarks.provider_stub import ProviderStub
+
+_CALLERS = 64
+_RETRY = RetryPolicy(attempts=4, base_delay_seconds=0.01)
+
+
+def _prompts(count: int, duplicate_rate: float, rng: random.Random) -> list[str]:
+    prompts: list[str] = []
+    for n in range(count):
+        if prompts and rng.random() < duplicate_rate:
+            # Repeat a prompt issued moments earlier, i.e. still in flight.
+            prompts.append(prompts[max(0, len(prompts) - rng.randint(1, _CALLERS // 2))])
+        else:
+            prompts.append(f"Step {n}: open the export dialog and confirm the settings.")
+    return prompts
+
+
+async def _calls(prompts: list[str], call: Callable[[str], Awaitable[None]]) -> list[float]:
+    queue = list(reversed(prompts))
+    latencies: list[float] = []
+
+    async def caller() -> None:
+        while queue:
+            prompt = queue.pop()
+            started = time.perf_counter()
+            await call(prompt)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(caller() for _ in range(_CALLERS)))
+    return latencies
+
+
+async def _run(
+    label: str,
+    count: int,
+    latency_ms: float,
+    concurrency: int,
+    *,
+    pooled: bool,
+    duplicates: float = 0.0,
+    failures: float = 0.0,
+) -> None:
+    stub = ProviderStub(latency_ms=latency_ms, tail_ms=200.0, tail_rate=0.01, failure_rate=failures, seed=3)
+    url = await stub.start()
+    prompts = _prompts(count, duplicates, random.Random(7))
+    pool = build_http_pool(max_connections=concurrency, max_keepalive_connections=concurrency)
+    provider = ProviderClient(pool, url, name="stub", max_concurrency=concurrency, retry=_RETRY)
+    client = LocalLLMClient(provider, model="stub")
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def unpooled(prompt: str) -> None:
+        async with gate, httpx.AsyncClient() as fresh:
+            once = ProviderClient(fresh, url, name="stub", retry=_RETRY)
+            await LocalLLMClient(once, model="stub").regenerate(FragmentRequest(fragment=prompt))
+
+    async def shared(prompt: str) -> None:
+        await client.regenerate(FragmentRequest(fragment=prompt))
+
+    started = time.perf_counter()
+    latencies = sorted(await _calls(prompts, shared if pooled else unpooled))
+    elapsed = time.perf_counter() - started
+    await pool.aclose()
+    await stub.close()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    stats = provider.stats
+    print(
+        f"{label:<30} {count / elapsed:>8.0f} {quantiles[49] * 1e3:>7.1f} {quantiles[94] * 1e3:>7.1f} "
+        f"{quantiles[98] * 1e3:>7.1f} {stub.connections:>6} {sum(stub.requests.values()):>9} "
+        f"{stats.coalesced:>9} {stats.retries:>7}"
+    )
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 2_000
+    latency_ms = float(argv[1]) if len(argv) > 1 else 20.0
+    concurrency = int(argv[2]) if len(argv) > 2 else 16
+    print(f"{count} calls from {_CALLERS} callers, {latency_ms:.0f} ms per request, {concurrency} provider slots")
+    print(
+        f"{'mode':<30} {'calls/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'conns':>6} "
+        f"{'upstream':>9} {'coalesced':>9} {'retries':>7}"
+    )
+    runs = (
+        ("client per call", {"pooled": False}),
+        ("shared keep-alive pool", {"pooled": True}),
+        ("pool, 50% repeated prompts", {"pooled": True, "duplicates": 0.5}),
+        ("pool, 5% 503s retried", {"pooled": True, "failures": 0.05}),
+    )
+    for label, options in runs:
+        asyncio.run(_run(label, count, latency_ms, concurrency, **options))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,100 @@
+"""Regenerate throughput, queueing and fairness against the fake LLM.
+
+Usage: ``python3 -m benchmarks.bench_regenerate_scheduler [instructions] [latency_ms] [concurrency]``
+(defaults to 400 instructions, 50 ms per provider call, 8 slots).
+
+One heavy owner submits half the instructions in a burst before nine light
+owners submit the rest. The run reports throughput, the provider's peak
+concurrency, queue depth and slot wait times, and when the light owners'
+tasks finish, under the per-owner fair queue and under a single shared FIFO
+(every task keyed the same) for comparison.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+from unittest import mock
+
+from app.adapters.llm import FakeLLMClient
+from app.core.scheduling import FairLimiter
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.instructions import InstructionStore
+from app.repositories.memory import InMemoryStore
+from app.schemas.instruction import RegenerateRequest, RegenerateTaskStatus
+from app.services.instructions import InstructionService
+from app.services.regenerate import RegenerateService
+
+_BLOCK_ID = "00000000-0000-4000-8000-000000000001"
+_MARKDOWN = f"# Guide\n<!-- block:{_BLOCK_ID} -->\nOpen the panel and confirm the export settings.\n"
+_LIGHT_OWNERS = 9
+
+
+class _SharedFifo(FairLimiter):
+    """Every key shares one queue, i.e. plain first-come first-served."""
+
+    def slot(self, key: str):  # type: ignore[override]
+        return super().slot("*")
+
+
+async def _run(instructions: int, latency: float, concurrency: int, *, fair: bool) -> None:
+    store = InMemoryStore()
+    service = InstructionService(DirectAsyncRepository(store), InstructionStore())
+    heavy = instructions // 2
+    owners = ["heavy"] * heavy + [f"light-{n % _LIGHT_OWNERS}" for n in range(instructions - heavy)]
+    targets = []
+    for owner in sorted(set(owners)):
+        project = store.create_project(owner_id=owner, name="P")
+        job = store.create_job(owner_id=owner, project_id=project.id)
+        for _ in range(owners.count(owner)):
+            created = await service.create_instruction(job_id=job.id, markdown=_MARKDOWN)
+            targets.append((owner, created.instruction_id))
+    targets.sort(key=lambda target: target[0] != "heavy")
+
+    llm = FakeLLMClient(latency_seconds=latency)
+    limiter = FairLimiter if fair else _SharedFifo
+    with mock.patch("app.services.regenerate.FairLimiter", limiter):
+        scheduler = RegenerateService(service, llm, max_concurrency=concurrency)
+    finished: dict[str, float] = {}
+    started = time.perf_counter()
+    submitted = []
+    for n, (owner, instruction_id) in enumerate(targets):
+        request = RegenerateRequest(base_version=1, selection={"block_id": _BLOCK_ID}, client_request_id=f"r{n}")
+        task, _ = await scheduler.submit(owner_id=owner, instruction_id=instruction_id, request=request)
+        submitted.append((owner, task.id))
+    while len(finished) < len(submitted):
+        await asyncio.sleep(latency / 4)
+        for owner, task_id in submitted:
+            if task_id not in finished:
+                task = await scheduler.get_task(owner_id=owner, task_id=task_id)
+                if task.status in (RegenerateTaskStatus.SUCCEEDED, RegenerateTaskStatus.FAILED):
+                    finished[task_id] = time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+
+    stats = scheduler.stats
+    light = sorted(finished[task_id] for owner, task_id in submitted if owner != "heavy")
+    label = "fair per owner" if fair else "shared FIFO"
+    print(
+        f"{label:<16} {len(submitted) / elapsed:>8.1f} {llm.max_in_flight:>6} {stats.queue.max_queued:>6} "
+        f"{stats.queue.mean_wait_seconds * 1e3:>10.0f} {stats.queue.max_wait_seconds * 1e3:>10.0f} "
+        f"{statistics.median(light) * 1e3:>12.0f} {light[-1] * 1e3:>12.0f}"
+    )
+
+
+def main(argv: list[str]) -> None:
+    instructions = int(argv[0]) if argv else 400
+    latency = (float(argv[1]) if len(argv) > 1 else 50.0) / 1e3
+    concurrency = int(argv[2]) if len(argv) > 2 else 8
+    print(f"{instructions} tasks, {latency * 1e3:.0f} ms per call, {concurrency} slots")
+    print(
+        f"{'queue':<16} {'tasks/s':>8} {'peak':>6} {'depth':>6} {'mean wait':>10} {'max wait':>10} "
+        f"{'light p50 ms':>12} {'light max ms':>12}"
+    )
+    for fair in (True, False):
+        asyncio.run(_run(instructions, latency, concurrency, fair=fair))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,110 @@
+"""In-memory vs SQLite repository latency at 10^5-10^6 rows.
+
+Usage: ``python3 -m benchmarks.bench_repository_backends [rows ...]``
+(defaults to 100000 and 1000000).
+
+Each backend is seeded with ``rows`` projects spread over 10k owners plus one
+job per project, then timed on point reads, a 50-item owner page, a 50-item
+job page and single-row inserts. SQLite runs on a temporary WAL database.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+from app.repositories.base import JobRecord, ProjectRecord, Repository
+from app.repositories.memory import InMemoryStore
+from app.repositories.sql import SqlRepository, format_timestamp
+from app.schemas.job import JobStatus
+
+_OWNERS = 10_000
+_PAGE = 50
+_ITERATIONS = 2_000
+
+
+def _seed_records(rows: int) -> tuple[list[ProjectRecord], list[JobRecord]]:
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    projects: list[ProjectRecord] = []
+    jobs: list[JobRecord] = []
+    for index in range(rows):
+        created_at = base + timedelta(microseconds=index)
+        project = ProjectRecord(
+            id=str(uuid4()),
+            name=f"p{index}",
+            owner_id=f"owner-{index % _OWNERS}",
+            created_at=created_at,
+        )
+        projects.append(project)
+        jobs.append(
+            JobRecord(
+                id=str(uuid4()),
+                project_id=project.id,
+                owner_id=project.owner_id,
+                status=JobStatus.CREATED,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+    return projects, jobs
+
+
+def _seed_sql(repo: SqlRepository, projects: list[ProjectRecord], jobs: list[JobRecord]) -> None:
+    with repo._pool.transaction() as connection:
+        connection.executemany(
+            "INSERT INTO projects (id, owner_id, name, created_at) VALUES (?, ?, ?, ?)",
+            ((p.id, p.owner_id, p.name, format_timestamp(p.created_at)) for p in projects),
+        )
+        connection.executemany(
+            "INSERT INTO jobs (id, project_id, owner_id, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (j.id, j.project_id, j.owner_id, j.status.value, format_timestamp(j.created_at), None)
+                for j in jobs
+            ),
+        )
+
+
+def _us_per_call(fn: Callable[[], object], iterations: int = _ITERATIONS) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _measure(name: str, repo: Repository, projects: list[ProjectRecord]) -> None:
+    rng = random.Random(7)
+    sample = [projects[rng.randrange(len(projects))] for _ in range(_ITERATIONS)]
+    ids = iter(sample * 2)
+    owners = iter([p.owner_id for p in sample] * 2)
+    get_us = _us_per_call(lambda: repo.get_project(next(ids).id))
+    page_us = _us_per_call(lambda: repo.list_projects_for_owner(next(owners), limit=_PAGE))
+    jobs_us = _us_per_call(lambda: repo.list_jobs_for_project(next(ids).id, limit=_PAGE))
+    insert_us = _us_per_call(lambda: repo.create_project(owner_id="bench-writer", name="new"), 500)
+    print(f"{name:>8} {len(projects):>9} {get_us:>10.1f} {page_us:>12.1f} {jobs_us:>11.1f} {insert_us:>10.1f}")
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(arg) for arg in argv] or [100_000, 1_000_000]
+    print(f"{'backend':>8} {'rows':>9} {'get us':>10} {'owner pg us':>12} {'jobs pg us':>11} {'insert us':>10}")
+    for rows in sizes:
+        projects, jobs = _seed_records(rows)
+
+        memory = InMemoryStore(projects={p.id: p for p in projects}, jobs={j.id: j for j in jobs})
+        _measure("memory", memory, projects)
+        del memory
+
+        with tempfile.TemporaryDirectory() as tmp:
+            sql = SqlRepository.from_path(str(Path(tmp) / "bench.db"))
+            _seed_sql(sql, projects, jobs)
+            _measure("sqlite", sql, projects)
+            sql.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
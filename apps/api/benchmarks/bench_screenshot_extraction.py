@@ -0,0 +1,103 @@
+"""Batched versus per-frame ffmpeg screenshot extraction on a generated test video.
+
+Usage: ``python3 -m benchmarks.bench_screenshot_extraction [frames] [minutes] [workers]``
+(defaults to 48 frames from a 10-minute 1280x720 video, 4 workers).
+
+The video is rendered locally with ffmpeg's ``testsrc`` source (a keyframe
+every 2 s) and the benchmark exits if ffmpeg is not on ``PATH``. Frames are
+requested concurrently at timestamps clustered the way an instruction's
+screenshots are: a few steps per minute. "per-frame" caps passes at one
+frame, i.e. one ffmpeg process, open and seek per screenshot; "batched" lets
+the pool coalesce each burst into passes over nearby frames. The pool is
+warmed up before timing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from app.adapters.media import FrameExtractionPool, FrameSpec
+
+
+def _render_video(path: str, minutes: int) -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=duration={minutes * 60}:size=1280x720:rate=30",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-g",
+            "60",
+            "-pix_fmt",
+            "yuv420p",
+            path,
+        ],
+        check=True,
+    )
+
+
+def _timestamps(frames: int, minutes: int) -> list[int]:
+    rng = random.Random(7)
+    return sorted(rng.randrange(0, minutes * 60_000 - 1_000) for _ in range(frames))
+
+
+async def _run(label: str, video: str, out: str, timestamps: list[int], *, workers: int, strategy: str, batched: bool) -> None:
+    pool = FrameExtractionPool(workers=workers, max_pass_frames=32 if batched else 1)
+    try:
+        await asyncio.gather(
+            *(pool.extract(video, FrameSpec(0, strategy, "png", os.path.join(out, f"warm-{n}.png"))) for n in range(workers))
+        )
+        warm = pool.stats.passes
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                pool.extract(video, FrameSpec(ms, strategy, "png", os.path.join(out, f"{label.replace(' ', '-')}-{ms}.png")))
+                for ms in timestamps
+            )
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+    passes = pool.stats.passes - warm
+    print(f"{label:<30} {elapsed:>8.2f} {passes:>7} {len(timestamps) / elapsed:>9.1f}")
+
+
+def main(argv: list[str]) -> None:
+    frames = int(argv[0]) if argv else 48
+    minutes = int(argv[1]) if len(argv) > 1 else 10
+    workers = int(argv[2]) if len(argv) > 2 else 4
+    if shutil.which("ffmpeg") is None:
+        sys.exit("ffmpeg is not on PATH; install it to run this benchmark")
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "testsrc.mp4")
+        _render_video(video, minutes)
+        timestamps = _timestamps(frames, minutes)
+        print(f"{frames} frames from a {minutes}-minute 1280x720 video, {workers} workers")
+        print(f"{'mode':<30} {'wall s':>8} {'passes':>7} {'frames/s':>9}")
+        for label, strategy, batched in (
+            ("per-frame precise", "precise", False),
+            ("batched precise", "precise", True),
+            ("per-frame nearest_keyframe", "nearest_keyframe", False),
+            ("batched nearest_keyframe", "nearest_keyframe", True),
+        ):
+            asyncio.run(_run(label, video, tmp, timestamps, workers=workers, strategy=strategy, batched=batched))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
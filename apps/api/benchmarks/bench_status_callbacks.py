@@ -0,0 +1,125 @@
+"""Status callback ingestion throughput (engine and full ASGI request path).
+
+Usage: ``python3 -m benchmarks.bench_status_callbacks [jobs [batch_size]]``
+(defaults to 2000 jobs and batches of 100 events).
+
+Each job walks the processing pipeline (UPLOADED -> ... -> DRAFT_READY, nine
+callbacks) and every callback is then replayed once, so half the traffic is
+applied transitions and half is replay lookups. The engine is timed against
+the in-memory store and a temporary SQLite database; the ASGI run posts the
+same traffic through FastAPI (auth, validation, routing) with httpx, once
+as one request per callback and once through the batch endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+import httpx
+
+from app.core.config import Settings
+from app.core.container import build_container
+from app.main import create_app
+from app.repositories.base import Repository
+from app.repositories.memory import InMemoryStore
+from app.repositories.sql import SqlRepository
+from app.schemas.internal import StatusCallbackRequest
+from app.schemas.job import JobStatus
+from app.services.callbacks import StatusCallbackEngine
+
+_PIPELINE = (
+    JobStatus.UPLOADED,
+    JobStatus.AUDIO_EXTRACTING,
+    JobStatus.AUDIO_READY,
+    JobStatus.TRANSCRIBING,
+    JobStatus.TRANSCRIPT_READY,
+    JobStatus.GENERATING,
+    JobStatus.GENERATING,
+    JobStatus.DRAFT_READY,
+    JobStatus.EDITING,
+)
+_BASE = datetime(2026, 2, 22, tzinfo=UTC)
+
+
+def _seed_jobs(repo: Repository, jobs: int) -> list[str]:
+    project = repo.create_project(owner_id="bench-owner", name="bench")
+    return [repo.create_job(owner_id="bench-owner", project_id=project.id).id for _ in range(jobs)]
+
+
+def _traffic(job_ids: list[str]) -> Iterator[tuple[str, dict]]:
+    for job_id in job_ids:
+        for step, status in enumerate(_PIPELINE):
+            body = {
+                "event_id": f"{job_id}-{step}",
+                "status": status.value,
+                "occurred_at": (_BASE + timedelta(seconds=step)).isoformat(),
+                "correlation_id": f"run-{job_id}",
+                "artifact_updates": {"metrics": {"step": step}},
+            }
+            yield job_id, body
+            yield job_id, body
+
+
+def _time_engine(name: str, repo: Repository, jobs: int) -> None:
+    engine = StatusCallbackEngine(repo)
+    traffic = [(job_id, StatusCallbackRequest.model_validate(body)) for job_id, body in _traffic(_seed_jobs(repo, jobs))]
+    started = time.perf_counter()
+    for job_id, callback in traffic:
+        engine.ingest(job_id, callback)
+    elapsed = time.perf_counter() - started
+    _report(name, len(traffic), elapsed, engine)
+
+
+async def _time_asgi(jobs: int, batch_size: int | None) -> None:
+    settings = Settings(auth_provider="mock", callback_secret="bench-secret")
+    container = build_container(settings)
+    app = create_app(container=container)
+    traffic = list(_traffic(_seed_jobs(container.store, jobs)))
+    headers = {"X-Callback-Secret": "bench-secret"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        if batch_size is None:
+            for job_id, body in traffic:
+                await client.post(f"/api/v1/internal/jobs/{job_id}/status", headers=headers, json=body)
+        else:
+            events = [{**body, "job_id": job_id} for job_id, body in traffic]
+            for offset in range(0, len(events), batch_size):
+                chunk = events[offset : offset + batch_size]
+                await client.post("/api/v1/internal/jobs/status-batch", headers=headers, json={"events": chunk})
+        elapsed = time.perf_counter() - started
+    name = "asgi" if batch_size is None else f"batch{batch_size}"
+    _report(name, len(traffic), elapsed, container.callback_service.engine)
+    container.close()
+
+
+def _report(name: str, calls: int, elapsed: float, engine: StatusCallbackEngine) -> None:
+    print(
+        f"{name:>8} {calls:>8} {calls / elapsed:>12.0f} {elapsed / calls * 1e6:>9.1f}"
+        f" {engine.applied:>8} {engine.replayed:>8} {engine.rejected:>8}"
+    )
+
+
+def main(argv: list[str]) -> None:
+    jobs = int(argv[0]) if argv else 2_000
+    batch_size = int(argv[1]) if len(argv) > 1 else 100
+    print(f"{'path':>8} {'calls':>8} {'callbacks/s':>12} {'us/call':>9} {'applied':>8} {'replayed':>8} {'rejected':>8}")
+    _time_engine("memory", InMemoryStore(), jobs)
+    with tempfile.TemporaryDirectory() as tmp:
+        sql = SqlRepository.from_path(str(Path(tmp) / "bench.db"))
+        _time_engine("sqlite", sql, jobs)
+        sql.close()
+    os.environ.setdefault("HOWERA_CALLBACK_SECRET", "bench-secret")
+    asyncio.run(_time_asgi(jobs, None))
+    asyncio.run(_time_asgi(jobs, batch_size))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
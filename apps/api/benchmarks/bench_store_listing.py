@@ -0,0 +1,72 @@
+"""Owner/project listing latency as the in-memory store grows.
+
+Usage: ``python3 -m benchmarks.bench_store_listing``
+
+Each round grows the store with projects and jobs owned by other users, then
+times listing a fixed-size owner and project. With the secondary indexes the
+per-call latency should stay flat regardless of total store size. A second
+table times keyset pages at increasing depth for one large owner; page N
+should cost the same as page 1.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+
+from app.repositories.memory import InMemoryStore
+
+_OWNER_PROJECTS = 50
+_PROJECT_JOBS = 50
+_SIZES = (1_000, 10_000, 100_000, 300_000)
+_ITERATIONS = 2_000
+_DEEP_OWNER_PROJECTS = 100_000
+_PAGE_LIMIT = 50
+
+
+def _time_per_call(fn: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> None:
+    store = InMemoryStore()
+    for index in range(_OWNER_PROJECTS):
+        store.create_project(owner_id="bench-owner", name=f"owned-{index}")
+    target_project = store.list_projects_for_owner("bench-owner")[0]
+    for _ in range(_PROJECT_JOBS):
+        store.create_job(owner_id="bench-owner", project_id=target_project.id)
+
+    print(f"{'total projects':>15} {'list_projects us':>17} {'list_jobs us':>13}")
+    filler = 0
+    for size in _SIZES:
+        while len(store.projects) < size:
+            project = store.create_project(owner_id=f"other-{filler % 5_000}", name="filler")
+            store.create_job(owner_id=project.owner_id, project_id=project.id)
+            filler += 1
+
+        projects_us = _time_per_call(lambda: store.list_projects_for_owner("bench-owner"), _ITERATIONS) * 1e6
+        jobs_us = _time_per_call(lambda: store.list_jobs_for_project(target_project.id), _ITERATIONS) * 1e6
+        print(f"{len(store.projects):>15} {projects_us:>17.2f} {jobs_us:>13.2f}")
+
+    for index in range(_DEEP_OWNER_PROJECTS):
+        store.create_project(owner_id="deep-owner", name=f"deep-{index}")
+    owned = store.list_projects_for_owner("deep-owner")
+
+    print(f"\n{'page offset':>15} {'page us':>17}")
+    for offset in (0, 1_000, 10_000, 50_000, _DEEP_OWNER_PROJECTS - _PAGE_LIMIT - 1):
+        after = (owned[offset].created_at, owned[offset].id)
+        page_us = (
+            _time_per_call(
+                lambda: store.list_projects_for_owner("deep-owner", after=after, limit=_PAGE_LIMIT + 1),
+                _ITERATIONS,
+            )
+            * 1e6
+        )
+        print(f"{offset:>15} {page_us:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
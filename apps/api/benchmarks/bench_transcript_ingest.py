@@ -0,0 +1,99 @@
+"""Streaming transcript ingestion throughput and working-set memory.
+
+Usage: ``python3 -m benchmarks.bench_transcript_ingest [segments ...]``
+(defaults to 1000, 10000 and 100000).
+
+For each size an NDJSON and a JSON-array segment file are written to a
+temporary directory and ingested through ``LocalArtifactStorage``. The run
+reports file size, segments per second, traced peak memory during parsing
+alone (segments discarded) and during full ingestion minus the finished
+``CompactTranscript``; both should stay flat as the file grows. ``json.load``
+of the whole array is shown for comparison.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import io
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app.adapters.storage import LocalArtifactStorage
+from app.repositories.transcripts import TranscriptStore
+from app.services.transcript_ingest import TranscriptIngestor, iter_transcript_segments
+
+
+def _write(root: Path, segments: int) -> tuple[Path, Path]:
+    rows = (
+        json.dumps({"start_ms": i * 3000, "end_ms": i * 3000 + 2800, "text": f"step {i}: open settings and pick a theme"})
+        for i in range(segments)
+    )
+    ndjson, array = root / f"{segments}.ndjson", root / f"{segments}.json"
+    with ndjson.open("w", encoding="utf-8") as nd, array.open("w", encoding="utf-8") as arr:
+        arr.write("[")
+        for index, row in enumerate(rows):
+            nd.write(row + "\n")
+            arr.write(("," if index else "") + row)
+        arr.write("]")
+    return ndjson, array
+
+
+def _peak(fn: Callable[[], object]) -> tuple[object, int, float]:
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return value, peak, elapsed
+
+
+def _parse_only(path: Path) -> int:
+    count = 0
+    with path.open("rb") as raw, io.TextIOWrapper(raw, encoding="utf-8") as text:
+        for _ in iter_transcript_segments(text):
+            count += 1
+    return count
+
+
+def _run(root: Path, segments: int) -> None:
+    storage = LocalArtifactStorage(root)
+    for path in _write(root, segments):
+        _, parse_peak, _ = _peak(lambda: _parse_only(path))
+        store = TranscriptStore()
+        ingestor = TranscriptIngestor(storage, store)
+        _, ingest_peak, elapsed = _peak(lambda: ingestor.ingest("job", path.name))
+        transcript = store.get("job")
+        assert transcript is not None and len(transcript) == segments
+        working_set = ingest_peak - transcript.nbytes
+        print(
+            f"{path.suffix[1:]:>7} {segments:>9} {path.stat().st_size / 2**20:>8.1f} {segments / elapsed:>11.0f}"
+            f" {parse_peak / 1024:>10.0f} {working_set / 1024:>12.0f}",
+            end="",
+        )
+        if path.suffix == ".json":
+            _, load_peak, _ = _peak(lambda: json.loads(path.read_text(encoding="utf-8")))
+            print(f" {load_peak / 1024:>14.0f}")
+        else:
+            print(f" {'-':>14}")
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(arg) for arg in argv] or [1_000, 10_000, 100_000]
+    print(
+        f"{'format':>7} {'segments':>9} {'file MiB':>8} {'segments/s':>11} {'parse KiB':>10}"
+        f" {'ingest KiB*':>12} {'json.load KiB':>14}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for segments in sizes:
+            _run(Path(tmp), segments)
+    print("* peak during ingestion minus the finished transcript's buffers")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
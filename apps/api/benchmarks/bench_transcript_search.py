@@ -0,0 +1,85 @@
+"""Transcript search latency: inverted index versus a linear scan of segment text.
+
+Usage: ``python3 -m benchmarks.bench_transcript_search [hours ...]``
+(defaults to 1 and 4).
+
+An hour of speech is modelled as 1200 three-second segments of ~8 words
+drawn from a Zipf-like 5000-word vocabulary. Each query shape (a rare term,
+a common term, two terms, a two-word phrase) is timed through
+``TranscriptIndex.search`` and through the per-keystroke baseline it
+replaces: case-folded substring checks over every segment. Index build
+time and approximate index size are reported per transcript.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import random
+import sys
+import time
+
+from app.repositories.transcript_index import TranscriptIndex
+from app.repositories.transcripts import CompactTranscript
+
+_SEGMENTS_PER_HOUR = 1200
+_WORDS_PER_SEGMENT = 8
+_VOCABULARY = [f"w{rank}" for rank in range(5000)]
+_WEIGHTS = [1 / (rank + 1) for rank in range(len(_VOCABULARY))]
+_REPEATS = 200
+
+
+def _transcript(hours: int, rng: random.Random) -> CompactTranscript:
+    segments = []
+    for index in range(hours * _SEGMENTS_PER_HOUR):
+        words = rng.choices(_VOCABULARY, weights=_WEIGHTS, k=_WORDS_PER_SEGMENT)
+        segments.append((index * 3000, index * 3000 + 2900, " ".join(words)))
+    return CompactTranscript.from_segments(segments)
+
+
+def _scan(transcript: CompactTranscript, needles: list[str]) -> list[int]:
+    return [
+        index
+        for index, segment in enumerate(transcript)
+        if all(needle in segment.text.casefold() for needle in needles)
+    ]
+
+
+def _us(fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    for _ in range(_REPEATS):
+        fn()
+    return (time.perf_counter() - started) / _REPEATS * 1e6
+
+
+def _run(hours: int) -> None:
+    transcript = _transcript(hours, random.Random(hours))
+    started = time.perf_counter()
+    index = TranscriptIndex.build(transcript)
+    build_ms = (time.perf_counter() - started) * 1e3
+    middle = transcript.segment(len(transcript) // 2).text.split()
+    rare = max(middle, key=lambda word: int(word[1:]))
+    phrase = " ".join(middle[:2])
+    queries = {
+        "rare": (rare, [rare]),
+        "common": ("w1", ["w1 "]),
+        "two terms": ("w3 w20", ["w3 ", "w20 "]),
+        "phrase": (f'"{phrase}"', [phrase]),
+    }
+    for name, (query, needles) in queries.items():
+        hits = len(index.search(query, 20))
+        print(
+            f"{hours:>5} {len(transcript):>8} {build_ms:>9.1f} {index.nbytes / 1024:>9.0f}"
+            f" {name:>10} {hits:>5} {_us(lambda: index.search(query, 20)):>9.1f}"
+            f" {_us(lambda: _scan(transcript, needles)):>9.0f}"
+        )
+
+
+def main(argv: list[str]) -> None:
+    hours = [int(arg) for arg in argv] or [1, 4]
+    print(f"{'hours':>5} {'segments':>8} {'build ms':>9} {'index KiB':>9} {'query':>10} {'hits':>5} {'index us':>9} {'scan us':>9}")
+    for value in hours:
+        _run(value)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,86 @@
+"""Memory and lookup latency of the compact transcript store versus Pydantic segments.
+
+Usage: ``python3 -m benchmarks.bench_transcript_store [segments ...]``
+(defaults to 1000, 10000 and 50000).
+
+A transcript of ``segments`` three-second segments with ~60 characters of
+text each is held once as a list of ``TranscriptSegment`` models and once as
+a ``CompactTranscript``. The run reports traced memory for each, the
+``segment at T`` lookup cost (linear scan over the models, bisect over the
+arrays) and the cost of serving one 200-segment page from the middle of the
+transcript.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import random
+import sys
+import time
+import tracemalloc
+
+from app.repositories.transcripts import CompactTranscript
+from app.schemas.transcript import TranscriptSegment
+from app.services.transcripts import encode_segment_cursor, transcript_page
+
+_LOOKUPS = 2_000
+_PAGES = 500
+
+
+def _rows(segments: int) -> list[tuple[int, int, str]]:
+    return [(i * 3000, i * 3000 + 2800, f"step {i}: click the export button and choose a format") for i in range(segments)]
+
+
+def _traced(build: Callable[[], object]) -> tuple[object, int]:
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    value = build()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return value, used
+
+
+def _scan(models: list[TranscriptSegment], timestamp_ms: int) -> TranscriptSegment | None:
+    for model in models:
+        if model.start_ms <= timestamp_ms < model.end_ms:
+            return model
+    return None
+
+
+def _per_call_us(fn: Callable[[int], object], args: list[int]) -> float:
+    started = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - started) / len(args) * 1e6
+
+
+def _run(segments: int) -> None:
+    rows = _rows(segments)
+    models, models_bytes = _traced(lambda: [TranscriptSegment(start_ms=s, end_ms=e, text=t) for s, e, t in rows])
+    compact, compact_bytes = _traced(lambda: CompactTranscript.from_segments(rows))
+    assert isinstance(compact, CompactTranscript)
+
+    rng = random.Random(7)
+    targets = [rng.randrange(segments * 3000) for _ in range(_LOOKUPS)]
+    scan_us = _per_call_us(lambda t: _scan(models, t), targets[: max(_LOOKUPS // 20, 1)])
+    bisect_us = _per_call_us(compact.segment_at, targets)
+
+    middle = segments // 2
+    cursor = encode_segment_cursor(compact.start_ms(middle), middle)
+    page_us = _per_call_us(lambda _: transcript_page(compact, limit=200, cursor=cursor), list(range(_PAGES)))
+
+    print(
+        f"{segments:>9} {models_bytes / 1024:>11.0f} {compact_bytes / 1024:>12.0f} {models_bytes / compact_bytes:>6.1f}x"
+        f" {scan_us:>9.1f} {bisect_us:>10.2f} {page_us:>9.0f}"
+    )
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(arg) for arg in argv] or [1_000, 10_000, 50_000]
+    print(f"{'segments':>9} {'models KiB':>11} {'compact KiB':>12} {'ratio':>7} {'scan us':>9} {'bisect us':>10} {'page us':>9}")
+    for segments in sizes:
+        _run(segments)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,139 @@
+"""Local HTTP stub of the LLM/STT provider contracts for offline load runs.
+
+Usage: ``python3 -m benchmarks.provider_stub [port] [latency_ms] [tail_ms] [tail_rate] [failure_rate]``
+(defaults to port 8099, 20 ms per request, no tail, no failures).
+
+Serves the local contract (``/llm/generate``, ``/llm/regenerate``,
+``/stt/transcribe``) and the OpenAI shapes the adapters use
+(``/chat/completions``, ``/audio/transcriptions``) over HTTP/1.1 with
+keep-alive. Every request waits ``latency_ms``; a ``tail_rate`` fraction
+waits an extra ``tail_ms``, and a ``failure_rate`` fraction answers 503 so
+retry paths can be exercised. ``connections`` counts accepted sockets,
+which shows whether the client reuses them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import json
+import random
+import sys
+from typing import Any
+
+
+def _reply(path: str, body: bytes) -> tuple[int, Any]:
+    payload: Any = {}
+    if body[:1] == b"{":
+        payload = json.loads(body)
+    if path == "/llm/generate":
+        return 200, {"markdown": str(payload.get("transcript", "")).strip()}
+    if path == "/llm/regenerate":
+        return 200, {"markdown": f"{payload.get('fragment', '')} (regenerated)"}
+    if path == "/chat/completions":
+        content = payload.get("messages", [{}])[-1].get("content", "")
+        return 200, {"choices": [{"index": 0, "message": {"role": "assistant", "content": f"{content} (regenerated)"}}]}
+    if path == "/stt/transcribe":
+        return 200, {"segments": [{"start_ms": 0, "end_ms": 1500, "text": "Open the settings panel."}]}
+    if path == "/audio/transcriptions":
+        return 200, {"segments": [{"start": 0.0, "end": 1.5, "text": " Open the settings panel."}]}
+    return 404, {"error": "not found"}
+
+
+class ProviderStub:
+    """In-process asyncio server; ``start`` returns its base URL."""
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 20.0,
+        tail_ms: float = 0.0,
+        tail_rate: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self._latency = latency_ms / 1e3
+        self._tail = tail_ms / 1e3
+        self._tail_rate = tail_rate
+        self._failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self.connections = 0
+        self.requests: Counter[str] = Counter()
+        self.failures = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = await asyncio.start_server(self._serve, host, port)
+        bound_host, bound_port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{bound_host}:{bound_port}"
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                _, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                path = target.split("?", 1)[0]
+                self.requests[path] += 1
+
+                delay = self._latency + (self._tail if self._rng.random() < self._tail_rate else 0.0)
+                await asyncio.sleep(delay)
+                if self._rng.random() < self._failure_rate:
+                    self.failures += 1
+                    status, payload = 503, {"error": "overloaded"}
+                else:
+                    status, payload = _reply(path, body)
+                data = json.dumps(payload).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            return
+        finally:
+            writer.close()
+
+
+async def _serve_forever(port: int, stub: ProviderStub) -> None:
+    url = await stub.start(port=port)
+    print(f"provider stub listening on {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.close()
+
+
+def main(argv: list[str]) -> None:
+    port = int(argv[0]) if argv else 8099
+    stub = ProviderStub(
+        latency_ms=float(argv[1]) if len(argv) > 1 else 20.0,
+        tail_ms=float(argv[2]) if len(argv) > 2 else 0.0,
+        tail_rate=float(argv[3]) if len(argv) > 3 else 0.0,
+        failure_rate=float(argv[4]) if len(argv) > 4 else 0.0,
+    )
+    try:
+        asyncio.run(_serve_forever(port, stub))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
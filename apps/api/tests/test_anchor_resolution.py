@@ -0,0 +1,124 @@
+"""Batch anchor resolution tests."""
+
+from __future__ import annotations
+
+import unittest
+
+from app.errors import ApiError
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.block_index import BlockIndex
+from app.repositories.instructions import InstructionStore
+from app.repositories.memory import InMemoryStore
+from app.schemas.anchor import AnchorAddress, CharRange
+from app.services.anchor_resolution import AnchorResolver
+from app.services.instructions import InstructionService
+
+
+def _id(n: int) -> str:
+    return f"00000000-0000-4000-8000-{n:012d}"
+
+
+def _document(blocks: dict[int, str], preamble: str = "# Guide\n") -> str:
+    return preamble + "".join(f"<!-- block:{_id(n)} -->\n{text}\n\n" for n, text in blocks.items())
+
+
+def _block_anchor(n: int) -> AnchorAddress:
+    return AnchorAddress(address_type="block_id", block_id=_id(n))
+
+
+def _range_anchor(start: int, end: int) -> AnchorAddress:
+    return AnchorAddress(address_type="char_range", char_range=CharRange(start_offset=start, end_offset=end))
+
+
+_SOURCE = {1: "Open settings.", 2: "Click export.", 3: "Pick PDF.", 4: "Confirm."}
+
+
+class AnchorResolverTests(unittest.TestCase):
+    def _resolver(self, source: str, target: str) -> AnchorResolver:
+        return AnchorResolver(
+            BlockIndex.build(source),
+            BlockIndex.build(target),
+            source_version_id="i:1",
+            target_version_id="i:2",
+        )
+
+    def test_block_anchors_retain_remap_by_content_hash_or_go_unresolved(self) -> None:
+        target_blocks = {1: "Open settings now.", 9: "Click export.", 3: "Pick PDF."}
+        resolver = self._resolver(_document(_SOURCE), _document(target_blocks))
+
+        retained, remapped, changed, removed = resolver.resolve_all([_block_anchor(n) for n in (3, 2, 1, 4)])
+
+        self.assertEqual(retained.resolution_state, "retain")
+        self.assertEqual((retained.source_instruction_version_id, retained.target_instruction_version_id), ("i:1", "i:2"))
+        self.assertEqual(retained.trace["content_changed"], False)
+        self.assertEqual(remapped.resolution_state, "remap")
+        self.assertEqual((remapped.trace["method"], remapped.trace["target_block_id"]), ("content_hash", _id(9)))
+        self.assertEqual((changed.resolution_state, changed.trace["content_changed"]), ("retain", True))
+        self.assertEqual((removed.resolution_state, removed.trace["reason"]), ("unresolved", "block_removed"))
+
+    def test_char_range_anchors_follow_unchanged_blocks(self) -> None:
+        source = _document(_SOURCE)
+        target = _document({0: "New first step.", **_SOURCE})
+        start = source.index("Click export.")
+        spanning = (source.index("Pick"), source.index("Confirm.") + 3)
+
+        same = self._resolver(source, source).resolve(_range_anchor(start, start + 5))
+        moved, across = self._resolver(source, target).resolve_all([_range_anchor(start, start + 5), _range_anchor(*spanning)])
+
+        self.assertEqual(same.resolution_state, "retain")
+        self.assertEqual(moved.resolution_state, "remap")
+        shifted = target.index("Click export.")
+        self.assertEqual(moved.trace["target_char_range"], {"start_offset": shifted, "end_offset": shifted + 5})
+        self.assertEqual(moved.trace["source_block_ids"], [_id(2)])
+        self.assertEqual(across.resolution_state, "remap")
+        self.assertEqual(across.trace["target_block_ids"], [_id(3), _id(4)])
+
+    def test_char_range_anchors_on_changed_or_unblocked_text_are_unresolved(self) -> None:
+        source = _document(_SOURCE)
+        target = _document({**_SOURCE, 2: "Click export twice."})
+        start = source.index("Click export.")
+        resolver = self._resolver(source, target)
+
+        changed, preamble, out_of_bounds = resolver.resolve_all(
+            [_range_anchor(start, start + 5), _range_anchor(0, 3), _range_anchor(5, len(source) + 1)]
+        )
+
+        self.assertEqual((changed.resolution_state, changed.trace["reason"]), ("unresolved", "content_changed"))
+        self.assertEqual(preamble.trace["reason"], "outside_blocks")
+        self.assertEqual(out_of_bounds.trace["reason"], "range_out_of_bounds")
+
+
+class AnchorResolutionServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_resolves_against_the_latest_version_by_default(self) -> None:
+        store = InMemoryStore()
+        project = store.create_project(owner_id="owner-1", name="P")
+        job = store.create_job(owner_id="owner-1", project_id=project.id)
+        service = InstructionService(DirectAsyncRepository(store), InstructionStore())
+        created = await service.create_instruction(job_id=job.id, markdown=_document(_SOURCE))
+        await service.update_instruction(
+            owner_id="owner-1",
+            instruction_id=created.instruction_id,
+            base_version=1,
+            markdown=_document({1: "Open settings.", 3: "Pick PDF."}),
+        )
+
+        results = await service.resolve_anchors(
+            owner_id="owner-1",
+            instruction_id=created.instruction_id,
+            source_version=1,
+            anchors=[_block_anchor(1), _block_anchor(2)],
+        )
+
+        self.assertEqual([result.resolution_state for result in results], ["retain", "unresolved"])
+        self.assertEqual(results[0].target_instruction_version_id, f"{created.instruction_id}:2")
+        with self.assertRaises(ApiError):
+            await service.resolve_anchors(
+                owner_id="intruder",
+                instruction_id=created.instruction_id,
+                source_version=1,
+                anchors=[],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
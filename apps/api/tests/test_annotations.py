@@ -0,0 +1,129 @@
+"""Annotation op-log validation, hashing and deterministic rendering tests."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+from pathlib import Path
+import tempfile
+import unittest
+
+from app.adapters.media import AnnotationError, AnnotationRenderer, canonical_operation, ops_hash, prefix_hashes
+
+_HAS_RENDERER = importlib.util.find_spec("numpy") is not None and importlib.util.find_spec("PIL") is not None
+
+_OPERATIONS = [
+    {"op_type": "blur", "geometry": {"rect": {"x": 0.1, "y": 0.1, "w": 0.3, "h": 0.3}}, "style": {"radius": 6}},
+    {"op_type": "pencil", "geometry": {"points": [{"x": 0.5, "y": 0.5}, {"x": 0.6, "y": 0.55}, {"x": 0.7, "y": 0.5}]}},
+    {"op_type": "arrow", "geometry": {"from": {"x": 0.2, "y": 0.8}, "to": {"x": 0.45, "y": 0.6}}, "style": {"color": "#1e88e5"}},
+    {"op_type": "marker", "geometry": {"rect": {"x": 0.6, "y": 0.1, "w": 0.2, "h": 0.1}}, "style": {"opacity": 0.5}},
+    {"op_type": "text", "geometry": {"pos": {"x": 0.55, "y": 0.3}, "value": "Click here"}, "style": {"font_size": 12}},
+    {"op_type": "box", "geometry": {"rect": {"x": 0.05, "y": 0.05, "w": 0.5, "h": 0.5}}, "style": {"thickness": 2}},
+]
+
+
+class OperationHashTests(unittest.TestCase):
+    def test_equivalent_operations_hash_the_same(self) -> None:
+        marker = {"op_type": "marker", "geometry": {"rect": {"x": 0, "y": 0, "w": 1, "h": 0.5}}, "op_id": "a"}
+        highlight = {
+            "op_type": "highlight",
+            "geometry": {"rect": {"x": 0.0, "y": 0.0, "w": 1.0, "h": 0.5}},
+            "style": {"color": "#ffeb3b", "opacity": 0.4},
+            "op_id": "b",
+        }
+
+        self.assertEqual(canonical_operation(marker), canonical_operation(highlight))
+        self.assertEqual(ops_hash("base", [marker]), ops_hash("base", [highlight]))
+        self.assertNotEqual(ops_hash("base", [marker]), ops_hash("other-base", [marker]))
+
+    def test_prefix_hashes_are_shared_by_logs_that_extend_them(self) -> None:
+        hashes = prefix_hashes("base", _OPERATIONS)
+
+        self.assertEqual(len(hashes), len(_OPERATIONS) + 1)
+        self.assertEqual(prefix_hashes("base", _OPERATIONS[:3]), hashes[:4])
+        self.assertEqual(ops_hash("base", []), hashes[0])
+        self.assertEqual(len(set(hashes)), len(hashes))
+
+    def test_invalid_operations_are_rejected(self) -> None:
+        rect = {"x": 0.1, "y": 0.1, "w": 0.2, "h": 0.2}
+        cases = [
+            {"op_type": "circle", "geometry": {"rect": rect}},
+            {"op_type": "blur", "geometry": {"rect": {**rect, "x": 1.2}}},
+            {"op_type": "blur", "geometry": {"rect": {**rect, "w": 0.95}}},
+            {"op_type": "box", "geometry": {"rect": rect}, "style": {"color": "red"}},
+            {"op_type": "stroke", "geometry": {"points": []}},
+            {"op_type": "arrow", "geometry": {"from": {"x": 0.1, "y": True}, "to": {"x": 0.2, "y": 0.2}}},
+            {"op_type": "text", "geometry": {"pos": {"x": 0.1, "y": 0.1}, "value": " "}},
+            {"op_type": "stroke", "geometry": {"points": [{"x": 0.1, "y": 0.1}]}, "style": {"thickness": 0}},
+        ]
+
+        for operation in cases:
+            with self.subTest(operation=operation):
+                with self.assertRaises(AnnotationError) as ctx:
+                    canonical_operation(operation)
+                self.assertEqual(ctx.exception.code, "INVALID_ANNOTATION")
+
+
+@unittest.skipUnless(_HAS_RENDERER, "numpy and Pillow are required to render annotations")
+class AnnotationRendererTests(unittest.TestCase):
+    def setUp(self) -> None:
+        import numpy as np
+        from PIL import Image
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.np = np
+        self.base = Path(tmp.name, "base.png")
+        pixels = np.random.default_rng(7).integers(0, 256, (120, 200, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(self.base)
+        self.pixels = pixels
+        self.checksum = hashlib.sha256(self.base.read_bytes()).hexdigest()
+
+    def test_renders_are_deterministic_whether_fresh_or_continued_from_a_cached_prefix(self) -> None:
+        first = AnnotationRenderer().render(self.base, self.checksum, _OPERATIONS)
+        second = AnnotationRenderer().render(self.base, self.checksum, _OPERATIONS)
+        incremental = AnnotationRenderer()
+        incremental.render(self.base, self.checksum, _OPERATIONS[:4])
+        continued = incremental.render(self.base, self.checksum, _OPERATIONS)
+
+        self.assertTrue(self.np.array_equal(first, second))
+        self.assertTrue(self.np.array_equal(first, continued))
+        self.assertEqual(hashlib.sha256(first.tobytes()).hexdigest(), hashlib.sha256(second.tobytes()).hexdigest())
+        stats = incremental.stats
+        self.assertEqual((stats.renders, stats.ops_applied, stats.ops_reused), (2, 6, 4))
+        self.assertFalse(first.flags.writeable)
+
+    def test_operations_only_touch_their_region(self) -> None:
+        blur = _OPERATIONS[0]
+
+        rendered = AnnotationRenderer().render(self.base, self.checksum, [blur])
+
+        changed = self.np.argwhere((rendered != self.pixels).any(axis=2))
+        self.assertGreater(len(changed), 0)
+        self.assertEqual((changed.min(axis=0).tolist(), changed.max(axis=0).tolist()), ([12, 20], [47, 79]))
+        self.assertLess(rendered[12:48, 20:80].std(), self.pixels[12:48, 20:80].std() / 2)
+
+    def test_export_dpi_scales_the_output(self) -> None:
+        renderer = AnnotationRenderer()
+
+        preview = renderer.render(self.base, self.checksum, _OPERATIONS)
+        export = renderer.render(self.base, self.checksum, _OPERATIONS, dpi=300)
+
+        self.assertEqual(preview.shape, (120, 200, 3))
+        self.assertEqual(export.shape, (375, 625, 3))
+        self.assertEqual(renderer.stats.entries, 2 * (len(_OPERATIONS) + 1))
+        with self.assertRaises(AnnotationError):
+            renderer.render(self.base, self.checksum, _OPERATIONS, dpi=0)
+
+    def test_cache_stays_within_its_budget(self) -> None:
+        renderer = AnnotationRenderer(max_bytes=3 * self.pixels.nbytes)
+
+        renderer.render(self.base, self.checksum, _OPERATIONS)
+
+        stats = renderer.stats
+        self.assertEqual((stats.entries, stats.evictions), (3, len(_OPERATIONS) - 2))
+        self.assertLessEqual(stats.bytes, stats.max_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""Event-loop offloading tests for blocking repositories and token verifiers."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import tempfile
+import threading
+import time
+import unittest
+
+from app.adapters.auth import (
+    CachingTokenVerifier,
+    DirectAsyncTokenVerifier,
+    MockTokenVerifier,
+    OffloadedTokenVerifier,
+    TokenVerifier,
+    as_async_verifier,
+)
+from app.core.config import Settings
+from app.core.container import build_container
+from app.core.executor import BlockingExecutor
+from app.repositories.async_adapters import DirectAsyncRepository, OffloadedAsyncRepository, as_async_repository
+from app.repositories.memory import InMemoryStore
+from app.repositories.sql import SqlRepository
+from app.schemas.auth import AuthPrincipal
+
+
+class _SlowVerifier(TokenVerifier):
+    blocking = True
+
+    def __init__(self, delay_seconds: float) -> None:
+        self._inner = MockTokenVerifier()
+        self._delay_seconds = delay_seconds
+        self.threads: list[str] = []
+
+    def verify_token(self, token: str) -> AuthPrincipal:
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self._delay_seconds)
+        return self._inner.verify_token(token)
+
+
+class BlockingExecutorTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.executor = BlockingExecutor(2, thread_name_prefix="offload-test")
+
+    async def asyncTearDown(self) -> None:
+        self.executor.shutdown()
+
+    async def test_runs_on_worker_threads_and_counts_calls(self) -> None:
+        name = await self.executor.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(name.startswith("offload-test"))
+        stats = self.executor.stats
+        self.assertEqual((stats.submitted, stats.completed, stats.queued, stats.running), (1, 1, 0, 0))
+
+    async def test_records_queue_wait_when_pool_is_saturated(self) -> None:
+        await asyncio.gather(*(self.executor.run(time.sleep, 0.05) for _ in range(4)))
+
+        stats = self.executor.stats
+        self.assertEqual(stats.completed, 4)
+        self.assertGreaterEqual(stats.max_queue_wait_seconds, 0.04)
+        self.assertGreater(stats.mean_queue_wait_seconds, 0.0)
+
+    def test_rejects_empty_pool(self) -> None:
+        with self.assertRaises(ValueError):
+            BlockingExecutor(0)
+
+
+class AsyncRepositoryAdapterTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.executor = BlockingExecutor(2)
+
+    async def asyncTearDown(self) -> None:
+        self.executor.shutdown()
+
+    async def test_in_memory_store_is_called_inline(self) -> None:
+        repository = as_async_repository(InMemoryStore(), self.executor)
+
+        self.assertIsInstance(repository, DirectAsyncRepository)
+        project = await repository.create_project("user-a", "A")
+        self.assertEqual([p.id for p in await repository.list_projects_for_owner("user-a")], [project.id])
+        self.assertEqual(self.executor.stats.submitted, 0)
+
+    async def test_sql_repository_calls_go_through_the_executor(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SqlRepository.from_path(str(Path(tmp) / "offload.db"))
+            repository = as_async_repository(store, self.executor)
+            try:
+                self.assertIsInstance(repository, OffloadedAsyncRepository)
+                project = await repository.create_project("user-a", "A")
+                job = await repository.create_job("user-a", project.id)
+
+                self.assertEqual((await repository.get_job(job.id)).id, job.id)
+                self.assertEqual(
+                    [j.id for j in await repository.list_jobs_for_project(project.id, limit=10)],
+                    [job.id],
+                )
+                self.assertEqual(self.executor.stats.completed, 4)
+            finally:
+                store.close()
+
+
+class AsyncTokenVerifierAdapterTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.executor = BlockingExecutor(2, thread_name_prefix="verify-test")
+
+    async def asyncTearDown(self) -> None:
+        self.executor.shutdown()
+
+    async def test_non_blocking_verifier_runs_inline(self) -> None:
+        verifier = as_async_verifier(MockTokenVerifier(), self.executor)
+
+        self.assertIsInstance(verifier, DirectAsyncTokenVerifier)
+        self.assertEqual((await verifier.verify_token("test:user-1")).user_id, "user-1")
+        self.assertEqual(self.executor.stats.submitted, 0)
+
+    async def test_blocking_verifier_does_not_stall_the_event_loop(self) -> None:
+        slow = _SlowVerifier(0.2)
+        verifier = as_async_verifier(slow, self.executor)
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        try:
+            principal = await verifier.verify_token("test:user-1")
+        finally:
+            ticking.cancel()
+
+        self.assertIsInstance(verifier, OffloadedTokenVerifier)
+        self.assertEqual(principal.user_id, "user-1")
+        self.assertTrue(slow.threads[0].startswith("verify-test"))
+        self.assertGreaterEqual(ticks, 5)
+
+    async def test_cache_hits_skip_the_executor(self) -> None:
+        slow = _SlowVerifier(0.0)
+        cached = CachingTokenVerifier(slow)
+        verifier = as_async_verifier(cached, self.executor)
+
+        self.assertTrue(cached.blocking)
+        for _ in range(3):
+            await verifier.verify_token("test:user-1")
+
+        self.assertEqual(len(slow.threads), 1)
+        self.assertEqual(self.executor.stats.submitted, 1)
+        self.assertEqual((cached.hits, cached.misses), (2, 1))
+
+
+class ContainerExecutorTests(unittest.TestCase):
+    def test_pool_size_comes_from_settings_and_close_shuts_it_down(self) -> None:
+        container = build_container(Settings(auth_provider="mock", callback_secret="s", blocking_pool_size=3))
+
+        self.assertEqual(container.executor.max_workers, 3)
+        container.close()
+        with self.assertRaises(RuntimeError):
+            asyncio.run(container.executor.run(lambda: None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Verified-token cache tests."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+import unittest
+
+from app.adapters.auth.base import AuthVerificationError, TokenVerifier
+from app.adapters.auth.cache import CachingTokenVerifier
+from app.adapters.auth.mock_auth import MockTokenVerifier
+from app.schemas.auth import AuthPrincipal
+
+
+class _FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingVerifier(TokenVerifier):
+    def __init__(self, inner: TokenVerifier, expires_at: datetime | None = None) -> None:
+        self.inner = inner
+        self.expires_at = expires_at
+        self.calls = 0
+
+    def verify_token(self, token: str) -> AuthPrincipal:
+        self.calls += 1
+        principal = self.inner.verify_token(token)
+        if self.expires_at is not None:
+            principal = principal.model_copy(update={"expires_at": self.expires_at})
+        return principal
+
+
+class CachingTokenVerifierTests(unittest.TestCase):
+    def test_repeat_token_is_served_from_cache(self) -> None:
+        inner = _CountingVerifier(MockTokenVerifier())
+        verifier = CachingTokenVerifier(inner, clock=_FakeClock())
+
+        first = verifier.verify_token("test:user-1:editor")
+        second = verifier.verify_token("test:user-1:editor")
+
+        self.assertEqual(first, second)
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual((verifier.hits, verifier.misses), (1, 1))
+
+    def test_entry_never_outlives_token_exp(self) -> None:
+        clock = _FakeClock()
+        expires_at = datetime.fromtimestamp(clock.now + 10, UTC)
+        inner = _CountingVerifier(MockTokenVerifier(), expires_at=expires_at)
+        verifier = CachingTokenVerifier(inner, revocation_check_seconds=3_600, clock=clock)
+
+        verifier.verify_token("test:user-1")
+        clock.now += 9
+        verifier.verify_token("test:user-1")
+        clock.now += 1
+        verifier.verify_token("test:user-1")
+
+        self.assertEqual(inner.calls, 2)
+
+    def test_revocation_is_rechecked_after_interval(self) -> None:
+        clock = _FakeClock()
+        inner = _CountingVerifier(MockTokenVerifier())
+        verifier = CachingTokenVerifier(inner, revocation_check_seconds=60, clock=clock)
+
+        verifier.verify_token("test:user-1")
+        clock.now += 59
+        verifier.verify_token("test:user-1")
+        clock.now += 2
+        verifier.verify_token("test:user-1")
+
+        self.assertEqual(inner.calls, 2)
+        self.assertEqual((verifier.hits, verifier.misses), (1, 2))
+
+    def test_already_expired_token_is_not_cached(self) -> None:
+        clock = _FakeClock()
+        inner = _CountingVerifier(MockTokenVerifier(), expires_at=datetime.fromtimestamp(clock.now - 1, UTC))
+        verifier = CachingTokenVerifier(inner, clock=clock)
+
+        verifier.verify_token("test:user-1")
+
+        self.assertEqual(len(verifier), 0)
+
+    def test_failures_are_not_cached(self) -> None:
+        inner = _CountingVerifier(MockTokenVerifier())
+        verifier = CachingTokenVerifier(inner, clock=_FakeClock())
+
+        for _ in range(2):
+            with self.assertRaises(AuthVerificationError):
+                verifier.verify_token("invalid")
+
+        self.assertEqual(inner.calls, 2)
+        self.assertEqual(len(verifier), 0)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        inner = _CountingVerifier(MockTokenVerifier())
+        verifier = CachingTokenVerifier(inner, max_entries=2, clock=_FakeClock())
+
+        verifier.verify_token("test:user-a")
+        verifier.verify_token("test:user-b")
+        verifier.verify_token("test:user-a")
+        verifier.verify_token("test:user-c")
+        verifier.verify_token("test:user-a")
+        verifier.verify_token("test:user-b")
+
+        self.assertEqual(verifier.evictions, 2)
+        self.assertEqual(inner.calls, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,11 +13,13 @@ from fastapi import Request
 from fastapi.testclient import TestClient
 
 from app.adapters.auth.base import AuthVerificationError
+from app.adapters.auth.cache import CachingTokenVerifier
 from app.adapters.auth.firebase_auth import FirebaseTokenVerifier
 from app.adapters.auth.mock_auth import MockTokenVerifier
 from app.core.config import Settings, get_settings
+from app.core.container import build_token_verifier
 from app.main import create_app
-from app.routes.dependencies import get_project_service, get_token_verifier
+from app.routes.dependencies import get_project_service
 from app.schemas.project import Project
 
 
@@ -25,7 +27,7 @@ class _CapturingProjectService:
     def __init__(self) -> None:
         self.calls: list[tuple[str, str]] = []
 
-    def create_project(self, *, owner_id: str, name: str) -> Project:
+    async def create_project(self, *, owner_id: str, name: str) -> Project:
         self.calls.append((owner_id, name))
         return Project(id="project-1", name=name, created_at=datetime.now(UTC))
 
@@ -70,7 +72,11 @@ class AuthApiTests(_SettingsEnvCase):
         self.assertIn("/api/v1/internal/jobs/{jobId}/status", paths)
 
         self.assertEqual(set(paths["/api/v1/projects"]["post"]["responses"].keys()), {"201", "401"})
-        self.assertEqual(set(paths["/api/v1/projects"]["get"]["responses"].keys()), {"200"})
+        self.assertEqual(set(paths["/api/v1/projects"]["get"]["responses"].keys()), {"200", "400", "401"})
+        self.assertEqual(
+            set(paths["/api/v1/projects/{projectId}/jobs"]["get"]["responses"].keys()),
+            {"200", "400", "401", "404"},
+        )
         self.assertEqual(set(paths["/api/v1/projects/{projectId}"]["get"]["responses"].keys()), {"200", "404"})
         self.assertEqual(
             set(paths["/api/v1/projects/{projectId}/jobs"]["post"]["responses"].keys()),
@@ -78,7 +84,7 @@ class AuthApiTests(_SettingsEnvCase):
         )
         self.assertEqual(
             set(paths["/api/v1/internal/jobs/{jobId}/status"]["post"]["responses"].keys()),
-            {"200", "204", "401", "404", "409"},
+            {"200", "204", "401", "404", "409", "422"},
         )
         self.assertEqual(
             paths["/api/v1/projects/{projectId}"]["get"]["responses"]["404"]["content"]["application/json"]["schema"]["$ref"],
@@ -165,20 +171,23 @@ class AuthApiTests(_SettingsEnvCase):
     def test_internal_callback_uses_callback_secret_not_bearer(self) -> None:
         app = create_app()
         client = TestClient(app)
+        owner_headers = {"Authorization": "Bearer test:user-1:editor"}
+        project_id = client.post("/api/v1/projects", headers=owner_headers, json={"name": "P"}).json()["id"]
+        job_id = client.post(f"/api/v1/projects/{project_id}/jobs", headers=owner_headers).json()["id"]
 
         body = {
             "event_id": "evt-1",
-            "status": "CREATED",
+            "status": "UPLOADED",
             "occurred_at": "2026-02-22T00:00:00Z",
             "correlation_id": "corr-1",
         }
 
-        unauthorized = client.post("/api/v1/internal/jobs/job-1/status", json=body)
+        unauthorized = client.post(f"/api/v1/internal/jobs/{job_id}/status", json=body)
         self.assertEqual(unauthorized.status_code, 401)
         self.assertEqual(unauthorized.json()["code"], "UNAUTHORIZED")
 
         authorized = client.post(
-            "/api/v1/internal/jobs/job-1/status",
+            f"/api/v1/internal/jobs/{job_id}/status",
             headers={"X-Callback-Secret": "test-callback-secret"},
             json=body,
         )
@@ -221,7 +230,22 @@ class AuthAdapterUnitTests(unittest.TestCase):
             firebase_audience="aud-a",
         )
 
-        verifier = get_token_verifier(settings)
+        verifier = build_token_verifier(settings)
+
+        self.assertIsInstance(verifier, CachingTokenVerifier)
+        assert isinstance(verifier, CachingTokenVerifier)
+        self.assertIsInstance(verifier.inner, FirebaseTokenVerifier)
+
+    def test_dependency_skips_cache_when_disabled(self) -> None:
+        settings = Settings(
+            auth_provider="firebase",
+            callback_secret="secret",
+            firebase_project_id="project-a",
+            firebase_audience="aud-a",
+            auth_cache_enabled=False,
+        )
+
+        verifier = build_token_verifier(settings)
 
         self.assertIsInstance(verifier, FirebaseTokenVerifier)
 
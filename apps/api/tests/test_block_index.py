@@ -0,0 +1,166 @@
+"""Instruction block index tests."""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import unittest
+
+from app.errors import ApiError
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.block_index import BlockIndex, BlockIndexCache
+from app.repositories.instructions import InstructionStore, compute_delta
+from app.repositories.memory import InMemoryStore
+from app.services.instructions import InstructionService, select_blocks
+
+
+def _marker(n: int) -> str:
+    return f"<!-- block:00000000-0000-4000-8000-{n:012d} -->"
+
+
+def _document(blocks: int = 60) -> str:
+    parts = ["Preamble text.\n\n# Guide\n\n"]
+    for i in range(blocks):
+        heading = f"## Part {i // 10}\n\n" if i % 10 == 0 else ""
+        parts.append(f"{_marker(i)}\n{heading}Step {i}: click the button.\n\n")
+    return "".join(parts)
+
+
+def _spans(index: BlockIndex) -> list[tuple]:
+    return [(b.block_id, b.start, b.content_start, b.end, b.heading_path, b.content_hash) for b in index]
+
+
+class BlockIndexBuildTests(unittest.TestCase):
+    def test_blocks_carry_span_heading_path_and_content_hash(self) -> None:
+        markdown = f"# Guide\n{_marker(1)}\n## Setup\nInstall it.\n{_marker(2)}\nThen run it.\n"
+        index = BlockIndex.build(markdown)
+
+        first, second = list(index)
+        self.assertEqual((first.start, first.end), (markdown.index(_marker(1)), markdown.index(_marker(2))))
+        self.assertEqual(second.end, len(markdown))
+        self.assertEqual(first.heading_path, ("Guide", "Setup"))
+        self.assertEqual(second.heading_path, ("Guide", "Setup"))
+        self.assertEqual(second.content_hash, hashlib.sha256(b"Then run it.").hexdigest())
+        self.assertEqual(index.find(second.block_id), second)
+        self.assertIsNone(index.find("missing"))
+
+    def test_overlapping_ignores_the_preamble(self) -> None:
+        markdown = _document(3)
+        index = BlockIndex.build(markdown)
+        blocks = list(index)
+
+        self.assertEqual(index.overlapping(0, 5), [])
+        self.assertEqual(index.overlapping(0, blocks[0].start + 1), [blocks[0]])
+        self.assertEqual(index.overlapping(blocks[0].end - 1, blocks[2].start), blocks[:2])
+
+
+class BlockIndexApplyTests(unittest.TestCase):
+    def _check(self, old: str, new: str) -> BlockIndex:
+        derived = BlockIndex.build(old).apply(new, compute_delta(old, new))
+        self.assertEqual(_spans(derived), _spans(BlockIndex.build(new)))
+        self.assertEqual(derived.length, len(new))
+        return derived
+
+    def test_local_edit_reparses_only_the_touched_block(self) -> None:
+        old = _document()
+        new = old.replace("Step 30: click", "Step 30: double-click")
+
+        derived = self._check(old, new)
+
+        self.assertLess(derived.parsed_chars, 100)
+
+    def test_heading_changes_propagate_until_the_headings_realign(self) -> None:
+        old = _document()
+        new = old.replace("## Part 2\n", "## Chapter 2\n")
+
+        derived = self._check(old, new)
+
+        # Blocks 20-29 sit under the renamed heading; Part 3 resets the path.
+        self.assertEqual(derived.find(_marker(25)[11:-4]).heading_path, ("Guide", "Chapter 2"))
+        self.assertLess(derived.parsed_chars, len(new) // 4)
+
+    def test_marker_edits_and_random_edits_match_a_full_build(self) -> None:
+        old = _document()
+        self._check(old, old.replace(_marker(5) + "\n", ""))
+        self._check(old, old.replace("Step 7: click the button.", f"Split.\n\n{_marker(99)}\n# New top\nMore."))
+        self._check(old, old.replace("Preamble", "<!-- block:pre -->\nPreamble"))
+
+        rng = random.Random(3)
+        fragments = ("x", "\n## H\n", "\n# Top\n", _marker(77), "<!--", "\n")
+        text = old
+        for _ in range(200):
+            start = rng.randrange(len(text) + 1)
+            end = min(len(text), start + rng.randrange(40))
+            new = text[:start] + rng.choice(fragments) + text[end:]
+            with self.subTest(start=start, end=end):
+                self._check(text, new)
+            text = new
+
+
+class BlockIndexCacheTests(unittest.TestCase):
+    def test_least_recently_used_versions_are_evicted(self) -> None:
+        cache = BlockIndexCache(max_entries=2)
+        index = BlockIndex.build(_document(2))
+
+        cache.put("i", 1, index)
+        cache.put("i", 2, index)
+        cache.get("i", 1)
+        cache.put("i", 3, index)
+
+        self.assertIsNone(cache.get("i", 2))
+        self.assertIs(cache.get("i", 1), index)
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+
+
+class BlockIndexServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        store = InMemoryStore()
+        project = store.create_project(owner_id="owner-1", name="P")
+        job = store.create_job(owner_id="owner-1", project_id=project.id)
+        self.cache = BlockIndexCache()
+        self.service = InstructionService(DirectAsyncRepository(store), InstructionStore(), block_indexes=self.cache)
+        self.markdown = _document()
+        created = await self.service.create_instruction(job_id=job.id, markdown=self.markdown)
+        self.instruction_id = created.instruction_id
+
+    async def test_updates_derive_and_cache_each_version_index(self) -> None:
+        edited = self.markdown.replace("Step 12: click", "Step 12: tap")
+        await self.service.update_instruction(
+            owner_id="owner-1",
+            instruction_id=self.instruction_id,
+            base_version=1,
+            markdown=edited,
+        )
+
+        latest = await self.service.get_block_index(owner_id="owner-1", instruction_id=self.instruction_id)
+        first = await self.service.get_block_index(owner_id="owner-1", instruction_id=self.instruction_id, version=1)
+
+        self.assertIs(latest, self.cache.get(self.instruction_id, 2))
+        self.assertLess(latest.parsed_chars, 100)
+        self.assertEqual(_spans(latest), _spans(BlockIndex.build(edited)))
+        self.assertEqual(_spans(first), _spans(BlockIndex.build(self.markdown)))
+
+    async def test_evicted_versions_are_rebuilt_and_foreign_owners_get_not_found(self) -> None:
+        self.cache._entries.clear()
+
+        index = await self.service.get_block_index(owner_id="owner-1", instruction_id=self.instruction_id)
+
+        self.assertEqual(len(index), 60)
+        with self.assertRaises(ApiError) as ctx:
+            await self.service.get_block_index(owner_id="intruder", instruction_id=self.instruction_id)
+        self.assertEqual(ctx.exception.payload.code, "RESOURCE_NOT_FOUND")
+
+    async def test_selections_resolve_through_the_index(self) -> None:
+        index = await self.service.get_block_index(owner_id="owner-1", instruction_id=self.instruction_id)
+        block = index.block(4)
+
+        self.assertEqual(select_blocks(index, block_id=block.block_id), [block])
+        self.assertEqual(select_blocks(index, char_range=(block.content_start, block.end)), [block])
+        for selection in ({}, {"block_id": "missing"}, {"char_range": (5, len(self.markdown) + 1)}):
+            with self.subTest(selection=selection), self.assertRaises(ApiError) as ctx:
+                select_blocks(index, **selection)
+            self.assertEqual((ctx.exception.status_code, ctx.exception.payload.code), (400, "VALIDATION_ERROR"))
+
+
+if __name__ == "__main__":
+    unittest.main()
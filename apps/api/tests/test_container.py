@@ -0,0 +1,132 @@
+"""App-scoped dependency container tests."""
+
+from __future__ import annotations
+
+import os
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.adapters.auth.base import TokenVerifier
+from app.adapters.auth.firebase_auth import FirebaseTokenVerifier
+from app.adapters.auth.mock_auth import MockTokenVerifier
+from app.core.config import Settings, get_settings
+from app.core.container import AppContainer, build_container
+from app.main import create_app
+from app.schemas.auth import AuthPrincipal
+
+
+class _LifecycleVerifier(TokenVerifier):
+    def __init__(self) -> None:
+        self.warm_up_calls = 0
+        self.close_calls = 0
+        self._inner = MockTokenVerifier()
+
+    def verify_token(self, token: str) -> AuthPrincipal:
+        return self._inner.verify_token(token)
+
+    def warm_up(self) -> None:
+        self.warm_up_calls += 1
+
+    def close(self) -> None:
+        self.close_calls += 1
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ["HOWERA_FIREBASE_PROJECT_ID"] = "test-project"
+        os.environ["HOWERA_FIREBASE_AUDIENCE"] = "test-audience"
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class ContainerLifecycleTests(_SettingsEnvCase):
+    def _container_with(self, verifier: TokenVerifier) -> AppContainer:
+        return build_container(Settings(auth_provider="mock", callback_secret="secret"), token_verifier=verifier)
+
+    def test_lifespan_warms_up_once_and_closes_on_shutdown(self) -> None:
+        verifier = _LifecycleVerifier()
+        app = create_app(container=self._container_with(verifier))
+
+        with TestClient(app) as client:
+            self.assertEqual(verifier.warm_up_calls, 1)
+            for _ in range(3):
+                response = client.get("/api/v1/projects", headers={"Authorization": "Bearer test:user-1"})
+                self.assertEqual(response.status_code, 200)
+            self.assertEqual(verifier.warm_up_calls, 1)
+
+        self.assertEqual(verifier.close_calls, 1)
+
+    def test_services_are_shared_across_requests(self) -> None:
+        app = create_app()
+
+        with TestClient(app) as client:
+            container = app.state.container
+            headers = {"Authorization": "Bearer test:user-1"}
+            project_id = client.post("/api/v1/projects", headers=headers, json={"name": "Shared"}).json()["id"]
+            client.post(f"/api/v1/projects/{project_id}/jobs", headers=headers)
+
+            self.assertIs(app.state.container, container)
+            self.assertIs(container.store, app.state.store)
+            self.assertEqual(container.store.project_write_count, 1)
+            self.assertEqual(container.store.job_write_count, 1)
+
+    def test_container_is_built_lazily_without_lifespan(self) -> None:
+        app = create_app()
+        client = TestClient(app)
+        self.assertIsNone(app.state.container)
+
+        response = client.get("/api/v1/projects", headers={"Authorization": "Bearer test:user-1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(app.state.container, AppContainer)
+
+
+class FirebaseWarmUpTests(unittest.TestCase):
+    def _fake_firebase_modules(self) -> tuple[types.ModuleType, dict[str, types.ModuleType]]:
+        fake_admin = types.ModuleType("firebase_admin")
+        fake_auth = types.ModuleType("firebase_admin.auth")
+        fake_admin._apps = []
+        fake_admin.initialize_app = lambda: fake_admin._apps.append(object())
+        fake_admin.auth = fake_auth
+        return fake_admin, {"firebase_admin": fake_admin, "firebase_admin.auth": fake_auth}
+
+    def test_eager_init_initializes_sdk_during_warm_up(self) -> None:
+        fake_admin, modules = self._fake_firebase_modules()
+
+        with patch.dict(sys.modules, modules):
+            FirebaseTokenVerifier(project_id="p", audience=None, eager_init=True).warm_up()
+
+        self.assertEqual(len(fake_admin._apps), 1)
+
+    def test_warm_up_is_noop_without_eager_init(self) -> None:
+        fake_admin, modules = self._fake_firebase_modules()
+
+        with patch.dict(sys.modules, modules):
+            FirebaseTokenVerifier(project_id="p", audience=None).warm_up()
+
+        self.assertEqual(fake_admin._apps, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,315 @@
+"""Screenshot derivative generation, signed URL and download tests."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+from fastapi.testclient import TestClient
+
+from app.adapters.media import DerivativeSpec, image_dimensions, write_derivatives
+from app.core.config import Settings, get_settings
+from app.core.container import build_container
+from app.core.signing import UrlSigner
+from app.errors import ApiError
+from app.main import create_app
+from app.repositories.derivatives import DerivativeStore
+from app.repositories.screenshots import ScreenshotAssetRecord
+from app.schemas.screenshot import ScreenshotAssetKind
+from app.services.derivatives import DerivativeService
+
+_HAS_PILLOW = importlib.util.find_spec("PIL") is not None
+
+
+def _record(image: Path, checksum: str | None = None, *, uri: str | None = None) -> ScreenshotAssetRecord:
+    return ScreenshotAssetRecord(
+        id="asset-1",
+        job_id="job-1",
+        owner_id="owner-1",
+        anchor_id="anchor-1",
+        version=1,
+        kind=ScreenshotAssetKind.UPLOADED,
+        previous_asset_id=None,
+        image_uri=uri or image.resolve().as_uri(),
+        mime_type="image/png",
+        width=2000,
+        height=1000,
+        created_at=datetime.now(UTC),
+        checksum_sha256=checksum or hashlib.sha256(image.read_bytes()).hexdigest(),
+    )
+
+
+class UrlSignerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1_000_000.0
+        self.signer = UrlSigner("secret", ttl_seconds=900, clock=lambda: self.now)
+
+    def _parts(self, url: str) -> tuple[str, int, str]:
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        return parts.path, int(query["expires"][0]), query["signature"][0]
+
+    def test_signed_urls_verify_until_they_expire(self) -> None:
+        url, expires_at = self.signer.sign("/api/v1/derivatives/abc/320.webp")
+        path, expires, signature = self._parts(url)
+
+        self.assertEqual(path, "/api/v1/derivatives/abc/320.webp")
+        self.assertEqual(expires_at.timestamp(), expires)
+        self.assertGreaterEqual(expires, self.now + 900)
+        self.assertTrue(self.signer.verify(path, expires, signature))
+        self.assertFalse(self.signer.verify("/api/v1/derivatives/abd/320.webp", expires, signature))
+        self.assertFalse(self.signer.verify(path, expires + 60, signature))
+        self.assertFalse(UrlSigner("other", clock=lambda: self.now).verify(path, expires, signature))
+        self.now = expires + 1
+        self.assertFalse(self.signer.verify(path, expires, signature))
+
+    def test_urls_signed_within_one_expiry_window_are_identical(self) -> None:
+        first, _ = self.signer.sign("/a")
+        self.now += 15
+        second, _ = self.signer.sign("/a")
+
+        self.assertEqual(first, second)
+
+
+@unittest.skipUnless(_HAS_PILLOW, "Pillow is required to write derivatives")
+class WriteDerivativesTests(unittest.TestCase):
+    def setUp(self) -> None:
+        from PIL import Image
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.Image = Image
+        self.root = Path(tmp.name)
+
+    def test_renditions_are_downscaled_never_upscaled_and_flattened_for_jpeg(self) -> None:
+        source = self.root / "source.png"
+        image = self.Image.new("RGBA", (2000, 1000), (0, 128, 255, 255))
+        image.paste((0, 0, 0, 0), (0, 0, 1000, 1000))
+        image.save(source)
+        specs = [
+            DerivativeSpec(320, "webp", str(self.root / "out" / "320.webp")),
+            DerivativeSpec(1280, "jpg", str(self.root / "out" / "1280.jpg")),
+            DerivativeSpec(320, "jpg", str(self.root / "out" / "320.jpg")),
+            DerivativeSpec(4000, "webp", str(self.root / "out" / "4000.webp")),
+        ]
+
+        sizes = write_derivatives(source, specs)
+
+        self.assertEqual(sizes, [(320, 160), (1280, 640), (320, 160), (2000, 1000)])
+        self.assertEqual([image_dimensions(spec.output_path) for spec in specs], sizes)
+        with self.Image.open(specs[2].output_path) as thumbnail:
+            self.assertEqual(thumbnail.format, "JPEG")
+            self.assertGreater(min(thumbnail.convert("RGB").getpixel((10, 80))), 240)
+        self.assertEqual(sorted(os.listdir(self.root / "out")), ["1280.jpg", "320.jpg", "320.webp", "4000.webp"])
+
+    def test_jpeg_sources_decode_at_reduced_size(self) -> None:
+        source = self.root / "source.jpg"
+        self.Image.new("RGB", (4000, 3000), (200, 10, 10)).save(source, quality=90)
+
+        sizes = write_derivatives(source, [DerivativeSpec(320, "webp", str(self.root / "thumb.webp"))])
+
+        self.assertEqual(sizes, [(320, 240)])
+
+    def test_unreadable_sources_raise_oserror(self) -> None:
+        source = self.root / "broken.png"
+        source.write_bytes(b"not an image")
+
+        with self.assertRaises(OSError):
+            write_derivatives(source, [DerivativeSpec(320, "webp", str(self.root / "thumb.webp"))])
+
+
+class _PngWriter:
+    """Stands in for ``write_derivatives``: writes header-only PNGs and counts decodes."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self, source: Path, specs: list[DerivativeSpec]) -> list[tuple[int, int]]:
+        import struct
+        import time
+        import zlib
+
+        self.calls += 1
+        time.sleep(self.delay)
+        sizes = []
+        for spec in specs:
+            size = (min(spec.width, 2000), min(spec.width, 2000) // 2)
+            ihdr = struct.pack(">IIBBBBB", *size, 8, 2, 0, 0, 0)
+            os.makedirs(os.path.dirname(spec.output_path), exist_ok=True)
+            with open(spec.output_path, "wb") as stream:
+                stream.write(b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr)))
+            sizes.append(size)
+        return sizes
+
+
+class DerivativeServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.image = self.root / "shot.png"
+        self.image.write_bytes(b"source image")
+        self.writer = _PngWriter(delay=0.01)
+        self.service = DerivativeService(
+            DerivativeStore(self.root / "derivatives"),
+            UrlSigner("secret"),
+            variants={"thumbnail": 320, "preview": 1280},
+            formats=("webp", "jpg"),
+            writer=self.writer,
+        )
+
+    async def _settle(self) -> None:
+        for _ in range(100):
+            if self.service.generated + self.service.reused + self.service.failures:
+                return
+            await asyncio.sleep(0.005)
+
+    async def test_renditions_are_generated_once_per_checksum_and_listed_with_signed_urls(self) -> None:
+        record = _record(self.image)
+
+        self.service.schedule(record)
+        self.service.schedule(record)
+        await self._settle()
+        self.service.schedule(record)
+        for _ in range(100):
+            if self.service.reused:
+                break
+            await asyncio.sleep(0.005)
+        derivatives = await self.service.for_asset(record)
+
+        self.assertEqual((self.writer.calls, self.service.generated, self.service.reused), (1, 1, 1))
+        self.assertEqual(
+            [(d.variant, d.format.value, d.width, d.height, d.mime_type) for d in derivatives],
+            [
+                ("thumbnail", "webp", 320, 160, "image/webp"),
+                ("thumbnail", "jpg", 320, 160, "image/jpeg"),
+                ("preview", "webp", 1280, 640, "image/webp"),
+                ("preview", "jpg", 1280, 640, "image/jpeg"),
+            ],
+        )
+        parts = urlsplit(derivatives[0].url)
+        query = parse_qs(parts.query)
+        self.assertEqual(parts.path, f"/api/v1/derivatives/{record.checksum_sha256}/320.webp")
+        path, mime_type = await self.service.open(
+            checksum=record.checksum_sha256,
+            name="320.webp",
+            expires=int(query["expires"][0]),
+            signature=query["signature"][0],
+        )
+        self.assertEqual((path.name, mime_type), ("320.webp", "image/webp"))
+
+    async def test_unsigned_or_unknown_derivatives_are_not_found(self) -> None:
+        record = _record(self.image)
+        self.service.schedule(record)
+        await self._settle()
+        url = (await self.service.for_asset(record))[0].url
+        expires = int(parse_qs(urlsplit(url).query)["expires"][0])
+        signature = parse_qs(urlsplit(url).query)["signature"][0]
+
+        cases = [
+            (record.checksum_sha256, "320.webp", expires, "0" * 64),
+            (record.checksum_sha256, "1280.webp", expires, signature),
+            (record.checksum_sha256, "0320.webp", expires, signature),
+            ("../../etc", "320.webp", expires, signature),
+        ]
+        for checksum, name, expires_at, signed in cases:
+            with self.subTest(checksum=checksum, name=name):
+                with self.assertRaises(ApiError) as ctx:
+                    await self.service.open(checksum=checksum, name=name, expires=expires_at, signature=signed)
+                self.assertEqual(ctx.exception.status_code, 404)
+
+    async def test_remote_and_unchecksummed_images_are_skipped(self) -> None:
+        self.service.schedule(_record(self.image, uri="gs://bucket/shot.png"))
+        self.service.schedule(_record(self.image, checksum="not-a-checksum"))
+        await asyncio.sleep(0.02)
+
+        self.assertEqual(self.writer.calls, 0)
+        self.assertEqual(await self.service.for_asset(_record(self.image, checksum="not-a-checksum")), [])
+
+    async def test_failed_generation_is_retried_by_the_next_asset(self) -> None:
+        record = _record(self.image)
+
+        def bomb(source: Path, specs: list[DerivativeSpec]) -> list[tuple[int, int]]:
+            # Like Pillow's DecompressionBombError, which is not an OSError.
+            raise RuntimeError("Image size exceeds limit, could be decompression bomb DOS attack.")
+
+        self.service._writer = bomb
+        self.service.schedule(record)
+        await self._settle()
+        self.service._writer = self.writer
+        self.service.schedule(record)
+        for _ in range(100):
+            if self.service.generated:
+                break
+            await asyncio.sleep(0.005)
+
+        self.assertEqual((self.service.failures, self.service.generated), (1, 1))
+        self.assertEqual(len(await self.service.for_asset(record)), 4)
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class DerivativeApiTests(_SettingsEnvCase):
+    def test_signed_urls_download_without_a_bearer_token(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            image = Path(tmp, "shot.png")
+            image.write_bytes(b"source image")
+            record = _record(image)
+            staged = Path(tmp, "staged.webp")
+            _PngWriter()(image, [DerivativeSpec(320, "webp", str(staged))])
+            DerivativeStore(Path(tmp, "derivatives")).put(record.checksum_sha256, 320, "webp", staged, (320, 160))
+            container = build_container(
+                Settings(
+                    auth_provider="mock",
+                    callback_secret="test-callback-secret",
+                    derivative_root=str(Path(tmp, "derivatives")),
+                )
+            )
+            with TestClient(create_app(container=container)) as client:
+                derivatives = client.portal.call(container.derivative_service.for_asset, record)
+                url = derivatives[0].url
+                served = client.get(url)
+                tampered = client.get(url.replace(record.checksum_sha256, "f" * 64))
+                unsigned = client.get(urlsplit(url).path)
+
+        self.assertEqual([d.variant for d in derivatives], ["thumbnail"])
+        self.assertEqual((served.status_code, served.headers["content-type"]), (200, "image/webp"))
+        self.assertTrue(served.headers["cache-control"].startswith("private, max-age="))
+        self.assertEqual(served.content[:8], b"\x89PNG\r\n\x1a\n")
+        self.assertEqual((tampered.status_code, tampered.json()["code"]), (404, "RESOURCE_NOT_FOUND"))
+        self.assertEqual(unsigned.status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
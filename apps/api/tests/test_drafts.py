@@ -0,0 +1,170 @@
+"""Windowed draft generation tests."""
+
+from __future__ import annotations
+
+import unittest
+
+from app.adapters.llm import DraftRequest, FakeLLMClient, LLMError, ProgressCallback
+from app.errors import ApiError
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.block_index import BlockIndex
+from app.repositories.instructions import InstructionStore
+from app.repositories.memory import InMemoryStore
+from app.repositories.transcripts import CompactTranscript, TranscriptStore
+from app.schemas.job import JobStatus
+from app.services.drafts import DraftService, estimate_tokens, merge_fragments, plan_windows
+from app.services.instruction_validation import validate_markdown
+from app.services.instructions import InstructionService
+from app.services.transcripts import TranscriptService
+
+
+def _transcript(count: int = 200) -> CompactTranscript:
+    return CompactTranscript.from_segments(
+        (n * 3000, n * 3000 + 2500, f"Step {n}: open the panel and confirm setting number {n}.") for n in range(count)
+    )
+
+
+class _FlakyLLM(FakeLLMClient):
+    """Fails the first call for any window containing ``poison``."""
+
+    def __init__(self, poison: str) -> None:
+        super().__init__(latency_seconds=0.005)
+        self._poison = poison
+        self._failed = False
+
+    async def generate(self, request: DraftRequest, progress: ProgressCallback | None = None) -> str:
+        if self._poison in request.transcript and not self._failed:
+            self._failed = True
+            raise LLMError("provider timed out", code="PROVIDER_TIMEOUT", retryable=True)
+        return await super().generate(request, progress)
+
+
+class PlanWindowsTests(unittest.TestCase):
+    def test_windows_cover_the_transcript_within_budget_and_overlap(self) -> None:
+        transcript = _transcript()
+
+        windows = plan_windows(transcript, max_tokens=400, overlap_tokens=50)
+
+        self.assertGreater(len(windows), 5)
+        self.assertEqual((windows[0].start, windows[-1].stop), (0, len(transcript)))
+        for previous, window in zip(windows, windows[1:]):
+            self.assertEqual(window.start, previous.stop)
+            self.assertTrue(previous.start <= window.context_start < window.start)
+            overlap = window.context.splitlines()
+            self.assertEqual(len(overlap), window.start - window.context_start)
+            self.assertTrue(previous.text.endswith(window.context))
+            self.assertLessEqual(sum(estimate_tokens(line) for line in overlap), 50)
+        self.assertEqual(windows[0].context, "")
+        for window in windows:
+            self.assertLessEqual(sum(estimate_tokens(line) for line in window.text.splitlines()), 400)
+        self.assertEqual(windows, plan_windows(transcript, max_tokens=400, overlap_tokens=50))
+        self.assertTrue(windows[1].text.startswith("[00:"))
+
+    def test_oversized_segments_get_their_own_window(self) -> None:
+        transcript = CompactTranscript.from_segments([(0, 1, "short"), (1, 2, "x" * 4000), (2, 3, "short")])
+
+        windows = plan_windows(transcript, max_tokens=100, overlap_tokens=10)
+
+        self.assertEqual([(w.start, w.stop) for w in windows], [(0, 1), (1, 2), (2, 3)])
+
+
+class MergeFragmentsTests(unittest.TestCase):
+    def test_overlap_repeats_are_dropped_and_ids_are_deterministic(self) -> None:
+        fragments = [
+            "# Title\n\n## Open\nOpen the panel.\n\n## Confirm\nConfirm the settings.",
+            "<!-- block:nope -->\n## Confirm\nConfirm   the settings.\n\n## Export\n```\n# not a heading\n```",
+        ]
+
+        markdown = merge_fragments("job-1", fragments)
+
+        index = BlockIndex.build(markdown)
+        self.assertEqual(markdown, merge_fragments("job-1", fragments))
+        self.assertNotEqual(markdown, merge_fragments("job-2", fragments))
+        self.assertEqual([block.heading_path[-1] for block in index], ["Open", "Confirm", "Export"])
+        self.assertTrue(markdown.startswith("# Instructions\n"))
+        self.assertNotIn("# Title", markdown)
+        self.assertEqual(validate_markdown(markdown), [])
+
+
+class DraftServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        store = InMemoryStore()
+        project = store.create_project(owner_id="owner-1", name="P")
+        self.job = store.create_job(owner_id="owner-1", project_id=project.id)
+        self.transcripts = TranscriptStore()
+        self.transcripts.put(self.job.id, _transcript())
+        repository = DirectAsyncRepository(store)
+        self.transcript_service = TranscriptService(repository, self.transcripts)
+        self.instructions = InstructionService(repository, InstructionStore())
+
+    def _service(self, llm: FakeLLMClient) -> DraftService:
+        return DraftService(
+            self.transcript_service,
+            self.instructions,
+            llm,
+            max_concurrency=3,
+            max_window_tokens=400,
+            overlap_tokens=50,
+        )
+
+    async def test_windows_are_generated_concurrently_and_merged(self) -> None:
+        self.job.status = JobStatus.TRANSCRIPT_READY
+        llm = FakeLLMClient(latency_seconds=0.01)
+        service = self._service(llm)
+
+        draft = await service.generate_draft(owner_id="owner-1", job_id=self.job.id, prompt_template_id="tpl-1")
+
+        windows = plan_windows(_transcript(), max_tokens=400, overlap_tokens=50)
+        self.assertEqual((llm.calls, llm.max_in_flight), (len(windows), 3))
+        self.assertEqual((draft.version, draft.prompt_template_id), (1, "tpl-1"))
+        self.assertEqual(len(BlockIndex.build(draft.markdown)), len(windows))
+        for n in (0, 99, 199):
+            self.assertIn(f"Step {n}: open the panel", draft.markdown)
+        self.assertEqual(draft.validation_status, "PASS")
+
+    async def test_overlap_is_context_so_no_step_is_generated_twice(self) -> None:
+        self.job.status = JobStatus.TRANSCRIPT_READY
+        requests: list[DraftRequest] = []
+
+        class _RecordingLLM(FakeLLMClient):
+            async def generate(self, request: DraftRequest, progress: ProgressCallback | None = None) -> str:
+                requests.append(request)
+                return await super().generate(request, progress)
+
+        draft = await self._service(_RecordingLLM()).generate_draft(owner_id="owner-1", job_id=self.job.id)
+
+        steps = [line for line in draft.markdown.splitlines() if line.startswith("[")]
+        self.assertEqual(len(steps), 200)
+        self.assertEqual(len(set(steps)), 200)
+        self.assertTrue(any("do not write steps" in (request.context or "") for request in requests[1:]))
+
+    async def test_retry_after_a_failed_window_only_generates_that_window(self) -> None:
+        self.job.status = JobStatus.TRANSCRIPT_READY
+        llm = _FlakyLLM("Step 120:")
+        service = self._service(llm)
+
+        with self.assertRaises(LLMError):
+            await service.generate_draft(owner_id="owner-1", job_id=self.job.id)
+        generated = service.windows_generated
+        self.job.status = JobStatus.FAILED
+        draft = await service.generate_draft(owner_id="owner-1", job_id=self.job.id)
+
+        windows = len(plan_windows(_transcript(), max_tokens=400, overlap_tokens=50))
+        self.assertEqual(generated, windows - 1)
+        self.assertEqual((service.windows_generated, service.windows_reused), (windows, windows - 1))
+        self.assertIn("Step 120:", draft.markdown)
+
+    async def test_transcript_must_be_readable(self) -> None:
+        service = self._service(FakeLLMClient())
+
+        with self.assertRaises(ApiError) as ctx:
+            await service.generate_draft(owner_id="owner-1", job_id=self.job.id)
+        with self.assertRaises(ApiError) as foreign:
+            await service.generate_draft(owner_id="intruder", job_id=self.job.id)
+
+        self.assertEqual((ctx.exception.status_code, ctx.exception.payload.code), (409, "TRANSCRIPT_NOT_READY"))
+        self.assertEqual(foreign.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Instruction validation tests."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.block_index import BlockIndex
+from app.repositories.instructions import InstructionStore, compute_delta
+from app.repositories.memory import InMemoryStore
+from app.services import instruction_validation
+from app.services.instruction_validation import InstructionValidator, validate_markdown
+from app.services.instructions import InstructionService
+
+
+def _marker(n: int) -> str:
+    return f"<!-- block:00000000-0000-4000-8000-{n:012d} -->"
+
+
+def _document(blocks: int = 50) -> str:
+    return "# Guide\n" + "".join(f"{_marker(i)}\nStep {i}: press the button.\n\n" for i in range(blocks))
+
+
+class ValidationRuleTests(unittest.TestCase):
+    def test_rules_report_block_paths(self) -> None:
+        markdown = (
+            f"{_marker(1)}\n```python\nprint()\n"
+            f"{_marker(1)}\n~~~\nclosed\n~~~\n"
+            "<!-- block:nope -->\ntext\n"
+        )
+
+        issues = validate_markdown(markdown)
+
+        self.assertEqual(
+            [(issue.code, issue.path) for issue in issues],
+            [("UNCLOSED_CODE_FENCE", "blocks[0]"), ("BLOCK_ID_DUPLICATE", "blocks[1]"), ("BLOCK_ID_INVALID", "blocks[2]")],
+        )
+        self.assertEqual([issue.code for issue in validate_markdown(" \n")], ["EMPTY_DOCUMENT"])
+
+
+class InstructionValidatorTests(unittest.TestCase):
+    def test_unchanged_or_reverted_documents_skip_validation(self) -> None:
+        validator = InstructionValidator()
+        original = _document()
+        edited = original.replace("Step 3:", "Step three:")
+
+        first = validator.validate(original)
+        validator.validate(edited)
+        reverted = validator.validate(original)
+
+        self.assertIs(reverted, first)
+        self.assertEqual((validator.documents_validated, validator.documents_skipped), (2, 1))
+
+    def test_edits_recheck_only_changed_blocks_and_merge_the_rest(self) -> None:
+        validator = InstructionValidator()
+        original = _document()
+        edited = original.replace("Step 7: press the button.", "```\nunclosed")
+        index = BlockIndex.build(original).apply(edited, compute_delta(original, edited))
+
+        validator.validate(original)
+        issues = validator.validate(edited, index)
+
+        # 50 blocks on the first save; only the edited block on the second.
+        self.assertEqual((validator.blocks_validated, validator.blocks_skipped), (51, 49))
+        self.assertEqual(list(issues), validate_markdown(edited))
+
+    def test_results_are_keyed_by_validator_version(self) -> None:
+        validator = InstructionValidator()
+        validator.validate(_document())
+
+        with mock.patch.object(instruction_validation, "VALIDATOR_VERSION", "next"):
+            validator.validate(_document())
+
+        self.assertEqual((validator.documents_validated, validator.documents_skipped), (2, 0))
+
+    def test_caches_are_bounded(self) -> None:
+        validator = InstructionValidator(max_documents=2, max_blocks=4)
+        for n in range(5):
+            validator.validate(_document(n + 1).replace("press", f"press {n}"))
+
+        validator.validate(_document(1).replace("press", "press 0"))
+
+        self.assertEqual(validator.documents_skipped, 0)
+        self.assertEqual(len(validator._documents), 2)
+        self.assertEqual(len(validator._blocks), 4)
+
+
+class ServiceValidationTests(unittest.IsolatedAsyncioTestCase):
+    async def test_saving_reverted_content_reuses_the_validation(self) -> None:
+        store = InMemoryStore()
+        project = store.create_project(owner_id="owner-1", name="P")
+        job = store.create_job(owner_id="owner-1", project_id=project.id)
+        validator = InstructionValidator()
+        service = InstructionService(DirectAsyncRepository(store), InstructionStore(), validator=validator)
+        original = _document()
+        created = await service.create_instruction(job_id=job.id, markdown=original)
+
+        for version, markdown in enumerate((original + "extra\n", original), start=1):
+            updated = await service.update_instruction(
+                owner_id="owner-1",
+                instruction_id=created.instruction_id,
+                base_version=version,
+                markdown=markdown,
+            )
+
+        self.assertEqual(updated.version, 3)
+        self.assertEqual((updated.validation_status, updated.validator_version), ("PASS", "2"))
+        self.assertEqual((validator.documents_validated, validator.documents_skipped), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+"""Instruction version storage and endpoint tests."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings, get_settings
+from app.core.container import build_container
+from app.main import create_app
+from app.repositories.instructions import InstructionStore, InstructionVersionConflict, apply_delta, compute_delta
+
+_OWNER_HEADERS = {"Authorization": "Bearer test:owner-1:editor"}
+_BLOCK = "<!-- block:0f8fad5b-d9cb-469f-a165-70867728950e -->\n"
+
+
+def _document(sections: int = 400) -> str:
+    return "".join(f"## Step {i}\n\nDo thing number {i} carefully.\n\n" for i in range(sections))
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class DeltaTests(unittest.TestCase):
+    def test_small_and_scattered_edits_round_trip(self) -> None:
+        old = _document()
+        cases = (
+            old,
+            old.replace("thing number 7 ", "thing number seven "),
+            old.replace("Step 3\n", "Step three\n").replace("number 390", "number 391"),
+            "prefix\n" + old[:-10],
+            "",
+        )
+        for new in cases:
+            with self.subTest(length=len(new)):
+                self.assertEqual(apply_delta(old, compute_delta(old, new)), new)
+
+    def test_scattered_edits_store_only_changed_lines(self) -> None:
+        old = _document()
+        new = old.replace("Step 3\n", "Step three\n").replace("number 390", "number 391")
+
+        delta = compute_delta(old, new)
+
+        self.assertEqual(len(delta), 2)
+        self.assertLess(sum(len(text) for _, _, text in delta), 100)
+
+
+class InstructionStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = InstructionStore(snapshot_interval=4)
+        self.texts = [_document()]
+        self.instruction_id = self.store.create(job_id="job-1", owner_id="owner-1", markdown=self.texts[0]).instruction_id
+        for i in range(9):
+            self.texts.append(self.texts[-1].replace(f"number {i} ", f"number {i}b "))
+            self.store.update(self.instruction_id, base_version=i + 1, markdown=self.texts[-1])
+
+    def test_every_version_reads_back_exactly(self) -> None:
+        for version, text in enumerate(self.texts, start=1):
+            with self.subTest(version=version):
+                record = self.store.get(self.instruction_id, version)
+                self.assertEqual((record.version, record.markdown), (version, text))
+        self.assertIsNone(self.store.get(self.instruction_id, 11))
+        self.assertIsNone(self.store.get("missing"))
+
+    def test_latest_is_served_hot_and_old_reads_replay_a_bounded_chain(self) -> None:
+        self.assertEqual(self.store.get(self.instruction_id).version, 10)
+        self.assertEqual(self.store.reconstructed_deltas, 0)
+
+        for version in range(1, 10):
+            self.store.get(self.instruction_id, version)
+            self.assertLess(self.store.reconstructed_deltas, 4 * version)
+        # Versions 1, 5 and 9 are snapshots; the rest replay at most three deltas.
+        self.assertEqual(self.store.reconstructed_deltas, 0 + 1 + 2 + 3 + 0 + 1 + 2 + 3 + 0)
+
+    def test_deltas_keep_history_far_below_full_copies(self) -> None:
+        # Three snapshots and the hot latest copy instead of ten full copies.
+        self.assertLess(self.store.stored_chars(self.instruction_id), 4 * len(self.texts[0]) + 100)
+
+    def test_rewrites_are_snapshotted_and_stale_bases_conflict(self) -> None:
+        rewrite = "# Something else entirely\n"
+        before = self.store.reconstructed_deltas
+        self.store.update(self.instruction_id, base_version=10, markdown=rewrite)
+
+        with self.assertRaises(InstructionVersionConflict) as ctx:
+            self.store.update(self.instruction_id, base_version=10, markdown="late")
+
+        self.assertEqual((ctx.exception.base_version, ctx.exception.current_version), (10, 11))
+        self.assertEqual(self.store.get(self.instruction_id, 10).markdown, self.texts[-1])
+        self.assertEqual(self.store.reconstructed_deltas, before + 1)
+        self.assertEqual(self.store.get(self.instruction_id).markdown, rewrite)
+
+
+class InstructionApiTests(_SettingsEnvCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.container = build_container(Settings(auth_provider="mock", callback_secret="test-callback-secret"))
+        self.client = TestClient(create_app(container=self.container))
+        project_id = self.client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+        job_id = self.client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"]
+        instruction = asyncio.run(
+            self.container.instruction_service.create_instruction(
+                job_id=job_id,
+                markdown=_BLOCK + "# Intro\n",
+                model_profile_id="profile-1",
+            )
+        )
+        self.instruction_id = instruction.instruction_id
+        self.url = f"/api/v1/instructions/{self.instruction_id}"
+
+    def test_update_creates_the_next_version_and_old_versions_stay_readable(self) -> None:
+        updated = self.client.put(self.url, headers=_OWNER_HEADERS, json={"base_version": 1, "markdown": "# Intro v2\n"})
+
+        self.assertEqual(updated.status_code, 200)
+        body = updated.json()
+        self.assertEqual((body["version"], body["markdown"], body["id"]), (2, "# Intro v2\n", self.instruction_id))
+        self.assertEqual((body["validation_status"], body["model_profile_id"]), ("PASS", "profile-1"))
+        self.assertEqual(self.client.get(self.url, headers=_OWNER_HEADERS).json()["version"], 2)
+        old = self.client.get(self.url, headers=_OWNER_HEADERS, params={"version": 1}).json()
+        self.assertEqual((old["version"], old["markdown"]), (1, _BLOCK + "# Intro\n"))
+
+    def test_stale_base_version_is_a_conflict_with_no_mutation(self) -> None:
+        self.client.put(self.url, headers=_OWNER_HEADERS, json={"base_version": 1, "markdown": "v2"})
+
+        stale = self.client.put(self.url, headers=_OWNER_HEADERS, json={"base_version": 1, "markdown": "lost"})
+
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(stale.json()["code"], "VERSION_CONFLICT")
+        self.assertEqual(stale.json()["details"], {"base_version": 1, "current_version": 2})
+        self.assertEqual(self.client.get(self.url, headers=_OWNER_HEADERS).json()["markdown"], "v2")
+
+    def test_validation_failures_are_recorded_on_the_version(self) -> None:
+        body = self.client.put(
+            self.url,
+            headers=_OWNER_HEADERS,
+            json={"base_version": 1, "markdown": _BLOCK + _BLOCK},
+        ).json()
+
+        self.assertEqual(body["validation_status"], "FAIL")
+        self.assertEqual([issue["code"] for issue in body["validation_errors"]], ["BLOCK_ID_DUPLICATE"])
+
+    def test_foreign_and_missing_instructions_are_indistinguishable(self) -> None:
+        intruder = {"Authorization": "Bearer test:intruder:editor"}
+        foreign = self.client.get(self.url, headers=intruder)
+        foreign_put = self.client.put(self.url, headers=intruder, json={"base_version": 1, "markdown": "x"})
+        missing = self.client.get("/api/v1/instructions/missing", headers=_OWNER_HEADERS)
+        missing_version = self.client.get(self.url, headers=_OWNER_HEADERS, params={"version": 9})
+
+        for response in (foreign, foreign_put, missing, missing_version):
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.json(), missing.json())
+        self.assertEqual(self.client.get(self.url, headers=_OWNER_HEADERS).json()["version"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
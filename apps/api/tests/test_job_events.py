@@ -0,0 +1,229 @@
+"""Job event broker and SSE stream tests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.core.events import HEARTBEAT_FRAME, JOB_STATUS_EVENT, JobEventBroker
+from app.main import create_app
+from app.repositories.memory import InMemoryStore
+from app.schemas.internal import StatusCallbackRequest
+from app.schemas.job import JobStatus
+from app.services.callbacks import StatusCallbackEngine
+
+_OWNER_HEADERS = {"Authorization": "Bearer test:owner-1:editor"}
+_SECRET_HEADERS = {"X-Callback-Secret": "test-callback-secret"}
+
+
+def _parse_frames(body: str) -> list[dict]:
+    frames = []
+    for block in body.strip().split("\n\n"):
+        frame: dict = {}
+        for line in block.split("\n"):
+            key, _, value = line.partition(": ")
+            frame[key] = value
+        frames.append(frame)
+    return frames
+
+
+async def _collect(subscription, count: int, heartbeat_seconds: float = 5.0) -> list[bytes]:
+    frames = []
+    async for frame in subscription.frames(heartbeat_seconds):
+        frames.append(frame)
+        if len(frames) == count:
+            break
+    return frames
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class JobEventBrokerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_subscribers_receive_published_frames(self) -> None:
+        broker = JobEventBroker()
+        subscription = broker.subscribe("job-1")
+        broker.publish("job-2", JOB_STATUS_EVENT, {"status": "UPLOADED"})
+        event = broker.publish("job-1", JOB_STATUS_EVENT, {"status": "UPLOADED"})
+
+        frames = await _collect(subscription, 1)
+
+        self.assertEqual(frames, [event.frame])
+        self.assertEqual(event.frame, b'id: 2\nevent: job.status\ndata: {"status":"UPLOADED"}\n\n')
+
+    async def test_last_event_id_replays_newer_history_only(self) -> None:
+        broker = JobEventBroker()
+        first = broker.publish("job-1", JOB_STATUS_EVENT, {"n": 1})
+        second = broker.publish("job-1", JOB_STATUS_EVENT, {"n": 2})
+        third = broker.publish("job-1", JOB_STATUS_EVENT, {"n": 3})
+
+        subscription = broker.subscribe("job-1", last_event_id=first.id)
+
+        self.assertEqual(await _collect(subscription, 2), [second.frame, third.frame])
+
+    async def test_full_buffer_drains_then_ends_the_stream(self) -> None:
+        broker = JobEventBroker(subscriber_buffer=2)
+        subscription = broker.subscribe("job-1")
+        events = [broker.publish("job-1", JOB_STATUS_EVENT, {"n": n}) for n in range(3)]
+
+        frames = [frame async for frame in subscription.frames(5.0)]
+        subscription.close()
+
+        self.assertEqual(frames, [events[0].frame, events[1].frame])
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(broker.overflow_disconnects, 1)
+        self.assertEqual(broker.subscriber_count, 0)
+
+    async def test_publish_from_worker_thread_is_delivered_on_the_loop(self) -> None:
+        broker = JobEventBroker()
+        subscription = broker.subscribe("job-1")
+        thread = threading.Thread(target=broker.publish, args=("job-1", JOB_STATUS_EVENT, {"n": 1}))
+        thread.start()
+        thread.join()
+
+        frames = await asyncio.wait_for(_collect(subscription, 1), 1.0)
+
+        self.assertIn(b'"n":1', frames[0])
+
+    async def test_idle_stream_heartbeats_and_close_ends_it(self) -> None:
+        broker = JobEventBroker()
+        subscription = broker.subscribe("job-1")
+
+        self.assertEqual(await _collect(subscription, 1, heartbeat_seconds=0.01), [HEARTBEAT_FRAME])
+        broker.close()
+        self.assertEqual([frame async for frame in subscription.frames(5.0)], [])
+
+    async def test_idle_channels_are_evicted_but_watched_ones_are_kept(self) -> None:
+        broker = JobEventBroker(max_tracked_jobs=2)
+        subscription = broker.subscribe("watched")
+        for job_id in ("a", "b", "c"):
+            broker.publish(job_id, JOB_STATUS_EVENT, {})
+        event = broker.publish("watched", JOB_STATUS_EVENT, {})
+
+        recent = broker.subscribe("c", last_event_id=0)
+        evicted = broker.subscribe("a", last_event_id=0)
+
+        self.assertEqual(await _collect(subscription, 1), [event.frame])
+        self.assertIn(b"id: 3\n", (await _collect(recent, 1))[0])
+        self.assertEqual(await _collect(evicted, 1, heartbeat_seconds=0.01), [HEARTBEAT_FRAME])
+
+
+class CallbackEventPublishingTests(unittest.IsolatedAsyncioTestCase):
+    async def test_applied_transitions_are_published_but_replays_are_not(self) -> None:
+        store = InMemoryStore()
+        project = store.create_project(owner_id="owner-1", name="P")
+        job = store.create_job(owner_id="owner-1", project_id=project.id)
+        broker = JobEventBroker()
+        engine = StatusCallbackEngine(store, events=broker)
+        subscription = broker.subscribe(job.id)
+        callback = StatusCallbackRequest(
+            event_id="evt-1",
+            status=JobStatus.UPLOADED,
+            occurred_at="2026-02-22T10:00:00Z",
+            correlation_id="corr",
+        )
+
+        engine.ingest(job.id, callback)
+        engine.ingest(job.id, callback)
+        frames = await _collect(subscription, 1)
+
+        self.assertEqual(broker.published, 1)
+        data = json.loads(_parse_frames(frames[0].decode())[0]["data"])
+        self.assertEqual(
+            data,
+            {
+                "job_id": job.id,
+                "status": "UPLOADED",
+                "previous_status": "CREATED",
+                "occurred_at": "2026-02-22T10:00:00+00:00",
+            },
+        )
+
+
+class JobEventStreamApiTests(_SettingsEnvCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.app = create_app()
+        self.client = TestClient(self.app)
+        project_id = self.client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+        self.job_id = self.client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"]
+
+    def _callback(self, event_id: str, status: str, second: int) -> None:
+        response = self.client.post(
+            f"/api/v1/internal/jobs/{self.job_id}/status",
+            headers=_SECRET_HEADERS,
+            json={
+                "event_id": event_id,
+                "status": status,
+                "occurred_at": f"2026-02-22T10:00:{second:02d}Z",
+                "correlation_id": "corr",
+            },
+        )
+        self.assertEqual(response.status_code, 204)
+
+    def test_stream_resumes_from_last_event_id_with_a_snapshot_first(self) -> None:
+        self._callback("evt-1", "UPLOADED", 1)
+        self._callback("evt-2", "AUDIO_EXTRACTING", 2)
+        self._callback("evt-3", "AUDIO_READY", 3)
+        # A closed broker ends streams after the backlog, so the response completes.
+        self.app.state.container.events.close()
+
+        response = self.client.get(
+            f"/api/v1/jobs/{self.job_id}/events",
+            headers={**_OWNER_HEADERS, "Last-Event-ID": "1"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        frames = _parse_frames(response.text)
+        self.assertEqual(frames[0], {"retry": "3000"})
+        snapshot = json.loads(frames[1]["data"])
+        self.assertNotIn("id", frames[1])
+        self.assertEqual((snapshot["status"], snapshot["snapshot"]), ("AUDIO_READY", True))
+        self.assertEqual([frame["id"] for frame in frames[2:]], ["2", "3"])
+        self.assertEqual([json.loads(frame["data"])["status"] for frame in frames[2:]], ["AUDIO_EXTRACTING", "AUDIO_READY"])
+
+    def test_stream_requires_auth_and_hides_foreign_jobs(self) -> None:
+        unauthenticated = self.client.get(f"/api/v1/jobs/{self.job_id}/events")
+        foreign = self.client.get(
+            f"/api/v1/jobs/{self.job_id}/events",
+            headers={"Authorization": "Bearer test:intruder:editor"},
+        )
+        missing = self.client.get("/api/v1/jobs/missing/events", headers=_OWNER_HEADERS)
+
+        self.assertEqual(unauthenticated.status_code, 401)
+        self.assertEqual(foreign.status_code, 404)
+        self.assertEqual(foreign.json(), missing.json())
+        self.assertEqual(self.app.state.container.events.subscriber_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
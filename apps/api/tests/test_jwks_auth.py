@@ -0,0 +1,214 @@
+"""Offline JWKS verifier tests using locally generated keys."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+import tempfile
+import threading
+import time
+import unittest
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+import jwt
+from jwt.algorithms import RSAAlgorithm
+
+from app.adapters.auth.base import AuthVerificationError
+from app.adapters.auth.jwks_auth import JwksTokenVerifier, _load_jwks_document
+from app.adapters.auth.offload import OffloadedTokenVerifier, as_async_verifier
+from app.core.config import Settings
+from app.core.container import _build_jwks_verifier
+from app.core.executor import BlockingExecutor
+
+_ISSUER = "https://securetoken.google.com/project-a"
+
+
+def _generate_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwk(private_key: rsa.RSAPrivateKey, kid: str) -> dict[str, str]:
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return jwk
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class JwksTokenVerifierTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.key_a = _generate_key()
+        cls.key_b = _generate_key()
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.jwks_path = Path(self._tmp.name) / "jwks.json"
+        self._write_jwks(("kid-a", self.key_a))
+        self.clock = _FakeClock()
+        self.verifier = JwksTokenVerifier.for_firebase(
+            "project-a",
+            jwks_uri=str(self.jwks_path),
+            background_refresh=False,
+            min_refresh_seconds=30,
+            clock=self.clock,
+        )
+
+    def tearDown(self) -> None:
+        self.verifier.close()
+        self._tmp.cleanup()
+
+    def _write_jwks(self, *keys: tuple[str, rsa.RSAPrivateKey]) -> None:
+        self.jwks_path.write_text(json.dumps({"keys": [_jwk(key, kid) for kid, key in keys]}))
+
+    def _token(self, key: rsa.RSAPrivateKey, kid: str, **overrides: object) -> str:
+        now = int(time.time())
+        claims: dict[str, object] = {
+            "iss": _ISSUER,
+            "aud": "project-a",
+            "sub": "user-1",
+            "iat": now,
+            "exp": now + 600,
+            "role": "editor",
+        }
+        claims.update(overrides)
+        return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+    def test_valid_token_is_verified_locally_and_normalized(self) -> None:
+        principal = self.verifier.verify_token(self._token(self.key_a, "kid-a", uid="uid-1"))
+
+        self.assertEqual(principal.user_id, "uid-1")
+        self.assertEqual(principal.role, "editor")
+        self.assertIsNotNone(principal.expires_at)
+        self.assertEqual(self.verifier.refresh_count, 1)
+
+        self.verifier.verify_token(self._token(self.key_a, "kid-a"))
+        self.assertEqual(self.verifier.refresh_count, 1)
+
+    def test_rotated_kid_triggers_refresh(self) -> None:
+        self.verifier.start()
+        self._write_jwks(("kid-a", self.key_a), ("kid-b", self.key_b))
+        self.clock.now += 31
+
+        principal = self.verifier.verify_token(self._token(self.key_b, "kid-b"))
+
+        self.assertEqual(principal.user_id, "user-1")
+        self.assertEqual(self.verifier.key_ids, frozenset({"kid-a", "kid-b"}))
+
+    def test_unknown_kid_refresh_is_rate_limited(self) -> None:
+        self.verifier.start()
+
+        with self.assertRaises(AuthVerificationError):
+            self.verifier.verify_token(self._token(self.key_b, "kid-unknown"))
+        with self.assertRaises(AuthVerificationError):
+            self.verifier.verify_token(self._token(self.key_b, "kid-unknown"))
+
+        self.assertEqual(self.verifier.refresh_count, 1)
+
+    def test_refresh_on_an_unknown_kid_runs_off_the_event_loop(self) -> None:
+        fetches: list[str] = []
+
+        def slow_loader(uri: str, timeout: float) -> dict:
+            fetches.append(threading.current_thread().name)
+            time.sleep(0.2)
+            return _load_jwks_document(uri, timeout)
+
+        verifier = JwksTokenVerifier.for_firebase(
+            "project-a", jwks_uri=str(self.jwks_path), background_refresh=False, loader=slow_loader, clock=self.clock
+        )
+        verifier.start()
+        self.clock.now += 31
+        executor = BlockingExecutor(1, thread_name_prefix="jwks-test")
+        self.addCleanup(executor.shutdown)
+        async_verifier = as_async_verifier(verifier, executor)
+        ticks = 0
+
+        async def run() -> None:
+            nonlocal ticks
+
+            async def ticker() -> None:
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            try:
+                with self.assertRaises(AuthVerificationError):
+                    await async_verifier.verify_token(self._token(self.key_b, "kid-unknown"))
+            finally:
+                ticking.cancel()
+
+        asyncio.run(run())
+
+        self.assertIsInstance(async_verifier, OffloadedTokenVerifier)
+        self.assertTrue(fetches[1].startswith("jwks-test"))
+        self.assertGreaterEqual(ticks, 5)
+
+    def test_wrong_signature_issuer_audience_and_expiry_are_rejected(self) -> None:
+        now = int(time.time())
+        bad_tokens = {
+            "signature": self._token(self.key_b, "kid-a"),
+            "issuer": self._token(self.key_a, "kid-a", iss="https://securetoken.google.com/other"),
+            "audience": self._token(self.key_a, "kid-a", aud="other"),
+            "expired": self._token(self.key_a, "kid-a", iat=now - 700, exp=now - 100),
+            "identity": self._token(self.key_a, "kid-a", sub=""),
+        }
+
+        for label, token in bad_tokens.items():
+            with self.subTest(label=label), self.assertRaises(AuthVerificationError):
+                self.verifier.verify_token(token)
+
+    def test_non_rs256_algorithm_is_rejected(self) -> None:
+        token = jwt.encode(
+            {"sub": "user-1"},
+            "shared-secret-for-hs256-tests-only",
+            algorithm="HS256",
+            headers={"kid": "kid-a"},
+        )
+
+        with self.assertRaises(AuthVerificationError):
+            self.verifier.verify_token(token)
+
+    def test_missing_jwks_file_surfaces_as_verification_error(self) -> None:
+        verifier = JwksTokenVerifier(
+            jwks_uri=str(Path(self._tmp.name) / "missing.json"),
+            issuer=_ISSUER,
+            audience="project-a",
+            background_refresh=False,
+        )
+
+        with self.assertRaises(AuthVerificationError):
+            verifier.verify_token(self._token(self.key_a, "kid-a"))
+
+    def test_keycloak_profile_uses_realm_issuer(self) -> None:
+        settings = Settings(
+            auth_provider="jwks",
+            callback_secret="secret",
+            jwks_issuer_profile="keycloak",
+            jwks_uri=str(self.jwks_path),
+            keycloak_server_url="https://sso.example.test/",
+            keycloak_realm="howera",
+            keycloak_audience="howera-api",
+        )
+        verifier = _build_jwks_verifier(settings)
+        self.addCleanup(verifier.close)
+        token = self._token(
+            self.key_a,
+            "kid-a",
+            iss="https://sso.example.test/realms/howera",
+            aud="howera-api",
+        )
+
+        self.assertEqual(verifier.verify_token(token).user_id, "user-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Keyset pagination tests for project and job listings."""
+
+from __future__ import annotations
+
+import os
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.errors import ApiError
+from app.main import create_app
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.memory import InMemoryStore
+from app.services.jobs import JobService
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.projects import ProjectService
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ["HOWERA_FIREBASE_PROJECT_ID"] = "test-project"
+        os.environ["HOWERA_FIREBASE_AUDIENCE"] = "test-audience"
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class PaginationApiTests(_SettingsEnvCase):
+    def test_project_listing_pages_follow_next_cursor_until_exhausted(self) -> None:
+        app = create_app()
+        client = TestClient(app)
+        headers = {"Authorization": "Bearer test:pager:editor"}
+
+        created_ids = [
+            client.post("/api/v1/projects", headers=headers, json={"name": f"P{index}"}).json()["id"]
+            for index in range(5)
+        ]
+
+        seen: list[str] = []
+        cursor: str | None = None
+        pages = 0
+        while True:
+            params: dict[str, str | int] = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/v1/projects", headers=headers, params=params)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(body["limit"], 2)
+            seen.extend(item["id"] for item in body["items"])
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, created_ids)
+        self.assertEqual(pages, 3)
+
+    def test_invalid_cursor_and_limit_are_rejected(self) -> None:
+        app = create_app()
+        client = TestClient(app)
+        headers = {"Authorization": "Bearer test:pager:editor"}
+
+        bad_cursor = client.get("/api/v1/projects", headers=headers, params={"cursor": "%%%not-a-cursor"})
+        self.assertEqual(bad_cursor.status_code, 400)
+        self.assertEqual(bad_cursor.json()["code"], "VALIDATION_ERROR")
+
+        too_large = client.get("/api/v1/projects", headers=headers, params={"limit": 501})
+        self.assertEqual(too_large.status_code, 422)
+
+    def test_job_listing_is_owner_scoped_with_no_leak_404(self) -> None:
+        app = create_app()
+        client = TestClient(app)
+        owner_headers = {"Authorization": "Bearer test:owner:editor"}
+        other_headers = {"Authorization": "Bearer test:other:editor"}
+
+        project_id = client.post("/api/v1/projects", headers=owner_headers, json={"name": "Owned"}).json()["id"]
+        job_ids = [
+            client.post(f"/api/v1/projects/{project_id}/jobs", headers=owner_headers).json()["id"] for _ in range(3)
+        ]
+
+        first = client.get(f"/api/v1/projects/{project_id}/jobs", headers=owner_headers, params={"limit": 2})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([job["id"] for job in first.json()["items"]], job_ids[:2])
+
+        second = client.get(
+            f"/api/v1/projects/{project_id}/jobs",
+            headers=owner_headers,
+            params={"limit": 2, "cursor": first.json()["next_cursor"]},
+        )
+        self.assertEqual([job["id"] for job in second.json()["items"]], job_ids[2:])
+        self.assertIsNone(second.json()["next_cursor"])
+
+        cross_owner = client.get(f"/api/v1/projects/{project_id}/jobs", headers=other_headers)
+        self.assertEqual(cross_owner.status_code, 404)
+        self.assertEqual(cross_owner.json(), {"code": "RESOURCE_NOT_FOUND", "message": "Resource not found"})
+
+
+class PaginationUnitTests(unittest.IsolatedAsyncioTestCase):
+    def test_cursor_round_trips_created_at_and_id(self) -> None:
+        store = InMemoryStore()
+        record = store.create_project(owner_id="user-a", name="A")
+
+        self.assertEqual(decode_cursor(encode_cursor(record.created_at, record.id)), (record.created_at, record.id))
+
+    async def test_cursor_stays_stable_when_new_records_are_created(self) -> None:
+        service = ProjectService(DirectAsyncRepository(InMemoryStore()))
+        first = await service.create_project(owner_id="user-a", name="First")
+        second = await service.create_project(owner_id="user-a", name="Second")
+
+        page = await service.list_projects(owner_id="user-a", limit=1)
+        third = await service.create_project(owner_id="user-a", name="Third")
+        next_page = await service.list_projects(owner_id="user-a", limit=5, cursor=page.next_cursor)
+
+        self.assertEqual([project.id for project in page.items], [first.id])
+        self.assertEqual([project.id for project in next_page.items], [second.id, third.id])
+        self.assertIsNone(next_page.next_cursor)
+
+    async def test_job_listing_rejects_foreign_project(self) -> None:
+        store = InMemoryStore()
+        project = store.create_project(owner_id="user-a", name="A")
+
+        with self.assertRaises(ApiError) as context:
+            await JobService(DirectAsyncRepository(store)).list_jobs(owner_id="user-b", project_id=project.id)
+        self.assertEqual(context.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ from fastapi.testclient import TestClient
 from app.core.config import get_settings
 from app.errors import ApiError
 from app.main import create_app
+from app.repositories.async_adapters import DirectAsyncRepository
 from app.repositories.memory import InMemoryStore
 from app.services.projects import ProjectService
 
@@ -62,11 +63,11 @@ class ProjectOwnershipApiTests(_SettingsEnvCase):
 
         list_a = client.get("/api/v1/projects", headers=user_a_headers)
         self.assertEqual(list_a.status_code, 200)
-        self.assertEqual([p["id"] for p in list_a.json()], [project_a["id"]])
+        self.assertEqual([p["id"] for p in list_a.json()["items"]], [project_a["id"]])
 
         list_b = client.get("/api/v1/projects", headers=user_b_headers)
         self.assertEqual(list_b.status_code, 200)
-        self.assertEqual([p["id"] for p in list_b.json()], [project_b["id"]])
+        self.assertEqual([p["id"] for p in list_b.json()["items"]], [project_b["id"]])
 
         get_a = client.get(f"/api/v1/projects/{project_a['id']}", headers=user_a_headers)
         self.assertEqual(get_a.status_code, 200)
@@ -109,21 +110,21 @@ class ProjectOwnershipApiTests(_SettingsEnvCase):
         self.assertEqual(stored_project.owner_id, "owner-123")
 
 
-class ProjectOwnershipUnitTests(unittest.TestCase):
-    def test_repository_and_service_scope_projects_to_owner(self) -> None:
+class ProjectOwnershipUnitTests(unittest.IsolatedAsyncioTestCase):
+    async def test_repository_and_service_scope_projects_to_owner(self) -> None:
         store = InMemoryStore()
-        service = ProjectService(store)
+        service = ProjectService(DirectAsyncRepository(store))
 
-        project_a = service.create_project(owner_id="user-a", name="Project A")
-        project_b = service.create_project(owner_id="user-b", name="Project B")
+        project_a = await service.create_project(owner_id="user-a", name="Project A")
+        project_b = await service.create_project(owner_id="user-b", name="Project B")
 
-        listed_for_a = service.list_projects(owner_id="user-a")
-        self.assertEqual([project.id for project in listed_for_a], [project_a.id])
+        listed_for_a = await service.list_projects(owner_id="user-a")
+        self.assertEqual([project.id for project in listed_for_a.items], [project_a.id])
 
-        loaded_for_a = service.get_project(owner_id="user-a", project_id=project_a.id)
+        loaded_for_a = await service.get_project(owner_id="user-a", project_id=project_a.id)
         self.assertEqual(loaded_for_a.id, project_a.id)
 
         with self.assertRaises(ApiError) as context:
-            service.get_project(owner_id="user-a", project_id=project_b.id)
+            await service.get_project(owner_id="user-a", project_id=project_b.id)
         self.assertEqual(context.exception.status_code, 404)
         self.assertEqual(context.exception.payload.code, "RESOURCE_NOT_FOUND")
@@ -0,0 +1,247 @@
+"""LLM/STT provider adapter tests."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import unittest
+
+import httpx
+
+from app.adapters.llm import DraftRequest, FragmentRequest, LLMError, LocalLLMClient, OpenAILLMClient
+from app.adapters.providers import ProviderClient, ProviderError, RetryPolicy, build_http_pool, request_key
+from app.adapters.stt import LocalSTTClient, OpenAISTTClient, STTError, TranscriptionRequest
+from app.core.config import Settings
+from app.core.container import build_container, build_llm_client
+from app.core.executor import BlockingExecutor
+from benchmarks.provider_stub import ProviderStub
+
+
+class _Provider:
+    """Mock transport that records requests and answers from ``respond``."""
+
+    def __init__(self, respond, *, delay: float = 0.0) -> None:
+        self.requests: list[httpx.Request] = []
+        self.sleeps: list[float] = []
+        self._respond = respond
+        self._delay = delay
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        n = len(self.requests)
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return self._respond(request, n)
+
+    async def _sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+    def client(self, *, max_concurrency: int = 4, attempts: int = 3, headers=None) -> ProviderClient:
+        pool = httpx.AsyncClient(transport=httpx.MockTransport(self._handle))
+        return ProviderClient(
+            pool,
+            "http://provider.test/v1/",
+            name="test-provider",
+            headers=headers,
+            max_concurrency=max_concurrency,
+            retry=RetryPolicy(attempts=attempts, base_delay_seconds=0.1),
+            sleep=self._sleep,
+        )
+
+
+def _ok(payload: object) -> httpx.Response:
+    return httpx.Response(200, json=payload)
+
+
+class ProviderClientTests(unittest.IsolatedAsyncioTestCase):
+    async def test_retryable_failures_back_off_and_retry(self) -> None:
+        def respond(request: httpx.Request, n: int) -> httpx.Response:
+            if n == 1:
+                raise httpx.ConnectError("refused", request=request)
+            if n == 2:
+                return httpx.Response(429, headers={"Retry-After": "2"}, text="slow down")
+            return _ok({"markdown": "done"})
+
+        provider = _Provider(respond)
+        client = provider.client()
+
+        body = await client.post("/llm/regenerate", json={"fragment": "x"})
+
+        self.assertEqual(body, {"markdown": "done"})
+        self.assertEqual(str(provider.requests[0].url), "http://provider.test/v1/llm/regenerate")
+        self.assertEqual(len(provider.sleeps), 2)
+        self.assertLessEqual(provider.sleeps[0], 0.1)
+        self.assertEqual(provider.sleeps[1], 2.0)
+        self.assertEqual((client.stats.attempts, client.stats.retries, client.stats.failures), (3, 2, 0))
+
+    async def test_non_retryable_and_exhausted_failures_raise_sanitized_errors(self) -> None:
+        cases = (
+            (401, "PROVIDER_AUTH_FAILED", False, 1),
+            (422, "PROVIDER_REJECTED", False, 1),
+            (503, "PROVIDER_UNAVAILABLE", True, 3),
+        )
+        for status, code, retryable, attempts in cases:
+            with self.subTest(status=status):
+                provider = _Provider(lambda request, n: httpx.Response(status, text="echo: secret prompt"))
+                with self.assertRaises(ProviderError) as ctx:
+                    await provider.client().post("/llm/generate", json={})
+
+                self.assertEqual((ctx.exception.code, ctx.exception.retryable), (code, retryable))
+                self.assertEqual(str(ctx.exception), f"test-provider returned HTTP {status}")
+                self.assertEqual(len(provider.requests), attempts)
+
+    async def test_identical_in_flight_requests_are_coalesced(self) -> None:
+        provider = _Provider(lambda request, n: _ok({"n": n}), delay=0.02)
+        client = provider.client()
+        key = request_key("regenerate", {"fragment": "x"})
+
+        first = asyncio.create_task(client.post("/llm/regenerate", key=key, json={"fragment": "x"}))
+        await asyncio.sleep(0)
+        first.cancel()
+        results = await asyncio.gather(
+            *(client.post("/llm/regenerate", key=key, json={"fragment": "x"}) for _ in range(5)),
+            client.post("/llm/regenerate", key=request_key("regenerate", {"fragment": "y"}), json={"fragment": "y"}),
+        )
+        later = await client.post("/llm/regenerate", key=key, json={"fragment": "x"})
+
+        # The cancelled caller did not cancel the request the others shared.
+        self.assertEqual(results, [{"n": 1}] * 5 + [{"n": 2}])
+        self.assertEqual(later, {"n": 3})
+        self.assertEqual((client.stats.calls, client.stats.coalesced, len(provider.requests)), (8, 5, 3))
+
+    async def test_requests_on_the_wire_are_capped_per_provider(self) -> None:
+        provider = _Provider(lambda request, n: _ok({}), delay=0.01)
+        client = provider.client(max_concurrency=3)
+
+        await asyncio.gather(*(client.post("/llm/generate", json={"n": n}) for n in range(12)))
+
+        self.assertEqual((client.stats.max_in_flight, client.stats.in_flight), (3, 0))
+
+    def test_request_key_ignores_param_order(self) -> None:
+        self.assertEqual(request_key("t", {"a": 1, "b": 2}), request_key("t", {"b": 2, "a": 1}))
+        self.assertNotEqual(request_key("t", {"a": 1}), request_key("u", {"a": 1}))
+
+
+class LLMAdapterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_openai_adapter_sends_chat_completions_and_maps_errors(self) -> None:
+        provider = _Provider(lambda request, n: _ok({"choices": [{"message": {"content": "Click **Export**."}}]}))
+        llm = OpenAILLMClient(provider.client(headers={"Authorization": "Bearer sk-test"}), model="gpt-test")
+        progress: list[float] = []
+
+        fragment = await llm.regenerate(FragmentRequest(fragment="Click export.", context="Guide"), progress.append)
+
+        request = provider.requests[0]
+        payload = json.loads(request.content)
+        self.assertEqual(fragment, "Click **Export**.")
+        self.assertEqual((request.url.path, request.headers["authorization"]), ("/v1/chat/completions", "Bearer sk-test"))
+        self.assertEqual((payload["model"], payload["temperature"]), ("gpt-test", 0))
+        self.assertEqual(payload["messages"][1]["content"], "Context:\nGuide\n\n---\n\nClick export.")
+        self.assertEqual(progress, [1.0])
+
+        broken = OpenAILLMClient(_Provider(lambda request, n: _ok({"choices": []})).client(), model="gpt-test")
+        with self.assertRaises(LLMError) as ctx:
+            await broken.generate(DraftRequest(transcript="hello"))
+        self.assertEqual(ctx.exception.code, "PROVIDER_BAD_RESPONSE")
+
+    async def test_local_adapter_uses_the_workflow_contract(self) -> None:
+        provider = _Provider(lambda request, n: _ok({"markdown": "# Draft"}) if n == 1 else httpx.Response(400))
+        llm = LocalLLMClient(provider.client(), model="llama")
+
+        draft = await llm.generate(DraftRequest(transcript="hello", prompt_template_id="tpl-1", prompt_params_ref="p-1"))
+        with self.assertRaises(LLMError) as ctx:
+            await llm.regenerate(FragmentRequest(fragment="x"))
+
+        payload = json.loads(provider.requests[0].content)
+        self.assertEqual(draft, "# Draft")
+        self.assertEqual(provider.requests[0].url.path, "/v1/llm/generate")
+        self.assertEqual((payload["model"], payload["prompt_template_id"], payload["transcript"]), ("llama", "tpl-1", "hello"))
+        self.assertEqual((ctx.exception.code, ctx.exception.retryable), ("PROVIDER_REJECTED", False))
+
+
+class STTAdapterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_adapters_return_transcript_segments_in_milliseconds(self) -> None:
+        openai = _Provider(lambda request, n: _ok({"segments": [{"start": 0.25, "end": 1.5, "text": " Open it."}]}))
+        local = _Provider(lambda request, n: _ok({"segments": [{"start_ms": 250, "end_ms": 1500, "text": "Open it."}]}))
+        request = TranscriptionRequest(audio=b"RIFF", language="en")
+
+        from_openai = await OpenAISTTClient(openai.client(), model="whisper-1").transcribe(request)
+        from_local = await LocalSTTClient(local.client(), model="whisper-small").transcribe(request)
+
+        self.assertEqual(from_openai, from_local)
+        self.assertEqual((from_local[0].start_ms, from_local[0].end_ms, from_local[0].text), (250, 1500, "Open it."))
+        self.assertEqual(openai.requests[0].url.path, "/v1/audio/transcriptions")
+        self.assertIn(b'name="response_format"', openai.requests[0].content)
+        self.assertEqual(local.requests[0].url.path, "/v1/stt/transcribe")
+
+    async def test_audio_is_hashed_off_the_event_loop_unless_its_checksum_is_known(self) -> None:
+        provider = _Provider(lambda request, n: _ok({"segments": []}), delay=0.01)
+        executor = BlockingExecutor(1, thread_name_prefix="stt-test")
+        self.addCleanup(executor.shutdown)
+        client = LocalSTTClient(provider.client(), model="m", executor=executor)
+        audio = b"RIFF" * 1024
+
+        await asyncio.gather(*(client.transcribe(TranscriptionRequest(audio=audio)) for _ in range(3)))
+        hashed = executor.stats.submitted
+        await client.transcribe(TranscriptionRequest(audio=audio, audio_sha256=hashlib.sha256(audio).hexdigest()))
+
+        self.assertEqual(hashed, 3)
+        self.assertEqual(executor.stats.submitted, 3)
+        self.assertEqual(len(provider.requests), 2)
+
+    async def test_malformed_segments_are_rejected(self) -> None:
+        provider = _Provider(lambda request, n: _ok({"segments": [{"start_ms": "soon"}]}))
+
+        with self.assertRaises(STTError) as ctx:
+            await LocalSTTClient(provider.client(), model="m").transcribe(TranscriptionRequest(audio=b"x"))
+
+        self.assertEqual(ctx.exception.code, "PROVIDER_BAD_RESPONSE")
+
+
+class ProviderStubTests(unittest.IsolatedAsyncioTestCase):
+    async def test_pooled_client_reuses_keep_alive_connections(self) -> None:
+        stub = ProviderStub(latency_ms=0.0)
+        url = await stub.start()
+        pool = build_http_pool(max_connections=2)
+        try:
+            llm = LocalLLMClient(ProviderClient(pool, url, name="stub", max_concurrency=2), model="stub")
+            results = await asyncio.gather(*(llm.regenerate(FragmentRequest(fragment=f"step {n}")) for n in range(20)))
+        finally:
+            await pool.aclose()
+            await stub.close()
+
+        self.assertEqual(results[3], "step 3 (regenerated)")
+        self.assertEqual(stub.requests["/llm/regenerate"], 20)
+        self.assertLessEqual(stub.connections, 2)
+
+
+class ProviderWiringTests(unittest.IsolatedAsyncioTestCase):
+    async def test_container_builds_remote_providers_on_one_shared_pool(self) -> None:
+        settings = Settings(
+            auth_provider="mock",
+            callback_secret="secret",
+            llm_provider="local",
+            local_llm_base_url="http://llm.local",
+            local_llm_model="llama",
+            stt_provider="local",
+            local_stt_base_url="http://stt.local",
+            local_stt_model="whisper-small",
+        )
+        container = build_container(settings)
+        try:
+            self.assertIsInstance(container.llm, LocalLLMClient)
+            self.assertIsInstance(container.stt, LocalSTTClient)
+            self.assertIs(container.llm._provider._pool, container.http)
+            self.assertIs(container.stt._provider._pool, container.http)
+            self.assertIs(container.stt._executor, container.executor)
+        finally:
+            container.close()
+            await container.aclose()
+        self.assertTrue(container.http.is_closed)
+
+        with self.assertRaises(ValueError):
+            build_llm_client(Settings(callback_secret="secret", llm_provider="openai", llm_model="gpt"), container.http)
+
+
+if __name__ == "__main__":
+    unittest.main()
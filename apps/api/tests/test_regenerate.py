@@ -0,0 +1,273 @@
+"""Regenerate scheduler and endpoint tests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.adapters.llm import FakeLLMClient, LLMError
+from app.core.config import Settings, get_settings
+from app.core.container import build_container
+from app.core.events import REGENERATE_STATUS_EVENT, JobEventBroker
+from app.core.scheduling import FairLimiter
+from app.errors import ApiError
+from app.main import create_app
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.instructions import InstructionStore
+from app.repositories.memory import InMemoryStore
+from app.schemas.instruction import RegenerateRequest
+from app.services.instructions import InstructionService
+from app.services.regenerate import RegenerateService
+
+_OWNER_HEADERS = {"Authorization": "Bearer test:owner-1:editor"}
+_BLOCK_ID = "0f8fad5b-d9cb-469f-a165-70867728950e"
+_MARKDOWN = f"# Guide\n<!-- block:{_BLOCK_ID} -->\nClick export.\n\nDone.\n"
+
+
+def _request(client_request_id: str = "req-1", base_version: int = 1, **selection: object) -> RegenerateRequest:
+    return RegenerateRequest(
+        base_version=base_version,
+        selection=selection or {"block_id": _BLOCK_ID},
+        client_request_id=client_request_id,
+    )
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class FairLimiterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_slots_are_capped_and_handed_out_round_robin_by_key(self) -> None:
+        limiter = FairLimiter(1)
+        order: list[str] = []
+        gate = asyncio.Event()
+
+        async def work(key: str) -> None:
+            async with limiter.slot(key):
+                order.append(key)
+                await gate.wait()
+
+        holder = asyncio.create_task(work("a"))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(work(key)) for key in ("a", "a", "a", "b", "c")]
+        await asyncio.sleep(0)
+        self.assertEqual((limiter.stats.running, limiter.stats.queued, limiter.queued_for("a")), (1, 5, 3))
+        gate.set()
+        await asyncio.gather(holder, *waiters)
+
+        self.assertEqual(order, ["a", "a", "b", "c", "a", "a"])
+        self.assertEqual((limiter.stats.admitted, limiter.stats.max_queued, limiter.stats.running), (6, 5, 0))
+
+    async def test_cancelled_waiters_leave_the_queue(self) -> None:
+        limiter = FairLimiter(1)
+        gate = asyncio.Event()
+
+        async def hold() -> None:
+            async with limiter.slot("a"):
+                await gate.wait()
+
+        async def queued() -> None:
+            async with limiter.slot("b"):
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(queued())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        gate.set()
+        await holder
+
+        self.assertEqual((limiter.stats.queued, limiter.stats.running), (0, 0))
+        async with limiter.slot("c"):
+            self.assertEqual(limiter.stats.running, 1)
+
+
+class RegenerateServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        store = InMemoryStore()
+        project = store.create_project(owner_id="owner-1", name="P")
+        self.job = store.create_job(owner_id="owner-1", project_id=project.id)
+        self.instructions = InstructionService(DirectAsyncRepository(store), InstructionStore())
+        self.instruction = await self.instructions.create_instruction(job_id=self.job.id, markdown=_MARKDOWN)
+        self.events = JobEventBroker()
+        self.llm = FakeLLMClient(latency_seconds=0.01)
+
+    def _service(self, llm: FakeLLMClient | None = None, max_concurrency: int = 4) -> RegenerateService:
+        return RegenerateService(self.instructions, llm or self.llm, max_concurrency=max_concurrency, events=self.events)
+
+    async def _finish(self, service: RegenerateService, task_id: str):
+        for _ in range(200):
+            task = await service.get_task(owner_id="owner-1", task_id=task_id)
+            if task.status in ("SUCCEEDED", "FAILED"):
+                return task
+            await asyncio.sleep(0.005)
+        self.fail("task did not finish")
+
+    async def test_task_regenerates_the_block_and_reports_progress(self) -> None:
+        service = self._service()
+        subscription = self.events.subscribe(self.job.id)
+
+        task, replayed = await service.submit(
+            owner_id="owner-1",
+            instruction_id=self.instruction.instruction_id,
+            request=_request(),
+        )
+        done = await self._finish(service, task.id)
+
+        self.assertFalse(replayed)
+        self.assertEqual((task.status, task.progress_pct), ("PENDING", 0))
+        self.assertEqual((done.status, done.progress_pct, done.instruction_version), ("SUCCEEDED", 100, 2))
+        self.assertEqual(done.provenance.requested_by, "owner-1")
+        latest = await self.instructions.get_instruction(owner_id="owner-1", instruction_id=self.instruction.instruction_id)
+        self.assertEqual(latest.markdown, _MARKDOWN.replace("Done.", "Done. (regenerated)"))
+        subscription.close()
+        events = []
+        async for frame in subscription.frames(5.0):
+            fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+            if fields.get("event") == REGENERATE_STATUS_EVENT:
+                events.append(json.loads(fields["data"]))
+        progress = [event["progress_pct"] for event in events]
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual((events[0]["status"], events[-1]["status"]), ("PENDING", "SUCCEEDED"))
+        self.assertGreater(len(events), 4)
+
+    async def test_one_active_task_per_instruction_and_replays_do_no_llm_work(self) -> None:
+        service = self._service()
+        first, _ = await service.submit(owner_id="owner-1", instruction_id=self.instruction.instruction_id, request=_request())
+
+        with self.assertRaises(ApiError) as ctx:
+            await service.submit(owner_id="owner-1", instruction_id=self.instruction.instruction_id, request=_request("req-2"))
+        replay, replayed = await service.submit(
+            owner_id="owner-1",
+            instruction_id=self.instruction.instruction_id,
+            request=_request(),
+        )
+        await self._finish(service, first.id)
+        again, _ = await service.submit(owner_id="owner-1", instruction_id=self.instruction.instruction_id, request=_request())
+
+        self.assertEqual((ctx.exception.status_code, ctx.exception.payload.code), (409, "REGENERATE_IN_PROGRESS"))
+        self.assertEqual(ctx.exception.payload.details, {"active_task_id": first.id})
+        self.assertTrue(replayed and replay.replayed)
+        self.assertEqual((replay.id, again.id), (first.id, first.id))
+        self.assertEqual(self.llm.calls, 1)
+        stats = service.stats
+        self.assertEqual((stats.submitted, stats.replayed, stats.rejected_active, stats.llm_calls), (1, 2, 1, 1))
+
+    async def test_llm_concurrency_is_capped_across_instructions(self) -> None:
+        llm = FakeLLMClient(latency_seconds=0.02)
+        service = self._service(llm, max_concurrency=2)
+        tasks = []
+        for n in range(6):
+            instruction = await self.instructions.create_instruction(job_id=self.job.id, markdown=_MARKDOWN)
+            task, _ = await service.submit(owner_id="owner-1", instruction_id=instruction.instruction_id, request=_request(f"r{n}"))
+            tasks.append(task)
+        await asyncio.sleep(0)
+
+        self.assertEqual(service.stats.queue.queued, 4)
+        for task in tasks:
+            self.assertEqual((await self._finish(service, task.id)).status, "SUCCEEDED")
+        self.assertEqual((llm.calls, llm.max_in_flight), (6, 2))
+        self.assertGreater(service.stats.queue.max_wait_seconds, 0.0)
+
+    async def test_provider_failures_are_sanitized(self) -> None:
+        service = self._service(FakeLLMClient(fail_with=LLMError("upstream said: secret prompt", code="LLM_TIMEOUT")))
+        task, _ = await service.submit(owner_id="owner-1", instruction_id=self.instruction.instruction_id, request=_request())
+
+        done = await self._finish(service, task.id)
+
+        self.assertEqual((done.status, done.failure_code, done.failed_stage), ("FAILED", "LLM_TIMEOUT", "llm"))
+        self.assertNotIn("secret", done.failure_message)
+        self.assertIsNone(done.instruction_version)
+
+    async def test_requests_are_validated_before_any_task_exists(self) -> None:
+        service = self._service()
+        instruction_id = self.instruction.instruction_id
+        cases = (
+            (_request(base_version=2), 409, "VERSION_CONFLICT"),
+            (_request(block_id="missing"), 400, "VALIDATION_ERROR"),
+            (RegenerateRequest(base_version=1, selection={}, client_request_id="x"), 400, "VALIDATION_ERROR"),
+        )
+        for request, status_code, code in cases:
+            with self.subTest(code=code), self.assertRaises(ApiError) as ctx:
+                await service.submit(owner_id="owner-1", instruction_id=instruction_id, request=request)
+            self.assertEqual((ctx.exception.status_code, ctx.exception.payload.code), (status_code, code))
+        with self.assertRaises(ApiError) as ctx:
+            await service.submit(owner_id="intruder", instruction_id=instruction_id, request=_request())
+        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertEqual((service.stats.submitted, self.llm.calls), (0, 0))
+
+    async def test_char_range_selection_keeps_surrounding_text(self) -> None:
+        service = self._service()
+        start = _MARKDOWN.index("Done.")
+        task, _ = await service.submit(
+            owner_id="owner-1",
+            instruction_id=self.instruction.instruction_id,
+            request=_request(char_range={"start_offset": start, "end_offset": start + 5}),
+        )
+
+        await self._finish(service, task.id)
+
+        latest = await self.instructions.get_instruction(owner_id="owner-1", instruction_id=self.instruction.instruction_id)
+        self.assertEqual(latest.markdown, _MARKDOWN.replace("Done.", "Done. (regenerated)"))
+
+
+class RegenerateApiTests(_SettingsEnvCase):
+    def test_regenerate_is_accepted_replayed_and_polled_to_completion(self) -> None:
+        container = build_container(Settings(auth_provider="mock", callback_secret="test-callback-secret"))
+        with TestClient(create_app(container=container)) as client:
+            project_id = client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+            job_id = client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"]
+            instruction = client.portal.call(
+                lambda: container.instruction_service.create_instruction(job_id=job_id, markdown=_MARKDOWN)
+            )
+            url = f"/api/v1/instructions/{instruction.instruction_id}/regenerate"
+            body = {"base_version": 1, "selection": {"block_id": _BLOCK_ID}, "client_request_id": "req-1"}
+
+            accepted = client.post(url, headers=_OWNER_HEADERS, json=body)
+            replayed = client.post(url, headers=_OWNER_HEADERS, json=body)
+            task_url = f"/api/v1/tasks/{accepted.json()['id']}"
+            for _ in range(100):
+                task = client.get(task_url, headers=_OWNER_HEADERS).json()
+                if task["status"] == "SUCCEEDED":
+                    break
+                time.sleep(0.01)
+            foreign = client.get(task_url, headers={"Authorization": "Bearer test:intruder:editor"})
+            invalid = client.post(url, headers=_OWNER_HEADERS, json={**body, "base_version": 2, "selection": {}, "client_request_id": "r2"})
+
+        self.assertEqual(accepted.status_code, 202)
+        self.assertEqual((replayed.status_code, replayed.json()["id"], replayed.json()["replayed"]), (200, task["id"], True))
+        self.assertEqual((task["status"], task["instruction_version"], task["progress_pct"]), ("SUCCEEDED", 2, 100))
+        self.assertEqual(foreign.status_code, 404)
+        self.assertEqual((invalid.status_code, invalid.json()["code"]), (400, "VALIDATION_ERROR"))
+
+
+if __name__ == "__main__":
+    unittest.main()
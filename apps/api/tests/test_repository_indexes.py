@@ -0,0 +1,68 @@
+"""In-memory store secondary index tests."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+import unittest
+
+from app.repositories.memory import InMemoryStore, JobRecord, ProjectRecord
+from app.schemas.job import JobStatus
+
+
+class InMemoryStoreIndexTests(unittest.TestCase):
+    def test_owner_listing_returns_only_owner_projects_in_created_order(self) -> None:
+        store = InMemoryStore()
+        first = store.create_project(owner_id="user-a", name="First")
+        store.create_project(owner_id="user-b", name="Other")
+        second = store.create_project(owner_id="user-a", name="Second")
+
+        listed = store.list_projects_for_owner("user-a")
+
+        self.assertEqual([record.id for record in listed], [first.id, second.id])
+        self.assertEqual(store.list_projects_for_owner("missing-owner"), [])
+
+    def test_listing_returns_copy_that_does_not_mutate_index(self) -> None:
+        store = InMemoryStore()
+        store.create_project(owner_id="user-a", name="Only")
+
+        store.list_projects_for_owner("user-a").clear()
+
+        self.assertEqual(len(store.list_projects_for_owner("user-a")), 1)
+
+    def test_out_of_order_created_at_is_inserted_in_sorted_position(self) -> None:
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        late = ProjectRecord(id="p-late", name="Late", owner_id="user-a", created_at=base + timedelta(seconds=5))
+        early = ProjectRecord(id="p-early", name="Early", owner_id="user-a", created_at=base)
+        store = InMemoryStore(projects={late.id: late, early.id: early})
+
+        self.assertEqual([record.id for record in store.list_projects_for_owner("user-a")], ["p-early", "p-late"])
+
+    def test_job_listing_is_project_scoped_and_created_ordered(self) -> None:
+        store = InMemoryStore()
+        project_a = store.create_project(owner_id="user-a", name="A")
+        project_b = store.create_project(owner_id="user-a", name="B")
+        job_1 = store.create_job(owner_id="user-a", project_id=project_a.id)
+        store.create_job(owner_id="user-a", project_id=project_b.id)
+        job_2 = store.create_job(owner_id="user-a", project_id=project_a.id)
+
+        listed = store.list_jobs_for_project(project_a.id)
+
+        self.assertEqual([record.id for record in listed], [job_1.id, job_2.id])
+        self.assertIs(store.get_job(job_1.id), job_1)
+
+    def test_indexes_are_built_from_preloaded_jobs(self) -> None:
+        created_at = datetime(2026, 1, 1, tzinfo=UTC)
+        job = JobRecord(
+            id="job-1",
+            project_id="project-1",
+            owner_id="user-a",
+            status=JobStatus.CREATED,
+            created_at=created_at,
+        )
+        store = InMemoryStore(jobs={job.id: job})
+
+        self.assertEqual(store.list_jobs_for_project("project-1"), [job])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,624 @@
+"""Screenshot extraction pool, service and endpoint tests."""
+
+from __future__ import annotations
+
+from array import array
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+import json
+import os
+from pathlib import Path
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import zlib
+
+from fastapi.testclient import TestClient
+
+from app.adapters.media import (
+    DecodePass,
+    FfmpegError,
+    FrameExtractionPool,
+    FrameResult,
+    FrameSpec,
+    build_pass_command,
+    plan_passes,
+    read_image_dimensions,
+)
+from app.adapters.storage import LocalArtifactStorage
+from app.core.config import Settings, get_settings
+from app.core.container import build_container
+from app.core.signing import UrlSigner
+from app.core.events import SCREENSHOT_STATUS_EVENT, JobEventBroker
+from app.errors import ApiError
+from app.main import create_app
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.derivatives import DerivativeStore
+from app.repositories import frame_cache
+from app.repositories.frame_cache import FrameCache, frame_key
+from app.repositories.instructions import InstructionStore
+from app.repositories.memory import InMemoryStore
+from app.repositories.screenshots import ScreenshotAssetStore
+from app.schemas.screenshot import ScreenshotExtractionRequest
+from app.services.derivatives import DerivativeService
+from app.services.instructions import InstructionService, instruction_version_id
+from app.services.screenshots import ScreenshotService
+from app.services.video_index import VideoIndexService
+
+_OWNER_HEADERS = {"Authorization": "Bearer test:owner-1:editor"}
+_BLOCK_ID = "0f8fad5b-d9cb-469f-a165-70867728950e"
+_MARKDOWN = f"# Guide\n<!-- block:{_BLOCK_ID} -->\nClick export.\n"
+
+
+def _png(width: int, height: int) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+
+
+async def _status_events(subscription) -> list[dict]:
+    """Close ``subscription`` and decode the screenshot status events it received."""
+    subscription.close()
+    events = []
+    async for frame in subscription.frames(5.0):
+        fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+        if fields.get("event") == SCREENSHOT_STATUS_EVENT:
+            events.append(json.loads(fields["data"]))
+    return events
+
+
+class _FakeRunner:
+    """Stands in for ``run_pass``: writes a 64x36 PNG per frame before ``end_ms``, records each pass."""
+
+    def __init__(self, end_ms: int = 60_000, delay: float = 0.0) -> None:
+        self.end_ms = end_ms
+        self.delay = delay
+        self.passes: list[DecodePass] = []
+
+    def __call__(self, ffmpeg_path: str, decode_pass: DecodePass, timeout_seconds: float) -> list[FrameResult | None]:
+        self.passes.append(decode_pass)
+        time.sleep(self.delay)
+        results: list[FrameResult | None] = []
+        for frame in decode_pass.frames:
+            if frame.timestamp_ms >= self.end_ms:
+                results.append(None)
+                continue
+            os.makedirs(os.path.dirname(frame.output_path), exist_ok=True)
+            with open(frame.output_path, "wb") as stream:
+                stream.write(_png(64, 36))
+            results.append(FrameResult(frame.output_path, 64, 36))
+        return results
+
+
+def _failing_runner(ffmpeg_path: str, decode_pass: DecodePass, timeout_seconds: float) -> list[FrameResult | None]:
+    raise FfmpegError("ffmpeg timed out", "FFMPEG_TIMEOUT", True)
+
+
+def _frame(timestamp_ms: int, strategy: str = "precise", name: str | None = None) -> FrameSpec:
+    return FrameSpec(timestamp_ms, strategy, "png", f"/tmp/out/{name or timestamp_ms}.png")
+
+
+class BuildPassCommandTests(unittest.TestCase):
+    def test_precise_frames_share_one_input_seek(self) -> None:
+        command = build_pass_command(
+            "ffmpeg",
+            DecodePass("in.mp4", (_frame(1500), _frame(2250), _frame(4000, "nearest_keyframe"))),
+        )
+
+        self.assertEqual(command.count("-i"), 2)
+        self.assertEqual(command[command.index("-i") - 2 : command.index("-i") + 2], ["-ss", "1.500", "-i", "in.mp4"])
+        keyframe_input = command.index("-noaccurate_seek")
+        self.assertEqual(command[keyframe_input + 1 : keyframe_input + 4], ["-ss", "4.000", "-i"])
+        outputs = [command[n + 1] for n, arg in enumerate(command) if arg == "-ss"]
+        self.assertEqual(outputs, ["1.500", "4.000", "0.000", "0.750"])
+        self.assertEqual(command[-1], "/tmp/out/4000.png")
+
+    def test_seek_point_never_passes_the_first_precise_frame(self) -> None:
+        early = build_pass_command("ffmpeg", DecodePass("in.mp4", (_frame(1500), _frame(2000)), seek_ms=1000))
+        late = build_pass_command("ffmpeg", DecodePass("in.mp4", (_frame(1500),), seek_ms=9000))
+
+        self.assertEqual([early[n + 1] for n, arg in enumerate(early) if arg == "-ss"], ["1.000", "0.500", "1.000"])
+        self.assertEqual([late[n + 1] for n, arg in enumerate(late) if arg == "-ss"], ["1.500", "0.000"])
+
+
+class ImageHeaderTests(unittest.TestCase):
+    def test_dimensions_are_read_from_headers(self) -> None:
+        app1 = b"\xff\xe1" + struct.pack(">H", 2 + 300) + b"\0" * 300
+        sof = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, 720, 1280, 3) + b"\0" * 3
+        jpeg = b"\xff\xd8" + app1 + sof + b"\xff\xd9"
+        vp8x = b"RIFF\0\0\0\0WEBPVP8X" + b"\0" * 8 + (1919).to_bytes(3, "little") + (1079).to_bytes(3, "little")
+
+        self.assertEqual(read_image_dimensions(io.BytesIO(_png(64, 36))), (64, 36))
+        self.assertEqual(read_image_dimensions(io.BytesIO(jpeg)), (1280, 720))
+        self.assertEqual(read_image_dimensions(io.BytesIO(vp8x)), (1920, 1080))
+        self.assertIsNone(read_image_dimensions(io.BytesIO(b"\xff\xd8\x00garbage")))
+        self.assertIsNone(read_image_dimensions(io.BytesIO(b"GIF89a")))
+
+
+class FrameExtractionPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.executor = ThreadPoolExecutor(2)
+        self.addCleanup(self.executor.shutdown)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _frame(self, timestamp_ms: int, name: str | None = None) -> FrameSpec:
+        return FrameSpec(timestamp_ms, "precise", "png", os.path.join(self.tmp.name, f"{name or timestamp_ms}.png"))
+
+    def test_passes_split_on_span_and_size(self) -> None:
+        frames = [_frame(ms) for ms in (9000, 0, 1000, 2000, 70_000)]
+
+        passes = plan_passes("in.mp4", frames, max_frames=3, max_span_ms=60_000)
+
+        self.assertEqual([[f.timestamp_ms for f in p.frames] for p in passes], [[0, 1000, 2000], [9000], [70_000]])
+
+    def test_passes_split_where_a_keyframe_lies_between_precise_frames(self) -> None:
+        def precise(ms: int, seek_ms: int) -> FrameSpec:
+            return FrameSpec(ms, "precise", "png", f"{ms}.png", seek_ms)
+
+        frames = [precise(100, 0), precise(1500, 0), precise(2500, 2000), precise(2600, 2000)]
+
+        passes = plan_passes("in.mp4", frames, max_frames=32, max_span_ms=5_000)
+
+        self.assertEqual(
+            [([f.timestamp_ms for f in p.frames], p.seek_ms) for p in passes],
+            [([100, 1500], 0), ([2500, 2600], 2000)],
+        )
+
+    async def test_concurrent_requests_for_a_video_share_one_pass(self) -> None:
+        runner = _FakeRunner()
+        pool = FrameExtractionPool(executor=self.executor, runner=runner, batch_window_seconds=0.01)
+        started: list[int] = []
+
+        results = await asyncio.gather(
+            *(
+                pool.extract("in.mp4", self._frame(ms), started=lambda ms=ms: started.append(ms))
+                for ms in (3000, 1000, 2000, 1000)
+            )
+        )
+
+        self.assertEqual(len(runner.passes), 1)
+        self.assertEqual([f.timestamp_ms for f in runner.passes[0].frames], [1000, 2000, 3000])
+        self.assertEqual(results[1], results[3])
+        self.assertEqual((results[0].width, results[0].height), (64, 36))
+        self.assertEqual(sorted(started), [1000, 1000, 2000, 3000])
+        stats = pool.stats
+        self.assertEqual((stats.requests, stats.coalesced, stats.passes, stats.frames, stats.queued), (4, 1, 1, 3, 0))
+
+    async def test_full_batch_flushes_without_waiting_for_the_window(self) -> None:
+        runner = _FakeRunner()
+        pool = FrameExtractionPool(executor=self.executor, runner=runner, batch_window_seconds=60, max_pass_frames=2)
+
+        await asyncio.wait_for(asyncio.gather(pool.extract("in.mp4", self._frame(0)), pool.extract("in.mp4", self._frame(1))), 5)
+
+        self.assertEqual(len(runner.passes), 1)
+
+    async def test_missing_frames_and_failed_passes_fail_their_requests(self) -> None:
+        pool = FrameExtractionPool(executor=self.executor, runner=_FakeRunner(end_ms=5000), batch_window_seconds=0.01)
+        failing = FrameExtractionPool(executor=self.executor, runner=_failing_runner, batch_window_seconds=0.01)
+
+        ok, missing = await asyncio.gather(
+            pool.extract("in.mp4", self._frame(1000)),
+            pool.extract("in.mp4", self._frame(9000)),
+            return_exceptions=True,
+        )
+        with self.assertRaises(FfmpegError) as timed_out:
+            await failing.extract("in.mp4", self._frame(1000))
+
+        self.assertIsInstance(ok, FrameResult)
+        self.assertIsInstance(missing, FfmpegError)
+        self.assertEqual(missing.code, "FRAME_NOT_FOUND")
+        self.assertEqual((timed_out.exception.code, timed_out.exception.retryable), ("FFMPEG_TIMEOUT", True))
+        self.assertEqual(failing.stats.failed_passes, 1)
+
+
+class ScreenshotServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.executor = ThreadPoolExecutor(2)
+        self.addCleanup(self.executor.shutdown)
+        store = InMemoryStore()
+        project = store.create_project(owner_id="owner-1", name="P")
+        self.job = store.create_job(owner_id="owner-1", project_id=project.id)
+        self.job.manifest["video_uri"] = "videos/in.mp4"
+        os.makedirs(os.path.join(self.tmp.name, "videos"))
+        with open(os.path.join(self.tmp.name, "videos", "in.mp4"), "wb") as stream:
+            stream.write(b"not really a video")
+        repository = self.repository = DirectAsyncRepository(store)
+        self.storage = LocalArtifactStorage(self.tmp.name)
+        self.instructions = InstructionService(repository, InstructionStore())
+        self.instruction = await self.instructions.create_instruction(job_id=self.job.id, markdown=_MARKDOWN)
+        self.runner = _FakeRunner(delay=0.01)
+        self.events = JobEventBroker()
+        self.assets = ScreenshotAssetStore()
+        self.cache = FrameCache(Path(self.tmp.name) / "cache")
+        self.service = ScreenshotService(
+            repository,
+            self.instructions,
+            self.storage,
+            FrameExtractionPool(executor=self.executor, runner=self.runner, batch_window_seconds=0.01),
+            self.cache,
+            output_root=Path(self.tmp.name) / "screenshots",
+            assets=self.assets,
+            events=self.events,
+        )
+
+    def _request(self, timestamp_ms: int = 1000, **fields: object) -> ScreenshotExtractionRequest:
+        fields.setdefault("instruction_version_id", instruction_version_id(self.instruction.instruction_id, 1))
+        return ScreenshotExtractionRequest(instruction_id=self.instruction.instruction_id, timestamp_ms=timestamp_ms, **fields)
+
+    async def _wait(self, task_id: str):
+        for _ in range(200):
+            task = await self.service.get_task(owner_id="owner-1", task_id=task_id)
+            if task.status.value in ("SUCCEEDED", "FAILED"):
+                return task
+            await asyncio.sleep(0.005)
+        self.fail("task did not finish")
+
+    async def test_extraction_creates_an_asset_and_reports_progress(self) -> None:
+        subscription = self.events.subscribe(self.job.id)
+        self.addCleanup(subscription.close)
+
+        task, replayed = await self.service.extract(
+            owner_id="owner-1",
+            job_id=self.job.id,
+            request=self._request(1000, offset_ms=-250, format="png", anchor_id="anchor-1"),
+        )
+        done = await self._wait(task.task_id)
+
+        asset = await self.service.get_asset(owner_id="owner-1", asset_id=done.asset_id)
+        self.assertEqual((replayed, task.status.value, task.progress_pct), (False, "PENDING", 0))
+        self.assertEqual((done.status.value, done.progress_pct, done.extracted_at_ms), ("SUCCEEDED", 100, 750))
+        self.assertEqual((asset.anchor_id, asset.version, asset.kind.value), ("anchor-1", 1, "EXTRACTED"))
+        self.assertEqual((asset.mime_type, asset.width, asset.height), ("image/png", 64, 36))
+        self.assertEqual(len(asset.checksum_sha256), 64)
+        self.assertTrue(asset.image_uri.startswith(Path(self.tmp.name, "screenshots", self.job.id).resolve().as_uri()))
+        self.assertTrue(asset.extraction_key.startswith(f"{self.job.id}|"))
+        progress = [(event["status"], event["progress_pct"]) for event in await _status_events(subscription)]
+        self.assertEqual(progress, [("PENDING", 0), ("RUNNING", 10), ("SUCCEEDED", 100)])
+        with self.assertRaises(ApiError):
+            await self.service.get_asset(owner_id="intruder", asset_id=done.asset_id)
+
+    async def test_replays_by_idempotency_and_extraction_key(self) -> None:
+        first, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request(idempotency_key="k1"))
+        by_key, key_replayed = await self.service.extract(
+            owner_id="owner-1",
+            job_id=self.job.id,
+            request=self._request(5000, idempotency_key="k1"),
+        )
+        canonical, canonical_replayed = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request())
+        await self._wait(first.task_id)
+
+        self.assertEqual((by_key.task_id, key_replayed, by_key.replayed), (first.task_id, True, True))
+        self.assertEqual((canonical.task_id, canonical_replayed), (first.task_id, True))
+        self.assertEqual(self.service.stats.submitted, 1)
+        self.assertEqual(len(self.runner.passes), 1)
+
+    async def test_requests_for_the_same_frame_are_extracted_once(self) -> None:
+        subscription = self.events.subscribe(self.job.id)
+        self.addCleanup(subscription.close)
+        second = await self.instructions.update_instruction(
+            owner_id="owner-1",
+            instruction_id=self.instruction.instruction_id,
+            base_version=1,
+            markdown=_MARKDOWN + "\nDone.\n",
+        )
+        requests = [
+            self._request(1000),
+            self._request(1000, instruction_version_id=instruction_version_id(second.instruction_id, 2)),
+            self._request(4000, strategy="nearest_keyframe"),
+        ]
+
+        tasks = [
+            (await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=request))[0] for request in requests
+        ]
+        done = [await self._wait(task.task_id) for task in tasks]
+
+        self.assertEqual([task.status.value for task in done], ["SUCCEEDED"] * 3)
+        self.assertEqual(len(self.runner.passes), 1)
+        self.assertEqual(len(self.runner.passes[0].frames), 2)
+        self.assertEqual(self.service.stats.cache.misses, 3)
+        running = {event["task_id"] for event in await _status_events(subscription) if event["status"] == "RUNNING"}
+        self.assertEqual(running, {task.task_id for task in tasks})
+
+    async def test_repeat_extractions_of_a_frame_are_served_from_the_cache(self) -> None:
+        first, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request(1000))
+        first = await self._wait(first.task_id)
+        nudged, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request(1200, offset_ms=-200))
+        nudged = await self._wait(nudged.task_id)
+
+        original = await self.service.get_asset(owner_id="owner-1", asset_id=first.asset_id)
+        repeat = await self.service.get_asset(owner_id="owner-1", asset_id=nudged.asset_id)
+        self.assertEqual(nudged.status.value, "SUCCEEDED")
+        self.assertEqual(len(self.runner.passes), 1)
+        self.assertEqual((repeat.checksum_sha256, repeat.width), (original.checksum_sha256, original.width))
+        self.assertNotEqual(repeat.extraction_key, original.extraction_key)
+        stats = self.service.stats.cache
+        self.assertEqual((stats.hits, stats.misses, stats.hit_rate, stats.entries), (1, 1, 0.5, 1))
+
+    async def test_requests_are_validated_before_a_task_is_created(self) -> None:
+        cases = [
+            ("owner-1", self._request(instruction_version_id="other:1"), 400),
+            ("owner-1", self._request(1000, offset_ms=-2000), 400),
+            ("owner-1", self._request(block_id="missing-block"), 400),
+            ("owner-1", self._request(instruction_version_id=f"{self.instruction.instruction_id}:9"), 404),
+            ("intruder", self._request(), 404),
+        ]
+
+        for owner_id, request, status_code in cases:
+            with self.subTest(request=request, owner_id=owner_id):
+                with self.assertRaises(ApiError) as ctx:
+                    await self.service.extract(owner_id=owner_id, job_id=self.job.id, request=request)
+                self.assertEqual(ctx.exception.status_code, status_code)
+        self.assertEqual(self.service.stats.submitted, 0)
+
+    async def test_failed_tasks_are_retried_by_an_identical_request(self) -> None:
+        self.runner.end_ms = 0
+
+        task, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request())
+        failed = await self._wait(task.task_id)
+        self.runner.end_ms = 60_000
+        retry, replayed = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request())
+        succeeded = await self._wait(retry.task_id)
+
+        self.assertEqual((failed.status.value, failed.failure_code), ("FAILED", "FRAME_NOT_FOUND"))
+        self.assertEqual((replayed, succeeded.status.value), (False, "SUCCEEDED"))
+        self.assertNotEqual(retry.task_id, task.task_id)
+
+    async def test_indexed_videos_snap_requests_to_the_extracted_frame(self) -> None:
+        # 25 fps for 10 s with a keyframe every 2 s.
+        indexes = VideoIndexService(
+            self.repository,
+            self.storage,
+            prober=lambda *_: (array("q", range(0, 10_000_000, 40_000)), array("q", range(0, 10_000_000, 2_000_000))),
+        )
+        self.service = ScreenshotService(
+            self.repository,
+            self.instructions,
+            self.storage,
+            FrameExtractionPool(executor=self.executor, runner=self.runner, batch_window_seconds=0.01),
+            self.cache,
+            output_root=Path(self.tmp.name) / "screenshots",
+            indexes=indexes,
+        )
+
+        tasks = [
+            (await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=request))[0]
+            for request in (self._request(3010), self._request(4100, strategy="nearest_keyframe"), self._request(20_000))
+        ]
+        precise, keyframe, past_end = [await self._wait(task.task_id) for task in tasks]
+        nearby, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request(3020))
+        nearby = await self._wait(nearby.task_id)
+
+        self.assertEqual((precise.extracted_at_ms, keyframe.extracted_at_ms, nearby.extracted_at_ms), (3040, 4000, 3040))
+        self.assertEqual((past_end.status.value, past_end.failure_code), ("FAILED", "FRAME_NOT_FOUND"))
+        self.assertEqual(len(self.runner.passes), 1)
+        self.assertEqual(self.runner.passes[0].seek_ms, 2000)
+        self.assertEqual(self.service.stats.cache.hits, 1)
+        self.assertEqual(indexes.built, 1)
+
+    async def test_new_assets_get_derivatives_in_the_background(self) -> None:
+        written = []
+
+        def writer(source, specs):
+            written.append(source)
+            for spec in specs:
+                Path(spec.output_path).parent.mkdir(parents=True, exist_ok=True)
+                Path(spec.output_path).write_bytes(_png(spec.width, spec.width // 2))
+            return [(spec.width, spec.width // 2) for spec in specs]
+
+        derivatives = DerivativeService(
+            DerivativeStore(Path(self.tmp.name) / "derivatives"),
+            UrlSigner("secret"),
+            variants={"thumbnail": 32},
+            formats=("webp",),
+            writer=writer,
+        )
+        self.service = ScreenshotService(
+            self.repository,
+            self.instructions,
+            self.storage,
+            FrameExtractionPool(executor=self.executor, runner=self.runner, batch_window_seconds=0.01),
+            self.cache,
+            output_root=Path(self.tmp.name) / "screenshots",
+            derivatives=derivatives,
+        )
+
+        task, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request())
+        done = await self._wait(task.task_id)
+        for _ in range(100):
+            if derivatives.generated:
+                break
+            await asyncio.sleep(0.005)
+        asset = await self.service.get_asset(owner_id="owner-1", asset_id=done.asset_id)
+
+        self.assertEqual(len(written), 1)
+        self.assertEqual(asset.image_uri, written[0].as_uri())
+        self.assertEqual([(d.variant, d.width, d.height) for d in asset.derivatives], [("thumbnail", 32, 16)])
+        self.assertTrue(asset.derivatives[0].url.startswith(f"/api/v1/derivatives/{asset.checksum_sha256}/32.webp?"))
+
+    async def test_after_a_restart_indexed_videos_hit_the_cache_without_being_reread(self) -> None:
+        def prober(*_: object) -> tuple[array, array]:
+            return array("q", range(0, 10_000_000, 40_000)), array("q", range(0, 10_000_000, 2_000_000))
+
+        def service() -> ScreenshotService:
+            return ScreenshotService(
+                self.repository,
+                self.instructions,
+                self.storage,
+                FrameExtractionPool(executor=self.executor, runner=self.runner, batch_window_seconds=0.01),
+                FrameCache(Path(self.tmp.name) / "cache"),
+                output_root=Path(self.tmp.name) / "screenshots",
+                indexes=VideoIndexService(self.repository, self.storage, prober=prober),
+            )
+
+        self.service = service()
+        first, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request(1000))
+        first = await self._wait(first.task_id)
+        self.service = service()
+        with mock.patch("app.services.screenshots.file_sha256", side_effect=AssertionError("video re-read")):
+            repeat, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request(1000))
+            repeat = await self._wait(repeat.task_id)
+
+        self.assertEqual((first.status.value, repeat.status.value), ("SUCCEEDED", "SUCCEEDED"))
+        self.assertEqual(len(self.runner.passes), 1)
+        self.assertEqual(self.service.stats.cache.hits, 1)
+
+    async def test_missing_video_fails_the_task(self) -> None:
+        del self.job.manifest["video_uri"]
+
+        task, _ = await self.service.extract(owner_id="owner-1", job_id=self.job.id, request=self._request())
+        failed = await self._wait(task.task_id)
+
+        self.assertEqual((failed.status.value, failed.failure_code), ("FAILED", "VIDEO_NOT_READY"))
+        self.assertEqual(self.runner.passes, [])
+
+
+class FrameCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name) / "cache"
+
+    def _put(self, cache: FrameCache, timestamp_ms: int, size: int = 64) -> str:
+        key = frame_key("video-sha", timestamp_ms, "precise", "png")
+        staged = cache.staging_path(key, "png")
+        staged.parent.mkdir(parents=True, exist_ok=True)
+        staged.write_bytes(_png(size, size) + bytes(1000))
+        cache.put(key, "png", staged, size, size)
+        return key
+
+    def test_checkout_links_cached_frames_and_counts_hits(self) -> None:
+        cache = FrameCache(self.root)
+        key = self._put(cache, 1000)
+        dest = Path(self.tmp.name) / "assets" / "a.png"
+
+        hit = cache.checkout(key, dest)
+        miss = cache.checkout(frame_key("video-sha", 2000, "precise", "png"), Path(self.tmp.name) / "b.png")
+
+        self.assertEqual((hit.path, hit.width, hit.height, len(hit.checksum_sha256)), (dest, 64, 64, 64))
+        self.assertTrue(dest.is_file())
+        self.assertIsNone(miss)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+        self.assertNotEqual(key, frame_key("video-sha", 1000, "nearest_keyframe", "png"))
+        self.assertNotEqual(key, frame_key("other-video", 1000, "precise", "png"))
+
+    def test_least_recently_used_frames_are_evicted_past_the_size_bound(self) -> None:
+        entry_bytes = len(_png(64, 64)) + 1000
+        cache = FrameCache(self.root, max_bytes=2 * entry_bytes)
+        first = self._put(cache, 1)
+        second = self._put(cache, 2)
+        dest = Path(self.tmp.name) / "first.png"
+        cache.checkout(first, dest)
+
+        self._put(cache, 3)
+
+        self.assertEqual((len(cache), cache.stats.bytes, cache.evictions), (2, 2 * entry_bytes, 1))
+        self.assertIsNone(cache.checkout(second, Path(self.tmp.name) / "second.png"))
+        self.assertIsNotNone(cache.checkout(first, Path(self.tmp.name) / "again.png"))
+        # The asset's own link outlives eviction of the cache entry.
+        self._put(cache, 4)
+        self._put(cache, 5)
+        self.assertTrue(dest.is_file())
+
+    def test_checkout_copies_files_without_holding_the_cache_lock(self) -> None:
+        cache = FrameCache(self.root)
+        slow, fast = self._put(cache, 1), self._put(cache, 2)
+        entered, release = threading.Event(), threading.Event()
+        replace_from = frame_cache._replace_from
+
+        def blocking_replace(source: Path, dest: Path) -> None:
+            if dest.name == "slow.png":
+                entered.set()
+                release.wait(5)
+            replace_from(source, dest)
+
+        with mock.patch.object(frame_cache, "_replace_from", blocking_replace), ThreadPoolExecutor(1) as pool:
+            pending = pool.submit(cache.checkout, slow, Path(self.tmp.name) / "slow.png")
+            self.assertTrue(entered.wait(5))
+            hit = cache.checkout(fast, Path(self.tmp.name) / "fast.png")
+            hits_while_blocked = cache.stats.hits
+            release.set()
+            self.assertIsNotNone(pending.result(5))
+
+        self.assertIsNotNone(hit)
+        self.assertEqual((hits_while_blocked, cache.stats.hits), (1, 2))
+
+    def test_frames_on_disk_are_adopted_by_a_new_cache(self) -> None:
+        key = self._put(FrameCache(self.root), 1000, size=32)
+        (self.root / ".staging" / "partial.png").write_bytes(b"half a frame")
+
+        cache = FrameCache(self.root)
+        hit = cache.checkout(key, Path(self.tmp.name) / "a.png")
+
+        self.assertEqual((len(cache), hit.width, hit.height), (1, 32, 32))
+        self.assertFalse((self.root / ".staging").exists())
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class ScreenshotApiTests(_SettingsEnvCase):
+    def test_extract_is_accepted_replayed_and_polled(self) -> None:
+        container = build_container(Settings(auth_provider="mock", callback_secret="test-callback-secret"))
+        with TestClient(create_app(container=container)) as client:
+            project_id = client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+            job_id = client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"]
+            instruction = client.portal.call(
+                lambda: container.instruction_service.create_instruction(job_id=job_id, markdown=_MARKDOWN)
+            )
+            url = f"/api/v1/jobs/{job_id}/screenshots/extract"
+            body = {
+                "instruction_id": instruction.instruction_id,
+                "instruction_version_id": instruction_version_id(instruction.instruction_id, 1),
+                "timestamp_ms": 1000,
+                "idempotency_key": "shot-1",
+            }
+
+            accepted = client.post(url, headers=_OWNER_HEADERS, json=body)
+            replayed = client.post(url, headers=_OWNER_HEADERS, json=body)
+            task_url = f"/api/v1/screenshot-tasks/{accepted.json()['task_id']}"
+            for _ in range(100):
+                task = client.get(task_url, headers=_OWNER_HEADERS).json()
+                if task["status"] == "FAILED":
+                    break
+                time.sleep(0.01)
+            foreign = client.get(task_url, headers={"Authorization": "Bearer test:intruder:editor"})
+            invalid = client.post(url, headers=_OWNER_HEADERS, json={**body, "idempotency_key": "shot-2", "offset_ms": -5000})
+
+        self.assertEqual((accepted.status_code, accepted.json()["operation"]), (202, "extract"))
+        self.assertEqual((replayed.status_code, replayed.json()["task_id"], replayed.json()["replayed"]), (200, task["task_id"], True))
+        # The job never reached UPLOADED, so there is no video to extract from.
+        self.assertEqual((task["status"], task["failure_code"]), ("FAILED", "VIDEO_NOT_READY"))
+        self.assertEqual(foreign.status_code, 404)
+        self.assertEqual((invalid.status_code, invalid.json()["code"]), (400, "VALIDATION_ERROR"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+"""SQLite repository backend tests, checked against the in-memory contract."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import UTC, datetime
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings, get_settings
+from app.core.container import build_repository
+from app.main import create_app
+from app.repositories.base import JobTransition, Repository
+from app.repositories.memory import InMemoryStore
+from app.repositories.sql import SCHEMA_VERSION, SqlRepository
+from app.schemas.job import JobStatus
+
+
+class _RepositoryContract:
+    """Behavior every ``Repository`` backend must share."""
+
+    def make_repository(self) -> Repository:
+        raise NotImplementedError
+
+    def test_projects_are_owner_scoped_and_created_ordered(self: unittest.TestCase) -> None:
+        repo = self.make_repository()
+        first = repo.create_project(owner_id="user-a", name="First")
+        repo.create_project(owner_id="user-b", name="Other")
+        second = repo.create_project(owner_id="user-a", name="Second")
+
+        self.assertEqual([p.id for p in repo.list_projects_for_owner("user-a")], [first.id, second.id])
+        self.assertEqual(repo.get_project(first.id), first)
+        self.assertEqual(repo.get_project_for_owner("user-a", first.id), first)
+        self.assertIsNone(repo.get_project_for_owner("user-b", first.id))
+        self.assertIsNone(repo.get_project("missing"))
+        self.assertEqual(repo.project_write_count, 3)
+
+    def test_keyset_pages_resume_after_position(self: unittest.TestCase) -> None:
+        repo = self.make_repository()
+        created = [repo.create_project(owner_id="user-a", name=f"P{index}") for index in range(5)]
+
+        first_page = repo.list_projects_for_owner("user-a", limit=2)
+        after = (first_page[-1].created_at, first_page[-1].id)
+        rest = repo.list_projects_for_owner("user-a", after=after)
+
+        self.assertEqual([p.id for p in first_page + rest], [p.id for p in created])
+
+    def test_jobs_are_project_scoped_and_created_ordered(self: unittest.TestCase) -> None:
+        repo = self.make_repository()
+        project_a = repo.create_project(owner_id="user-a", name="A")
+        project_b = repo.create_project(owner_id="user-a", name="B")
+        job_1 = repo.create_job(owner_id="user-a", project_id=project_a.id)
+        repo.create_job(owner_id="user-a", project_id=project_b.id)
+        job_2 = repo.create_job(owner_id="user-a", project_id=project_a.id)
+
+        listed = repo.list_jobs_for_project(project_a.id)
+
+        self.assertEqual([job.id for job in listed], [job_1.id, job_2.id])
+        self.assertEqual(repo.get_job(job_1.id), job_1)
+        self.assertEqual(listed[0].status, JobStatus.CREATED)
+        self.assertEqual(repo.list_jobs_for_project(project_a.id, after=(job_1.created_at, job_1.id)), [job_2])
+
+    def test_job_transition_writes_status_manifest_failure_and_last_event(self: unittest.TestCase) -> None:
+        repo = self.make_repository()
+        project = repo.create_project(owner_id="user-a", name="A")
+        job = repo.create_job(owner_id="user-a", project_id=project.id)
+        occurred_at = datetime(2026, 2, 22, 10, 0, tzinfo=UTC)
+        transition = JobTransition(
+            job_id=job.id,
+            status=JobStatus.FAILED,
+            manifest={"video_uri": "gs://bucket/v.mp4", "metrics": {"duration_ms": 5}},
+            failure_code="STT_TIMEOUT",
+            failure_message="Speech-to-text timed out",
+            failed_stage="TRANSCRIBING",
+            event_id="evt-1",
+            event_digest="ab" * 16,
+            occurred_at=occurred_at,
+            recorded_at=occurred_at,
+        )
+
+        applied = repo.apply_job_transition(transition)
+
+        self.assertEqual(applied, repo.get_job(job.id))
+        self.assertEqual(applied.status, JobStatus.FAILED)
+        self.assertEqual(applied.manifest, transition.manifest)
+        self.assertEqual((applied.failure_code, applied.failed_stage), ("STT_TIMEOUT", "TRANSCRIBING"))
+        self.assertEqual((applied.last_event_id, applied.last_event_at), ("evt-1", occurred_at))
+        self.assertEqual(repo.job_write_count, 2)
+        self.assertIsNone(repo.apply_job_transition(replace(transition, job_id="missing")))
+
+
+class InMemoryRepositoryContractTests(_RepositoryContract, unittest.TestCase):
+    def make_repository(self) -> Repository:
+        return InMemoryStore()
+
+
+class SqlRepositoryContractTests(_RepositoryContract, unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = str(Path(self._tmp.name) / "howera.db")
+
+    def make_repository(self) -> Repository:
+        repo = SqlRepository.from_path(self.path, pool_size=2)
+        self.addCleanup(repo.close)
+        return repo
+
+    def test_data_survives_reopening_the_database(self) -> None:
+        repo = self.make_repository()
+        project = repo.create_project(owner_id="user-a", name="Durable")
+        repo.close()
+
+        reopened = self.make_repository()
+
+        self.assertEqual(reopened.get_project(project.id), project)
+
+    def test_databases_created_before_versioning_are_migrated(self) -> None:
+        # The original schema: jobs without manifest, failure or last-event columns.
+        legacy = sqlite3.connect(self.path)
+        legacy.executescript(
+            """
+            CREATE TABLE projects (id VARCHAR(36) PRIMARY KEY, owner_id VARCHAR(255) NOT NULL,
+                name TEXT NOT NULL, created_at VARCHAR(32) NOT NULL);
+            CREATE TABLE jobs (id VARCHAR(36) PRIMARY KEY, project_id VARCHAR(36) NOT NULL REFERENCES projects (id),
+                owner_id VARCHAR(255) NOT NULL, status VARCHAR(32) NOT NULL, created_at VARCHAR(32) NOT NULL,
+                updated_at VARCHAR(32));
+            INSERT INTO projects VALUES ('p1', 'user-a', 'Legacy', '2024-01-01T00:00:00.000000+00:00');
+            INSERT INTO jobs VALUES ('j1', 'p1', 'user-a', 'CREATED', '2024-01-01T00:00:01.000000+00:00', NULL);
+            """
+        )
+        legacy.close()
+
+        repo = self.make_repository()
+        job = repo.get_job("j1")
+        updated = repo.apply_job_transition(
+            JobTransition(
+                job_id="j1",
+                status=JobStatus.UPLOADED,
+                manifest={"video_uri": "videos/in.mp4"},
+                failure_code=None,
+                failure_message=None,
+                failed_stage=None,
+                event_id="evt-1",
+                event_digest="ab" * 16,
+                occurred_at=datetime(2026, 2, 22, 10, 0, tzinfo=UTC),
+                recorded_at=datetime(2026, 2, 22, 10, 0, tzinfo=UTC),
+            )
+        )
+        repo.close()
+        reopened = self.make_repository()
+        with reopened._pool.connection() as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+
+        self.assertEqual((job.status, job.manifest, job.failure_code, job.last_event_at), (JobStatus.CREATED, {}, None, None))
+        self.assertEqual(updated.manifest, {"video_uri": "videos/in.mp4"})
+        self.assertEqual(reopened.get_job("j1").manifest, {"video_uri": "videos/in.mp4"})
+        self.assertEqual(version, SCHEMA_VERSION)
+
+    def test_wal_mode_and_listing_index_are_used(self) -> None:
+        repo = self.make_repository()
+        with repo._pool.connection() as connection:
+            journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE project_id = ? AND (created_at, id) > (?, ?) "
+                "ORDER BY created_at, id LIMIT ?",
+                ("p", "", "", 10),
+            ).fetchall()
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertIn("jobs_project_created_idx", " ".join(str(row) for row in plan))
+
+    def test_settings_select_sqlite_backend(self) -> None:
+        settings = Settings(callback_secret="secret", storage_backend="sqlite", sqlite_path=self.path)
+
+        repo = build_repository(settings)
+        self.addCleanup(repo.close)
+
+        self.assertIsInstance(repo, SqlRepository)
+
+
+class SqlBackedApiTests(unittest.TestCase):
+    _env_keys = ("HOWERA_AUTH_PROVIDER", "HOWERA_CALLBACK_SECRET", "HOWERA_STORAGE_BACKEND", "HOWERA_SQLITE_PATH")
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ["HOWERA_STORAGE_BACKEND"] = "sqlite"
+        os.environ["HOWERA_SQLITE_PATH"] = str(Path(self._tmp.name) / "api.db")
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+        self._tmp.cleanup()
+
+    def test_projects_persist_across_app_restarts(self) -> None:
+        headers = {"Authorization": "Bearer test:user-1:editor"}
+        with TestClient(create_app()) as client:
+            project_id = client.post("/api/v1/projects", headers=headers, json={"name": "Kept"}).json()["id"]
+
+        with TestClient(create_app()) as client:
+            listed = client.get("/api/v1/projects", headers=headers).json()["items"]
+
+        self.assertEqual([project["id"] for project in listed], [project_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,333 @@
+"""Workflow status callback ingestion tests (FSM, idempotency, ordering)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.domain.job_fsm import TERMINAL_STATUSES, TRANSITIONS, allowed_next_statuses, can_transition
+from app.errors import ApiError
+from app.main import create_app
+from app.repositories.memory import InMemoryStore
+from app.repositories.sql import SqlRepository
+from app.schemas.internal import StatusCallbackRequest
+from app.schemas.job import JobStatus
+from app.services.callbacks import StatusCallbackEngine, merge_manifest
+
+_SECRET_HEADERS = {"X-Callback-Secret": "test-callback-secret"}
+_OWNER_HEADERS = {"Authorization": "Bearer test:owner-1:editor"}
+
+
+def _callback(event_id: str, status: JobStatus, second: int, **extra: object) -> StatusCallbackRequest:
+    return StatusCallbackRequest(
+        event_id=event_id,
+        status=status,
+        occurred_at=f"2026-02-22T10:00:{second:02d}Z",
+        correlation_id=f"corr-{event_id}",
+        **extra,
+    )
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class JobFsmTableTests(unittest.TestCase):
+    def test_pipeline_rows_and_retries_are_allowed(self) -> None:
+        for current, target in (
+            (JobStatus.CREATED, JobStatus.UPLOADED),
+            (JobStatus.UPLOADED, JobStatus.AUDIO_EXTRACTING),
+            (JobStatus.AUDIO_EXTRACTING, JobStatus.AUDIO_EXTRACTING),
+            (JobStatus.TRANSCRIBING, JobStatus.TRANSCRIPT_READY),
+            (JobStatus.EXPORTING, JobStatus.EDITING),
+            (JobStatus.EDITING, JobStatus.CANCELLED),
+            (JobStatus.GENERATING, JobStatus.FAILED),
+        ):
+            with self.subTest(current=current, target=target):
+                self.assertTrue(can_transition(current, target))
+
+    def test_forbidden_and_terminal_transitions_are_rejected(self) -> None:
+        self.assertFalse(can_transition(JobStatus.CREATED, JobStatus.TRANSCRIBING))
+        self.assertFalse(can_transition(JobStatus.UPLOADING, JobStatus.AUDIO_EXTRACTING))
+        self.assertFalse(can_transition(JobStatus.AUDIO_READY, JobStatus.AUDIO_READY))
+        for terminal in TERMINAL_STATUSES:
+            self.assertEqual(TRANSITIONS[terminal], frozenset())
+            self.assertEqual(allowed_next_statuses(terminal), [])
+
+
+class StatusCallbackApiTests(_SettingsEnvCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.app = create_app()
+        self.client = TestClient(self.app)
+        project_id = self.client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+        self.project_id = project_id
+        self.job_id = self.client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"]
+
+    def _post(self, body: dict, job_id: str | None = None):
+        return self.client.post(
+            f"/api/v1/internal/jobs/{job_id or self.job_id}/status",
+            headers=_SECRET_HEADERS,
+            json=body,
+        )
+
+    def _body(self, event_id: str, status: str, second: int, **extra: object) -> dict:
+        return {
+            "event_id": event_id,
+            "status": status,
+            "occurred_at": f"2026-02-22T10:00:{second:02d}Z",
+            "correlation_id": f"corr-{event_id}",
+            **extra,
+        }
+
+    def _job(self) -> dict:
+        return self.client.get(f"/api/v1/projects/{self.project_id}/jobs", headers=_OWNER_HEADERS).json()["items"][0]
+
+    def test_first_callback_applies_and_identical_replay_is_a_no_op(self) -> None:
+        body = self._body("evt-1", "UPLOADED", 1, artifact_updates={"video_uri": "gs://b/v.mp4"})
+
+        first = self._post(body)
+        writes_after_first = self.app.state.store.job_write_count
+        replay = self._post(body)
+
+        self.assertEqual(first.status_code, 204)
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(
+            replay.json(),
+            {
+                "job_id": self.job_id,
+                "event_id": "evt-1",
+                "replayed": True,
+                "current_status": "UPLOADED",
+                "latest_applied_occurred_at": "2026-02-22T10:00:01Z",
+            },
+        )
+        self.assertEqual(self.app.state.store.job_write_count, writes_after_first)
+        job = self._job()
+        self.assertEqual(job["status"], "UPLOADED")
+        self.assertEqual(job["manifest"]["video_uri"], "gs://b/v.mp4")
+
+    def test_replay_with_different_payload_is_rejected(self) -> None:
+        self.assertEqual(self._post(self._body("evt-1", "UPLOADED", 1)).status_code, 204)
+
+        mismatch = self._post(self._body("evt-1", "CANCELLED", 1))
+
+        self.assertEqual(mismatch.status_code, 409)
+        self.assertEqual(mismatch.json()["code"], "EVENT_ID_PAYLOAD_MISMATCH")
+        self.assertEqual(mismatch.json()["details"], {"event_id": "evt-1"})
+        self.assertEqual(self._job()["status"], "UPLOADED")
+
+    def test_out_of_order_callback_is_rejected_with_latest_applied_time(self) -> None:
+        self.assertEqual(self._post(self._body("evt-1", "UPLOADED", 5)).status_code, 204)
+
+        late = self._post(self._body("evt-2", "AUDIO_EXTRACTING", 4))
+
+        self.assertEqual(late.status_code, 409)
+        self.assertEqual(late.json()["code"], "CALLBACK_OUT_OF_ORDER")
+        self.assertEqual(
+            late.json()["details"],
+            {
+                "latest_applied_occurred_at": "2026-02-22T10:00:05+00:00",
+                "current_status": "UPLOADED",
+                "attempted_status": "AUDIO_EXTRACTING",
+            },
+        )
+
+    def test_invalid_and_terminal_transitions_are_rejected(self) -> None:
+        invalid = self._post(self._body("evt-1", "TRANSCRIBING", 1))
+        self.assertEqual(invalid.status_code, 409)
+        self.assertEqual(invalid.json()["code"], "FSM_TRANSITION_INVALID")
+        self.assertEqual(invalid.json()["details"]["current_status"], "CREATED")
+        self.assertIn("UPLOADED", invalid.json()["details"]["allowed_next_statuses"])
+
+        failed = self._body(
+            "evt-2",
+            "FAILED",
+            2,
+            failure_code="UNSUPPORTED_CODEC",
+            failure_message="Codec not supported",
+            failed_stage="UPLOADED",
+        )
+        self.assertEqual(self._post(failed).status_code, 204)
+        after_terminal = self._post(self._body("evt-3", "UPLOADED", 3))
+
+        self.assertEqual(after_terminal.status_code, 409)
+        self.assertEqual(after_terminal.json()["code"], "FSM_TERMINAL_IMMUTABLE")
+        record = self.app.state.store.get_job(self.job_id)
+        self.assertEqual((record.status, record.failure_code), (JobStatus.FAILED, "UNSUPPORTED_CODEC"))
+
+    def test_unknown_job_returns_no_leak_404(self) -> None:
+        response = self._post(self._body("evt-1", "UPLOADED", 1), job_id="missing-job")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"code": "RESOURCE_NOT_FOUND", "message": "Resource not found"})
+
+
+class StatusCallbackBatchApiTests(_SettingsEnvCase):
+    def _app_with_jobs(self) -> tuple[TestClient, object, list[str]]:
+        app = create_app()
+        client = TestClient(app)
+        project_id = client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+        job_ids = [
+            client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"] for _ in range(2)
+        ]
+        return client, app, job_ids
+
+    def _events(self, job_a: str, job_b: str) -> list[dict]:
+        def event(job_id: str, event_id: str, status: str, second: int) -> dict:
+            return {
+                "job_id": job_id,
+                "event_id": event_id,
+                "status": status,
+                "occurred_at": f"2026-02-22T10:00:{second:02d}Z",
+                "correlation_id": "corr",
+            }
+
+        return [
+            event(job_a, "a-1", "UPLOADED", 1),
+            event(job_b, "b-1", "UPLOADED", 1),
+            event(job_a, "a-2", "AUDIO_EXTRACTING", 2),
+            event(job_a, "a-1", "UPLOADED", 1),
+            event(job_b, "b-1", "CANCELLED", 1),
+            event(job_b, "b-2", "AUDIO_EXTRACTING", 0),
+            event(job_b, "b-3", "AUDIO_READY", 3),
+            event("missing-job", "m-1", "UPLOADED", 1),
+        ]
+
+    def test_batch_results_match_single_event_endpoint(self) -> None:
+        batch_client, batch_app, (batch_a, batch_b) = self._app_with_jobs()
+        single_client, single_app, (single_a, single_b) = self._app_with_jobs()
+
+        response = batch_client.post(
+            "/api/v1/internal/jobs/status-batch",
+            headers=_SECRET_HEADERS,
+            json={"events": self._events(batch_a, batch_b)},
+        )
+        single_statuses = []
+        single_codes = []
+        for event in self._events(single_a, single_b):
+            job_id = event.pop("job_id")
+            reply = single_client.post(f"/api/v1/internal/jobs/{job_id}/status", headers=_SECRET_HEADERS, json=event)
+            single_statuses.append(reply.status_code)
+            single_codes.append(reply.json().get("code") if reply.status_code >= 400 else None)
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([r["event_id"] for r in results], ["a-1", "b-1", "a-2", "a-1", "b-1", "b-2", "b-3", "m-1"])
+        self.assertEqual(
+            [r["outcome"] for r in results],
+            ["applied", "applied", "applied", "replayed", "rejected", "rejected", "rejected", "rejected"],
+        )
+        self.assertEqual([r["status_code"] for r in results], single_statuses)
+        self.assertEqual([(r.get("error") or {}).get("code") for r in results], single_codes)
+        self.assertEqual(results[3]["current_status"], "AUDIO_EXTRACTING")
+        for batch_id, single_id in ((batch_a, single_a), (batch_b, single_b)):
+            self.assertEqual(batch_app.state.store.get_job(batch_id).status, single_app.state.store.get_job(single_id).status)
+        self.assertEqual(batch_app.state.store.job_write_count, single_app.state.store.job_write_count)
+
+    def test_batch_requires_callback_secret_and_events(self) -> None:
+        client, app, (job_a, job_b) = self._app_with_jobs()
+
+        unauthorized = client.post("/api/v1/internal/jobs/status-batch", json={"events": self._events(job_a, job_b)})
+        empty = client.post("/api/v1/internal/jobs/status-batch", headers=_SECRET_HEADERS, json={"events": []})
+
+        self.assertEqual(unauthorized.status_code, 401)
+        self.assertEqual(empty.status_code, 401)
+        self.assertEqual(app.state.store.get_job(job_a).status, JobStatus.CREATED)
+
+
+class StatusCallbackEngineTests(unittest.TestCase):
+    def _job(self, store: InMemoryStore | SqlRepository) -> str:
+        project = store.create_project(owner_id="owner-1", name="P")
+        return store.create_job(owner_id="owner-1", project_id=project.id).id
+
+    def test_ledger_stays_bounded_and_compacts_on_terminal_status(self) -> None:
+        store = InMemoryStore()
+        engine = StatusCallbackEngine(store, max_events_per_job=4, terminal_retained_events=2)
+        job_id = self._job(store)
+        engine.ingest(job_id, _callback("evt-up", JobStatus.UPLOADED, 0))
+
+        for second in range(1, 10):
+            engine.ingest(job_id, _callback(f"evt-retry-{second}", JobStatus.AUDIO_EXTRACTING, second))
+        self.assertEqual(engine.ledger_size(job_id), 4)
+
+        engine.ingest(job_id, _callback("evt-cancel", JobStatus.CANCELLED, 30))
+        self.assertEqual(engine.ledger_size(job_id), 2)
+        self.assertEqual((engine.applied, engine.replayed, engine.rejected), (11, 0, 0))
+
+    def test_ledgers_are_bounded_by_job_and_rebuilt_from_the_last_event(self) -> None:
+        store = InMemoryStore()
+        engine = StatusCallbackEngine(store, max_jobs=2)
+        jobs = [self._job(store) for _ in range(3)]
+        for job_id in jobs:
+            engine.ingest(job_id, _callback(f"evt-{job_id}", JobStatus.UPLOADED, 1))
+
+        evicted = engine.ledger_size(jobs[0])
+        replay = engine.ingest(jobs[0], _callback(f"evt-{jobs[0]}", JobStatus.UPLOADED, 1))
+
+        self.assertEqual([engine.ledger_size(job_id) for job_id in jobs], [1, 0, 1])
+        self.assertEqual(evicted, 0)
+        self.assertTrue(replay.replayed)
+
+    def test_last_event_replay_is_recognized_after_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "callbacks.db")
+            store = SqlRepository.from_path(path, pool_size=1)
+            job_id = self._job(store)
+            callback = _callback("evt-1", JobStatus.UPLOADED, 1)
+            StatusCallbackEngine(store).ingest(job_id, callback)
+            store.close()
+
+            reopened = SqlRepository.from_path(path, pool_size=1)
+            try:
+                engine = StatusCallbackEngine(reopened)
+                replay = engine.ingest(job_id, callback)
+                with self.assertRaises(ApiError) as mismatch:
+                    engine.ingest(job_id, _callback("evt-1", JobStatus.CANCELLED, 1))
+            finally:
+                reopened.close()
+
+        self.assertIsNotNone(replay)
+        self.assertTrue(replay.replayed)
+        self.assertEqual(mismatch.exception.payload.code, "EVENT_ID_PAYLOAD_MISMATCH")
+
+    def test_manifest_merge_keeps_raw_video_and_appends_exports(self) -> None:
+        merged = merge_manifest(
+            {"video_uri": "gs://b/original.mp4", "exports": ["gs://b/a.pdf"]},
+            {"video_uri": "gs://b/other.mp4", "export_uri": "gs://b/b.pdf", "draft_uri": "gs://b/d.md", "audio_uri": None},
+        )
+
+        self.assertEqual(
+            merged,
+            {"video_uri": "gs://b/original.mp4", "exports": ["gs://b/a.pdf", "gs://b/b.pdf"], "draft_uri": "gs://b/d.md"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
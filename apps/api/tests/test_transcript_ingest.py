@@ -0,0 +1,213 @@
+"""Streaming transcript ingestion tests."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.adapters.storage import LocalArtifactStorage
+from app.core.config import Settings, get_settings
+from app.core.container import build_container
+from app.errors import ApiError
+from app.main import create_app
+from app.repositories.transcripts import TranscriptStore
+from app.services.transcript_ingest import TranscriptFormatError, TranscriptIngestor, iter_transcript_segments
+
+_OWNER_HEADERS = {"Authorization": "Bearer test:owner-1:editor"}
+_SECRET_HEADERS = {"X-Callback-Secret": "test-callback-secret"}
+
+
+def _rows(count: int) -> list[dict]:
+    return [{"start_ms": i * 1000, "end_ms": i * 1000 + 900, "text": f"línea {i}"} for i in range(count)]
+
+
+class _UnreadableStorage(LocalArtifactStorage):
+    """Opens artifacts whose reads fail part-way, like a dropped network mount."""
+
+    def open(self, uri: str) -> io.BufferedReader:
+        class _Failing(io.RawIOBase):
+            def readable(self) -> bool:
+                return True
+
+            def readinto(self, buffer) -> int:
+                raise PermissionError(13, "Permission denied")
+
+        return io.BufferedReader(_Failing())
+
+
+def _parse(text: str, **options) -> list[tuple[int, int, str]]:
+    return list(iter_transcript_segments(io.StringIO(text), **options))
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class SegmentParserTests(unittest.TestCase):
+    def test_ndjson_and_json_array_parse_identically_across_chunk_boundaries(self) -> None:
+        rows = _rows(50)
+        ndjson = "\n".join(json.dumps(row) for row in rows) + "\n\n"
+        array = " [\n" + ",\n".join(json.dumps(row) for row in rows) + "\n] \n"
+        expected = [(row["start_ms"], row["end_ms"], row["text"]) for row in rows]
+
+        for chunk_chars in (1, 7, 4096):
+            self.assertEqual(_parse(ndjson, chunk_chars=chunk_chars), expected)
+            self.assertEqual(_parse(array, chunk_chars=chunk_chars), expected)
+        self.assertEqual(_parse("[]"), [])
+        self.assertEqual(_parse(""), [])
+
+    def test_invalid_segments_report_their_index(self) -> None:
+        cases = {
+            '{"start_ms":0,"end_ms":5,"text":"a"}\n{"start_ms":9,"end_ms":5,"text":"b"}': 1,
+            '[{"start_ms":10,"end_ms":15,"text":"a"},{"start_ms":9,"end_ms":12,"text":"b"}]': 1,
+            '[{"start_ms":0,"end_ms":5,"text":"a"} {"start_ms":1,"end_ms":2,"text":"b"}]': 1,
+            '[{"start_ms":0,"end_ms":5,"text":"a"}] trailing': 1,
+            '{"start_ms":true,"end_ms":5,"text":"a"}': 0,
+            '{"start_ms":0,"end_ms":5,"text":"a"': 0,
+            '[{"start_ms":0,"end_ms":5,"text":"a"': 0,
+            "[1]": 0,
+        }
+        for text, index in cases.items():
+            with self.subTest(text=text), self.assertRaises(TranscriptFormatError) as ctx:
+                _parse(text, chunk_chars=8)
+            self.assertEqual(ctx.exception.segment_index, index)
+
+    def test_oversized_segment_is_rejected_without_buffering_the_rest(self) -> None:
+        text = json.dumps({"start_ms": 0, "end_ms": 1, "text": "x" * 500})
+
+        with self.assertRaises(TranscriptFormatError):
+            _parse(text, chunk_chars=16, max_segment_chars=100)
+
+
+class TranscriptIngestorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.transcripts = TranscriptStore()
+        self.ingestor = TranscriptIngestor(LocalArtifactStorage(self.root), self.transcripts, batch_size=7)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_ingests_in_batches_and_skips_the_current_uri(self) -> None:
+        (self.root / "t.ndjson").write_text("\n".join(json.dumps(row) for row in _rows(30)), encoding="utf-8")
+        file_uri = (self.root / "t.ndjson").as_uri()
+
+        self.assertTrue(self.ingestor.ingest("job-1", "t.ndjson"))
+        self.assertFalse(self.ingestor.ingest("job-1", "t.ndjson"))
+        self.assertTrue(self.ingestor.ingest("job-1", file_uri))
+        self.assertFalse(self.ingestor.ingest("job-1", file_uri))
+
+        transcript = self.transcripts.get("job-1")
+        self.assertEqual(len(transcript), 30)
+        self.assertEqual(transcript.segment(29).text, "línea 29")
+        self.assertEqual(self.ingestor.ingested, 2)
+
+    def test_failures_keep_the_previous_transcript(self) -> None:
+        (self.root / "good.json").write_text(json.dumps(_rows(3)), encoding="utf-8")
+        (self.root / "bad.json").write_text(json.dumps(_rows(3)[::-1]), encoding="utf-8")
+        self.ingestor.ingest("job-1", "good.json")
+
+        for uri in ("bad.json", "missing.json", "../outside.json", "s3://bucket/t.json"):
+            with self.subTest(uri=uri), self.assertRaises(ApiError) as ctx:
+                self.ingestor.ingest("job-1", uri)
+            self.assertEqual((ctx.exception.status_code, ctx.exception.payload.code), (422, "TRANSCRIPT_INGEST_FAILED"))
+
+        self.assertEqual(self.transcripts.source_uri("job-1"), "good.json")
+        self.assertEqual(self.ingestor.failed, 4)
+
+
+    def test_read_errors_are_reported_as_ingest_failures(self) -> None:
+        ingestor = TranscriptIngestor(_UnreadableStorage(self.root), self.transcripts)
+
+        with self.assertRaises(ApiError) as ctx:
+            ingestor.ingest("job-1", "t.ndjson")
+
+        self.assertEqual((ctx.exception.status_code, ctx.exception.payload.code), (422, "TRANSCRIPT_INGEST_FAILED"))
+        self.assertIsNone(self.transcripts.get("job-1"))
+
+
+class TranscriptCallbackIngestionTests(_SettingsEnvCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        container = build_container(
+            Settings(auth_provider="mock", callback_secret="test-callback-secret"),
+            storage=LocalArtifactStorage(self.root),
+        )
+        self.client = TestClient(create_app(container=container))
+        project_id = self.client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+        self.job_id = self.client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"]
+        for step, status in enumerate(("UPLOADED", "AUDIO_EXTRACTING", "AUDIO_READY", "TRANSCRIBING")):
+            self._callback(f"evt-{step}", status, step)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+        super().tearDown()
+
+    def _callback(self, event_id: str, status: str, second: int, artifact_updates: dict | None = None):
+        return self.client.post(
+            f"/api/v1/internal/jobs/{self.job_id}/status",
+            headers=_SECRET_HEADERS,
+            json={
+                "event_id": event_id,
+                "status": status,
+                "occurred_at": f"2026-02-22T10:00:{second:02d}Z",
+                "correlation_id": "corr",
+                "artifact_updates": artifact_updates,
+            },
+        )
+
+    def test_transcript_ready_callback_ingests_the_segment_file(self) -> None:
+        (self.root / "transcript.ndjson").write_text("\n".join(json.dumps(row) for row in _rows(3)), encoding="utf-8")
+
+        response = self._callback("evt-ready", "TRANSCRIPT_READY", 10, {"transcript_uri": "transcript.ndjson"})
+        page = self.client.get(f"/api/v1/jobs/{self.job_id}/transcript", headers=_OWNER_HEADERS)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual([item["text"] for item in page.json()["items"]], ["línea 0", "línea 1", "línea 2"])
+
+    def test_failed_ingestion_is_reported_and_retried_on_replay(self) -> None:
+        updates = {"transcript_uri": "late.json"}
+
+        failed = self._callback("evt-ready", "TRANSCRIPT_READY", 10, updates)
+        (self.root / "late.json").write_text(json.dumps(_rows(2)), encoding="utf-8")
+        replay = self._callback("evt-ready", "TRANSCRIPT_READY", 10, updates)
+        page = self.client.get(f"/api/v1/jobs/{self.job_id}/transcript", headers=_OWNER_HEADERS)
+
+        self.assertEqual(failed.status_code, 422)
+        self.assertEqual(failed.json()["details"], {"reason": "transcript artifact not found"})
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(len(page.json()["items"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
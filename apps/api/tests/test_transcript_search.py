@@ -0,0 +1,177 @@
+"""Transcript inverted index and search endpoint tests."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.adapters.storage import LocalArtifactStorage
+from app.core.config import Settings, get_settings
+from app.core.container import build_container
+from app.main import create_app
+from app.repositories.transcript_index import TranscriptIndex, TranscriptIndexCache, parse_query
+from app.repositories.transcripts import CompactTranscript, TranscriptStore
+from app.services.transcript_ingest import TranscriptIngestor
+
+_OWNER_HEADERS = {"Authorization": "Bearer test:owner-1:editor"}
+_SECRET_HEADERS = {"X-Callback-Secret": "test-callback-secret"}
+
+_TEXTS = (
+    "Open the settings menu.",
+    "Click Export, then choose PDF export.",
+    "The export button is at the top right.",
+    "Choose a theme in Settings.",
+    "Press the button to confirm the export button choice.",
+)
+
+
+def _transcript(texts: tuple[str, ...] = _TEXTS) -> CompactTranscript:
+    return CompactTranscript.from_segments((i * 1000, i * 1000 + 900, text) for i, text in enumerate(texts))
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class TranscriptIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = TranscriptIndex.build(_transcript())
+
+    def test_parse_query_splits_terms_and_phrases(self) -> None:
+        self.assertEqual(parse_query('Export "the  BUTTON" "pdf"'), (["pdf", "export"], [["the", "button"]]))
+
+    def test_terms_are_case_insensitive_conjunctive_and_ranked(self) -> None:
+        hits = self.index.search("EXPORT", 10)
+
+        self.assertEqual([segment for segment, _ in hits], [1, 2, 4])
+        self.assertGreater(hits[0][1], hits[1][1])
+        self.assertEqual([segment for segment, _ in self.index.search("settings theme", 10)], [3])
+        self.assertEqual(self.index.search("settings missingword", 10), [])
+
+    def test_phrases_require_adjacent_tokens(self) -> None:
+        self.assertEqual([segment for segment, _ in self.index.search('"export button"', 10)], [4, 2])
+        self.assertEqual(self.index.search('"button export"', 10), [])
+
+    def test_limit_and_empty_queries(self) -> None:
+        self.assertEqual(len(self.index.search("the", 1)), 1)
+        self.assertEqual(self.index.search("?!", 10), [])
+
+
+class TranscriptIndexCacheTests(unittest.TestCase):
+    def test_least_recently_used_indexes_are_evicted_past_the_byte_cap(self) -> None:
+        transcript = _transcript()
+        index = TranscriptIndex.build(transcript)
+        cache = TranscriptIndexCache(max_bytes=index.nbytes * 2)
+
+        cache.put("a", transcript, index)
+        cache.put("b", transcript, index)
+        self.assertIs(cache.get("a", transcript), index)
+        cache.put("c", transcript, index)
+
+        self.assertIsNone(cache.get("b", transcript))
+        self.assertIs(cache.get("a", transcript), index)
+        self.assertEqual((len(cache), cache.evictions, cache.nbytes), (2, 1, index.nbytes * 2))
+
+    def test_an_index_for_a_replaced_transcript_is_not_served(self) -> None:
+        cache = TranscriptIndexCache()
+        old = _transcript()
+        cache.put("a", old, TranscriptIndex.build(old))
+
+        self.assertIsNone(cache.get("a", _transcript()))
+        self.assertEqual(len(cache), 0)
+
+    def test_ingestion_builds_the_index_alongside_the_transcript(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = [{"start_ms": i * 1000, "end_ms": i * 1000 + 900, "text": text} for i, text in enumerate(_TEXTS)]
+            Path(tmp, "t.json").write_text(json.dumps(rows), encoding="utf-8")
+            transcripts, cache = TranscriptStore(), TranscriptIndexCache()
+
+            TranscriptIngestor(LocalArtifactStorage(tmp), transcripts, indexes=cache, batch_size=2).ingest("job-1", "t.json")
+
+        index = cache.get("job-1", transcripts.get("job-1"))
+        self.assertIsNotNone(index)
+        self.assertEqual(index.search('"export button"', 10), TranscriptIndex.build(_transcript()).search('"export button"', 10))
+
+
+class TranscriptSearchApiTests(_SettingsEnvCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.container = build_container(Settings(auth_provider="mock", callback_secret="test-callback-secret"))
+        self.client = TestClient(create_app(container=self.container))
+        project_id = self.client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+        self.job_id = self.client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"]
+
+    def _advance_to_transcript_ready(self) -> None:
+        for step, status in enumerate(("UPLOADED", "AUDIO_EXTRACTING", "AUDIO_READY", "TRANSCRIBING", "TRANSCRIPT_READY")):
+            response = self.client.post(
+                f"/api/v1/internal/jobs/{self.job_id}/status",
+                headers=_SECRET_HEADERS,
+                json={
+                    "event_id": f"evt-{step}",
+                    "status": status,
+                    "occurred_at": f"2026-02-22T10:00:{step:02d}Z",
+                    "correlation_id": "corr",
+                },
+            )
+            self.assertEqual(response.status_code, 204)
+
+    def _search(self, params: dict, headers: dict = _OWNER_HEADERS, job_id: str | None = None):
+        return self.client.get(f"/api/v1/jobs/{job_id or self.job_id}/transcript/search", headers=headers, params=params)
+
+    def test_search_returns_ranked_hits_with_timestamps_building_the_index_on_demand(self) -> None:
+        self._advance_to_transcript_ready()
+        self.container.transcripts.put(self.job_id, _transcript())
+
+        response = self._search({"q": '"export button"'})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["limit"], 20)
+        self.assertEqual([(hit["start_ms"], hit["end_ms"]) for hit in body["items"]], [(4000, 4900), (2000, 2900)])
+        self.assertEqual(body["items"][1]["text"], "The export button is at the top right.")
+        self.assertEqual(len(self.container.transcript_indexes), 1)
+
+    def test_search_enforces_ownership_readiness_and_query_bounds(self) -> None:
+        not_ready = self._search({"q": "export"})
+        self._advance_to_transcript_ready()
+        self.container.transcripts.put(self.job_id, _transcript())
+
+        foreign = self._search({"q": "export"}, headers={"Authorization": "Bearer test:intruder:editor"})
+        missing = self._search({"q": "export"}, job_id="missing")
+
+        self.assertEqual(not_ready.status_code, 409)
+        self.assertEqual(not_ready.json()["code"], "TRANSCRIPT_NOT_READY")
+        self.assertEqual(foreign.status_code, 404)
+        self.assertEqual(foreign.json(), missing.json())
+        self.assertEqual(self._search({"q": ""}).status_code, 422)
+        self.assertEqual(self._search({"q": "x", "limit": 101}).status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Transcript segment store and transcript endpoint tests."""
+
+from __future__ import annotations
+
+import os
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.errors import ApiError
+from app.main import create_app
+from app.repositories.transcripts import CompactTranscript, SegmentRecord, TranscriptBuilder
+from app.services.transcripts import decode_segment_cursor, encode_segment_cursor, transcript_page
+
+_OWNER_HEADERS = {"Authorization": "Bearer test:owner-1:editor"}
+_SECRET_HEADERS = {"X-Callback-Secret": "test-callback-secret"}
+_TO_TRANSCRIPT_READY = ("UPLOADED", "AUDIO_EXTRACTING", "AUDIO_READY", "TRANSCRIBING", "TRANSCRIPT_READY")
+
+
+def _transcript(count: int) -> CompactTranscript:
+    return CompactTranscript.from_segments((i * 1000, i * 1000 + 900, f"segment {i} é") for i in range(count))
+
+
+class _SettingsEnvCase(unittest.TestCase):
+    _env_keys = (
+        "HOWERA_AUTH_PROVIDER",
+        "HOWERA_CALLBACK_SECRET",
+        "HOWERA_FIREBASE_PROJECT_ID",
+        "HOWERA_FIREBASE_AUDIENCE",
+    )
+
+    def setUp(self) -> None:
+        self._old_env = {k: os.environ.get(k) for k in self._env_keys}
+        os.environ["HOWERA_AUTH_PROVIDER"] = "mock"
+        os.environ["HOWERA_CALLBACK_SECRET"] = "test-callback-secret"
+        os.environ.pop("HOWERA_FIREBASE_PROJECT_ID", None)
+        os.environ.pop("HOWERA_FIREBASE_AUDIENCE", None)
+        get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        for key, value in self._old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+class CompactTranscriptTests(unittest.TestCase):
+    def test_segments_round_trip_including_non_ascii_text(self) -> None:
+        transcript = _transcript(3)
+
+        self.assertEqual(len(transcript), 3)
+        self.assertEqual(transcript.segment(1), SegmentRecord(1000, 1900, "segment 1 é"))
+        self.assertEqual([segment.text for segment in transcript], ["segment 0 é", "segment 1 é", "segment 2 é"])
+
+    def test_segment_at_bisects_start_inclusive_end_exclusive(self) -> None:
+        transcript = _transcript(10)
+
+        self.assertEqual(transcript.index_at(0), 0)
+        self.assertEqual(transcript.index_at(5899), 5)
+        self.assertIsNone(transcript.index_at(5900))
+        self.assertIsNone(transcript.index_at(-1))
+        self.assertIsNone(transcript.segment_at(50_000))
+        self.assertEqual(transcript.segment_at(9000).start_ms, 9000)
+
+    def test_builder_sorts_out_of_order_segments_stably(self) -> None:
+        builder = TranscriptBuilder()
+        builder.append(2000, 2500, "c")
+        builder.append(0, 500, "a")
+        builder.append(2000, 2100, "d")
+        builder.append(1000, 1500, "b")
+
+        transcript = builder.build()
+
+        self.assertEqual([segment.text for segment in transcript], ["a", "b", "c", "d"])
+
+    def test_builder_rejects_inverted_or_negative_ranges(self) -> None:
+        builder = TranscriptBuilder()
+        with self.assertRaises(ValueError):
+            builder.append(1000, 999, "x")
+        with self.assertRaises(ValueError):
+            builder.append(-1, 10, "x")
+
+    def test_pages_follow_cursor_and_survive_a_replaced_transcript(self) -> None:
+        transcript = _transcript(5)
+
+        first = transcript_page(transcript, limit=2, cursor=None)
+        second = transcript_page(transcript, limit=2, cursor=first.next_cursor)
+        last = transcript_page(transcript, limit=2, cursor=second.next_cursor)
+
+        self.assertEqual([item.start_ms for item in first.items + second.items + last.items], [0, 1000, 2000, 3000, 4000])
+        self.assertIsNone(last.next_cursor)
+        # A cursor whose index no longer matches falls back to its start time.
+        replaced = CompactTranscript.from_segments([(500, 600, "new"), (1000, 1900, "x"), (1500, 1600, "y")])
+        self.assertEqual([item.text for item in transcript_page(replaced, limit=5, cursor=first.next_cursor).items], ["y"])
+
+    def test_cursor_round_trips_and_rejects_garbage(self) -> None:
+        self.assertEqual(decode_segment_cursor(encode_segment_cursor(1234, 7)), (1234, 7))
+        for cursor in ("not-base64!", encode_segment_cursor(1, 2)[:-2], "LTF8Mg"):
+            with self.assertRaises(ApiError) as ctx:
+                decode_segment_cursor(cursor)
+            self.assertEqual(ctx.exception.status_code, 400)
+
+
+class TranscriptApiTests(_SettingsEnvCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.app = create_app()
+        self.client = TestClient(self.app)
+        project_id = self.client.post("/api/v1/projects", headers=_OWNER_HEADERS, json={"name": "P"}).json()["id"]
+        self.job_id = self.client.post(f"/api/v1/projects/{project_id}/jobs", headers=_OWNER_HEADERS).json()["id"]
+
+    def _advance(self, statuses: tuple[str, ...]) -> None:
+        for step, status in enumerate(statuses):
+            response = self.client.post(
+                f"/api/v1/internal/jobs/{self.job_id}/status",
+                headers=_SECRET_HEADERS,
+                json={
+                    "event_id": f"evt-{step}",
+                    "status": status,
+                    "occurred_at": f"2026-02-22T10:00:{step:02d}Z",
+                    "correlation_id": "corr",
+                },
+            )
+            self.assertEqual(response.status_code, 204)
+
+    def test_transcript_pages_in_start_order(self) -> None:
+        self._advance(_TO_TRANSCRIPT_READY)
+        self.app.state.container.transcripts.put(self.job_id, _transcript(3))
+
+        first = self.client.get(f"/api/v1/jobs/{self.job_id}/transcript", headers=_OWNER_HEADERS, params={"limit": 2})
+        rest = self.client.get(
+            f"/api/v1/jobs/{self.job_id}/transcript",
+            headers=_OWNER_HEADERS,
+            params={"cursor": first.json()["next_cursor"]},
+        )
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["items"][1], {"start_ms": 1000, "end_ms": 1900, "text": "segment 1 é"})
+        self.assertEqual(rest.json(), {"items": [{"start_ms": 2000, "end_ms": 2900, "text": "segment 2 é"}], "limit": 200, "next_cursor": None})
+
+    def test_transcript_is_not_ready_before_transcript_ready(self) -> None:
+        self._advance(_TO_TRANSCRIPT_READY[:2])
+
+        response = self.client.get(f"/api/v1/jobs/{self.job_id}/transcript", headers=_OWNER_HEADERS)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.json(),
+            {
+                "code": "TRANSCRIPT_NOT_READY",
+                "message": "Transcript is not available for this job state.",
+                "details": {"current_status": "AUDIO_EXTRACTING"},
+            },
+        )
+
+    def test_foreign_and_missing_jobs_are_indistinguishable(self) -> None:
+        self._advance(_TO_TRANSCRIPT_READY)
+        self.app.state.container.transcripts.put(self.job_id, _transcript(1))
+
+        foreign = self.client.get(
+            f"/api/v1/jobs/{self.job_id}/transcript",
+            headers={"Authorization": "Bearer test:intruder:editor"},
+        )
+        missing = self.client.get("/api/v1/jobs/missing/transcript", headers=_OWNER_HEADERS)
+
+        self.assertEqual(foreign.status_code, 404)
+        self.assertEqual(foreign.json(), missing.json())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+"""Video frame index parsing, lookup, persistence and build scheduling tests."""
+
+from __future__ import annotations
+
+from array import array
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from app.adapters.media import FfmpegError, parse_packets
+from app.adapters.storage import LocalArtifactStorage
+from app.errors import ApiError
+from app.repositories.async_adapters import DirectAsyncRepository
+from app.repositories.frame_index import VideoFrameIndex, VideoFrameIndexCache, index_path
+from app.repositories.memory import InMemoryStore
+from app.schemas.internal import StatusCallbackRequest
+from app.schemas.job import JobStatus
+from app.services.callbacks import StatusCallbackEngine, StatusCallbackService
+from app.services.video_index import VideoIndexService
+
+# ~30 fps with a keyframe at 0 and at the fourth frame.
+_FRAMES = array("q", [0, 33_367, 66_733, 100_100, 133_467])
+_KEYFRAMES = array("q", [0, 100_100])
+
+
+class _FakeProber:
+    def __init__(self, error: FfmpegError | None = None) -> None:
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, ffprobe_path: str, video_path: str, timeout_seconds: float) -> tuple[array, array]:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return array("q", _FRAMES), array("q", _KEYFRAMES)
+
+
+class ParsePacketsTests(unittest.TestCase):
+    def test_packets_are_sorted_by_presentation_time_and_keyframes_split_out(self) -> None:
+        output = (
+            b"packet,0.000000,K__\npacket,0.100100,___\npacket,0.033367,___\npacket,N/A,___\n"
+            b"packet,0.066733,___\npacket,0.133467,K_\nformat,0.000000\n"
+        )
+
+        frames, keyframes = parse_packets(output)
+
+        self.assertEqual(list(frames), [0, 33_367, 66_733, 100_100, 133_467])
+        self.assertEqual(list(keyframes), [0, 133_467])
+
+    def test_times_are_relative_to_the_container_start_time(self) -> None:
+        # MPEG-TS style: the first packet sits at 1.4s and a B-frame before the container start.
+        output = b"packet,1.400000,K__\npacket,1.466733,___\npacket,1.433367,___\nformat,1.433367\n"
+
+        frames, keyframes = parse_packets(output)
+
+        self.assertEqual(list(frames), [-33_367, 0, 33_366])
+        self.assertEqual(list(keyframes), [-33_367])
+        index = VideoFrameIndex(frames, keyframes)
+        self.assertEqual((index.snap_ms(0, "precise"), index.preseek_ms(10), index.step_ms(0, -1)), (0, 0, 0))
+
+
+class VideoFrameIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = VideoFrameIndex(_FRAMES, _KEYFRAMES, "ab" * 32)
+
+    def test_snapping_follows_what_each_strategy_extracts(self) -> None:
+        cases = [
+            (33, "precise", 33),
+            (34, "precise", 66),
+            (133, "precise", 133),
+            (134, "precise", None),
+            (99, "nearest_keyframe", 0),
+            (120, "nearest_keyframe", 101),
+            (134, "nearest_keyframe", None),
+        ]
+
+        for timestamp_ms, strategy, expected in cases:
+            with self.subTest(timestamp_ms=timestamp_ms, strategy=strategy):
+                self.assertEqual(self.index.snap_ms(timestamp_ms, strategy), expected)
+
+    def test_stepping_is_clamped_to_the_video(self) -> None:
+        self.assertEqual(self.index.step_ms(34, 1), 100)
+        self.assertEqual(self.index.step_ms(34, -1), 33)
+        self.assertEqual(self.index.step_ms(0, -5), 0)
+        self.assertEqual(self.index.step_ms(500, 1), 133)
+
+    def test_preseek_is_the_keyframe_at_or_before_the_frame(self) -> None:
+        self.assertEqual(self.index.preseek_ms(66), 0)
+        self.assertEqual(self.index.preseek_ms(120), 101)
+
+    def test_saved_index_loads_only_for_the_same_video(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = index_path(Path(tmp) / "in.mp4")
+            self.index.save(path, video_size=10, video_mtime_ns=20)
+
+            loaded = VideoFrameIndex.load(path, video_size=10, video_mtime_ns=20)
+            stale = VideoFrameIndex.load(path, video_size=10, video_mtime_ns=21)
+            path.write_bytes(path.read_bytes()[:-8])
+            truncated = VideoFrameIndex.load(path, video_size=10, video_mtime_ns=20)
+
+        self.assertEqual(path.name, "in.mp4.frames")
+        self.assertEqual((list(loaded.frames), list(loaded.keyframes)), (list(_FRAMES), list(_KEYFRAMES)))
+        self.assertEqual(loaded.checksum, "ab" * 32)
+        self.assertIsNone(stale)
+        self.assertIsNone(truncated)
+
+    def test_cache_evicts_least_recently_used_past_its_budget(self) -> None:
+        cache = VideoFrameIndexCache(max_bytes=2 * self.index.nbytes)
+        for name in ("a", "b", "c"):
+            cache.put((name, 1, 1), self.index)
+            if name == "b":
+                cache.get(("a", 1, 1))
+
+        self.assertIsNone(cache.get(("b", 1, 1)))
+        self.assertIsNotNone(cache.get(("a", 1, 1)))
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+
+
+class VideoIndexServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.video = Path(self.tmp.name, "videos", "in.mp4")
+        self.video.parent.mkdir()
+        self.video.write_bytes(b"not really a video")
+        self.store = InMemoryStore()
+        self.repository = DirectAsyncRepository(self.store)
+        self.storage = LocalArtifactStorage(self.tmp.name)
+
+    def _service(self, prober: _FakeProber) -> VideoIndexService:
+        return VideoIndexService(self.repository, self.storage, prober=prober)
+
+    async def test_concurrent_lookups_build_once_and_later_services_load_from_disk(self) -> None:
+        prober = _FakeProber()
+        service = self._service(prober)
+
+        first, second = await asyncio.gather(service.index(self.video), service.index(self.video))
+        restarted_prober = _FakeProber()
+        restarted = self._service(restarted_prober)
+        reloaded = await restarted.index(self.video)
+
+        self.assertIs(first, second)
+        self.assertEqual((prober.calls, service.built), (1, 1))
+        self.assertTrue(index_path(self.video).is_file())
+        self.assertEqual(list(reloaded.frames), list(_FRAMES))
+        self.assertEqual((restarted_prober.calls, restarted.loaded), (0, 1))
+        self.assertEqual(reloaded.checksum, hashlib.sha256(b"not really a video").hexdigest())
+
+    async def test_unprobeable_videos_are_not_reprobed(self) -> None:
+        prober = _FakeProber(FfmpegError("Video has no decodable frames", "VIDEO_UNREADABLE"))
+        service = self._service(prober)
+
+        self.assertIsNone(await service.index(self.video))
+        self.assertIsNone(await service.index(self.video))
+        self.assertEqual((prober.calls, service.failures), (1, 1))
+
+    async def test_frame_navigation_is_scoped_to_the_owner_and_an_indexed_video(self) -> None:
+        service = self._service(_FakeProber())
+        project = self.store.create_project(owner_id="owner-1", name="P")
+        job = self.store.create_job(owner_id="owner-1", project_id=project.id)
+        pending = self.store.create_job(owner_id="owner-1", project_id=project.id)
+        job.manifest["video_uri"] = "videos/in.mp4"
+
+        snapped = await service.snap(owner_id="owner-1", job_id=job.id, timestamp_ms=34, strategy="precise")
+        following = await service.step(owner_id="owner-1", job_id=job.id, timestamp_ms=snapped, frames=1)
+
+        self.assertEqual((snapped, following), (66, 100))
+        for owner_id, job_id, status_code in (("intruder", job.id, 404), ("owner-1", pending.id, 409)):
+            with self.subTest(owner_id=owner_id, job_id=job_id):
+                with self.assertRaises(ApiError) as ctx:
+                    await service.step(owner_id=owner_id, job_id=job_id, timestamp_ms=0, frames=1)
+                self.assertEqual(ctx.exception.status_code, status_code)
+
+    async def test_uploaded_callback_schedules_an_index_build(self) -> None:
+        service = self._service(_FakeProber())
+        callbacks = StatusCallbackService(StatusCallbackEngine(self.store), None, videos=service)
+        project = self.store.create_project(owner_id="owner-1", name="P")
+        job = self.store.create_job(owner_id="owner-1", project_id=project.id)
+
+        await callbacks.ingest(
+            job.id,
+            StatusCallbackRequest(
+                event_id="evt-1",
+                status=JobStatus.UPLOADED,
+                occurred_at="2026-02-22T10:00:00Z",
+                correlation_id="corr-1",
+                artifact_updates={"video_uri": "videos/in.mp4"},
+            ),
+        )
+        for _ in range(100):
+            if service.built:
+                break
+            await asyncio.sleep(0.005)
+
+        self.assertEqual(service.built, 1)
+        self.assertTrue(os.path.isfile(index_path(self.video)))
+
+
+if __name__ == "__main__":
+    unittest.main()